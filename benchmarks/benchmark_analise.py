@@ -0,0 +1,289 @@
+"""
+Benchmark de vazão e latência do pipeline de análise.
+
+Gera um corpus sintético, mede os carregadores de arquivo (CSV, TXT, JSON e
+JSON Lines, inteiros e em blocos) e roda `executar_analise` contra o backend
+simulado para cada combinação de tamanho de corpus, concorrência máxima e
+tamanho de lote.
+Cada medição roda em um processo próprio, para que o pico de RSS seja só dela.
+
+Reporta comentários/seg, latência por comentário e por requisição
+(p50/p95/p99), requisições, retentativas, requisições de reserva (hedging),
+timeouts, respostas inválidas e itens reparados (reenvios evitados), as
+estatísticas por faixa de modelo e pico de RSS, e grava tudo em JSON para
+comparar versões.
+
+Uso (da raiz do projeto):
+    python benchmarks/benchmark_analise.py --tamanhos 1000,10000 --workers 8,32,64 --lotes 1,20
+    python benchmarks/benchmark_analise.py --tamanhos 1000000 --workers 64 --lotes 20 --latencia-mediana 0.05
+    python benchmarks/benchmark_analise.py --tamanhos 5000 --workers 32 --lotes 20 --taxa-travamento 0.01 --sem-hedge
+    python benchmarks/benchmark_analise.py --tamanhos 5000 --lotes 20 --taxa-rotulo-variante 0.05 --sem-saida-estruturada
+    python benchmarks/benchmark_analise.py --tamanhos 2000 --lotes 20 --proporcao-longos 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from corpus_sintetico import gerar_corpus, salvar_corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+FORMATOS_CARREGADOR = ('csv', 'txt', 'json', 'jsonl')
+MODOS_CARREGADOR = ('inteiro', 'blocos')
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo atual, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _lista_inteiros(texto):
+    return [int(parte) for parte in texto.split(',') if parte.strip()]
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir_carregador(parametros):
+    """
+    Executado em processo separado: tempo de leitura de um arquivo.
+
+    'inteiro' junta todos os blocos em um DataFrame (arquivo completo em memória);
+    'blocos' percorre `iterar_blocos_arquivo` sem guardar os blocos, como o
+    fluxo principal faz.
+    """
+    caminho, modo = parametros
+    from feedback_analyzer.carregador_arquivos import iterar_blocos_arquivo, juntar_blocos
+
+    inicio = time.perf_counter()
+    if modo == 'blocos':
+        comentarios = sum(len(bloco) for bloco in iterar_blocos_arquivo(caminho))
+    else:
+        comentarios = len(juntar_blocos(iterar_blocos_arquivo(caminho)))
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "formato": caminho.rsplit('.', 1)[-1],
+        "modo": modo,
+        "comentarios": comentarios,
+        "segundos": round(segundos, 4),
+        "comentarios_por_seg": round(comentarios / segundos, 1) if segundos > 0 else None,
+        "pico_rss_mb": pico_rss_mb()
+    }
+
+
+def medir_analise(parametros):
+    """Executado em processo separado: uma execução completa do pipeline de análise."""
+    from feedback_analyzer.backends import BackendSimulado
+    from feedback_analyzer.gemini_processor import definir_backend, definir_saida_estruturada, estatisticas_faixas
+    from feedback_analyzer.rate_limiter import (
+        LimitadorTokenBucket, ControlePrazos, definir_limitador, definir_controle_prazos
+    )
+    from feedback_analyzer.analysis_engine import executar_analise
+
+    comentarios = gerar_corpus(
+        parametros['comentarios'], parametros['semente'], parametros['proporcao_repetidos'],
+        parametros['proporcao_longos']
+    )
+    definir_backend(BackendSimulado(semente=parametros['semente'], **parametros['simulacao']))
+    definir_limitador(LimitadorTokenBucket(
+        requisicoes_por_minuto=parametros['requisicoes_por_minuto'], rajada=parametros['rajada']
+    ))
+    definir_controle_prazos(ControlePrazos(timeout=parametros['timeout_requisicao'], hedge=parametros['hedge']))
+    definir_saida_estruturada(parametros['saida_estruturada'])
+
+    stats = {}
+    inicio = time.perf_counter()
+    # Saída do pipeline (prints e barra de progresso) não interessa aqui
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        resultados = executar_analise(
+            comentarios,
+            max_concorrencia=parametros['max_workers'],
+            tamanho_lote=parametros['tamanho_lote'],
+            agrupar_duplicados=parametros['agrupar_duplicados'],
+            usar_classificador_local=parametros['classificador_local'],
+            usar_cache=False,
+            estatisticas=stats
+        )
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "comentarios": len(comentarios),
+        "max_workers": parametros['max_workers'],
+        "tamanho_lote": parametros['tamanho_lote'],
+        "segundos": round(segundos, 3),
+        "comentarios_por_seg": round(len(comentarios) / segundos, 1) if segundos > 0 else None,
+        "latencia_p50": round(stats['latencia_comentario']['p50'], 4),
+        "latencia_p95": round(stats['latencia_comentario']['p95'], 4),
+        "latencia_p99": round(stats['latencia_comentario']['p99'], 4),
+        "requisicao_p50": round(stats['latencia_requisicao']['p50'], 4),
+        "requisicao_p95": round(stats['latencia_requisicao']['p95'], 4),
+        "requisicao_p99": round(stats['latencia_requisicao']['p99'], 4),
+        "unicos": stats['unicos'],
+        "requisicoes": stats['requisicoes'],
+        "retentativas": stats['retentativas'],
+        "hedges": stats['hedges'],
+        "hedges_vencedores": stats['hedges_vencedores'],
+        "timeouts": stats['timeouts'],
+        "respostas_invalidas": stats['respostas_invalidas'],
+        "itens_rejeitados": stats['itens_rejeitados'],
+        "itens_reparados": stats['itens_reparados'],
+        "reducoes_concorrencia": stats['reducoes'],
+        "pico_concorrencia": stats['pico_concorrencia'],
+        "erros": sum(1 for r in resultados if r['sentimento'] == 'Erro'),
+        "faixas": estatisticas_faixas(),
+        "pico_rss_mb": pico_rss_mb()
+    }
+
+
+def _em_processo_separado(funcao, argumento):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(funcao, argumento).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de análise com backend simulado")
+    parser.add_argument("--tamanhos", type=_lista_inteiros, default=[1000, 10000],
+                        help="Tamanhos de corpus, separados por vírgula (1000 a 1000000)")
+    parser.add_argument("--workers", type=_lista_inteiros, default=[8, 32, 64],
+                        help="Valores de max_workers (concorrência máxima)")
+    parser.add_argument("--lotes", type=_lista_inteiros, default=[1, 20],
+                        help="Tamanhos de lote")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--proporcao-repetidos", type=float, default=0.1)
+    parser.add_argument("--proporcao-longos", type=float, default=0.0,
+                        help="Fração de avaliações longas, de vários parágrafos")
+    parser.add_argument("--sem-dedup", action="store_true", help="Desativa o agrupamento de quase duplicados")
+    parser.add_argument("--classificador-local", action="store_true", help="Ativa o pré-classificador local")
+    parser.add_argument("--sem-carregadores", action="store_true", help="Não mede os carregadores de arquivo")
+    parser.add_argument("--requisicoes-por-minuto", type=float, default=60000)
+    parser.add_argument("--rajada", type=int, default=100)
+    parser.add_argument("--latencia-mediana", type=float, default=0.1)
+    parser.add_argument("--dispersao-latencia", type=float, default=0.4)
+    parser.add_argument("--segundos-por-item", type=float, default=0.005)
+    parser.add_argument("--taxa-erro", type=float, default=0.01)
+    parser.add_argument("--taxa-429", type=float, default=0.02)
+    parser.add_argument("--taxa-json-malformado", type=float, default=0.01)
+    parser.add_argument("--taxa-item-ausente", type=float, default=0.01)
+    parser.add_argument("--taxa-travamento", type=float, default=0.0,
+                        help="Fração de requisições que não respondem (testa o prazo por requisição)")
+    parser.add_argument("--timeout-requisicao", type=float, default=60.0)
+    parser.add_argument("--sem-hedge", action="store_true", help="Desativa as requisições de reserva")
+    parser.add_argument("--taxa-rotulo-variante", type=float, default=0.0,
+                        help="Fração de itens com rótulo fora do padrão (sem saída estruturada)")
+    parser.add_argument("--sem-saida-estruturada", action="store_true",
+                        help="Pede JSON só pelo prompt, sem esquema de resposta")
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"analise_{int(time.time())}.json"))
+    args = parser.parse_args()
+
+    relatorio = {
+        "benchmark": "analise",
+        "commit": _commit_atual(),
+        "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args),
+        "carregadores": [],
+        "analise": []
+    }
+
+    if not args.sem_carregadores:
+        print("📄 Carregadores de arquivo")
+        with tempfile.TemporaryDirectory() as pasta:
+            for tamanho in args.tamanhos:
+                comentarios = gerar_corpus(tamanho, args.semente, args.proporcao_repetidos, args.proporcao_longos)
+                for formato in FORMATOS_CARREGADOR:
+                    caminho = os.path.join(pasta, f"corpus_{tamanho}.{formato}")
+                    salvar_corpus(comentarios, caminho)
+                    for modo in MODOS_CARREGADOR:
+                        medicao = _em_processo_separado(medir_carregador, (caminho, modo))
+                        relatorio["carregadores"].append(medicao)
+                        print(f"   {formato:>5} | {modo:<7} | {medicao['comentarios']:>8} comentários | "
+                              f"{medicao['segundos']:>8.3f}s | {medicao['comentarios_por_seg']:>10} /s | "
+                              f"RSS {medicao['pico_rss_mb']} MB")
+
+    print("⚡ Análise (backend simulado)")
+    simulacao = {
+        "latencia_mediana": args.latencia_mediana,
+        "dispersao_latencia": args.dispersao_latencia,
+        "segundos_por_item": args.segundos_por_item,
+        "taxa_erro": args.taxa_erro,
+        "taxa_429": args.taxa_429,
+        "taxa_json_malformado": args.taxa_json_malformado,
+        "taxa_item_ausente": args.taxa_item_ausente,
+        "taxa_travamento": args.taxa_travamento,
+        "taxa_rotulo_variante": args.taxa_rotulo_variante
+    }
+    for tamanho in args.tamanhos:
+        for max_workers in args.workers:
+            for tamanho_lote in args.lotes:
+                medicao = _em_processo_separado(medir_analise, {
+                    "comentarios": tamanho,
+                    "semente": args.semente,
+                    "proporcao_repetidos": args.proporcao_repetidos,
+                    "proporcao_longos": args.proporcao_longos,
+                    "max_workers": max_workers,
+                    "tamanho_lote": tamanho_lote,
+                    "agrupar_duplicados": not args.sem_dedup,
+                    "classificador_local": args.classificador_local,
+                    "requisicoes_por_minuto": args.requisicoes_por_minuto,
+                    "rajada": args.rajada,
+                    "timeout_requisicao": args.timeout_requisicao,
+                    "hedge": not args.sem_hedge,
+                    "saida_estruturada": not args.sem_saida_estruturada,
+                    "simulacao": simulacao
+                })
+                relatorio["analise"].append(medicao)
+                print(f"   {tamanho:>8} comentários | workers {max_workers:>3} | lote {tamanho_lote:>3} | "
+                      f"{medicao['comentarios_por_seg']:>9} /s | p50 {medicao['latencia_p50']:.2f}s "
+                      f"p95 {medicao['latencia_p95']:.2f}s p99 {medicao['latencia_p99']:.2f}s | "
+                      f"{medicao['retentativas']} retentativas | {medicao['hedges']} hedges "
+                      f"{medicao['timeouts']} timeouts | {medicao['respostas_invalidas']} JSON inválidos "
+                      f"{medicao['itens_reparados']} reparados | RSS {medicao['pico_rss_mb']} MB")
+                for nome, faixa in medicao['faixas'].items():
+                    print(f"      faixa {nome:<6} ({faixa['modelo']}) | {faixa['comentarios']:>7} textos em "
+                          f"{faixa['requisicoes']:>5} requisições | p50 {faixa['latencia_p50']:.2f}s "
+                          f"p95 {faixa['latencia_p95']:.2f}s | {faixa['comentarios_por_segundo']:.1f} textos/s")
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmark do tempo por página dos extratores Selenium contra páginas locais.
+
+Serve páginas salvas (ou geradas, com a marcação de cada plataforma) em um
+servidor HTTP local em que imagens, fontes, mídia e scripts de terceiros
+demoram a responder, e mede o tempo de extração de cada página em três modos:
+
+- legado: as esperas fixas antigas (`time.sleep`) com a página completa;
+- esperas: os extratores atuais, que esperam os seletores, com a página completa;
+- rapido: os extratores atuais com o navegador no modo rápido (recursos bloqueados).
+
+Precisa do Chrome instalado. Uso (da raiz do projeto):
+    python benchmarks/benchmark_extracao.py --paginas-por-plataforma 5
+    python benchmarks/benchmark_extracao.py --pasta-paginas paginas_salvas/ --modos esperas,rapido
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from corpus_sintetico import gerar_corpus
+from benchmark_analise import _commit_atual
+
+MODOS = ('legado', 'esperas', 'rapido')
+
+# Marcação mínima que cada extrator procura
+MODELOS_PAGINA = {
+    'amazon': '<div class="review"><div data-hook="review-body"><span>{texto}</span></div></div>',
+    'mercadolivre': '<article><p class="ui-review-view__comment">{texto}</p></article>',
+    'google_play': '<div class="review"><div jsname="bN97Pc">{texto}</div></div>',
+    'generico': '<div class="customer-review"><p class="review-text">{texto}</p></div>',
+}
+CABECALHO_PLATAFORMA = {
+    'mercadolivre': '<a href="#opinioes">Opiniões</a>',
+}
+RECURSOS_PESADOS = (
+    '<link rel="preload" as="font" href="/recursos/fonte.woff2" crossorigin>'
+    '<style>@font-face {{ font-family: F; src: url(/recursos/fonte{i}.woff2); }} body {{ font-family: F; }}</style>'
+    '<script src="/recursos/googletagmanager.com/gtm.js"></script>'
+)
+
+
+def gerar_paginas(pasta, paginas_por_plataforma, comentarios_por_pagina, imagens_por_pagina):
+    """Grava páginas HTML sintéticas por plataforma; devolve [(plataforma, arquivo)]."""
+    comentarios = gerar_corpus(paginas_por_plataforma * len(MODELOS_PAGINA) * comentarios_por_pagina,
+                               semente=7, proporcao_repetidos=0)
+    paginas = []
+    for plataforma, modelo in MODELOS_PAGINA.items():
+        for n in range(paginas_por_plataforma):
+            trecho = [comentarios.pop() for _ in range(comentarios_por_pagina)]
+            imagens = "".join(f'<img src="/recursos/foto{n}_{i}.jpg">' for i in range(imagens_por_pagina))
+            html = (
+                f"<html><head><meta charset=\"utf-8\"><title>{plataforma} {n}</title>{RECURSOS_PESADOS.format(i=n)}</head><body>"
+                f"{CABECALHO_PLATAFORMA.get(plataforma, '')}{imagens}"
+                f'<video src="/recursos/video{n}.mp4" autoplay></video>'
+                + "".join(modelo.format(texto=texto) for texto in trecho)
+                + "</body></html>"
+            )
+            arquivo = f"{plataforma}_{n}.html"
+            with open(os.path.join(pasta, arquivo), 'w', encoding='utf-8') as f:
+                f.write(html)
+            paginas.append((plataforma, arquivo))
+    return paginas
+
+
+def listar_paginas(pasta):
+    """Páginas salvas em `pasta`; o prefixo do nome (ex.: amazon_1.html) escolhe o extrator."""
+    paginas = []
+    for arquivo in sorted(os.listdir(pasta)):
+        if arquivo.endswith(('.html', '.htm')):
+            prefixo = next((p for p in MODELOS_PAGINA if arquivo.startswith(p)), 'generico')
+            paginas.append((prefixo, arquivo))
+    return paginas
+
+
+def iniciar_servidor(pasta, atraso_recurso):
+    """Servidor HTTP local: páginas da `pasta` e recursos em /recursos/ com `atraso_recurso` segundos."""
+
+    class Manipulador(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=pasta, **kwargs)
+
+        def do_GET(self):
+            if not self.path.startswith('/recursos/'):
+                return super().do_GET()
+            time.sleep(atraso_recurso)
+            corpo = b'\0' * 50_000
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Manipulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def extrair_legado(driver, url):
+    """As esperas fixas de antes: página completa, 3s e os seletores genéricos."""
+    from selenium.webdriver.common.by import By
+
+    driver.get(url)
+    time.sleep(3)
+    for seletor in ("[data-hook='review-body'] span", ".ui-review-view__comment", "[jsname='bN97Pc']",
+                    ".review-text"):
+        elementos = driver.find_elements(By.CSS_SELECTOR, seletor)
+        if elementos:
+            return [e.text.strip() for e in elementos]
+    return []
+
+
+def medir_modo(modo, paginas, base_url):
+    """Tempo de extração de cada página em um modo; o primeiro acesso aquece o navegador."""
+    from feedback_analyzer.driver_pool import criar_driver
+    from feedback_analyzer import web_extractor
+
+    extratores = {
+        'amazon': web_extractor.extrair_amazon,
+        'mercadolivre': web_extractor.extrair_mercadolivre,
+        'google_play': web_extractor.extrair_google_play,
+        'generico': web_extractor.extrair_generico,
+    }
+
+    driver = criar_driver(modo_rapido=(modo == 'rapido'))
+    try:
+        driver.get(base_url + paginas[0][1])
+        tempos = []
+        extraidos = 0
+        for plataforma, arquivo in paginas:
+            url = base_url + arquivo
+            inicio = time.perf_counter()
+            if modo == 'legado':
+                textos = extrair_legado(driver, url)
+            else:
+                textos = list(extratores[plataforma](driver, url))
+            tempos.append(time.perf_counter() - inicio)
+            extraidos += len(textos)
+    finally:
+        driver.quit()
+
+    return {
+        "modo": modo,
+        "paginas": len(paginas),
+        "comentarios": extraidos,
+        "segundos_por_pagina_media": round(statistics.mean(tempos), 3),
+        "segundos_por_pagina_p50": round(statistics.median(tempos), 3),
+        "segundos_por_pagina_max": round(max(tempos), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos extratores Selenium contra páginas locais")
+    parser.add_argument("--pasta-paginas", help="Pasta com páginas salvas (por padrão, gera páginas sintéticas)")
+    parser.add_argument("--paginas-por-plataforma", type=int, default=3)
+    parser.add_argument("--comentarios-por-pagina", type=int, default=20)
+    parser.add_argument("--imagens-por-pagina", type=int, default=20)
+    parser.add_argument("--atraso-recurso", type=float, default=0.3,
+                        help="Segundos que cada imagem/fonte/mídia/script de terceiros leva para responder")
+    parser.add_argument("--modos", default=",".join(MODOS), help="Modos separados por vírgula: " + ", ".join(MODOS))
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"extracao_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args()
+
+    modos = [modo.strip() for modo in args.modos.split(',') if modo.strip()]
+    invalidos = set(modos) - set(MODOS)
+    if invalidos:
+        parser.error(f"Modos desconhecidos: {', '.join(sorted(invalidos))}")
+
+    try:
+        from feedback_analyzer.driver_pool import criar_driver
+        criar_driver(modo_rapido=False).quit()
+    except Exception as e:
+        print(f"[ERRO] Chrome/Selenium indisponível: {e}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        pasta = args.pasta_paginas or temporaria
+        if args.pasta_paginas:
+            paginas = listar_paginas(pasta)
+        else:
+            paginas = gerar_paginas(pasta, args.paginas_por_plataforma, args.comentarios_por_pagina,
+                                    args.imagens_por_pagina)
+        if not paginas:
+            print(f"[ERRO] Nenhuma página .html em {pasta}")
+            sys.exit(1)
+
+        servidor = iniciar_servidor(pasta, args.atraso_recurso)
+        base_url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+        print(f"[INFO] {len(paginas)} páginas servidas em {base_url}")
+
+        resultados = []
+        try:
+            for modo in modos:
+                resultado = medir_modo(modo, paginas, base_url)
+                resultados.append(resultado)
+                print(f"{modo:>8} | {resultado['paginas']:3d} páginas | {resultado['comentarios']:5d} comentários | "
+                      f"média {resultado['segundos_por_pagina_media']:.2f}s "
+                      f"p50 {resultado['segundos_por_pagina_p50']:.2f}s "
+                      f"máx {resultado['segundos_por_pagina_max']:.2f}s por página")
+        finally:
+            servidor.shutdown()
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            "benchmark": "extracao",
+            "commit": _commit_atual(),
+            "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "parametros": vars(args),
+            "extracao": resultados
+        }, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
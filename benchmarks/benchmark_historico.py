@@ -0,0 +1,175 @@
+"""
+Benchmark do histórico de execuções em Parquet (`armazem_resultados`).
+
+Grava execuções sintéticas (comentários do corpus sintético com sentimento,
+categoria e fonte sorteados) tanto no histórico em Parquet quanto no
+formato que existia antes, o resultados.jsonl do diário, e mede, cada
+leitura em um processo próprio:
+
+- escrita: comentários por segundo gravados com `ArmazemResultados`;
+- parquet: `agregar_historico` por sentimento e categoria, sobre todas as
+  execuções;
+- jsonl: a mesma agregação relendo os resultados.jsonl linha a linha.
+
+Reporta o tempo (melhor de algumas repetições), o tamanho em disco e o pico
+de RSS de cada processo.
+
+Uso (da raiz do projeto):
+    python benchmarks/benchmark_historico.py --comentarios 1000000 --execucoes 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import warnings
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from corpus_sintetico import gerar_corpus
+from benchmark_analise import pico_rss_mb, _commit_atual, _em_processo_separado
+
+SENTIMENTOS = ('Positivo', 'Negativo', 'Neutro', 'Erro')
+CATEGORIAS = ('Bug', 'UI/UX', 'Performance', 'Sugestão', 'Suporte', 'Preço', 'Elogio', 'Outros')
+FONTES = ('Produto Web', 'Amazon', 'Google Play', 'App Store', 'MercadoLivre')
+
+
+def gravar_execucoes(parametros):
+    """
+    Executado em processo separado (o pico de RSS passa para os processos
+    filhos): grava as execuções no histórico e nos resultados.jsonl e
+    retorna os segundos da escrita em Parquet.
+    """
+    pasta, comentarios, execucoes, semente = parametros
+    from feedback_analyzer.armazem_resultados import ArmazemResultados
+
+    rng = random.Random(semente)
+    corpus = gerar_corpus(min(comentarios, 50000), semente=semente)
+    por_execucao = comentarios // execucoes
+    segundos = 0.0
+    for numero in range(execucoes):
+        registros = [{
+            'linha': linha,
+            'data': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'fonte': rng.choice(FONTES),
+            'comentario': corpus[linha % len(corpus)]
+        } for linha in range(por_execucao)]
+        resultados = [{
+            'sentimento': rng.choices(SENTIMENTOS, weights=(45, 30, 23, 2))[0],
+            'categoria': rng.choice(CATEGORIAS),
+            'resumo_curto': 'Resumo sintético'
+        } for _ in range(por_execucao)]
+
+        inicio = time.perf_counter()
+        armazem = ArmazemResultados(os.path.join(pasta, 'historico'), f"execucao-{numero:04d}", f"Produto {numero % 3}")
+        for posicao in range(0, por_execucao, 200):  # Blocos do tamanho dos da análise
+            armazem.escrever(registros[posicao:posicao + 200], resultados[posicao:posicao + 200])
+        armazem.finalizar()
+        segundos += time.perf_counter() - inicio
+
+        pasta_execucao = os.path.join(pasta, 'execucoes', f"execucao-{numero:04d}")
+        os.makedirs(pasta_execucao)
+        with open(os.path.join(pasta_execucao, 'resultados.jsonl'), 'w', encoding='utf-8') as f:
+            for linha, resultado in enumerate(resultados):
+                f.write(json.dumps({"i": linha, "r": resultado}, ensure_ascii=False) + "\n")
+    return segundos
+
+
+def _tamanho_mb(pasta):
+    total = sum(os.path.getsize(os.path.join(raiz, nome)) for raiz, _, nomes in os.walk(pasta) for nome in nomes)
+    return round(total / (1024 * 1024), 1)
+
+
+def medir_agregacao(parametros):
+    """Executado em processo separado: agrega por sentimento e categoria no formato pedido."""
+    pasta, formato, repeticoes = parametros
+    from feedback_analyzer.armazem_resultados import agregar_historico
+
+    rss_antes = pico_rss_mb()
+    tempos = []
+    linhas = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        if formato == 'parquet':
+            contagem = agregar_historico(('sentimento', 'categoria'), pasta=os.path.join(pasta, 'historico'))
+            linhas = int(contagem['comentarios'].sum())
+        else:
+            contagem = Counter()
+            pasta_execucoes = os.path.join(pasta, 'execucoes')
+            for nome in os.listdir(pasta_execucoes):
+                with open(os.path.join(pasta_execucoes, nome, 'resultados.jsonl'), 'r', encoding='utf-8') as f:
+                    for linha in f:
+                        resultado = json.loads(linha)['r']
+                        if resultado['sentimento'] != 'Erro':
+                            contagem[(resultado['sentimento'], resultado['categoria'])] += 1
+            linhas = sum(contagem.values())
+        tempos.append(time.perf_counter() - inicio)
+
+    return {"formato": formato, "segundos": round(min(tempos), 4), "comentarios": linhas,
+            "rss_inicial_mb": rss_antes, "pico_rss_mb": pico_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do histórico de execuções em Parquet")
+    parser.add_argument("--comentarios", type=int, default=1000000, help="Total de comentários, somando as execuções")
+    parser.add_argument("--execucoes", type=int, default=10)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"historico_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args()
+
+    from feedback_analyzer.armazem_resultados import pa
+    if pa is None:
+        print("[ERRO] pyarrow não instalado (pip install pyarrow)")
+        sys.exit(1)
+
+    relatorio = {
+        "benchmark": "historico",
+        "commit": _commit_atual(),
+        "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args),
+        "agregacoes": []
+    }
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"📝 Gravando {args.comentarios} comentários em {args.execucoes} execuções...")
+        segundos = _em_processo_separado(gravar_execucoes, (pasta, args.comentarios, args.execucoes, args.semente))
+        relatorio["escrita"] = {
+            "segundos": round(segundos, 4),
+            "comentarios_por_seg": round(args.comentarios / segundos, 1) if segundos > 0 else None,
+            "parquet_mb": _tamanho_mb(os.path.join(pasta, 'historico')),
+            "jsonl_mb": _tamanho_mb(os.path.join(pasta, 'execucoes'))
+        }
+        escrita = relatorio["escrita"]
+        print(f"   Parquet: {escrita['segundos']:.3f}s ({escrita['comentarios_por_seg']} /s) | "
+              f"{escrita['parquet_mb']} MB em disco (resultados.jsonl: {escrita['jsonl_mb']} MB)")
+
+        print("📊 Agregação por sentimento e categoria")
+        for formato in ('parquet', 'jsonl'):
+            medicao = _em_processo_separado(medir_agregacao, (pasta, formato, args.repeticoes))
+            relatorio["agregacoes"].append(medicao)
+            print(f"   {formato:>7} | {medicao['comentarios']:>9} comentários | {medicao['segundos']:>8.3f}s | "
+                  f"pico RSS {medicao['pico_rss_mb']} MB")
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmark da leitura de páginas HTML grandes na extração por HTTP.
+
+Para cada página (gerada, imitando uma página de produto grande, ou salvas em
+uma pasta) mede, em um processo próprio por analisador:
+
+- legado: BeautifulSoup com `html.parser`, um `soup.select` por seletor e os
+  padrões de palavras-chave sem pré-compilar (a extração de antes);
+- selectolax, lxml e html.parser: `comentarios_do_html` com cada analisador
+  disponível (uma passada para todos os seletores).
+
+Reporta o tempo de leitura da árvore, o tempo total da extração (melhor de
+algumas repetições), os comentários encontrados e o pico de RSS do processo.
+
+Uso (da raiz do projeto):
+    python benchmarks/benchmark_parser.py --tamanho-mb 5
+    python benchmarks/benchmark_parser.py --pasta-paginas paginas_salvas/ --repeticoes 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from corpus_sintetico import gerar_corpus
+from benchmark_analise import pico_rss_mb, _commit_atual, _em_processo_separado
+
+
+def gerar_pagina(caminho, tamanho_mb, comentarios_por_pagina, semente=42, sem_reviews=False):
+    """
+    Grava uma página de produto sintética de ~`tamanho_mb` MB.
+
+    A maior parte é marcação que não interessa (menus, vitrines de produtos
+    relacionados, scripts inline); os reviews ficam no fim, como nas páginas
+    reais. `sem_reviews` gera a página sem a marcação de reviews, para medir a
+    busca por palavras-chave.
+    """
+    rng = random.Random(semente)
+    comentarios = gerar_corpus(comentarios_por_pagina, semente=semente, proporcao_repetidos=0)
+    alvo = int(tamanho_mb * 1024 * 1024)
+    partes = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Produto</title>',
+              '<script>' + 'var dados = {"x": 1};' * 200 + '</script></head><body>']
+    tamanho = sum(len(p) for p in partes)
+    n = 0
+    while tamanho < alvo * 0.9:
+        bloco = (
+            f'<div class="vitrine-item item-{n}" data-id="{rng.randrange(10**8)}">'
+            f'<a class="link-produto" href="/p/{n}"><img src="/i/{n}.jpg" alt="Produto {n}">'
+            f'<span class="titulo">Produto relacionado {n}</span></a>'
+            f'<ul class="atributos"><li>Cor: azul</li><li>Tamanho: {n % 50}</li><li>Marca: X{n % 7}</li></ul>'
+            f'<div class="preco"><span class="moeda">R$</span><span class="valor">{rng.randrange(10, 5000)},90</span></div>'
+            f'</div>'
+        )
+        partes.append(bloco)
+        tamanho += len(bloco)
+        n += 1
+
+    if not sem_reviews:
+        partes.append('<section class="reviews-section">')
+        for i, comentario in enumerate(comentarios):
+            partes.append(
+                f'<article class="review-card"><div class="review-header">Cliente {i}</div>'
+                f'<p class="review-text">{comentario}</p></article>'
+            )
+        partes.append('</section>')
+    partes.append('</body></html>')
+
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write("".join(partes))
+
+
+def extrair_legado(conteudo):
+    """A extração de antes: html.parser, um select por seletor e padrões compilados a cada chamada."""
+    import re
+    from bs4 import BeautifulSoup
+    from feedback_analyzer.web_extractor import SELETORES_HTML
+
+    comentarios = []
+    soup = BeautifulSoup(conteudo, 'html.parser')
+    for selector in SELETORES_HTML:
+        elements = soup.select(selector)
+        if elements:
+            for element in elements[:30]:
+                text = element.get_text().strip()
+                if text and 15 < len(text) < 1000:
+                    comentarios.append(text)
+            if comentarios:
+                break
+    if not comentarios:
+        all_text = soup.get_text()
+        patterns = [
+            r'(?i)(?:excelente|ótimo|bom|ruim|péssimo|recomendo|não recomendo).{10,200}',
+            r'(?i)(?:produto|app|aplicativo|serviço).{10,200}',
+            r'(?i)(?:comprei|usei|testei|instalei).{10,200}'
+        ]
+        for pattern in patterns:
+            for match in re.findall(pattern, all_text)[:10]:
+                if len(match.strip()) > 15:
+                    comentarios.append(match.strip())
+    return comentarios
+
+
+def medir_analisador(parametros):
+    """Executado em processo separado: tempos e memória de um analisador em uma página."""
+    from feedback_analyzer.analisador_html import analisar_html
+    from feedback_analyzer.web_extractor import comentarios_do_html
+
+    analisador, caminho, repeticoes = parametros
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+
+    rss_antes = pico_rss_mb()
+    tempos_leitura = []
+    tempos_total = []
+    comentarios = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        if analisador == 'legado':
+            from bs4 import BeautifulSoup
+            BeautifulSoup(conteudo, 'html.parser')
+        else:
+            analisar_html(conteudo, analisador)
+        tempos_leitura.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if analisador == 'legado':
+                comentarios = extrair_legado(conteudo)
+            else:
+                comentarios = comentarios_do_html(conteudo, analisador)
+        tempos_total.append(time.perf_counter() - inicio)
+
+    return {
+        "analisador": analisador,
+        "pagina": os.path.basename(caminho),
+        "tamanho_mb": round(len(conteudo) / (1024 * 1024), 2),
+        "segundos_leitura": round(min(tempos_leitura), 4),
+        "segundos_extracao": round(min(tempos_total), 4),
+        "comentarios": len(comentarios),
+        "rss_inicial_mb": rss_antes,
+        "pico_rss_mb": pico_rss_mb()
+    }
+
+
+def main():
+    from feedback_analyzer.analisador_html import analisadores_disponiveis
+
+    parser = argparse.ArgumentParser(description="Benchmark dos analisadores HTML da extração por HTTP")
+    parser.add_argument("--pasta-paginas", help="Pasta com páginas .html salvas (por padrão, gera páginas sintéticas)")
+    parser.add_argument("--tamanho-mb", type=float, default=3.0, help="Tamanho das páginas geradas")
+    parser.add_argument("--comentarios-por-pagina", type=int, default=100)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"parser_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args()
+
+    analisadores = ['legado', *analisadores_disponiveis()]
+    print(f"[INFO] Analisadores: {', '.join(analisadores)}")
+
+    relatorio = {
+        "benchmark": "parser",
+        "commit": _commit_atual(),
+        "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args),
+        "paginas": []
+    }
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        if args.pasta_paginas:
+            paginas = [os.path.join(args.pasta_paginas, nome) for nome in sorted(os.listdir(args.pasta_paginas))
+                       if nome.endswith(('.html', '.htm'))]
+        else:
+            paginas = [os.path.join(temporaria, 'produto.html'), os.path.join(temporaria, 'produto_sem_reviews.html')]
+            gerar_pagina(paginas[0], args.tamanho_mb, args.comentarios_por_pagina)
+            gerar_pagina(paginas[1], args.tamanho_mb, args.comentarios_por_pagina, sem_reviews=True)
+
+        for caminho in paginas:
+            for analisador in analisadores:
+                resultado = _em_processo_separado(medir_analisador, (analisador, caminho, args.repeticoes))
+                relatorio["paginas"].append(resultado)
+                print(f"{resultado['pagina']:<28} | {analisador:<11} | {resultado['tamanho_mb']:5.1f} MB | "
+                      f"leitura {resultado['segundos_leitura']:.3f}s | extração {resultado['segundos_extracao']:.3f}s | "
+                      f"{resultado['comentarios']:3d} comentários | pico RSS {resultado['pico_rss_mb']} MB")
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark da escrita do relatório em cada formato (`relatorio`).
+
+Gera resultados sintéticos e os entrega a cada escritor em blocos do
+tamanho dos da análise, como o fluxo principal faz, e mede, em um processo
+próprio por formato (md, md paginado/truncado, csv, parquet, html):
+
+- o tempo total (escrita dos blocos + `finalizar`);
+- o tamanho dos arquivos gerados e o pico de RSS do processo.
+
+Uso (da raiz do projeto):
+    python benchmarks/benchmark_relatorio.py --comentarios 100000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from corpus_sintetico import gerar_corpus
+from benchmark_analise import pico_rss_mb, _commit_atual, _em_processo_separado
+from benchmark_historico import SENTIMENTOS, CATEGORIAS, FONTES
+
+# (nome, formato, max_comentarios, comentarios_por_pagina)
+VARIANTES = (
+    ('md', 'md', 0, 0),
+    ('md paginado', 'md', 0, 5000),
+    ('md truncado', 'md', 1000, 0),
+    ('csv', 'csv', 0, 0),
+    ('parquet', 'parquet', 0, 0),
+    ('html', 'html', 0, 0),
+    ('html truncado', 'html', 1000, 0),
+)
+
+
+def medir_escrita(parametros):
+    """Executado em processo separado: escreve o relatório de uma variante e mede."""
+    pasta, formato, max_comentarios, por_pagina, comentarios, bloco, semente = parametros
+    from feedback_analyzer.relatorio import (
+        EscritorRelatorios, EscritorRelatorioMarkdown, EscritorRelatorioCsv,
+        EscritorRelatorioParquet, EscritorRelatorioHtml
+    )
+
+    rng = random.Random(semente)
+    corpus = gerar_corpus(min(comentarios, 50000), semente=semente)
+    registros = [{'linha': linha, 'data': '2024-01-15', 'fonte': rng.choice(FONTES),
+                  'comentario': corpus[linha % len(corpus)]} for linha in range(comentarios)]
+    resultados = [{'sentimento': rng.choices(SENTIMENTOS, weights=(45, 30, 23, 2))[0],
+                   'categoria': rng.choice(CATEGORIAS), 'resumo_curto': 'Resumo sintético'}
+                  for _ in range(comentarios)]
+
+    caminho = os.path.join(pasta, f"relatorio.{formato}")
+    rss_antes = pico_rss_mb()
+    inicio = time.perf_counter()
+    if formato == 'md':
+        escritor = EscritorRelatorioMarkdown(caminho, max_comentarios, por_pagina)
+    elif formato == 'csv':
+        escritor = EscritorRelatorioCsv(caminho)
+    elif formato == 'parquet':
+        escritor = EscritorRelatorioParquet(caminho, 'Benchmark')
+    else:
+        escritor = EscritorRelatorioHtml(caminho, max_comentarios)
+    relatorio = EscritorRelatorios([escritor])
+    for posicao in range(0, comentarios, bloco):
+        relatorio.escrever(registros[posicao:posicao + bloco], resultados[posicao:posicao + bloco])
+    relatorio.finalizar("# 📋 Análise de Feedback - Benchmark\n\n**Total de comentários:** "
+                        f"{relatorio.total}\n\n---\n\n")
+    segundos = time.perf_counter() - inicio
+
+    tamanho = sum(os.path.getsize(os.path.join(pasta, nome)) for nome in os.listdir(pasta))
+    return {
+        "segundos": round(segundos, 4),
+        "comentarios_por_seg": round(comentarios / segundos, 1) if segundos > 0 else None,
+        "arquivos": len(os.listdir(pasta)),
+        "mb": round(tamanho / (1024 * 1024), 1),
+        "rss_inicial_mb": rss_antes,
+        "pico_rss_mb": pico_rss_mb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da escrita do relatório em cada formato")
+    parser.add_argument("--comentarios", type=int, default=100000)
+    parser.add_argument("--bloco", type=int, default=200, help="Comentários por bloco entregue ao escritor")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"relatorio_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args()
+
+    from feedback_analyzer.armazem_resultados import pa
+
+    relatorio = {
+        "benchmark": "relatorio",
+        "commit": _commit_atual(),
+        "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args),
+        "variantes": []
+    }
+
+    print(f"📝 Relatório de {args.comentarios} comentários, em blocos de {args.bloco}")
+    for nome, formato, max_comentarios, por_pagina in VARIANTES:
+        if formato == 'parquet' and pa is None:
+            print("[AVISO] pyarrow não instalado, pulando o formato parquet")
+            continue
+        with tempfile.TemporaryDirectory() as pasta:
+            medicao = _em_processo_separado(medir_escrita, (
+                pasta, formato, max_comentarios, por_pagina, args.comentarios, args.bloco, args.semente
+            ))
+        medicao.update({"variante": nome, "formato": formato,
+                        "max_comentarios": max_comentarios, "comentarios_por_pagina": por_pagina})
+        relatorio["variantes"].append(medicao)
+        print(f"   {nome:<13} | {medicao['segundos']:>7.3f}s | {medicao['comentarios_por_seg']:>10} /s | "
+              f"{medicao['arquivos']:3d} arquivos, {medicao['mb']:>6} MB | pico RSS {medicao['pico_rss_mb']} MB")
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark offline da extração, reproduzindo páginas capturadas de sites reais.
+
+Capture as páginas uma vez com [EXTRACAO] PASTA_CAPTURA no config.ini (ver
+`feedback_analyzer.capturas`) e rode o benchmark sobre a pasta: as páginas
+são servidas pelo `servidor_capturas` local e as listagens capturadas são
+extraídas de novo pelo caminho completo (`iterar_comentarios_de_url`), sem
+cache HTTP nem coleta incremental, em um processo próprio por combinação:
+
+- http: extração por requests, com cada analisador HTML disponível;
+- selenium: extratores Selenium sobre os DOMs capturados (precisa do Chrome).
+
+Reporta, por listagem, o tempo (melhor de algumas repetições) e os
+comentários extraídos, e o pico de RSS de cada processo.
+
+Uso (da raiz do projeto):
+    python benchmarks/benchmark_reproducao.py --pasta-capturas capturas/
+    python benchmarks/benchmark_reproducao.py --pasta-capturas capturas/ --metodos http --latencia 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore', category=FutureWarning)  # Aviso de descontinuação do google.generativeai
+
+from benchmark_analise import pico_rss_mb, _commit_atual, _em_processo_separado
+
+METODOS = ('http', 'selenium')
+PLATAFORMAS = ('amazon', 'mercadolivre', 'google_play', 'app_store', 'generico')
+
+
+def escrever_config(pasta, servidor, metodo, analisador, max_paginas):
+    """config.ini do processo de medição: reprodução ligada, sem caches e só o método medido."""
+    ordens = "\n".join(f"ORDEM_{plataforma.upper()} = {metodo}" for plataforma in PLATAFORMAS)
+    with open(os.path.join(pasta, 'config.ini'), 'w', encoding='utf-8') as f:
+        f.write(
+            "[EXTRACAO]\n"
+            f"SERVIDOR_REPRODUCAO = {servidor}\n"
+            f"PARSER_HTML = {analisador}\n"
+            f"MAX_PAGINAS = {max_paginas}\n"
+            "CACHE_HTTP = false\n"
+            "COLETA_INCREMENTAL = false\n"
+            f"{ordens}\n"
+            "\n[NAVEGADOR]\n"
+            "TAMANHO_POOL = 1\n"
+            "MODO_RAPIDO = true\n"
+        )
+
+
+def medir_combinacao(parametros):
+    """Executado em processo separado, na pasta do config.ini da combinação: extrai cada listagem."""
+    pasta_config, listagens, repeticoes = parametros
+    os.chdir(pasta_config)
+
+    from feedback_analyzer.web_extractor import iterar_comentarios_de_url
+
+    rss_antes = pico_rss_mb()
+    resultados = []
+    for url in listagens:
+        tempos = []
+        comentarios = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                comentarios = list(iterar_comentarios_de_url(url, incremental=False))
+            tempos.append(time.perf_counter() - inicio)
+        resultados.append({"listagem": url, "segundos": round(min(tempos), 4), "comentarios": len(comentarios)})
+
+    return {"listagens": resultados, "rss_inicial_mb": rss_antes, "pico_rss_mb": pico_rss_mb()}
+
+
+def main():
+    from feedback_analyzer.analisador_html import analisadores_disponiveis
+    from feedback_analyzer.capturas import ler_indice
+    from feedback_analyzer.servidor_capturas import iniciar_servidor_capturas
+
+    parser = argparse.ArgumentParser(description="Benchmark offline da extração sobre páginas capturadas")
+    parser.add_argument("--pasta-capturas", required=True, help="Pasta gravada com [EXTRACAO] PASTA_CAPTURA")
+    parser.add_argument("--metodos", default=",".join(METODOS), help="Métodos separados por vírgula: " + ", ".join(METODOS))
+    parser.add_argument("--analisadores", default=None,
+                        help="Analisadores HTML separados por vírgula (por padrão, todos os instalados)")
+    parser.add_argument("--max-paginas", type=int, default=10)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos de espera por requisição no servidor")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default=os.path.join(RAIZ, 'benchmarks', 'resultados',
+                                                        f"reproducao_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args()
+
+    metodos = [metodo.strip() for metodo in args.metodos.split(',') if metodo.strip()]
+    invalidos = set(metodos) - set(METODOS)
+    if invalidos:
+        parser.error(f"Métodos desconhecidos: {', '.join(sorted(invalidos))}")
+    analisadores = ([nome.strip() for nome in args.analisadores.split(',') if nome.strip()]
+                    if args.analisadores else analisadores_disponiveis())
+
+    indice = ler_indice(args.pasta_capturas)
+    listagens = sorted(indice['listagens'])
+    if not listagens:
+        print(f"[ERRO] Nenhuma listagem capturada em {args.pasta_capturas}")
+        sys.exit(1)
+
+    if 'selenium' in metodos:
+        try:
+            from feedback_analyzer.driver_pool import criar_driver
+            criar_driver(modo_rapido=True).quit()
+        except Exception as e:
+            print(f"[AVISO] Chrome/Selenium indisponível, pulando o método selenium: {e}")
+            metodos.remove('selenium')
+
+    servidor, url_servidor = iniciar_servidor_capturas(args.pasta_capturas, latencia=args.latencia)
+    print(f"[INFO] {len(indice['paginas'])} páginas e {len(listagens)} listagens reproduzidas em {url_servidor}")
+
+    combinacoes = [('http', analisador) for analisador in analisadores if 'http' in metodos]
+    if 'selenium' in metodos:
+        combinacoes.append(('selenium', 'auto'))
+
+    relatorio = {
+        "benchmark": "reproducao",
+        "commit": _commit_atual(),
+        "data": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": vars(args),
+        "combinacoes": []
+    }
+
+    try:
+        for metodo, analisador in combinacoes:
+            with tempfile.TemporaryDirectory() as pasta_config:
+                escrever_config(pasta_config, url_servidor, metodo, analisador, args.max_paginas)
+                resultado = _em_processo_separado(medir_combinacao, (pasta_config, listagens, args.repeticoes))
+            resultado.update({"metodo": metodo, "analisador": analisador})
+            relatorio["combinacoes"].append(resultado)
+
+            total = sum(item['segundos'] for item in resultado['listagens'])
+            comentarios = sum(item['comentarios'] for item in resultado['listagens'])
+            print(f"{metodo:>8} | {analisador:<11} | {len(listagens):3d} listagens | {comentarios:5d} comentários | "
+                  f"{total:.3f}s | pico RSS {resultado['pico_rss_mb']} MB")
+    finally:
+        servidor.shutdown()
+
+    pasta_saida = os.path.dirname(args.saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Gerador de corpus sintético de avaliações em português para os benchmarks.
+
+As frases combinam modelos de elogio, reclamação, sugestão e comentário
+neutro com produtos, detalhes e complementos aleatórios. Uma fração dos
+comentários repete um anterior com pequenas variações (caixa, pontuação),
+como acontece em avaliações reais, para exercitar o agrupamento de duplicados.
+Outra fração, opcional, são avaliações longas de vários parágrafos, para
+exercitar o roteamento por tamanho e a segmentação.
+"""
+
+import random
+
+
+PRODUTOS = [
+    'produto', 'aplicativo', 'fone', 'celular', 'notebook', 'tênis', 'cafeteira', 'relógio',
+    'carregador', 'teclado', 'mouse', 'monitor', 'livro', 'jogo', 'aspirador', 'liquidificador'
+]
+
+ELOGIOS = [
+    'Ótimo {produto}, recomendo!',
+    'Adorei o {produto}, chegou antes do prazo.',
+    'Excelente qualidade, o {produto} superou as expectativas.',
+    'Muito bom, uso o {produto} todos os dias há {numero} semanas.',
+    'Perfeito! Melhor {produto} que já comprei.',
+    'Entrega rápida e {produto} bem embalado.',
+    'Custo-benefício excelente, o {produto} vale cada centavo.',
+]
+
+RECLAMACOES = [
+    'O {produto} parou de funcionar depois de {numero} dias.',
+    'Péssimo, o {produto} veio com defeito e ninguém responde.',
+    'O aplicativo trava toda vez que abro a tela de {tela}.',
+    'Entrega atrasou {numero} dias e o {produto} chegou amassado.',
+    'Atendimento horrível, pedi reembolso do {produto} e até agora nada.',
+    'Não recomendo, o {produto} esquenta muito e a bateria dura {numero} horas.',
+    'Depois da atualização o app fecha sozinho na tela de {tela}.',
+]
+
+SUGESTOES = [
+    'Poderiam incluir mais cores do {produto}.',
+    'Seria bom ter modo escuro na tela de {tela}.',
+    'Gostaria que o {produto} viesse com manual em português.',
+    'Sugiro melhorar a navegação do menu de {tela}.',
+    'Faltou um cabo mais longo no {produto}.',
+]
+
+NEUTROS = [
+    'Comprei o {produto} para presente, ainda não sei se gostaram.',
+    'O {produto} é normal, nada de especial.',
+    'Chegou no prazo. Vou usar o {produto} mais antes de avaliar.',
+    'Interface da tela de {tela} é diferente da versão anterior.',
+]
+
+TELAS = ['login', 'pagamento', 'perfil', 'carrinho', 'busca', 'configurações', 'notificações']
+
+COMPLEMENTOS = [
+    '', '', '', ' Comprei na promoção.', ' Uso para trabalhar.', ' Minha família também usa.',
+    ' Segunda vez que compro.', ' Vendedor atencioso.', ' O preço subiu bastante.',
+    ' Já tinha um da mesma marca.', ' Paguei no boleto.',
+]
+
+_MODELOS = [(ELOGIOS, 0.35), (RECLAMACOES, 0.35), (SUGESTOES, 0.15), (NEUTROS, 0.15)]
+
+
+def _variar(comentario: str, rng: random.Random) -> str:
+    """Repetição com ruído de digitação: caixa, pontuação e espaços."""
+    opcao = rng.randrange(4)
+    if opcao == 0:
+        return comentario.upper()
+    if opcao == 1:
+        return comentario.rstrip('.!') + '!!!'
+    if opcao == 2:
+        return '  ' + comentario.lower()
+    return comentario.replace(',', '')
+
+
+def _frase(rng: random.Random, grupos, pesos) -> str:
+    modelo = rng.choice(rng.choices(grupos, pesos)[0])
+    return modelo.format(
+        produto=rng.choice(PRODUTOS),
+        numero=rng.randint(1, 90),
+        tela=rng.choice(TELAS)
+    ) + rng.choice(COMPLEMENTOS)
+
+
+def _avaliacao_longa(rng: random.Random, grupos, pesos) -> str:
+    """Avaliação de 8 a 150 frases, em parágrafos de até 6 frases."""
+    frases = [_frase(rng, grupos, pesos) for _ in range(rng.randint(8, 150))]
+    return "\n\n".join(" ".join(frases[i:i + 6]) for i in range(0, len(frases), 6))
+
+
+def gerar_comentarios(quantidade: int, semente=42, proporcao_repetidos=0.1, proporcao_longos=0.0):
+    """Gera `quantidade` comentários de forma determinística para a `semente`."""
+    rng = random.Random(semente)
+    grupos = [modelos for modelos, _ in _MODELOS]
+    pesos = [peso for _, peso in _MODELOS]
+    recentes = []
+
+    for _ in range(quantidade):
+        if recentes and rng.random() < proporcao_repetidos:
+            yield _variar(rng.choice(recentes), rng)
+            continue
+        if proporcao_longos and rng.random() < proporcao_longos:
+            yield _avaliacao_longa(rng, grupos, pesos)
+            continue
+
+        comentario = _frase(rng, grupos, pesos)
+
+        # Mantém só uma janela de comentários recentes para repetir
+        if len(recentes) < 1000:
+            recentes.append(comentario)
+        else:
+            recentes[rng.randrange(1000)] = comentario
+        yield comentario
+
+
+def gerar_corpus(quantidade: int, semente=42, proporcao_repetidos=0.1, proporcao_longos=0.0) -> list:
+    return list(gerar_comentarios(quantidade, semente, proporcao_repetidos, proporcao_longos))
+
+
+def salvar_corpus(comentarios, caminho: str):
+    """Salva no formato pela extensão (.csv, .txt, .json ou .jsonl), como os arquivos de dados/."""
+    import json
+    import pandas as pd
+
+    extensao = caminho.rsplit('.', 1)[-1].lower()
+    if extensao == 'txt':
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for comentario in comentarios:
+                f.write(" ".join(comentario.split()) + "\n")
+    elif extensao == 'json':
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump([{"comentario": c} for c in comentarios], f, ensure_ascii=False)
+    elif extensao == 'jsonl':
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for comentario in comentarios:
+                f.write(json.dumps({"comentario": comentario}, ensure_ascii=False) + "\n")
+    else:
+        pd.DataFrame({
+            'data': '2024-01-15',
+            'fonte': 'Benchmark',
+            'comentario': list(comentarios)
+        }).to_csv(caminho, index=False)
@@ -42,6 +42,140 @@ if [ ! -f "config.ini" ]; then
     cat > config.ini << EOF
 [GEMINI]
 API_KEY = tu_api_key_aqui
+
+[BACKEND]
+# gemini (API real), simulado (em processo) ou http (servidor_simulado.py)
+TIPO = gemini
+# URL = http://127.0.0.1:8765
+# Parâmetros do backend simulado:
+# LATENCIA_MEDIANA = 0.5
+# TAXA_429 = 0.05
+# TAXA_JSON_MALFORMADO = 0.02
+
+[PROCESSAMENTO]
+# Comentários enviados por requisição e orçamento estimado de tokens de entrada
+TAMANHO_LOTE = 20
+MAX_TOKENS_LOTE = 6000
+# Pede a resposta como JSON restrito a um esquema (enums de sentimento/categoria).
+# Sem esta opção fica desligada; requer um modelo com suporte a response_schema
+SAIDA_ESTRUTURADA = true
+# Máximo de requisições simultâneas à API (ajustado automaticamente até esse limite)
+MAX_CONCORRENCIA = 64
+# Analisa comentários quase idênticos uma única vez
+AGRUPAR_DUPLICADOS = true
+LIMIAR_SIMILARIDADE = 0.85
+# Pipeline em fluxo: comentários por bloco de análise e tamanho da fila de entrada
+TAMANHO_BLOCO = 200
+TAMANHO_FILA = 1000
+# Arquivos de entrada lidos em blocos de N comentários (sem carregar o arquivo inteiro)
+TAMANHO_BLOCO_LEITURA = 10000
+
+[MODELOS]
+# Modelo por faixa de tamanho do comentário (em tokens estimados)
+CURTO = gemini-1.5-flash
+LIMITE_CURTO = 60
+MEDIO = gemini-1.5-flash
+LIMITE_MEDIO = 400
+LONGO = gemini-1.5-flash
+# Comentários acima disso são divididos em trechos e as análises combinadas
+TOKENS_SEGMENTO = 1000
+
+[LIMITES]
+# Cota da API key e rajada permitida pelo limitador
+REQUISICOES_POR_MINUTO = 1000
+RAJADA = 10
+# Retentativas permitidas por requisição feita (orçamento global)
+PROPORCAO_RETENTATIVAS = 0.2
+MINIMO_RETENTATIVAS = 20
+
+[PRAZOS]
+# Segundos até cancelar uma requisição sem resposta (ela é repetida como erro transitório)
+TIMEOUT_REQUISICAO = 60
+# Dispara uma cópia da requisição que passar do p95 de latência; vale a primeira resposta
+HEDGE = true
+PROPORCAO_HEDGE = 0.1
+# Prazo total da análise em segundos (0 = sem prazo); o que não ficar pronto pode ser retomado
+PRAZO_EXECUCAO = 0
+
+[CACHE]
+# Cache em disco das análises por comentário
+ATIVO = true
+CAMINHO = cache/analises.db
+MAX_ENTRADAS = 200000
+MAX_IDADE_DIAS = 30
+
+[CLASSIFICADOR_LOCAL]
+# Resolve localmente comentários triviais; treine com:
+#   cd src && python -m feedback_analyzer.local_classifier
+ATIVO = true
+LIMIAR_CONFIANCA = 0.9
+CAMINHO_MODELO = cache/classificador_local.npz
+
+[EXTRACAO]
+# URLs extraídas ao mesmo tempo no modo em lote (python main.py --urls ...)
+MAX_SIMULTANEAS = 4
+# Limite por site (Amazon, MercadoLivre, Google Play... ou o domínio)
+MAX_POR_DOMINIO = 2
+# Ordem dos métodos por plataforma (http e/ou selenium), até algum trazer comentários
+ORDEM_AMAZON = selenium, http
+ORDEM_MERCADOLIVRE = selenium, http
+ORDEM_GOOGLE_PLAY = selenium, http
+ORDEM_APP_STORE = http
+ORDEM_GENERICO = http, selenium
+# Conexões HTTP mantidas abertas por host e timeout das requisições
+CONEXOES_POR_HOST = 10
+TIMEOUT_HTTP = 15
+# Cache das páginas com ETag/Last-Modified: página sem alterações custa só um 304
+CACHE_HTTP = true
+CAMINHO_CACHE_HTTP = cache/paginas.db
+MAX_IDADE_CACHE_HTTP_DIAS = 30
+# Leitor de HTML: auto (o mais rápido instalado), selectolax, lxml ou html.parser
+PARSER_HTML = auto
+# Páginas de reviews lidas por URL em cada coleta
+MAX_PAGINAS = 10
+# Coletas seguintes da mesma URL trazem só os reviews novos (python main.py --coleta-completa lê tudo)
+COLETA_INCREMENTAL = true
+CAMINHO_ESTADO_COLETA = cache/coletas.db
+# Grava as páginas lidas na extração nesta pasta (vazio = desligado), para reproduzi-las offline
+PASTA_CAPTURA =
+# Lê as páginas do servidor de capturas em vez dos sites (vazio = desligado); suba-o com:
+#   cd src && python -m feedback_analyzer.servidor_capturas --pasta ../capturas --porta 8766
+SERVIDOR_REPRODUCAO =
+
+[NAVEGADOR]
+# Navegadores Chrome mantidos abertos e reaproveitados entre URLs
+TAMANHO_POOL = 2
+# Páginas abertas por navegador antes de fechá-lo e abrir outro (conferido quando ele volta ao pool)
+PAGINAS_POR_DRIVER = 50
+# Não baixa imagens, mídia, fontes nem rastreadores, e não espera a página carregar por completo
+MODO_RAPIDO = true
+# Segundos esperando os comentários aparecerem na página e novos itens depois de rolar
+TIMEOUT_ESPERA = 10
+TIMEOUT_ROLAGEM = 2
+# Caminho fixo do chromedriver (vazio = baixado/resolvido pelo webdriver_manager)
+# CAMINHO_DRIVER =
+
+[EXECUCAO]
+# Diário dos resultados para retomar execuções interrompidas (python main.py --resume)
+JOURNAL = true
+PASTA = execucoes
+# Histórico em Parquet (entrada e resultados de todas as execuções; requer pyarrow)
+HISTORICO = true
+PASTA_HISTORICO = historico
+
+[RELATORIO]
+# Formatos gerados em relatorios/: md, csv, parquet (requer pyarrow) e html (autocontido)
+FORMATOS = md,csv,parquet,html
+# Comentários listados no Markdown/HTML (0 = todos; a lista completa fica no CSV/Parquet)
+MAX_COMENTARIOS = 0
+# Divide a lista de comentários do Markdown em arquivos de N comentários (0 = tudo no relatório)
+COMENTARIOS_POR_PAGINA = 0
+
+[RESUMO]
+# Resumo executivo a partir do conteúdo: resume uma amostra de cada grupo
+# (categoria/sentimento) e junta os resumos; false usa só as estatísticas
+MAPA_REDUCE = true
+AMOSTRA_POR_GRUPO = 40
 EOF
     echo "⚠️  IMPORTANTE: Configure sua API key do Google Gemini em config.ini"
 fi
@@ -16,14 +16,19 @@ __author__ = "João Milanezi"
 
 # Importações condicionais para evitar erros se os módulos não estiverem prontos
 try:
-    from .gemini_processor import analisar_comentario_individual, gerar_resumo_executivo, configurar_ia
-    from .web_extractor import extrair_comentarios_de_url
+    from .gemini_processor import analisar_comentario_individual, gerar_resumo_executivo, configurar_ia, definir_backend
+    from .web_extractor import extrair_comentarios_de_url, extrair_comentarios_de_urls
+    from .analysis_engine import executar_analise, processar_comentarios_async
     
     __all__ = [
         'analisar_comentario_individual', 
         'gerar_resumo_executivo', 
         'configurar_ia',
-        'extrair_comentarios_de_url'
+        'definir_backend',
+        'extrair_comentarios_de_url',
+        'extrair_comentarios_de_urls',
+        'executar_analise',
+        'processar_comentarios_async'
     ]
 except ImportError:
     # Se houver problemas com dependências, apenas expor metadados
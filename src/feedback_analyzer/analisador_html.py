@@ -0,0 +1,305 @@
+"""
+Leitura de páginas HTML com o analisador mais rápido disponível.
+
+O HTML é lido por selectolax (lexbor), lxml ou, se nenhum dos dois estiver
+instalado, pelo `html.parser` do BeautifulSoup. Os seletores CSS usados na
+extração são avaliados todos de uma vez, em vez de uma busca por seletor:
+com selectolax, uma única consulta nativa com a lista de seletores; com lxml
+e `html.parser`, uma única passada pelos elementos, em que um filtro por
+expressão regular descarta quase todos antes do teste completo.
+
+Seletores aceitos: tag, `.classe`, `[atributo]`, `[atributo=valor]` (também
+`*=`, `^=`, `$=`, `~=`), descendência (espaço) e listas separadas por vírgula.
+"""
+
+import re
+from functools import lru_cache
+
+from .config import obter_opcao
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+
+ANALISADORES = ('selectolax', 'lxml', 'html.parser')
+
+_TOKEN_SELETOR = re.compile(r"""
+    (?P<espaco>\s+)
+  | (?P<tag>[a-zA-Z][\w-]*|\*)
+  | \.(?P<classe>[\w-]+)
+  | \[\s*(?P<atributo>[\w-]+)\s*(?:(?P<operador>[*^$~]?=)\s*(?:"(?P<aspas>[^"]*)"|'(?P<apostrofo>[^']*)'|(?P<valor>[\w-]+))\s*)?\]
+""", re.VERBOSE)
+
+
+def analisadores_disponiveis() -> list:
+    disponiveis = []
+    if LexborHTMLParser is not None:
+        disponiveis.append('selectolax')
+    if lxml is not None:
+        disponiveis.append('lxml')
+    disponiveis.append('html.parser')
+    return disponiveis
+
+
+def obter_analisador(nome=None) -> str:
+    """
+    Analisador a usar: `nome`, [EXTRACAO] PARSER_HTML ou, em 'auto', o mais rápido instalado.
+
+    Se o pedido não estiver instalado, avisa e usa o mais rápido disponível.
+    """
+    nome = (nome or obter_opcao('EXTRACAO', 'PARSER_HTML', 'auto')).strip().lower()
+    disponiveis = analisadores_disponiveis()
+    if nome == 'auto':
+        return disponiveis[0]
+    if nome not in disponiveis:
+        print(f"[AVISO] Analisador HTML '{nome}' indisponível; usando '{disponiveis[0]}'.")
+        return disponiveis[0]
+    return nome
+
+
+def _decodificar(conteudo: bytes) -> str:
+    # UTF-8 na maioria das páginas; senão, a detecção do BeautifulSoup (meta charset, BOM, heurística)
+    try:
+        return conteudo.decode('utf-8')
+    except UnicodeDecodeError:
+        from bs4 import UnicodeDammit
+        return UnicodeDammit(conteudo, is_html=True).unicode_markup or conteudo.decode('latin-1')
+
+
+def _compilar_composto(texto):
+    # Um seletor simples composto (ex.: div.review[data-x="1"]) -> (tag, predicados)
+    tag = None
+    predicados = []
+    posicao = 0
+    while posicao < len(texto):
+        token = _TOKEN_SELETOR.match(texto, posicao)
+        if token is None or token.group('espaco'):
+            raise ValueError(f"Seletor CSS não suportado: '{texto}'")
+        if token.group('tag'):
+            if predicados or tag is not None:
+                raise ValueError(f"Seletor CSS não suportado: '{texto}'")
+            tag = None if token.group('tag') == '*' else token.group('tag').lower()
+        elif token.group('classe'):
+            predicados.append(('class', '~=', token.group('classe')))
+        else:
+            valor = next((v for v in token.group('aspas', 'apostrofo', 'valor') if v is not None), None)
+            predicados.append((token.group('atributo').lower(), token.group('operador'), valor))
+        posicao = token.end()
+    return tag, tuple(predicados)
+
+
+@lru_cache(maxsize=256)
+def compilar_seletor(seletor: str) -> tuple:
+    """Alternativas do seletor, cada uma uma tupla de compostos do ancestral ao elemento."""
+    alternativas = []
+    for alternativa in seletor.split(','):
+        compostos = tuple(_compilar_composto(parte) for parte in alternativa.split())
+        if not compostos:
+            raise ValueError(f"Seletor CSS vazio em '{seletor}'")
+        alternativas.append(compostos)
+    return tuple(alternativas)
+
+
+def _casa_predicado(atributos, atributo, operador, valor):
+    atual = atributos.get(atributo)
+    if atual is None:
+        return False
+    if operador is None:
+        return True
+    if operador == '=':
+        return atual == valor
+    if operador == '*=':
+        return bool(valor) and valor in atual
+    if operador == '^=':
+        return bool(valor) and atual.startswith(valor)
+    if operador == '$=':
+        return bool(valor) and atual.endswith(valor)
+    return valor in atual.split()  # ~=
+
+
+def _casa_composto(composto, tag, atributos):
+    tag_esperada, predicados = composto
+    if tag_esperada is not None and tag_esperada != tag:
+        return False
+    for atributo, operador, valor in predicados:
+        if not _casa_predicado(atributos, atributo, operador, valor):
+            return False
+    return True
+
+
+def _casa_alternativa(compostos, tag, atributos, obter_ancestrais):
+    if not _casa_composto(compostos[-1], tag, atributos):
+        return False
+    if len(compostos) == 1:
+        return True
+    # Descendência: os compostos restantes casam com ancestrais, do mais próximo para a raiz
+    restante = len(compostos) - 2
+    for tag_ancestral, atributos_ancestral in reversed(obter_ancestrais()):
+        if _casa_composto(compostos[restante], tag_ancestral, atributos_ancestral):
+            restante -= 1
+            if restante < 0:
+                return True
+    return False
+
+
+class _Correspondencia:
+    """
+    Lista de seletores compilada para uma passada: filtro rápido + teste completo.
+
+    O filtro descarta quase todos os elementos com uma expressão regular por
+    atributo (união dos valores que os seletores procuram); só os que passam
+    são testados contra cada seletor, e os ancestrais só são montados quando
+    o elemento casa com o fim de um seletor de descendência.
+    """
+
+    def __init__(self, seletores):
+        self.compilados = [(seletor, compilar_seletor(seletor)) for seletor in seletores]
+        self.qualquer_elemento = False
+        self.tags = set()  # Tags que casam sem atributos (ex.: o `span` de `[data-hook] span`)
+        valores = {}  # atributo -> valores procurados (None: basta existir)
+        for _, alternativas in self.compilados:
+            for compostos in alternativas:
+                tag, predicados = compostos[-1]
+                if not predicados:
+                    if tag is None:
+                        self.qualquer_elemento = True
+                    self.tags.add(tag)
+                for atributo, _, valor in predicados:
+                    valores.setdefault(atributo, set()).add(valor if valor else None)
+        self.por_atributo = [
+            (atributo, None if None in procurados else re.compile("|".join(map(re.escape, sorted(procurados)))))
+            for atributo, procurados in valores.items()
+        ]
+
+    def pode_casar(self, tag, atributos):
+        if self.qualquer_elemento or tag in self.tags:
+            return True
+        for atributo, padrao in self.por_atributo:
+            valor = atributos.get(atributo)
+            if valor is not None and (padrao is None or padrao.search(valor)):
+                return True
+        return False
+
+    def atribuir(self, encontrados, no, tag, atributos, obter_ancestrais):
+        """Acrescenta `no` aos seletores com que casa; `obter_ancestrais()` só é chamado se preciso."""
+        ancestrais = []
+
+        def ancestrais_do_no():
+            if not ancestrais:
+                ancestrais.append(obter_ancestrais())
+            return ancestrais[0]
+
+        for seletor, alternativas in self.compilados:
+            for compostos in alternativas:
+                if _casa_alternativa(compostos, tag, atributos, ancestrais_do_no):
+                    encontrados[seletor].append(no)
+                    break
+
+
+def _atributos_selectolax(no):
+    return {chave: valor or '' for chave, valor in no.attributes.items()}
+
+
+def _atributos_bs4(no):
+    return {chave: " ".join(valor) if isinstance(valor, list) else (valor or '') for chave, valor in no.attrs.items()}
+
+
+class DocumentoHtml:
+    """Página lida por um dos analisadores, com busca de vários seletores em uma passada."""
+
+    def __init__(self, conteudo, analisador=None):
+        self.analisador = obter_analisador(analisador)
+
+        if self.analisador == 'html.parser':
+            from bs4 import BeautifulSoup
+            self._arvore = BeautifulSoup(conteudo, 'html.parser')
+            return
+
+        texto = _decodificar(conteudo) if isinstance(conteudo, bytes) else str(conteudo)
+        if self.analisador == 'selectolax':
+            self._arvore = LexborHTMLParser(texto)
+        else:
+            try:
+                self._arvore = lxml.html.document_fromstring(texto)
+            except (etree.ParserError, ValueError):  # Documento vazio
+                self._arvore = lxml.html.document_fromstring('<html></html>')
+
+    def _elementos(self):
+        # (no, tag, atributos) de cada elemento, em ordem de documento
+        if self.analisador == 'lxml':
+            for elemento in self._arvore.iter():
+                if isinstance(elemento.tag, str):
+                    yield elemento, elemento.tag.lower(), elemento.attrib
+        else:
+            for no in self._arvore.find_all(True):
+                yield no, no.name, _atributos_bs4(no)
+
+    def _ancestrais(self, no):
+        # (tag, atributos) dos ancestrais, da raiz até o pai
+        if self.analisador == 'lxml':
+            ancestrais = [(a.tag.lower(), a.attrib) for a in no.iterancestors() if isinstance(a.tag, str)]
+        elif self.analisador == 'selectolax':
+            ancestrais = []
+            pai = no.parent
+            while pai is not None and pai.tag[0] not in '-!_#':
+                ancestrais.append((pai.tag, _atributos_selectolax(pai)))
+                pai = pai.parent
+        else:
+            ancestrais = [(pai.name, _atributos_bs4(pai)) for pai in no.parents if pai.name != '[document]']
+        return ancestrais[::-1]
+
+    def selecionar_varios(self, seletores) -> dict:
+        """
+        Elementos de cada seletor, em ordem de documento, avaliando todos de uma vez.
+
+        Com selectolax, a lista de seletores vai em uma única consulta nativa;
+        nos demais, uma única passada pelos elementos com o filtro de
+        `_Correspondencia`. Devolve {seletor: [elementos]}; o texto de cada um
+        sai de `texto(elemento)`.
+        """
+        correspondencia = _Correspondencia(seletores)
+        encontrados = {seletor: [] for seletor in seletores}
+
+        if self.analisador == 'selectolax':
+            vistos = set()
+            for no in self._arvore.css(", ".join(seletores)):
+                if no.mem_id in vistos:  # O lexbor repete o nó que casa com mais de um seletor
+                    continue
+                vistos.add(no.mem_id)
+                correspondencia.atribuir(encontrados, no, no.tag, _atributos_selectolax(no),
+                                         lambda no=no: self._ancestrais(no))
+            return encontrados
+
+        for no, tag, atributos in self._elementos():
+            if correspondencia.pode_casar(tag, atributos):
+                correspondencia.atribuir(encontrados, no, tag, atributos, lambda no=no: self._ancestrais(no))
+        return encontrados
+
+    def texto(self, elemento=None) -> str:
+        """Texto de um elemento (ou da página inteira), sem separador entre os trechos."""
+        if self.analisador == 'lxml':
+            return (self._arvore if elemento is None else elemento).text_content()
+        if self.analisador == 'selectolax':
+            alvo = self._arvore.root if elemento is None else elemento
+            return alvo.text(deep=True) if alvo is not None else ''
+        return (self._arvore if elemento is None else elemento).get_text()
+
+    def atributo(self, elemento, nome):
+        """Valor do atributo `nome` do elemento, ou None."""
+        if self.analisador == 'selectolax':
+            return elemento.attributes.get(nome)
+        valor = elemento.get(nome)
+        return " ".join(valor) if isinstance(valor, list) else valor
+
+
+def analisar_html(conteudo, analisador=None) -> DocumentoHtml:
+    """Lê `conteudo` (bytes ou str) com `analisador` (por padrão [EXTRACAO] PARSER_HTML)."""
+    return DocumentoHtml(conteudo, analisador)
@@ -0,0 +1,287 @@
+"""
+Motor assíncrono de análise de comentários.
+
+Todas as requisições ao Gemini são disparadas a partir de um único event loop,
+com o número de requisições simultâneas ajustado por AIMD conforme a latência e
+os erros de cota observados. Usado tanto pela CLI quanto pelo dashboard.
+"""
+
+import asyncio
+import time
+
+from tqdm import tqdm
+
+from .gemini_processor import (
+    analisar_comentario_individual_async, analisar_lote_async, consultar_cache, registrar_no_cache,
+    dividir_em_lotes, resultado_erro, estatisticas_respostas, rotear, precisa_segmentar,
+    segmentar_comentario, TAMANHO_LOTE_PADRAO, MAX_TOKENS_LOTE_PADRAO
+)
+from .rate_limiter import (
+    ControleConcorrenciaAIMD, obter_orcamento_retentativas, obter_controle_prazos, CONCORRENCIA_INICIAL_PADRAO
+)
+from .dedup import agrupar_quase_duplicados, expandir_resultados, LIMIAR_SIMILARIDADE_PADRAO
+from .local_classifier import obter_classificador_local, LIMIAR_CONFIANCA_PADRAO
+
+
+MAX_CONCORRENCIA_PADRAO = 64
+MAX_RODADAS_PADRAO = 3
+
+def _percentis(valores: list) -> dict:
+    """p50/p95/p99 pelo método do posto mais próximo (zeros se não houver valores)."""
+    if not valores:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordenados = sorted(valores)
+    ultimo = len(ordenados) - 1
+    return {
+        f"p{p}": ordenados[min(ultimo, int(round(p / 100 * ultimo)))]
+        for p in (50, 95, 99)
+    }
+
+
+async def processar_comentarios_async(comentarios, max_concorrencia=MAX_CONCORRENCIA_PADRAO,
+                                      tamanho_lote=TAMANHO_LOTE_PADRAO,
+                                      max_tokens_lote=MAX_TOKENS_LOTE_PADRAO,
+                                      max_rodadas=MAX_RODADAS_PADRAO, ao_progredir=None,
+                                      concorrencia_inicial=CONCORRENCIA_INICIAL_PADRAO,
+                                      agrupar_duplicados=True,
+                                      limiar_similaridade=LIMIAR_SIMILARIDADE_PADRAO,
+                                      usar_classificador_local=True,
+                                      limiar_confianca=LIMIAR_CONFIANCA_PADRAO,
+                                      usar_cache=True, ao_concluir=None, controle=None,
+                                      silencioso=False, prazo_execucao=None, estatisticas=None) -> list:
+    """
+    Analisa os comentários e retorna os resultados na mesma ordem da entrada.
+
+    Com `agrupar_duplicados`, comentários quase idênticos são analisados uma
+    única vez e o resultado é copiado para o grupo todo.
+
+    Com `usar_cache`, comentários em cache não são reenviados. Com
+    `usar_classificador_local`, os que o pré-classificador local resolve com
+    confiança >= `limiar_confianca` também não vão para a API. Os demais vão em lotes
+    separados por faixa de tamanho (cada faixa com seu modelo); itens
+    ausentes ou inválidos na resposta são reenviados por até `max_rodadas` e o
+    que sobrar é analisado individualmente. Com `tamanho_lote=1` todos os
+    comentários são analisados individualmente. Comentários longos demais
+    para um lote vão direto para a análise individual, que os segmenta.
+
+    O número de requisições simultâneas começa em `concorrencia_inicial` e é
+    ajustado por AIMD até no máximo `max_concorrencia`. Um `controle` já
+    existente pode ser passado para dividir o mesmo limite entre várias
+    chamadas simultâneas (como faz o pipeline em fluxo).
+
+    Com `prazo_execucao` (segundos), as requisições ainda em andamento quando
+    o prazo acaba são canceladas e os comentários sem resultado ficam como
+    erro; o restante é retornado normalmente. Cada requisição também tem seu
+    próprio prazo e pode ganhar uma cópia de reserva (ver ControlePrazos).
+
+    Com `silencioso`, não exibe mensagens nem barra de progresso.
+
+    `ao_progredir(concluidos, total)` é chamado a cada avanço, se informado.
+    `ao_concluir(posicoes, resultados)` recebe os resultados definitivos assim
+    que saem (posições na lista de entrada, já expandidas para os duplicados),
+    para que possam ser persistidos antes do fim da execução.
+
+    Se `estatisticas` (um dict) for informado, recebe no fim os contadores
+    desta chamada: camadas, requisições, retentativas, prazos etc. A latência
+    por comentário (do primeiro envio à API até o resultado final, incluindo
+    espera por vaga e reenvios) e a de cada requisição bem-sucedida ficam em
+    `latencia_comentario` e `latencia_requisicao`.
+    """
+    def informar(mensagem):
+        if not silencioso:
+            print(mensagem)
+
+    todos = comentarios
+    grupos = None
+    membros = [[i] for i in range(len(todos))]
+    if agrupar_duplicados and len(todos) > 1:
+        grupos = agrupar_quase_duplicados(todos, limiar_similaridade)
+        representantes = sorted(set(grupos))
+        comentarios = [todos[i] for i in representantes]
+        posicao = {representante: j for j, representante in enumerate(representantes)}
+        membros = [[] for _ in representantes]
+        for i, representante in enumerate(grupos):
+            membros[posicao[representante]].append(i)
+        if len(representantes) < len(todos):
+            informar(f"[INFO] {len(todos) - len(representantes)} comentários quase duplicados "
+                     f"agrupados em {len(representantes)} únicos")
+
+    total = len(comentarios)
+    resultados = consultar_cache(comentarios) if usar_cache else [None] * total
+    pendentes = [i for i, r in enumerate(resultados) if r is None]
+    do_cache = total - len(pendentes)
+
+    classificador = obter_classificador_local() if usar_classificador_local else None
+    if classificador is not None and pendentes:
+        locais = classificador.classificar([comentarios[i] for i in pendentes], limiar_confianca)
+        for index, resultado in zip(pendentes, locais):
+            if resultado is not None:
+                resultados[index] = resultado
+        pendentes = [i for i in pendentes if resultados[i] is None]
+    do_classificador = total - do_cache - len(pendentes)
+    para_api = len(pendentes)
+    if controle is None:
+        controle = ControleConcorrenciaAIMD(inicial=concorrencia_inicial, maximo=max_concorrencia)
+    orcamento = obter_orcamento_retentativas()
+    retentativas_antes = orcamento.estatisticas()['retentativas']
+    prazos = obter_controle_prazos()
+    prazos_antes = prazos.estatisticas()
+    respostas_antes = estatisticas_respostas()
+    requisicoes = 0
+    enviados_em = {}
+    latencias = []
+
+    def registrar_resultados(indices, respostas):
+        if usar_cache:
+            registrar_no_cache([comentarios[i] for i in indices], respostas)
+        notificar_concluidos(indices)
+
+    def notificar_concluidos(indices):
+        if not ao_concluir:
+            return
+        posicoes, finais = [], []
+        for index in indices:
+            if resultados[index] is not None:
+                posicoes.extend(membros[index])
+                finais.extend(resultados[index] for _ in membros[index])
+        if posicoes:
+            ao_concluir(posicoes, finais)
+
+    # Resolvidos pelo cache ou pelo classificador local
+    notificar_concluidos([i for i in range(total) if resultados[i] is not None])
+
+    if do_cache:
+        informar(f"[INFO] {do_cache} comentários recuperados do cache")
+    if do_classificador:
+        informar(f"[INFO] {do_classificador} comentários resolvidos pelo classificador local")
+
+    with tqdm(total=total, initial=total - len(pendentes), desc="Processando", disable=silencioso) as pbar:
+
+        def avancar(quantidade):
+            pbar.update(quantidade)
+            if ao_progredir:
+                ao_progredir(pbar.n, total)
+
+        async def executar_lote(faixa, indices):
+            agora = time.monotonic()
+            for index in indices:
+                enviados_em.setdefault(index, agora)
+            try:
+                respostas = await analisar_lote_async([comentarios[i] for i in indices], controle, faixa)
+            except Exception:
+                respostas = [None] * len(indices)
+
+            concluidos = 0
+            agora = time.monotonic()
+            for index, resposta in zip(indices, respostas):
+                if resposta is not None:
+                    resultados[index] = resposta
+                    latencias.append(agora - enviados_em[index])
+                    concluidos += 1
+            registrar_resultados(indices, respostas)
+            avancar(concluidos)
+
+        async def executar_individual(index):
+            enviados_em.setdefault(index, time.monotonic())
+            try:
+                resultado = await analisar_comentario_individual_async(
+                    comentarios[index], usar_cache=False, controle=controle
+                )
+            except Exception:
+                resultado = resultado_erro()
+
+            resultados[index] = resultado
+            latencias.append(time.monotonic() - enviados_em[index])
+            registrar_resultados([index], [resultado])
+            avancar(1)
+
+        async def executar_rodadas():
+            nonlocal pendentes, requisicoes
+            segmentados = [i for i in pendentes if precisa_segmentar(comentarios[i])]
+            if segmentados:
+                informar(f"[INFO] {len(segmentados)} comentários longos serão divididos em trechos")
+                longos = set(segmentados)
+                pendentes = [i for i in pendentes if i not in longos]
+
+            if tamanho_lote > 1:
+                for rodada in range(max_rodadas):
+                    if not pendentes:
+                        break
+
+                    por_faixa = {}
+                    for index in pendentes:
+                        faixa = rotear(comentarios[index])
+                        por_faixa.setdefault(faixa["nome"], (faixa, []))[1].append(index)
+
+                    lotes = [
+                        (faixa, [indices[p] for p in lote])
+                        for faixa, indices in por_faixa.values()
+                        for lote in dividir_em_lotes(
+                            [comentarios[i] for i in indices], tamanho_lote, max_tokens_lote
+                        )
+                    ]
+                    requisicoes += len(lotes)
+                    await asyncio.gather(*(executar_lote(faixa, indices) for faixa, indices in lotes))
+
+                    pendentes = [i for i in pendentes if resultados[i] is None]
+                    if pendentes and rodada < max_rodadas - 1:
+                        informar(f"[INFO] Reenviando {len(pendentes)} comentários ausentes ou inválidos...")
+
+            if pendentes or segmentados:
+                # Comentários segmentados custam uma requisição por trecho
+                requisicoes += len(pendentes) + sum(len(segmentar_comentario(comentarios[i])) for i in segmentados)
+                pendentes = pendentes + segmentados
+                await asyncio.gather(*(executar_individual(i) for i in pendentes))
+
+        sem_analise = 0
+        try:
+            await asyncio.wait_for(executar_rodadas(), prazo_execucao)
+        except asyncio.TimeoutError:
+            # Requisições em andamento já foram canceladas pelo wait_for
+            pendentes = [i for i in range(total) if resultados[i] is None]
+            for index in pendentes:
+                resultados[index] = resultado_erro()
+            sem_analise = len(pendentes)
+            informar(f"[AVISO] Prazo da execução ({prazo_execucao:.0f}s) esgotado; "
+                     f"{sem_analise} comentários ficaram sem análise")
+
+    stats = controle.estatisticas()
+    retentativas = orcamento.estatisticas()['retentativas'] - retentativas_antes
+    stats_prazos = {chave: valor - prazos_antes[chave] for chave, valor in prazos.estatisticas().items()}
+    stats_respostas = {chave: valor - respostas_antes[chave] for chave, valor in estatisticas_respostas().items()}
+    informar(f"[INFO] {requisicoes} requisições à API para {total} comentários "
+             f"({retentativas} retentativas, pico de {stats['pico_concorrencia']} simultâneas, "
+             f"limite final {stats['limite_concorrencia']})")
+    if stats_prazos['hedges'] or stats_prazos['timeouts']:
+        informar(f"[INFO] {stats_prazos['hedges']} requisições de reserva "
+                 f"({stats_prazos['hedges_vencedores']} responderam primeiro), "
+                 f"{stats_prazos['timeouts']} requisições excederam o prazo")
+    if stats_respostas['respostas_invalidas'] or stats_respostas['itens_reparados'] or stats_respostas['itens_rejeitados']:
+        informar(f"[INFO] Respostas: {stats_respostas['respostas_invalidas']}/{stats_respostas['respostas']} com JSON "
+                 f"inválido, {stats_respostas['itens_rejeitados']} itens rejeitados, "
+                 f"{stats_respostas['itens_reparados']} reparados localmente (reenvios evitados)")
+
+    if estatisticas is not None:
+        estatisticas.update({
+            "comentarios": len(todos),
+            "unicos": total,
+            "duplicados_agrupados": len(todos) - total,
+            "por_camada": {"cache": do_cache, "local": do_classificador, "gemini": para_api},
+            "requisicoes": requisicoes,
+            "retentativas": retentativas,
+            "sem_analise_no_prazo": sem_analise,
+            "latencia_comentario": _percentis(latencias),
+            "latencia_requisicao": _percentis(controle.latencias),
+            **stats_prazos,
+            **stats_respostas,
+            **stats
+        })
+
+    if grupos is not None:
+        resultados = expandir_resultados(dict(zip(representantes, resultados)), grupos)
+    return resultados
+
+
+def executar_analise(comentarios, **kwargs) -> list:
+    """Executa `processar_comentarios_async` em um event loop próprio (uso síncrono)."""
+    return asyncio.run(processar_comentarios_async(list(comentarios), **kwargs))
@@ -0,0 +1,201 @@
+"""
+Histórico colunar das execuções: entrada e resultados de cada uma em Parquet.
+
+Cada execução grava `<pasta>/<id da execução>.parquet`, com uma linha por
+comentário analisado (data, fonte, comentario, sentimento, categoria,
+resumo_curto, além de execucao, produto e linha). Os arquivos de todas as
+execuções formam um único dataset, que cresce a cada execução sem reescrever
+as anteriores:
+
+- sentimento, categoria, fonte, execucao e produto são categóricas
+  (dictionary-encoded): cada linha guarda só um índice pequeno;
+- data é um timestamp de verdade (datas que não puderem ser lidas ficam nulas);
+- as consultas leem só as colunas pedidas, com os arquivos mapeados em
+  memória, então agregar milhões de linhas custa poucos MB.
+
+O arquivo é escrito em grupos de linhas à medida que os resultados chegam e
+só aparece no histórico quando a execução termina (`finalizar`). Requer o
+pyarrow (dependência opcional).
+
+Uso:
+    python -m feedback_analyzer.armazem_resultados --pasta historico --por sentimento,categoria
+"""
+
+import argparse
+import os
+import time
+import warnings
+
+import pandas as pd
+
+from .config import obter_opcao
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:
+    pa = None
+
+
+PASTA_HISTORICO_PADRAO = 'historico'
+LINHAS_POR_GRUPO = 65536  # Linhas acumuladas antes de gravar um grupo no Parquet
+
+
+def _esquema():
+    categorica = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('execucao', categorica),
+        ('produto', categorica),
+        ('linha', pa.int64()),
+        ('data', pa.timestamp('ms')),
+        ('fonte', categorica),
+        ('comentario', pa.string()),
+        ('sentimento', categorica),
+        ('categoria', categorica),
+        ('resumo_curto', pa.string()),
+    ])
+
+
+def obter_pasta_historico():
+    """Pasta do histórico ([EXECUCAO] PASTA_HISTORICO), ou None se desativado ou sem pyarrow."""
+    if not obter_opcao('EXECUCAO', 'HISTORICO', True, bool):
+        return None
+    if pa is None:
+        print("[AVISO] pyarrow não instalado; o histórico em Parquet fica desativado (pip install pyarrow).")
+        return None
+    return obter_opcao('EXECUCAO', 'PASTA_HISTORICO', PASTA_HISTORICO_PADRAO)
+
+
+def _coluna_categorica(valores):
+    return pa.array(valores, type=pa.string()).dictionary_encode()
+
+
+def _como_timestamps(datas):
+    # Poucas datas distintas por bloco: converte cada uma uma vez só
+    codigos, unicas = pd.factorize(pd.Series(datas, dtype=object))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # Formatos misturados caem no dateutil
+        convertidas = pd.to_datetime(pd.Series(unicas, dtype=object), errors='coerce')
+    valores = pd.Series(convertidas.to_numpy()[codigos]).where(codigos >= 0)
+    return pa.array(valores, from_pandas=True).cast(pa.timestamp('ms'), safe=False)
+
+
+class ArmazemResultados:
+    """Escreve os resultados de uma execução no histórico, em grupos de linhas."""
+
+    def __init__(self, pasta, id_execucao, produto, linhas_por_grupo=LINHAS_POR_GRUPO, caminho=None):
+        os.makedirs(pasta, exist_ok=True)
+        # `caminho` troca o arquivo padrão da execução (ex.: a saída Parquet do relatório)
+        self.caminho = caminho or os.path.join(pasta, f"{id_execucao}.parquet")
+        # Fora do padrão *.parquet até terminar: uma execução interrompida não entra no histórico
+        self._caminho_parcial = self.caminho + '.parcial'
+        self.id_execucao = id_execucao
+        self.produto = produto
+        self.linhas_por_grupo = linhas_por_grupo
+        self._esquema = _esquema()
+        self._escritor = pq.ParquetWriter(self._caminho_parcial, self._esquema, compression='zstd')
+        self._pendentes = []
+        self.total = 0
+
+    def escrever(self, registros, resultados):
+        """Acrescenta os comentários analisados (registros com linha, data, fonte e comentario)."""
+        for registro, resultado in zip(registros, resultados):
+            self._pendentes.append((registro, resultado))
+        if len(self._pendentes) >= self.linhas_por_grupo:
+            self._gravar_grupo()
+
+    def _gravar_grupo(self):
+        if not self._pendentes:
+            return
+        registros = [registro for registro, _ in self._pendentes]
+        resultados = [resultado for _, resultado in self._pendentes]
+        quantidade = len(registros)
+        tabela = pa.table([
+            pa.DictionaryArray.from_arrays(pa.array([0] * quantidade, pa.int32()), [self.id_execucao]),
+            pa.DictionaryArray.from_arrays(pa.array([0] * quantidade, pa.int32()), [self.produto]),
+            pa.array([registro['linha'] for registro in registros], pa.int64()),
+            _como_timestamps([registro.get('data') for registro in registros]),
+            _coluna_categorica([str(registro.get('fonte', '')) for registro in registros]),
+            pa.array([registro['comentario'] for registro in registros], pa.string()),
+            _coluna_categorica([resultado.get('sentimento') for resultado in resultados]),
+            _coluna_categorica([resultado.get('categoria') for resultado in resultados]),
+            pa.array([resultado.get('resumo_curto') for resultado in resultados], pa.string()),
+        ], schema=self._esquema)
+        self._escritor.write_table(tabela)
+        self.total += quantidade
+        self._pendentes = []
+
+    def finalizar(self):
+        """Grava o que falta e publica o arquivo no histórico."""
+        self._gravar_grupo()
+        self._escritor.close()
+        os.replace(self._caminho_parcial, self.caminho)
+
+    def descartar(self):
+        self._escritor.close()
+        if os.path.exists(self._caminho_parcial):
+            os.remove(self._caminho_parcial)
+
+
+def abrir_historico(pasta=None):
+    """Dataset com todas as execuções do histórico, lido com mapeamento em memória."""
+    if pa is None:
+        raise RuntimeError("pyarrow não instalado (pip install pyarrow)")
+    pasta = pasta or obter_opcao('EXECUCAO', 'PASTA_HISTORICO', PASTA_HISTORICO_PADRAO)
+    arquivos = sorted(
+        os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith('.parquet')
+    ) if os.path.isdir(pasta) else []
+    return ds.dataset(arquivos, schema=_esquema(), format='parquet',
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def ler_historico(colunas=None, filtro=None, pasta=None) -> pd.DataFrame:
+    """
+    Linhas do histórico como DataFrame, lendo só `colunas` (por padrão, todas).
+
+    `filtro` é uma expressão do pyarrow, ex.:
+    `pyarrow.dataset.field('produto') == 'App X'`. As colunas categóricas
+    chegam como `category` no pandas.
+    """
+    return abrir_historico(pasta).to_table(columns=colunas, filter=filtro).to_pandas()
+
+
+def agregar_historico(por=('sentimento',), filtro=None, pasta=None, incluir_erros=False) -> pd.DataFrame:
+    """
+    Contagem de comentários por `por` (colunas do histórico), somando todas as execuções.
+
+    Só as colunas de `por` são lidas; comentários com erro de análise ficam
+    de fora, a menos que `incluir_erros`.
+    """
+    por = list(por)
+    if not incluir_erros:
+        sem_erro = ds.field('sentimento') != 'Erro'
+        filtro = sem_erro if filtro is None else filtro & sem_erro
+    # Cada arquivo (e grupo de linhas) tem seu dicionário; unificados, o
+    # agrupamento trabalha com os índices, sem materializar as strings de cada linha
+    tabela = abrir_historico(pasta).to_table(columns=por, filter=filtro).unify_dictionaries()
+    contagem = tabela.group_by(por).aggregate([([], 'count_all')]).rename_columns(por + ['comentarios'])
+    return contagem.to_pandas().sort_values('comentarios', ascending=False).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agrega o histórico de execuções em Parquet")
+    parser.add_argument("--pasta", default=PASTA_HISTORICO_PADRAO, help="Pasta do histórico ([EXECUCAO] PASTA_HISTORICO)")
+    parser.add_argument("--por", default="sentimento",
+                        help="Colunas separadas por vírgula (ex.: sentimento,categoria ou produto,execucao)")
+    parser.add_argument("--produto", default=None, help="Só as execuções deste produto")
+    parser.add_argument("--incluir-erros", action="store_true", help="Conta também os comentários com erro")
+    args = parser.parse_args()
+
+    por = [coluna.strip() for coluna in args.por.split(',') if coluna.strip()]
+    filtro = ds.field('produto') == args.produto if args.produto else None
+    inicio = time.perf_counter()
+    contagem = agregar_historico(por, filtro=filtro, pasta=args.pasta, incluir_erros=args.incluir_erros)
+    print(contagem.to_string(index=False))
+    print(f"\n[INFO] {contagem['comentarios'].sum()} comentários agregados em {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
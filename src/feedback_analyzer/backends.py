@@ -0,0 +1,325 @@
+"""
+Backends de geração de texto usados pelo gemini_processor.
+
+- BackendGemini: API real via google.generativeai.
+- BackendSimulado: simulador em processo, sem rede nem cota.
+- BackendHTTP: cliente para o servidor simulado (servidor_simulado.py) ou
+  outro serviço http/https no formato REST do Gemini que responda com
+  Content-Length (o cliente assíncrono não lê respostas chunked).
+
+Todos expõem `gerar(prompt, max_output_tokens, esquema, timeout)` e
+`gerar_async(prompt, max_output_tokens, esquema)`, retornando o texto da
+resposta, e o atributo `modelo`, usado na chave do cache. O `timeout` da
+chamada síncrona é o prazo da requisição (TimeoutError se estourar); na
+assíncrona, quem aplica o prazo é o ControlePrazos.
+Com `esquema` (JSON Schema no formato do Gemini), a resposta é pedida como
+JSON restrito ao esquema (saída estruturada).
+O simulador reproduz latência, erros 5xx, 429 e respostas malformadas com
+taxas configuráveis, para ajustar concorrência e lotes sem gastar cota.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+
+SENTIMENTOS_SIMULADOS = ('Positivo', 'Negativo', 'Neutro')
+CATEGORIAS_SIMULADAS = ('Bug', 'Sugestão', 'UI/UX', 'Suporte')
+
+PARAMETROS_SIMULACAO = (
+    'latencia_mediana', 'dispersao_latencia', 'segundos_por_item',
+    'taxa_erro', 'taxa_429', 'taxa_json_malformado', 'taxa_item_ausente', 'taxa_travamento',
+    'taxa_rotulo_variante'
+)
+SEGUNDOS_TRAVAMENTO = 600  # Duração de uma requisição "travada" no simulador
+
+# Grafias que um modelo sem saída estruturada às vezes devolve
+VARIANTES_ROTULO = {
+    'Positivo': ('positivo', 'Positive', 'POSITIVO'),
+    'Negativo': ('negativo', 'negative', 'Negative'),
+    'Neutro': ('neutro', 'Neutral', 'neutral'),
+    'Bug': ('bug', 'Erro', 'error'),
+    'Sugestão': ('Sugestao', 'sugestão', 'Suggestion'),
+    'UI/UX': ('ui/ux', 'UI-UX', 'Interface'),
+    'Suporte': ('suporte', 'Support', 'Atendimento')
+}
+
+_ITEM_LOTE = re.compile(r'^\s*\[(\d+)\] (".*")\s*$', re.M)
+_COMENTARIO_INDIVIDUAL = re.compile(r'Comentário: "(.*)"\s*$', re.S)
+
+
+class ErroBackend(Exception):
+    """Erro de API com código HTTP, reconhecido por eh_erro_de_cota/eh_erro_transitorio."""
+
+    def __init__(self, code, mensagem=""):
+        super().__init__(f"{code} {mensagem}".strip())
+        self.code = code
+
+
+class BackendGemini:
+    nome = 'gemini'
+
+    def __init__(self, modelo):
+        import google.generativeai as genai
+        self._genai = genai
+        self.modelo = modelo
+
+    def _configuracao(self, max_output_tokens, esquema=None):
+        if not max_output_tokens and esquema is None:
+            return None
+        opcoes = {"temperature": 0.1, "max_output_tokens": max_output_tokens}
+        if esquema is not None:
+            opcoes.update(response_mime_type="application/json", response_schema=esquema)
+        return self._genai.types.GenerationConfig(**opcoes)
+
+    def gerar(self, prompt: str, max_output_tokens=None, esquema=None, timeout=None) -> str:
+        model = self._genai.GenerativeModel(self.modelo)
+        response = model.generate_content(
+            prompt, generation_config=self._configuracao(max_output_tokens, esquema),
+            request_options={'timeout': timeout} if timeout else None
+        )
+        return response.text
+
+    async def gerar_async(self, prompt: str, max_output_tokens=None, esquema=None) -> str:
+        model = self._genai.GenerativeModel(self.modelo)
+        response = await model.generate_content_async(
+            prompt, generation_config=self._configuracao(max_output_tokens, esquema)
+        )
+        return response.text
+
+
+class SimuladorGemini:
+    """
+    Gera respostas no formato esperado pelos prompts de análise.
+
+    A latência segue uma log-normal com mediana `latencia_mediana` e dispersão
+    `dispersao_latencia`, mais `segundos_por_item` por comentário do lote. As
+    taxas são probabilidades por requisição (ou por item, em `taxa_item_ausente`).
+    Com `taxa_travamento`, a requisição demora SEGUNDOS_TRAVAMENTO, como uma
+    chamada que nunca responde. Com `taxa_rotulo_variante`, um item traz o
+    sentimento ou a categoria com outra grafia (minúsculas, sem acento, em
+    inglês). Com saída estruturada a resposta é sempre JSON puro com os
+    rótulos válidos, como garante o esquema na API real.
+    """
+
+    def __init__(self, latencia_mediana=0.5, dispersao_latencia=0.4, segundos_por_item=0.02,
+                 taxa_erro=0.0, taxa_429=0.0, taxa_json_malformado=0.0, taxa_item_ausente=0.0,
+                 taxa_travamento=0.0, taxa_rotulo_variante=0.0, semente=None):
+        self.latencia_mediana = latencia_mediana
+        self.dispersao_latencia = dispersao_latencia
+        self.segundos_por_item = segundos_por_item
+        self.taxa_erro = taxa_erro
+        self.taxa_429 = taxa_429
+        self.taxa_json_malformado = taxa_json_malformado
+        self.taxa_item_ausente = taxa_item_ausente
+        self.taxa_travamento = taxa_travamento
+        self.taxa_rotulo_variante = taxa_rotulo_variante
+        self._rng = random.Random(semente)
+        self._lock = threading.Lock()
+
+    def _sortear(self, taxa) -> bool:
+        with self._lock:
+            return self._rng.random() < taxa
+
+    def latencia(self, prompt: str) -> float:
+        itens = max(1, len(_ITEM_LOTE.findall(prompt)))
+        with self._lock:
+            base = self.latencia_mediana * self._rng.lognormvariate(0, self.dispersao_latencia)
+        if self.taxa_travamento and self._sortear(self.taxa_travamento):
+            return SEGUNDOS_TRAVAMENTO
+        return base + self.segundos_por_item * itens
+
+    def verificar_falha(self):
+        """Levanta ErroBackend conforme as taxas de 429 e de erro do servidor."""
+        if self._sortear(self.taxa_429):
+            raise ErroBackend(429, "Resource has been exhausted (e.g. check quota).")
+        if self._sortear(self.taxa_erro):
+            raise ErroBackend(503, "The service is currently unavailable.")
+
+    @staticmethod
+    def _analise(comentario: str) -> dict:
+        digest = hashlib.md5(comentario.encode('utf-8')).digest()
+        return {
+            "sentimento": SENTIMENTOS_SIMULADOS[digest[0] % len(SENTIMENTOS_SIMULADOS)],
+            "categoria": CATEGORIAS_SIMULADAS[digest[1] % len(CATEGORIAS_SIMULADAS)],
+            "resumo_curto": comentario[:60]
+        }
+
+    def _variar_rotulo(self, analise: dict) -> dict:
+        if not self.taxa_rotulo_variante or not self._sortear(self.taxa_rotulo_variante):
+            return analise
+        with self._lock:
+            campo = self._rng.choice(('sentimento', 'categoria'))
+            variante = self._rng.choice(VARIANTES_ROTULO[analise[campo]])
+        return {**analise, campo: variante}
+
+    def responder(self, prompt: str, estruturada: bool = False) -> str:
+        itens = _ITEM_LOTE.findall(prompt)
+        if itens:
+            dados = []
+            for indice, texto in itens:
+                if self._sortear(self.taxa_item_ausente):
+                    continue
+                analise = self._analise(json.loads(texto))
+                dados.append({"indice": int(indice), **(analise if estruturada else self._variar_rotulo(analise))})
+        else:
+            encontrado = _COMENTARIO_INDIVIDUAL.search(prompt)
+            if not encontrado:
+                return "Resumo simulado: a maioria dos comentários é positiva; o problema mais citado é a entrega."
+            dados = self._analise(encontrado.group(1))
+            if not estruturada:
+                dados = self._variar_rotulo(dados)
+
+        if estruturada:
+            return json.dumps(dados, ensure_ascii=False)
+        texto = "```json\n" + json.dumps(dados, ensure_ascii=False) + "\n```"
+        if self._sortear(self.taxa_json_malformado):
+            texto = texto[:max(1, len(texto) // 2)]
+        return texto
+
+
+class BackendSimulado:
+    nome = 'simulado'
+
+    def __init__(self, simulador=None, modelo='simulado', **parametros):
+        self.simulador = simulador or SimuladorGemini(**parametros)
+        self.modelo = modelo
+
+    def gerar(self, prompt: str, max_output_tokens=None, esquema=None, timeout=None) -> str:
+        latencia = self.simulador.latencia(prompt)
+        if timeout and latencia > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Requisição excedeu o prazo de {timeout:.0f}s")
+        time.sleep(latencia)
+        self.simulador.verificar_falha()
+        return self.simulador.responder(prompt, estruturada=esquema is not None)
+
+    async def gerar_async(self, prompt: str, max_output_tokens=None, esquema=None) -> str:
+        await asyncio.sleep(self.simulador.latencia(prompt))
+        self.simulador.verificar_falha()
+        return self.simulador.responder(prompt, estruturada=esquema is not None)
+
+
+def _esquema_rest(esquema):
+    """Converte o esquema para a API REST, que usa os tipos em maiúsculas (OBJECT, STRING...)."""
+    if isinstance(esquema, dict):
+        return {
+            chave: valor.upper() if chave == 'type' else _esquema_rest(valor)
+            for chave, valor in esquema.items()
+        }
+    if isinstance(esquema, list):
+        return [_esquema_rest(valor) for valor in esquema]
+    return esquema
+
+
+def _corpo_requisicao(prompt, max_output_tokens, esquema=None):
+    corpo = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    configuracao = {}
+    if max_output_tokens:
+        configuracao.update(temperature=0.1, maxOutputTokens=max_output_tokens)
+    if esquema is not None:
+        configuracao.update(responseMimeType="application/json", responseSchema=_esquema_rest(esquema))
+    if configuracao:
+        corpo["generationConfig"] = configuracao
+    return corpo
+
+
+def _texto_da_resposta(status, corpo):
+    if status != 200:
+        raise ErroBackend(status, corpo[:200] if isinstance(corpo, str) else "")
+    dados = json.loads(corpo)
+    try:
+        return "".join(parte.get("text", "") for parte in dados["candidates"][0]["content"]["parts"])
+    except (KeyError, IndexError, TypeError):
+        raise ValueError("Resposta sem candidatos")
+
+
+class BackendHTTP:
+    """
+    Cliente REST no formato generateContent do Gemini.
+
+    `gerar` usa requests. `gerar_async` é um cliente HTTP/1.1 mínimo sobre
+    asyncio (TLS em URLs https), pensado para o servidor simulado: exige
+    Content-Length e recusa respostas com Transfer-Encoding: chunked.
+    """
+
+    nome = 'http'
+
+    def __init__(self, url_base, modelo='simulado', timeout=60):
+        if urlparse(url_base).scheme not in ('http', 'https'):
+            raise ValueError(f"Backend 'http' aceita só URLs http:// ou https://: {url_base}")
+        self.url_base = url_base.rstrip('/')
+        self.modelo = modelo
+        self.timeout = timeout
+        self._sessao = requests.Session()
+
+    @property
+    def _caminho(self):
+        return f"/v1beta/models/{self.modelo}:generateContent"
+
+    def gerar(self, prompt: str, max_output_tokens=None, esquema=None, timeout=None) -> str:
+        try:
+            response = self._sessao.post(
+                self.url_base + self._caminho, json=_corpo_requisicao(prompt, max_output_tokens, esquema),
+                timeout=timeout or self.timeout
+            )
+        except requests.Timeout as e:
+            raise TimeoutError(f"Requisição excedeu o prazo de {timeout or self.timeout:.0f}s") from e
+        return _texto_da_resposta(response.status_code, response.text)
+
+    async def gerar_async(self, prompt: str, max_output_tokens=None, esquema=None) -> str:
+        url = urlparse(self.url_base)
+        https = url.scheme == 'https'
+        corpo = json.dumps(_corpo_requisicao(prompt, max_output_tokens, esquema)).encode('utf-8')
+        requisicao = (
+            f"POST {url.path.rstrip('/')}{self._caminho} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode('ascii') + corpo
+
+        async def trocar():
+            leitor, escritor = await asyncio.open_connection(
+                url.hostname, url.port or (443 if https else 80), ssl=https or None
+            )
+            try:
+                escritor.write(requisicao)
+                await escritor.drain()
+                return await leitor.read()
+            finally:
+                escritor.close()
+
+        bruto = await asyncio.wait_for(trocar(), self.timeout)
+        cabecalho, _, corpo_resposta = bruto.partition(b"\r\n\r\n")
+        if re.search(rb'^transfer-encoding:.*chunked', cabecalho, re.IGNORECASE | re.MULTILINE):
+            raise ValueError("Resposta chunked não suportada pelo cliente assíncrono do backend 'http'")
+        status = int(cabecalho.split(b" ", 2)[1])
+        return _texto_da_resposta(status, corpo_resposta.decode('utf-8', errors='replace'))
+
+
+def criar_backend(tipo: str, modelo: str, url=None, **parametros_simulacao):
+    """
+    Cria o backend pelo nome: 'gemini', 'simulado' ou 'http'.
+
+    O atributo `modelo` do backend é o modelo realmente usado: no 'http', o
+    que vai na URL (/v1beta/models/<modelo>:generateContent).
+    """
+    tipo = (tipo or 'gemini').lower()
+    if tipo == 'gemini':
+        return BackendGemini(modelo)
+    if tipo == 'simulado':
+        # O modelo entra no nome (ex.: 'simulado:gemini-1.5-flash'): quem responde é o simulador
+        return BackendSimulado(modelo=f"simulado:{modelo}" if modelo else 'simulado', **parametros_simulacao)
+    if tipo == 'http':
+        if not url:
+            raise ValueError("Backend 'http' requer a opção URL")
+        return BackendHTTP(url, modelo or 'simulado')
+    raise ValueError(f"Backend desconhecido: {tipo}")
@@ -0,0 +1,251 @@
+"""
+Cache persistente (SQLite) dos resultados de análise por comentário.
+
+A chave é um hash do texto normalizado do comentário junto com o modelo e a
+versão do prompt, de modo que mudanças em qualquer um deles invalidam as
+entradas antigas automaticamente.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from .config import obter_opcao
+
+
+CAMINHO_PADRAO = os.path.join('cache', 'analises.db')
+MAX_ENTRADAS_PADRAO = 200000
+MAX_IDADE_DIAS_PADRAO = 30
+INTERVALO_EVICAO = 1000  # Inserções entre verificações do limite de tamanho
+TAMANHO_CONSULTA = 500  # Chaves por consulta em obter_varios
+
+_cache_global = None
+_cache_lock = threading.Lock()
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normalização usada na chave: Unicode NFC, minúsculas e espaços colapsados."""
+    texto = unicodedata.normalize('NFC', str(texto))
+    return " ".join(texto.lower().split())
+
+
+def calcular_chave(comentario: str, modelo: str, versao_prompt) -> str:
+    conteudo = f"{modelo}\x1f{versao_prompt}\x1f{normalizar_texto(comentario)}"
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CacheAnalises:
+    """Cache em disco com evicção por idade e por número de entradas (LRU)."""
+
+    def __init__(self, caminho=CAMINHO_PADRAO, max_entradas=MAX_ENTRADAS_PADRAO,
+                 max_idade_dias=MAX_IDADE_DIAS_PADRAO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.max_idade_segundos = max_idade_dias * 86400
+        self.acertos = 0
+        self.falhas = 0
+        self.evictos = 0
+        self._insercoes = 0
+        self._lock = threading.Lock()
+
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS analises (
+                chave TEXT PRIMARY KEY,
+                resultado TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL,
+                comentario TEXT,
+                modelo TEXT,
+                versao_prompt TEXT
+            )
+        """)
+        # Bancos criados antes das colunas de texto/modelo
+        colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(analises)")}
+        for coluna in ('comentario', 'modelo', 'versao_prompt'):
+            if coluna not in colunas:
+                self._conexao.execute(f"ALTER TABLE analises ADD COLUMN {coluna} TEXT")
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_acessado_em ON analises (acessado_em)")
+        # Resumos parciais do resumo executivo (um por grupo categoria/sentimento)
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS resumos (
+                chave TEXT PRIMARY KEY,
+                texto TEXT NOT NULL,
+                criado_em REAL NOT NULL
+            )
+        """)
+        self._conexao.commit()
+
+        self.aplicar_evicao()
+
+    def obter(self, comentario, modelo, versao_prompt):
+        return self.obter_varios([comentario], modelo, versao_prompt)[0]
+
+    def obter_varios(self, comentarios, modelo, versao_prompt) -> list:
+        """Retorna uma lista alinhada a `comentarios`, com None para as ausências."""
+        chaves = [calcular_chave(c, modelo, versao_prompt) for c in comentarios]
+        encontrados = {}
+        agora = time.time()
+        limite = agora - self.max_idade_segundos
+
+        with self._lock:
+            unicas = list(dict.fromkeys(chaves))
+            for inicio in range(0, len(unicas), TAMANHO_CONSULTA):
+                parte = unicas[inicio:inicio + TAMANHO_CONSULTA]
+                marcadores = ",".join("?" * len(parte))
+                linhas = self._conexao.execute(
+                    f"SELECT chave, resultado FROM analises "
+                    f"WHERE criado_em >= ? AND chave IN ({marcadores})",
+                    [limite, *parte]
+                ).fetchall()
+                encontrados.update((chave, json.loads(resultado)) for chave, resultado in linhas)
+
+            if encontrados:
+                self._conexao.executemany(
+                    "UPDATE analises SET acessado_em = ? WHERE chave = ?",
+                    [(agora, chave) for chave in encontrados]
+                )
+                self._conexao.commit()
+
+            resultados = [encontrados.get(chave) for chave in chaves]
+            acertos = sum(1 for r in resultados if r is not None)
+            self.acertos += acertos
+            self.falhas += len(resultados) - acertos
+
+        return [dict(r) if r is not None else None for r in resultados]
+
+    def salvar(self, comentario, resultado, modelo, versao_prompt):
+        self.salvar_varios([comentario], [resultado], modelo, versao_prompt)
+
+    def salvar_varios(self, comentarios, resultados, modelo, versao_prompt):
+        agora = time.time()
+        linhas = [
+            (calcular_chave(c, modelo, versao_prompt), json.dumps(r, ensure_ascii=False), agora, agora,
+             c, modelo, str(versao_prompt))
+            for c, r in zip(comentarios, resultados)
+        ]
+        if not linhas:
+            return
+
+        with self._lock:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO analises "
+                "(chave, resultado, criado_em, acessado_em, comentario, modelo, versao_prompt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                linhas
+            )
+            self._conexao.commit()
+            self._insercoes += len(linhas)
+            verificar = self._insercoes >= INTERVALO_EVICAO
+            if verificar:
+                self._insercoes = 0
+
+        if verificar:
+            self.aplicar_evicao()
+
+    def aplicar_evicao(self):
+        """Remove entradas expiradas e, acima do limite, as menos acessadas."""
+        with self._lock:
+            limite = time.time() - self.max_idade_segundos
+            cursor = self._conexao.execute("DELETE FROM analises WHERE criado_em < ?", (limite,))
+            removidos = cursor.rowcount
+            self._conexao.execute("DELETE FROM resumos WHERE criado_em < ?", (limite,))
+
+            total = self._conexao.execute("SELECT COUNT(*) FROM analises").fetchone()[0]
+            excesso = total - self.max_entradas
+            if excesso > 0:
+                cursor = self._conexao.execute(
+                    "DELETE FROM analises WHERE chave IN "
+                    "(SELECT chave FROM analises ORDER BY acessado_em ASC LIMIT ?)",
+                    (excesso,)
+                )
+                removidos += cursor.rowcount
+
+            self._conexao.commit()
+            self.evictos += max(removidos, 0)
+
+    def obter_resumo(self, chave):
+        limite = time.time() - self.max_idade_segundos
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT texto FROM resumos WHERE chave = ? AND criado_em >= ?", (chave, limite)
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def salvar_resumo(self, chave, texto):
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO resumos (chave, texto, criado_em) VALUES (?, ?, ?)",
+                (chave, texto, time.time())
+            )
+            self._conexao.commit()
+
+    def iterar_exemplos(self, modelo=None):
+        """Gera pares (comentario, resultado) armazenados, opcionalmente de um só modelo."""
+        consulta = "SELECT comentario, resultado FROM analises WHERE comentario IS NOT NULL"
+        parametros = []
+        if modelo is not None:
+            consulta += " AND modelo = ?"
+            parametros.append(modelo)
+
+        with self._lock:
+            linhas = self._conexao.execute(consulta, parametros).fetchall()
+
+        for comentario, resultado in linhas:
+            yield comentario, json.loads(resultado)
+
+    def tamanho(self) -> int:
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM analises").fetchone()[0]
+
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            "evictos": self.evictos,
+            "entradas": self.tamanho()
+        }
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+def obter_cache():
+    """
+    Retorna o cache global configurado em [CACHE] no config.ini.
+
+    Retorna None se o cache estiver desativado ou não puder ser aberto.
+    """
+    global _cache_global
+
+    with _cache_lock:
+        if _cache_global is not None:
+            return _cache_global
+
+        if not obter_opcao('CACHE', 'ATIVO', True, bool):
+            return None
+
+        try:
+            _cache_global = CacheAnalises(
+                caminho=obter_opcao('CACHE', 'CAMINHO', CAMINHO_PADRAO),
+                max_entradas=obter_opcao('CACHE', 'MAX_ENTRADAS', MAX_ENTRADAS_PADRAO, int),
+                max_idade_dias=obter_opcao('CACHE', 'MAX_IDADE_DIAS', MAX_IDADE_DIAS_PADRAO, float)
+            )
+        except sqlite3.Error as e:
+            print(f"[AVISO] Cache de análises indisponível: {e}")
+            return None
+
+        return _cache_global
@@ -0,0 +1,144 @@
+"""
+Captura das páginas baixadas na extração, para reproduzi-las offline.
+
+Com [EXTRACAO] PASTA_CAPTURA definida, cada página lida pela extração é
+gravada na pasta: o HTML cru baixado por requests (tipo 'http') e o DOM
+renderizado pelo Chrome depois da coleta (tipo 'dom', sem os <script>). O
+`indice.json` da pasta liga cada URL original aos seus arquivos e guarda as
+listagens extraídas (as URLs passadas à extração, com a plataforma).
+
+Com [EXTRACAO] SERVIDOR_REPRODUCAO apontando para o `servidor_capturas`, a
+extração pede as páginas a ele em vez dos sites: a URL original vira um
+caminho espelhado, `<servidor>/<tipo>/<esquema>/<host><caminho>?<consulta>`,
+em que links relativos continuam funcionando.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .config import obter_opcao
+
+
+TIPOS_CAPTURA = ('http', 'dom')
+ARQUIVO_INDICE = 'indice.json'
+PADRAO_SCRIPT = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+_indice_lock = threading.Lock()
+
+
+def obter_pasta_captura():
+    """Pasta das capturas ([EXTRACAO] PASTA_CAPTURA), ou None se a captura estiver desligada."""
+    return obter_opcao('EXTRACAO', 'PASTA_CAPTURA', '') or None
+
+
+def obter_servidor_reproducao():
+    """Endereço do servidor de reprodução ([EXTRACAO] SERVIDOR_REPRODUCAO), ou None."""
+    endereco = obter_opcao('EXTRACAO', 'SERVIDOR_REPRODUCAO', '')
+    return endereco.rstrip('/') or None
+
+
+def normalizar_url(url):
+    """URL usada como chave das capturas: sem o fragmento (#...) e com caminho ('/' se vazio)."""
+    partes = urlsplit(url)
+    consulta = f"?{partes.query}" if partes.query else ''
+    return f"{partes.scheme}://{partes.netloc}{partes.path or '/'}{consulta}"
+
+
+def para_reproducao(url, tipo='http'):
+    """Endereço de `url` no servidor de reprodução, ou a própria URL se a reprodução estiver desligada."""
+    servidor = obter_servidor_reproducao()
+    if servidor is None or url.startswith(servidor + '/'):
+        return url
+    esquema, resto = normalizar_url(url).split('://', 1)
+    return f"{servidor}/{tipo}/{esquema}/{resto}"
+
+
+def url_original(endereco):
+    """Inverso de `para_reproducao`: a URL original de um endereço espelhado (outros passam direto)."""
+    servidor = obter_servidor_reproducao()
+    if servidor is None or not endereco.startswith(servidor + '/'):
+        return endereco
+    return url_do_caminho(endereco[len(servidor):])[1] or endereco
+
+
+def url_do_caminho(caminho):
+    """(tipo, url original) de um caminho espelhado como '/http/https/site.com/p?x=1', ou (None, None)."""
+    encontrado = re.match(r'/(http|dom)/(https?)/([^/?]+)(.*)$', caminho)
+    if not encontrado:
+        return None, None
+    tipo, esquema, host, resto = encontrado.groups()
+    if not resto.startswith('/'):
+        resto = '/' + resto
+    return tipo, f"{esquema}://{host}{resto}"
+
+
+def ler_indice(pasta):
+    """Índice das capturas de `pasta`: {'paginas': {url: {tipo: {...}}}, 'listagens': {url: plataforma}}."""
+    caminho = os.path.join(pasta, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {'paginas': {}, 'listagens': {}}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _atualizar_indice(pasta, alterar):
+    with _indice_lock:
+        indice = ler_indice(pasta)
+        alterar(indice)
+        temporario = os.path.join(pasta, ARQUIVO_INDICE + '.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(indice, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, os.path.join(pasta, ARQUIVO_INDICE))
+
+
+def capturar_pagina(url, conteudo, tipo, tipo_conteudo=None):
+    """
+    Grava `conteudo` (bytes ou str) como a captura `tipo` de `url`, se a captura estiver ligada.
+
+    DOMs são gravados sem os <script>, para que a reprodução mostre o estado
+    capturado em vez de renderizar a página de novo.
+    """
+    pasta = obter_pasta_captura()
+    if pasta is None:
+        return
+    if tipo not in TIPOS_CAPTURA:
+        raise ValueError(f"Tipo de captura desconhecido: '{tipo}'")
+
+    url = normalizar_url(url)
+    if isinstance(conteudo, str):
+        if tipo == 'dom':
+            conteudo = PADRAO_SCRIPT.sub('', conteudo)
+        conteudo = conteudo.encode('utf-8')
+    tipo_conteudo = tipo_conteudo or 'text/html; charset=utf-8'
+    extensao = '.json' if 'json' in tipo_conteudo else '.html'
+    arquivo = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}_{tipo}{extensao}"
+
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        with open(os.path.join(pasta, arquivo), 'wb') as f:
+            f.write(conteudo)
+        _atualizar_indice(pasta, lambda indice: indice['paginas'].setdefault(url, {}).update({tipo: {
+            'arquivo': arquivo,
+            'tipo_conteudo': tipo_conteudo,
+            'bytes': len(conteudo),
+            'capturado_em': time.strftime('%Y-%m-%d %H:%M:%S')
+        }}))
+    except OSError as e:
+        print(f"[AVISO] Não foi possível capturar {url}: {e}")
+
+
+def registrar_listagem(url, plataforma):
+    """Anota `url` como listagem extraída (ponto de partida para reproduzir a extração)."""
+    pasta = obter_pasta_captura()
+    if pasta is None:
+        return
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        _atualizar_indice(pasta, lambda indice: indice['listagens'].update({normalizar_url(url): plataforma}))
+    except OSError as e:
+        print(f"[AVISO] Não foi possível registrar a listagem {url}: {e}")
@@ -0,0 +1,225 @@
+"""
+Leitura em blocos de arquivos de comentários (CSV, TXT, JSON e JSON Lines).
+
+Os arquivos são lidos aos poucos, em DataFrames de até `tamanho_bloco`
+linhas com as colunas data, fonte e comentario, para que exportações de
+vários GB não precisem caber na memória:
+
+- CSV: `pd.read_csv` com `chunksize`, lendo só as colunas usadas;
+- JSON: os itens de um array no topo do arquivo são decodificados um a um,
+  sem carregar o array inteiro; JSON Lines (um valor por linha) também.
+  Objetos usam a chave 'comentario' ou 'text' (sem elas, o objeto inteiro
+  vira o comentário, com um aviso); um .json com um único valor fora de
+  array vira um comentário só, com o valor inteiro;
+- TXT: uma linha por comentário, iterando o arquivo.
+
+Colunas constantes (a data de hoje e a fonte padrão) são categóricas de uma
+categoria só: um byte por linha em vez de uma string repetida.
+"""
+
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+TAMANHO_BLOCO_LEITURA_PADRAO = 10000
+TAMANHO_LEITURA_JSON = 1 << 20  # Caracteres lidos do arquivo por vez
+FONTE_PADRAO = 'Produto Web'
+COLUNAS_COMENTARIO = ['review', 'text', 'feedback', 'comment', 'mensaje', 'texto']
+FORMATOS_SUPORTADOS = ('csv', 'txt', 'json', 'jsonl', 'ndjson')
+
+
+def coluna_constante(valor, tamanho):
+    """Coluna categórica com `valor` em todas as `tamanho` linhas."""
+    return pd.Categorical.from_codes(np.zeros(tamanho, dtype=np.int8), categories=[valor])
+
+
+def _bloco(comentarios, data):
+    return pd.DataFrame({
+        'data': coluna_constante(data, len(comentarios)),
+        'fonte': coluna_constante(FONTE_PADRAO, len(comentarios)),
+        'comentario': comentarios
+    })
+
+
+def _coluna_comentario(colunas):
+    if 'comentario' in colunas:
+        return 'comentario'
+    # Tentar encontrar coluna de comentários com nomes alternativos
+    for coluna in COLUNAS_COMENTARIO:
+        if coluna in colunas:
+            return coluna
+    raise ValueError("Arquivo CSV deve ter uma coluna 'comentario' ou similar.")
+
+
+def _blocos_csv(caminho, tamanho_bloco, data):
+    # O cabeçalho é lido já, para um CSV sem coluna de comentários falhar antes da análise começar
+    colunas = pd.read_csv(caminho, nrows=0).columns
+    coluna = _coluna_comentario(colunas)
+    usadas = [coluna] + [c for c in ('data', 'fonte') if c in colunas and c != coluna]
+
+    def blocos():
+        for bloco in pd.read_csv(caminho, usecols=usadas, chunksize=tamanho_bloco,
+                                 dtype={'fonte': 'category'} if 'fonte' in usadas else None):
+            bloco = bloco.rename(columns={coluna: 'comentario'}).dropna(subset=['comentario'])
+            # Adicionar colunas padrão se não existirem
+            if 'data' not in bloco.columns:
+                bloco['data'] = coluna_constante(data, len(bloco))
+            if 'fonte' not in bloco.columns:
+                bloco['fonte'] = coluna_constante(FONTE_PADRAO, len(bloco))
+            yield bloco[['data', 'fonte', 'comentario']].reset_index(drop=True)
+
+    return blocos()
+
+
+def _blocos_txt(caminho, tamanho_bloco, data):
+    comentarios = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.strip()
+            if linha:
+                comentarios.append(linha)
+                if len(comentarios) >= tamanho_bloco:
+                    yield _bloco(comentarios, data)
+                    comentarios = []
+    if comentarios:
+        yield _bloco(comentarios, data)
+
+
+def iterar_valores_json(arquivo, tamanho_leitura=TAMANHO_LEITURA_JSON):
+    """
+    Gera os valores de um arquivo JSON aberto, lendo-o aos poucos.
+
+    Se o arquivo for um array, gera cada item do array; senão, cada valor de
+    nível superior (um objeto só, ou JSON Lines / valores concatenados). Só o
+    trecho ainda não decodificado fica em memória.
+    """
+    decodificador = json.JSONDecoder()
+    trecho = arquivo.read(tamanho_leitura)
+    fim_arquivo = not trecho
+    posicao = 0
+    em_array = None  # Decidido pelo primeiro caractere significativo
+
+    while True:
+        # Pular espaços (e, dentro do array, as vírgulas entre os itens)
+        while posicao < len(trecho) and (trecho[posicao].isspace() or (em_array and trecho[posicao] == ',')):
+            posicao += 1
+
+        if posicao >= len(trecho) or not fim_arquivo and len(trecho) - posicao < 64:
+            if fim_arquivo:
+                break
+            mais = arquivo.read(tamanho_leitura)
+            fim_arquivo = not mais
+            trecho, posicao = trecho[posicao:] + mais, 0
+            continue
+
+        if em_array is None:
+            em_array = trecho[posicao] == '['
+            if em_array:
+                posicao += 1
+            continue
+        if em_array and trecho[posicao] == ']':
+            break
+
+        try:
+            valor, fim = decodificador.raw_decode(trecho, posicao)
+        except json.JSONDecodeError:
+            if fim_arquivo:
+                raise
+            fim = None
+        if fim is None or (fim == len(trecho) and not fim_arquivo):
+            # Valor incompleto (ou um número que pode continuar): ler mais e tentar de novo
+            mais = arquivo.read(tamanho_leitura)
+            fim_arquivo = not mais
+            trecho, posicao = trecho[posicao:] + mais, 0
+            continue
+
+        yield valor
+        posicao = fim
+
+
+def _comentario_do_item(item):
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return item.get('comentario', item.get('text', str(item)))
+    return str(item)
+
+
+def _primeiro_caractere(arquivo):
+    """Primeiro caractere que não é espaço ('' se não houver); volta ao início do arquivo."""
+    while True:
+        caractere = arquivo.read(1)
+        if not caractere or not caractere.isspace():
+            break
+    arquivo.seek(0)
+    return caractere
+
+
+def _comentarios_json(arquivo, extensao):
+    em_array = _primeiro_caractere(arquivo) == '['
+    valores = iterar_valores_json(arquivo)
+    if extensao == 'json' and not em_array:
+        primeiros = list(itertools.islice(valores, 2))
+        if len(primeiros) == 1:
+            # Um valor só fora de array (ex.: um objeto): o valor inteiro é o comentário, como sempre foi
+            yield str(primeiros[0])
+            return
+        valores = itertools.chain(primeiros, valores)  # Vários valores: JSON Lines com extensão .json
+
+    sem_chave = 0
+    for item in valores:
+        if isinstance(item, dict) and 'comentario' not in item and 'text' not in item:
+            sem_chave += 1
+        yield _comentario_do_item(item)
+    if sem_chave:
+        print(f"[AVISO] {sem_chave} objetos sem a chave 'comentario' ou 'text'; "
+              "o objeto inteiro foi usado como comentário")
+
+
+def _blocos_json(caminho, tamanho_bloco, data, extensao):
+    comentarios = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for comentario in _comentarios_json(f, extensao):
+            comentarios.append(comentario)
+            if len(comentarios) >= tamanho_bloco:
+                yield _bloco(comentarios, data)
+                comentarios = []
+    if comentarios:
+        yield _bloco(comentarios, data)
+
+
+def iterar_blocos_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO_LEITURA_PADRAO):
+    """
+    Gera DataFrames de até `tamanho_bloco` comentários (colunas data, fonte, comentario).
+
+    O formato vem da extensão (.csv, .txt, .json, .jsonl/.ndjson). Em CSV,
+    usa a coluna 'comentario' ou a primeira de `COLUNAS_COMENTARIO` e, se
+    existirem, 'data' e 'fonte'. Formato desconhecido ou CSV sem coluna de
+    comentários (ValueError) e arquivo inexistente (FileNotFoundError) falham
+    já na chamada; erros no meio do arquivo saem durante a iteração.
+    """
+    if not os.path.isfile(caminho):
+        raise FileNotFoundError(f"Arquivo não encontrado: {caminho}")
+    extensao = caminho.rsplit('.', 1)[-1].lower()
+    data = pd.Timestamp.now().strftime('%Y-%m-%d')
+    tamanho_bloco = max(1, tamanho_bloco)
+
+    if extensao == 'csv':
+        return _blocos_csv(caminho, tamanho_bloco, data)
+    if extensao == 'txt':
+        return _blocos_txt(caminho, tamanho_bloco, data)
+    if extensao in ('json', 'jsonl', 'ndjson'):
+        return _blocos_json(caminho, tamanho_bloco, data, extensao)
+    raise ValueError(f"Formato não suportado: .{extensao} (use {', '.join(FORMATOS_SUPORTADOS)})")
+
+
+def juntar_blocos(blocos) -> pd.DataFrame:
+    """Junta os blocos em um DataFrame só (colunas constantes continuam categóricas)."""
+    blocos = list(blocos)
+    if not blocos:
+        return pd.DataFrame(columns=['data', 'fonte', 'comentario'])
+    return pd.concat(blocos, ignore_index=True)
@@ -0,0 +1,50 @@
+"""
+Leitura do arquivo config.ini compartilhada pelos módulos do Feedback Analyzer.
+"""
+
+import configparser
+import os
+
+
+CAMINHOS_CONFIG = [
+    'config.ini',  # Pasta atual
+    '../../config.ini',  # Subindo duas pastas (de src/feedback_analyzer)
+    os.path.join(os.path.dirname(__file__), '../../config.ini')  # Caminho absoluto
+]
+
+
+def carregar_config():
+    """Carrega o config.ini da pasta raiz do projeto."""
+    config = configparser.ConfigParser()
+
+    for config_path in CAMINHOS_CONFIG:
+        if os.path.exists(config_path):
+            config.read(config_path, encoding='utf-8')
+            return config
+
+    raise ValueError("Arquivo config.ini não encontrado")
+
+
+def obter_opcao(secao, chave, padrao=None, tipo=str):
+    """
+    Lê uma opção opcional do config.ini.
+
+    Retorna `padrao` se o arquivo, a seção ou a chave não existirem
+    ou se o valor não puder ser convertido para `tipo`.
+    """
+    try:
+        config = carregar_config()
+    except ValueError:
+        return padrao
+
+    if not config.has_option(secao, chave):
+        return padrao
+
+    valor = config.get(secao, chave).strip()
+    try:
+        if tipo is bool:
+            return valor.lower() in ('1', 'true', 'sim', 's', 'yes', 'on')
+        return tipo(valor)
+    except ValueError:
+        print(f"[AVISO] Valor inválido para {secao}.{chave}: '{valor}'. Usando {padrao}.")
+        return padrao
@@ -12,11 +12,12 @@ from datetime import datetime
 import os
 import sys
 
-# Adicionar o diretório atual ao path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Adicionar a pasta src ao path para importar o pacote
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from web_extractor import extrair_comentarios_de_url
-from gemini_processor import analisar_comentario_individual, configurar_ia
+from feedback_analyzer.web_extractor import extrair_comentarios_de_url
+from feedback_analyzer.gemini_processor import configurar_ia
+from feedback_analyzer.analysis_engine import executar_analise
 
 def main():
     st.set_page_config(
@@ -116,30 +117,41 @@ def main():
         
         # Botão para análise
         if st.button("🤖 Analisar com IA", type="primary"):
-            with st.spinner("🔄 Analisando comentários..."):
-                # Aqui você implementaria a análise
-                st.success("✅ Análise concluída!")
-                
-                # Gráficos de exemplo (você substituiria pelos dados reais)
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Gráfico de sentimentos
-                    fig_sentiment = px.pie(
-                        names=['Positivo', 'Negativo', 'Neutro'],
-                        values=[60, 25, 15],
-                        title="📊 Distribuição de Sentimentos"
-                    )
-                    st.plotly_chart(fig_sentiment, use_container_width=True)
-                
-                with col2:
-                    # Gráfico de categorias
-                    fig_category = px.bar(
-                        x=['Bug', 'Sugestão', 'UI/UX', 'Suporte'],
-                        y=[10, 30, 25, 35],
-                        title="📋 Categorias de Feedback"
-                    )
-                    st.plotly_chart(fig_category, use_container_width=True)
+            barra = st.progress(0.0, text="🔄 Analisando comentários...")
+
+            def atualizar_progresso(concluidos, total):
+                barra.progress(concluidos / total if total else 1.0,
+                               text=f"🔄 Analisando comentários... {concluidos}/{total}")
+
+            resultados = executar_analise(df['comentario'].tolist(), ao_progredir=atualizar_progresso)
+            df_resultados = pd.concat([df.reset_index(drop=True), pd.DataFrame(resultados)], axis=1)
+            validos = df_resultados[df_resultados['sentimento'] != 'Erro']
+
+            st.success(f"✅ Análise concluída! {len(validos)}/{len(df_resultados)} comentários processados.")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Gráfico de sentimentos
+                contagem_sentimentos = validos['sentimento'].value_counts()
+                fig_sentiment = px.pie(
+                    names=contagem_sentimentos.index,
+                    values=contagem_sentimentos.values,
+                    title="📊 Distribuição de Sentimentos"
+                )
+                st.plotly_chart(fig_sentiment, use_container_width=True)
+
+            with col2:
+                # Gráfico de categorias
+                contagem_categorias = validos['categoria'].value_counts()
+                fig_category = px.bar(
+                    x=contagem_categorias.index,
+                    y=contagem_categorias.values,
+                    title="📋 Categorias de Feedback"
+                )
+                st.plotly_chart(fig_category, use_container_width=True)
+
+            st.dataframe(df_resultados, use_container_width=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,129 @@
+"""
+Agrupamento de comentários quase duplicados antes da análise.
+
+Comentários são normalizados (minúsculas, sem acentos, pontuação ou letras
+repetidas) e comparados por MinHash/LSH sobre trigramas de caracteres. Cada
+grupo é representado pelo seu primeiro comentário, que é o único enviado à
+API; o resultado é copiado para os demais membros.
+"""
+
+import re
+import unicodedata
+from collections import deque
+import zlib
+
+import numpy as np
+
+
+LIMIAR_SIMILARIDADE_PADRAO = 0.85
+NUM_PERMUTACOES = 64
+NUM_BANDAS = 8  # 8 bandas de 8 linhas: candidatos a partir de ~77% de similaridade
+TAMANHO_SHINGLE = 3
+MAX_LIDERES_POR_BALDE = 32
+
+_PRIMO = np.uint64(4294967311)  # Primo > 2^32
+_rng = np.random.default_rng(20240115)
+_COEF_A = _rng.integers(1, 2 ** 31, size=NUM_PERMUTACOES, dtype=np.uint64)
+_COEF_B = _rng.integers(0, 2 ** 31, size=NUM_PERMUTACOES, dtype=np.uint64)
+
+_PONTUACAO = re.compile(r'[^\w\s]|_')
+_REPETICOES = re.compile(r'([^\W\d_])\1{2,}')  # Só letras: '1000' e '5000mAh' não encolhem
+_NEGACOES = {'nao', 'nunca', 'jamais', 'nem', 'nenhum', 'nenhuma', 'not', 'never'}
+
+
+def normalizar_comentario(texto: str) -> str:
+    """'Ótimo produto!!' e 'otimo   produtooo' viram 'otimo produto'."""
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = _PONTUACAO.sub(' ', texto)
+    texto = _REPETICOES.sub(r'\1', texto)
+    return " ".join(texto.split())
+
+
+def _shingles(texto: str) -> set:
+    if len(texto) <= TAMANHO_SHINGLE:
+        return {texto}
+    return {texto[i:i + TAMANHO_SHINGLE] for i in range(len(texto) - TAMANHO_SHINGLE + 1)}
+
+
+def _assinatura_minhash(shingles: set) -> np.ndarray:
+    valores = np.fromiter(
+        (zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    hashes = (_COEF_A[:, None] * valores[None, :] + _COEF_B[:, None]) % _PRIMO
+    return hashes.min(axis=1)
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def agrupar_quase_duplicados(comentarios, limiar=LIMIAR_SIMILARIDADE_PADRAO) -> list:
+    """
+    Retorna, para cada comentário, o índice do representante do seu grupo.
+
+    Pares candidatos vindos do LSH só são unidos se a similaridade de Jaccard
+    real dos trigramas for >= `limiar` e ambos tiverem as mesmas negações
+    ("bom" e "não é bom" nunca caem no mesmo grupo).
+    """
+    pai = list(range(len(comentarios)))
+
+    def raiz(i):
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    def unir(i, j):
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj:
+            pai[max(ri, rj)] = min(ri, rj)  # Representante é sempre o menor índice
+
+    # 1) Textos idênticos após a normalização
+    primeiro_por_texto = {}
+    unicos = []
+    for i, comentario in enumerate(comentarios):
+        normalizado = normalizar_comentario(comentario)
+        if normalizado in primeiro_por_texto:
+            unir(primeiro_por_texto[normalizado], i)
+        else:
+            primeiro_por_texto[normalizado] = i
+            unicos.append((i, normalizado))
+
+    # 2) Quase duplicados via MinHash + LSH
+    if limiar < 1.0 and len(unicos) > 1:
+        linhas = NUM_PERMUTACOES // NUM_BANDAS
+        conjuntos = {}
+        negacoes = {}
+        baldes = {}
+
+        for i, normalizado in unicos:
+            conjuntos[i] = _shingles(normalizado)
+            negacoes[i] = _NEGACOES.intersection(normalizado.split())
+            assinatura = _assinatura_minhash(conjuntos[i])
+            for banda in range(NUM_BANDAS):
+                chave = (banda, assinatura[banda * linhas:(banda + 1) * linhas].tobytes())
+                baldes.setdefault(chave, []).append(i)
+
+        # Dentro de cada balde, compara cada comentário só com os líderes mais
+        # recentes dos grupos formados ali, o que evita comparações
+        # quadráticas em baldes grandes
+        for membros in baldes.values():
+            lideres = deque(maxlen=MAX_LIDERES_POR_BALDE)
+            for j in membros:
+                raiz_j = raiz(j)
+                if any(raiz(lider) == raiz_j for lider in lideres):
+                    continue
+                for lider in lideres:
+                    if negacoes[lider] == negacoes[j] and _jaccard(conjuntos[lider], conjuntos[j]) >= limiar:
+                        unir(lider, j)
+                        break
+                else:
+                    lideres.append(j)
+
+    return [raiz(i) for i in range(len(comentarios))]
+
+
+def expandir_resultados(resultados_representantes: dict, grupos: list) -> list:
+    """Copia o resultado de cada representante para todos os membros do grupo."""
+    return [dict(resultados_representantes[representante]) for representante in grupos]
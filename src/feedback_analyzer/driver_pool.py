@@ -0,0 +1,293 @@
+"""
+Pool de navegadores Chrome headless reaproveitados entre extrações.
+
+Abrir um Chrome custa alguns segundos; com centenas de URLs isso domina o
+tempo da extração. O pool mantém sessões abertas e as empresta uma por vez:
+o caminho do chromedriver é resolvido uma única vez por processo, cada
+driver passa por uma verificação de saúde antes de ser emprestado e é
+reciclado (fechado e recriado) depois de um número de páginas abertas, para
+não acumular memória nem estado do site. Se o Chrome não puder ser aberto, o
+Selenium fica indisponível por um tempo e a criação é tentada de novo depois.
+
+No modo rápido, o navegador não baixa imagens, mídia, fontes nem scripts de
+rastreamento (bloqueio via DevTools) e `get` retorna quando o DOM está pronto,
+sem esperar esses recursos; os extratores esperam pelos seletores que usam.
+"""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+from .config import obter_opcao
+
+
+TAMANHO_POOL_PADRAO = 2
+PAGINAS_POR_DRIVER_PADRAO = 50
+ESPERA_APOS_ERRO_PADRAO = 60.0  # Segundos sem tentar abrir o Chrome depois de uma falha
+# Recursos que a extração não usa; o CSS continua, porque o texto visível depende dele
+PADROES_BLOQUEADOS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*', '*criteo.*', '*taboola.com*',
+]
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+_caminho_driver = None
+_caminho_lock = threading.Lock()
+
+
+def obter_caminho_driver() -> str:
+    """
+    Caminho do chromedriver, resolvido uma vez por processo.
+
+    Usa [NAVEGADOR] CAMINHO_DRIVER se configurado; senão, o webdriver_manager
+    (que consulta a versão instalada e baixa o driver na primeira vez).
+    """
+    global _caminho_driver
+
+    with _caminho_lock:
+        if _caminho_driver is None:
+            _caminho_driver = obter_opcao('NAVEGADOR', 'CAMINHO_DRIVER', '')
+            if not _caminho_driver:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _caminho_driver = ChromeDriverManager().install()
+        return _caminho_driver
+
+
+def bloquear_recursos(driver, padroes=PADROES_BLOQUEADOS):
+    """Bloqueia no navegador as URLs que casam com `padroes` (DevTools Network.setBlockedURLs)."""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(padroes)})
+    except Exception as e:
+        print(f"[AVISO] Não foi possível bloquear recursos no navegador: {e}")
+
+
+def criar_driver(modo_rapido=None):
+    """
+    Abre um Chrome headless com as opções usadas na extração.
+
+    `modo_rapido` (por padrão [NAVEGADOR] MODO_RAPIDO) bloqueia imagens,
+    mídia, fontes e rastreadores e não espera o carregamento completo da página.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    if modo_rapido is None:
+        modo_rapido = obter_opcao('NAVEGADOR', 'MODO_RAPIDO', True, bool)
+
+    options = Options()
+    options.add_argument('--headless')  # Executa em modo headless
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    if modo_rapido:
+        options.page_load_strategy = 'eager'  # Retorna no DOMContentLoaded
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+
+    driver = webdriver.Chrome(service=Service(obter_caminho_driver()), options=options)
+    if modo_rapido:
+        bloquear_recursos(driver)
+    return driver
+
+
+def driver_saudavel(driver) -> bool:
+    """Verifica se a sessão do navegador ainda responde."""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def _fechar_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class PoolDrivers:
+    """
+    Empresta drivers Chrome reaproveitados, no máximo `tamanho` abertos ao mesmo tempo.
+
+    `fabrica` cria um driver novo (por padrão `criar_driver`). As páginas
+    são contadas por `registrar_pagina` (chamado por quem abre cada página,
+    já que um empréstimo pode percorrer várias); um driver que falha na
+    verificação de saúde ou que, ao ser devolvido, já abriu
+    `paginas_por_driver` páginas é fechado e substituído no próximo
+    empréstimo. Se a `fabrica` falhar, os empréstimos devolvem None por
+    `espera_apos_erro` segundos e depois a criação é tentada de novo.
+    """
+
+    def __init__(self, tamanho=TAMANHO_POOL_PADRAO, paginas_por_driver=PAGINAS_POR_DRIVER_PADRAO, fabrica=None,
+                 espera_apos_erro=ESPERA_APOS_ERRO_PADRAO):
+        self.tamanho = max(1, tamanho)
+        self.paginas_por_driver = max(1, paginas_por_driver)
+        self.espera_apos_erro = espera_apos_erro
+        self._fabrica = fabrica or criar_driver
+        self._condicao = threading.Condition()
+        self._livres = []  # (driver, páginas já abertas)
+        self._emprestados = {}  # id(driver) -> páginas já abertas
+        self._abertos = 0
+        self._fechado = False
+        self.erro = None  # Motivo de o Selenium estar indisponível, se a criação falhou
+        self._erro_em = 0.0
+        self.criados = 0
+        self.reciclados = 0
+        self.emprestimos = 0
+        self.paginas = 0
+
+    def _pegar(self):
+        """Driver livre (driver, páginas), vaga para um novo (None, 0) ou None se indisponível."""
+        with self._condicao:
+            self.emprestimos += 1
+            while True:
+                if self.erro is not None and time.monotonic() - self._erro_em >= self.espera_apos_erro:
+                    self.erro = None  # Passada a espera, tenta abrir o Chrome de novo
+                if self._fechado or self.erro is not None:
+                    return None
+                if self._livres:
+                    return self._livres.pop()
+                if self._abertos < self.tamanho:
+                    self._abertos += 1
+                    return None, 0
+                self._condicao.wait()
+
+    def _liberar_vaga(self):
+        with self._condicao:
+            self._abertos -= 1
+            self._condicao.notify()
+
+    def _devolver(self, driver, paginas):
+        with self._condicao:
+            if not self._fechado:
+                self._livres.append((driver, paginas))
+                self._condicao.notify()
+                return
+        self._liberar_vaga()
+        _fechar_driver(driver)
+
+    def _reciclar(self, driver):
+        self.reciclados += 1
+        _fechar_driver(driver)
+
+    def registrar_pagina(self, driver):
+        """Conta uma página aberta por `driver`; ignora drivers que não estão emprestados pelo pool."""
+        with self._condicao:
+            if id(driver) in self._emprestados:
+                self._emprestados[id(driver)] += 1
+                self.paginas += 1
+
+    @contextmanager
+    def emprestar(self):
+        """
+        Empresta um driver pronto para uso; devolve None se o Selenium estiver indisponível.
+
+        Uso: `with pool.emprestar() as driver: ...`. O driver volta ao pool
+        ao sair do bloco.
+        """
+        vaga = self._pegar()
+        if vaga is None:
+            yield None
+            return
+
+        driver, paginas = vaga
+        if driver is not None and not driver_saudavel(driver):
+            self._reciclar(driver)
+            driver = None
+
+        if driver is None:
+            try:
+                driver = self._fabrica()
+                self.criados += 1
+                paginas = 0
+            except Exception as e:
+                with self._condicao:
+                    self.erro = e
+                    self._erro_em = time.monotonic()
+                    self._condicao.notify_all()
+                self._liberar_vaga()
+                print(f"⚠️ Selenium não disponível: {e} (nova tentativa em {self.espera_apos_erro:.0f}s)")
+        if driver is None:
+            yield None
+            return
+
+        with self._condicao:
+            self._emprestados[id(driver)] = paginas
+        try:
+            yield driver
+        finally:
+            with self._condicao:
+                paginas = self._emprestados.pop(id(driver))
+            if paginas >= self.paginas_por_driver:
+                self._reciclar(driver)
+                self._liberar_vaga()
+            else:
+                self._devolver(driver, paginas)
+
+    def estatisticas(self) -> dict:
+        with self._condicao:
+            return {
+                'criados': self.criados,
+                'reciclados': self.reciclados,
+                'emprestimos': self.emprestimos,
+                'paginas': self.paginas,
+                'abertos': self._abertos
+            }
+
+    def fechar(self):
+        """Fecha todos os drivers ociosos; os emprestados fecham ao ser devolvidos."""
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._abertos -= len(livres)
+            self._condicao.notify_all()
+        for driver, _ in livres:
+            _fechar_driver(driver)
+
+
+_pool_global = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool_drivers() -> PoolDrivers:
+    """Retorna o pool global configurado em [NAVEGADOR] no config.ini."""
+    global _pool_global
+
+    with _pool_lock:
+        if _pool_global is None:
+            _pool_global = PoolDrivers(
+                tamanho=obter_opcao('NAVEGADOR', 'TAMANHO_POOL', TAMANHO_POOL_PADRAO, int),
+                paginas_por_driver=obter_opcao('NAVEGADOR', 'PAGINAS_POR_DRIVER', PAGINAS_POR_DRIVER_PADRAO, int)
+            )
+            atexit.register(_pool_global.fechar)
+        return _pool_global
+
+
+def registrar_pagina(driver):
+    """Conta uma página aberta por `driver` no pool global, se ele veio de lá."""
+    pool = _pool_global
+    if pool is not None:
+        pool.registrar_pagina(driver)
+
+
+def definir_pool_drivers(pool):
+    """Substitui o pool global (ex.: `PoolDrivers(fabrica=...)` em benchmarks); None fecha e volta ao config.ini."""
+    global _pool_global
+
+    with _pool_lock:
+        if _pool_global is not None and _pool_global is not pool:
+            _pool_global.fechar()
+        _pool_global = pool
@@ -0,0 +1,223 @@
+"""
+Estado persistente da coleta de reviews por URL de listagem.
+
+Para cada listagem (a URL passada à extração) guarda as impressões digitais
+dos reviews já extraídos, a do mais recente e o cursor da paginação: a URL
+da próxima página a ler quando a última coleta parou no limite de páginas.
+
+Uma nova coleta lê as páginas a partir da primeira (os reviews mais novos),
+gera só os reviews ainda não vistos e para na primeira página que já tiver
+reviews conhecidos; se a coleta anterior tinha ficado pela metade, segue
+então do cursor para as páginas mais antigas que faltavam.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .cache import normalizar_texto
+from .config import obter_opcao
+
+
+CAMINHO_ESTADO_PADRAO = os.path.join('cache', 'coletas.db')
+MAX_PAGINAS_PADRAO = 10
+
+_estado_global = None
+_estado_carregado = False
+_estado_lock = threading.Lock()
+
+
+def impressao_review(texto: str) -> str:
+    """Impressão digital de um review: hash do texto normalizado (ver `cache.normalizar_texto`)."""
+    return hashlib.sha1(normalizar_texto(texto).encode('utf-8')).hexdigest()[:20]
+
+
+class EstadoColetas:
+    """Listagens já coletadas: cursor, último review visto e impressões de todos os reviews extraídos."""
+
+    def __init__(self, caminho=CAMINHO_ESTADO_PADRAO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS listagens (
+                url TEXT PRIMARY KEY,
+                ultima_impressao TEXT,
+                cursor TEXT,
+                coletas INTEGER NOT NULL DEFAULT 0,
+                atualizado_em REAL NOT NULL
+            )
+        """)
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS reviews_vistos (
+                url TEXT NOT NULL,
+                impressao TEXT NOT NULL,
+                PRIMARY KEY (url, impressao)
+            ) WITHOUT ROWID
+        """)
+        self._conexao.commit()
+
+    def obter(self, url):
+        """Estado de `url` como dict (ultima_impressao, cursor, coletas, impressoes), ou None."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT ultima_impressao, cursor, coletas FROM listagens WHERE url = ?", (url,)
+            ).fetchone()
+            if linha is None:
+                return None
+            impressoes = {impressao for (impressao,) in self._conexao.execute(
+                "SELECT impressao FROM reviews_vistos WHERE url = ?", (url,)
+            )}
+        return {'ultima_impressao': linha[0], 'cursor': linha[1], 'coletas': linha[2], 'impressoes': impressoes}
+
+    def salvar(self, url, ultima_impressao, cursor, novas_impressoes):
+        """Grava o fim de uma coleta de `url`: novo cursor, review mais recente e impressões novas."""
+        with self._lock:
+            self._conexao.execute(
+                "INSERT INTO listagens (url, ultima_impressao, cursor, coletas, atualizado_em) "
+                "VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(url) DO UPDATE SET "
+                "ultima_impressao = COALESCE(excluded.ultima_impressao, ultima_impressao), "
+                "cursor = excluded.cursor, coletas = coletas + 1, atualizado_em = excluded.atualizado_em",
+                (url, ultima_impressao, cursor, time.time())
+            )
+            self._conexao.executemany(
+                "INSERT OR IGNORE INTO reviews_vistos (url, impressao) VALUES (?, ?)",
+                ((url, impressao) for impressao in novas_impressoes)
+            )
+            self._conexao.commit()
+
+    def esquecer(self, url):
+        """Apaga o estado de `url`; a próxima coleta começa do zero."""
+        with self._lock:
+            self._conexao.execute("DELETE FROM listagens WHERE url = ?", (url,))
+            self._conexao.execute("DELETE FROM reviews_vistos WHERE url = ?", (url,))
+            self._conexao.commit()
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+def obter_estado_coletas():
+    """
+    Retorna o estado das coletas configurado em [EXTRACAO] no config.ini.
+
+    Retorna None se a coleta incremental estiver desativada ou o banco não
+    puder ser aberto.
+    """
+    global _estado_global, _estado_carregado
+
+    with _estado_lock:
+        if _estado_carregado:
+            return _estado_global
+        _estado_carregado = True
+
+        if not obter_opcao('EXTRACAO', 'COLETA_INCREMENTAL', True, bool):
+            return None
+
+        try:
+            _estado_global = EstadoColetas(
+                caminho=obter_opcao('EXTRACAO', 'CAMINHO_ESTADO_COLETA', CAMINHO_ESTADO_PADRAO)
+            )
+        except sqlite3.Error as e:
+            print(f"[AVISO] Estado das coletas indisponível: {e}")
+            return None
+
+        return _estado_global
+
+
+class Coleta:
+    """
+    Uma coleta paginada de uma listagem, do início à gravação do estado.
+
+    `percorrer` lê as páginas por uma função fornecida pelo extrator e gera
+    só os reviews novos; `concluir` grava o estado. Na primeira coleta da
+    listagem ou com `incremental=False`, lê até `max_paginas` páginas sem
+    parar em reviews conhecidos; o estado é gravado do mesmo jeito.
+    """
+
+    def __init__(self, url, estado=None, max_paginas=None, incremental=True):
+        self.url = url
+        self.estado = estado
+        self.max_paginas = max(1, max_paginas if max_paginas is not None
+                               else obter_opcao('EXTRACAO', 'MAX_PAGINAS', MAX_PAGINAS_PADRAO, int))
+        anterior = estado.obter(url) if estado is not None else None
+        self.incremental = incremental and anterior is not None
+        self.anteriores = anterior['impressoes'] if self.incremental else set()
+        self.conhecidas = set(self.anteriores)  # Anteriores + extraídas nesta coleta
+        self.cursor_anterior = anterior['cursor'] if anterior else None
+        self.cursor = self.cursor_anterior
+        self.novas = []  # Impressões geradas nesta coleta, em ordem
+        self.paginas_lidas = 0
+        self.lidos = 0  # Reviews lidos nas páginas, novos ou não
+        self.parou_em_conhecidos = False
+
+    def conhecido(self, texto) -> bool:
+        """Se o review já foi extraído numa coleta anterior (para parar a rolagem de páginas sem paginação)."""
+        return impressao_review(texto) in self.anteriores
+
+    def percorrer(self, primeira_pagina, ler_pagina):
+        """
+        Gera os reviews novos, página a página, a partir de `primeira_pagina`.
+
+        `ler_pagina(url_pagina)` devolve (textos, url_da_proxima_pagina ou
+        None). Fases: das páginas mais novas até a primeira com reviews
+        conhecidos; depois, se a coleta anterior parou no meio, do cursor em
+        diante, pulando os conhecidos. O total de páginas lidas fica em
+        `max_paginas`; se acabar antes do fim da listagem, a próxima página
+        vira o cursor.
+        """
+        pagina = primeira_pagina
+        retomando = False
+        self.paginas_lidas = 0  # Cada método de extração tentado começa do zero
+        self.cursor = self.cursor_anterior
+        while pagina:
+            if self.paginas_lidas >= self.max_paginas:
+                self.cursor = pagina
+                return
+
+            try:
+                textos, proxima = ler_pagina(pagina)
+            except Exception:
+                self.cursor = pagina  # A próxima coleta tenta esta página de novo
+                raise
+            self.paginas_lidas += 1
+            self.lidos += len(textos)
+            encontrou_conhecido = False
+            for texto in textos:
+                impressao = impressao_review(texto)
+                if impressao in self.conhecidas:
+                    encontrou_conhecido = encontrou_conhecido or impressao in self.anteriores
+                    continue
+                self.conhecidas.add(impressao)
+                self.novas.append(impressao)
+                yield texto
+
+            if self.incremental and encontrou_conhecido and not retomando:
+                # O resto da listagem já foi visto, exceto o que a coleta anterior não alcançou
+                self.parou_em_conhecidos = True
+                if not self.cursor_anterior or self.cursor_anterior == pagina:
+                    self.cursor = None
+                    return
+                print(f"↪️  Retomando a coleta anterior a partir de: {self.cursor_anterior}")
+                proxima, retomando = self.cursor_anterior, True
+            pagina = proxima
+
+        # Fim da listagem: nada ficou para trás
+        self.cursor = None
+
+    def concluir(self):
+        """Grava o estado da listagem, se houver onde gravar."""
+        if self.estado is None:
+            return
+        self.estado.salvar(self.url, self.novas[0] if self.novas else None, self.cursor, self.novas)
@@ -1,35 +1,308 @@
 import google.generativeai as genai
+import asyncio
+import contextlib
 import json
-import configparser
+import re
+import threading
 import time
-import os
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from .backends import criar_backend, PARAMETROS_SIMULACAO
+from .cache import obter_cache
+from .config import carregar_config, obter_opcao
+from .rate_limiter import (
+    obter_limitador, obter_orcamento_retentativas, obter_controle_prazos, calcular_backoff, eh_erro_de_cota,
+    eh_erro_transitorio, MAX_TENTATIVAS_PADRAO
+)
+
+
+MODELO_PADRAO = 'gemini-1.5-flash'
+VERSAO_PROMPT = 1  # Incrementar ao mudar os prompts de análise (invalida o cache)
+CAMPOS_OBRIGATORIOS = ('sentimento', 'categoria', 'resumo_curto')
+SENTIMENTOS = ('Positivo', 'Negativo', 'Neutro')
+CATEGORIAS = ('Bug', 'Sugestão', 'UI/UX', 'Suporte')
+
+# Parâmetros da análise em lote
+TAMANHO_LOTE_PADRAO = 20
+MAX_TOKENS_LOTE_PADRAO = 6000  # Orçamento estimado de tokens de entrada por requisição
+TOKENS_PROMPT_LOTE = 150  # Instruções fixas do prompt em lote
+
+# Saída estruturada: JSON restrito a estes esquemas (enums validados pela API)
+ESQUEMA_ANALISE = {
+    "type": "object",
+    "properties": {
+        "sentimento": {"type": "string", "format": "enum", "enum": list(SENTIMENTOS)},
+        "categoria": {"type": "string", "format": "enum", "enum": list(CATEGORIAS)},
+        "resumo_curto": {"type": "string"}
+    },
+    "required": list(CAMPOS_OBRIGATORIOS)
+}
+ESQUEMA_LOTE = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"indice": {"type": "integer"}, **ESQUEMA_ANALISE["properties"]},
+        "required": ["indice", *CAMPOS_OBRIGATORIOS]
+    }
+}
+
+# Reparo local de rótulos fora do padrão (chaves sem acento e em minúsculas)
+SINONIMOS_SENTIMENTO = {
+    'positivo': 'Positivo', 'positive': 'Positivo', 'pos': 'Positivo',
+    'negativo': 'Negativo', 'negative': 'Negativo', 'neg': 'Negativo',
+    'neutro': 'Neutro', 'neutral': 'Neutro', 'misto': 'Neutro', 'mixed': 'Neutro'
+}
+SINONIMOS_CATEGORIA = {
+    'bug': 'Bug', 'erro': 'Bug', 'error': 'Bug', 'defeito': 'Bug', 'falha': 'Bug', 'problema': 'Bug',
+    'sugestao': 'Sugestão', 'suggestion': 'Sugestão', 'melhoria': 'Sugestão', 'improvement': 'Sugestão',
+    'feature request': 'Sugestão', 'ideia': 'Sugestão', 'idea': 'Sugestão',
+    'ui/ux': 'UI/UX', 'ui ux': 'UI/UX', 'ui': 'UI/UX', 'ux': 'UI/UX', 'interface': 'UI/UX', 'design': 'UI/UX',
+    'usabilidade': 'UI/UX', 'usability': 'UI/UX',
+    'suporte': 'Suporte', 'support': 'Suporte', 'atendimento': 'Suporte', 'customer service': 'Suporte',
+    'customer support': 'Suporte'
+}
+SINONIMOS_CAMPOS = {
+    'sentiment': 'sentimento', 'category': 'categoria', 'summary': 'resumo_curto',
+    'short_summary': 'resumo_curto', 'resumo': 'resumo_curto', 'index': 'indice'
+}
+
+# Roteamento por tamanho: (faixa, limite de tokens do comentário, tokens de saída por item).
+# O modelo e os limites de cada faixa vêm de [MODELOS] no config.ini.
+FAIXAS_PADRAO = (
+    ('curto', 60, 80),
+    ('medio', 400, 100),
+    ('longo', None, 150),
+)
+TOKENS_SEGMENTO_PADRAO = 1000  # Comentários maiores são divididos em trechos
+
+_backend = None
+_backends = {}
+_faixas = None
+_tokens_segmento = None
+_metricas_faixas = {}
+_saida_estruturada = None
+_metricas_respostas = {"respostas": 0, "respostas_invalidas": 0, "itens_reparados": 0, "itens_rejeitados": 0}
+_lock_metricas = threading.Lock()
+
+
+def resultado_erro() -> dict:
+    return {
+        "sentimento": "Erro",
+        "categoria": "Erro",
+        "resumo_curto": "Erro no processamento."
+    }
+
+
+def definir_backend(backend):
+    """Substitui o backend de geração de todas as faixas (ex.: BackendSimulado em testes de carga)."""
+    global _backend
+    _backend = backend
+    _backends.clear()
+
+
+def obter_backend(modelo=None):
+    """
+    Retorna o backend do `modelo` (por padrão MODELO_PADRAO), do tipo
+    configurado em [BACKEND] no config.ini. Um backend definido com
+    `definir_backend` atende todos os modelos.
+    """
+    if _backend is not None:
+        return _backend
+
+    modelo = modelo or MODELO_PADRAO
+    if modelo not in _backends:
+        parametros = {}
+        for nome in PARAMETROS_SIMULACAO:
+            valor = obter_opcao('BACKEND', nome.upper(), None, float)
+            if valor is not None:
+                parametros[nome] = valor
+
+        _backends[modelo] = criar_backend(
+            obter_opcao('BACKEND', 'TIPO', 'gemini'),
+            modelo,
+            url=obter_opcao('BACKEND', 'URL'),
+            **parametros
+        )
+    return _backends[modelo]
+
+
+def obter_faixas() -> list:
+    """Faixas de roteamento por tamanho, com modelo e limites de [MODELOS] no config.ini."""
+    global _faixas
+    if _faixas is None:
+        _faixas = [
+            {
+                "nome": nome,
+                "modelo": obter_opcao('MODELOS', nome.upper(), MODELO_PADRAO),
+                "limite": obter_opcao('MODELOS', f'LIMITE_{nome.upper()}', limite, int) if limite else None,
+                "tokens_saida": tokens_saida
+            }
+            for nome, limite, tokens_saida in FAIXAS_PADRAO
+        ]
+    return _faixas
+
+
+def rotear(comentario: str) -> dict:
+    """Faixa (modelo e tokens de saída) para o tamanho estimado do comentário."""
+    tokens = estimar_tokens(comentario)
+    faixas = obter_faixas()
+    return next((f for f in faixas if f["limite"] is None or tokens <= f["limite"]), faixas[-1])
+
+
+def tokens_segmento() -> int:
+    """Limite de [MODELOS] TOKENS_SEGMENTO, lido do config.ini uma vez só (é consultado por comentário)."""
+    global _tokens_segmento
+    if _tokens_segmento is None:
+        _tokens_segmento = obter_opcao('MODELOS', 'TOKENS_SEGMENTO', TOKENS_SEGMENTO_PADRAO, int)
+    return _tokens_segmento
+
+
+def precisa_segmentar(comentario: str) -> bool:
+    return estimar_tokens(comentario) > tokens_segmento()
+
+
+def segmentar_comentario(comentario: str, max_tokens=None) -> list:
+    """
+    Divide um comentário longo em trechos de até `max_tokens` tokens estimados,
+    quebrando em parágrafos e frases (e, se preciso, entre palavras).
+    """
+    max_caracteres = (max_tokens or tokens_segmento()) * 4
+    frases = []
+    for paragrafo in re.split(r'\n\s*\n', comentario):
+        for frase in re.split(r'(?<=[.!?])\s+', paragrafo.strip()):
+            while len(frase) > max_caracteres:
+                corte = frase.rfind(' ', 0, max_caracteres)
+                corte = corte if corte > 0 else max_caracteres
+                frases.append(frase[:corte])
+                frase = frase[corte:].strip()
+            if frase:
+                frases.append(frase)
+
+    trechos = []
+    atual = ""
+    for frase in frases:
+        if atual and len(atual) + 1 + len(frase) > max_caracteres:
+            trechos.append(atual)
+            atual = frase
+        else:
+            atual = f"{atual} {frase}" if atual else frase
+    if atual:
+        trechos.append(atual)
+    return trechos
+
+
+def combinar_segmentos(trechos: list, resultados: list) -> dict:
+    """
+    Junta as análises dos trechos de um comentário de forma determinística.
+
+    Sentimento e categoria são os de maior peso (tamanho dos trechos), com
+    empate resolvido pela ordem de SENTIMENTOS/CATEGORIAS; o resumo é o do
+    maior trecho com a categoria e o sentimento escolhidos.
+    """
+    validos = [(len(t), r) for t, r in zip(trechos, resultados) if r and r.get('sentimento') != 'Erro']
+    if not validos:
+        return resultado_erro()
+
+    def mais_pesado(campo, ordem):
+        pesos = {}
+        for peso, resultado in validos:
+            pesos[resultado[campo]] = pesos.get(resultado[campo], 0) + peso
+        return max(pesos, key=lambda rotulo: (pesos[rotulo], -ordem.index(rotulo)))
+
+    sentimento = mais_pesado('sentimento', SENTIMENTOS)
+    categoria = mais_pesado('categoria', CATEGORIAS)
+    candidatos = [(peso, r) for peso, r in validos if r['categoria'] == categoria and r['sentimento'] == sentimento]
+    candidatos = candidatos or [(peso, r) for peso, r in validos if r['categoria'] == categoria]
+    # max mantém o primeiro trecho entre os de mesmo tamanho
+    _, principal = max(candidatos, key=lambda item: item[0])
+    return {"sentimento": sentimento, "categoria": categoria, "resumo_curto": principal['resumo_curto']}
+
+
+def _registrar_faixa(faixa, comentarios, latencia, segmentados=0):
+    with _lock_metricas:
+        metricas = _metricas_faixas.get(faixa["nome"])
+        if metricas is None:
+            metricas = _metricas_faixas[faixa["nome"]] = {
+                # O modelo que o backend realmente usa (ex.: o simulado), não só o configurado
+                "modelo": obter_backend(faixa["modelo"]).modelo,
+                "requisicoes": 0, "comentarios": 0, "segmentados": 0, "latencias": []
+            }
+        metricas["requisicoes"] += 1
+        metricas["comentarios"] += comentarios
+        metricas["segmentados"] += segmentados
+        metricas["latencias"].append(latencia)
+
+
+def estatisticas_faixas() -> dict:
+    """
+    Por faixa: modelo, requisições, textos analisados (comentários ou
+    trechos), quantos deles eram trechos de comentários segmentados,
+    latência p50/p95 das requisições que responderam e textos por segundo
+    de requisição.
+    """
+    with _lock_metricas:
+        copia = {nome: dict(m, latencias=sorted(m["latencias"])) for nome, m in _metricas_faixas.items()}
+
+    estatisticas = {}
+    for faixa in obter_faixas():
+        metricas = copia.get(faixa["nome"])
+        if not metricas:
+            continue
+        latencias = metricas.pop("latencias")
+        ultimo = len(latencias) - 1
+        estatisticas[faixa["nome"]] = {
+            **metricas,
+            "latencia_p50": latencias[int(round(0.5 * ultimo))],
+            "latencia_p95": latencias[int(round(0.95 * ultimo))],
+            "comentarios_por_segundo": metricas["comentarios"] / sum(latencias) if sum(latencias) > 0 else 0.0
+        }
+    return estatisticas
+
+
+def definir_saida_estruturada(ativa: bool):
+    """Liga ou desliga a saída estruturada (por padrão, [PROCESSAMENTO] SAIDA_ESTRUTURADA, desligada se ausente)."""
+    global _saida_estruturada
+    _saida_estruturada = ativa
+
+
+def usar_saida_estruturada() -> bool:
+    global _saida_estruturada
+    if _saida_estruturada is None:
+        _saida_estruturada = obter_opcao('PROCESSAMENTO', 'SAIDA_ESTRUTURADA', False, bool)
+    return _saida_estruturada
+
+
+def _contar_respostas(**quantidades):
+    with _lock_metricas:
+        for chave, quantidade in quantidades.items():
+            _metricas_respostas[chave] += quantidade
+
+
+def estatisticas_respostas() -> dict:
+    """
+    Contadores acumulados da interpretação das respostas de análise.
+
+    `respostas_invalidas` (JSON ilegível) e `itens_rejeitados` (rótulos sem
+    conserto) custam um reenvio; `itens_reparados` são os reenvios evitados
+    pelo reparo local.
+    """
+    with _lock_metricas:
+        return dict(_metricas_respostas)
 
 
 def configurar_ia():
     try:
-        config = configparser.ConfigParser()
-        
-        # Tentar carregar config.ini da pasta raiz do projeto
-        config_paths = [
-            'config.ini',  # Pasta atual
-            '../../config.ini',  # Subindo duas pastas (de src/feedback_analyzer)
-            os.path.join(os.path.dirname(__file__), '../../config.ini')  # Caminho absoluto
-        ]
-        
-        config_loaded = False
-        for config_path in config_paths:
-            if os.path.exists(config_path):
-                config.read(config_path)
-                config_loaded = True
-                break
-        
-        if not config_loaded:
-            raise ValueError("Arquivo config.ini não encontrado")
-        
+        if obter_opcao('BACKEND', 'TIPO', 'gemini').lower() != 'gemini':
+            print(f"[INFO] Usando backend '{obter_backend().nome}' (sem chamadas ao Gemini).")
+            return True
+
+        config = carregar_config()
+
         api_key = config.get('GEMINI', 'API_KEY')
         if not api_key or api_key == 'tu_api_key_aqui':
             raise ValueError("A API key não está configurada no config.ini")
-        
+
         genai.configure(api_key=api_key)
         print("[INFO] Configuração da IA concluída com sucesso.")
         return True
@@ -37,10 +310,129 @@ def configurar_ia():
         print(f"[ERRO] Falha ao configurar a IA: {e}")
         return False
 
-def analisar_comentario_individual(comentario: str) -> dict:
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
-    prompt = f"""
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa grosseira de tokens (~4 caracteres por token)."""
+    return max(1, len(texto) // 4)
+
+
+def _limpar_resposta(texto: str, abre: str, fecha: str) -> str:
+    """Remove cercas de código e texto ao redor do JSON."""
+    texto = texto.strip()
+    if "```" in texto:
+        texto = texto.split("```")[1] if "```json" in texto else texto.split("```")[0]
+
+    inicio = texto.find(abre)
+    fim = texto.rfind(fecha) + 1
+    if inicio != -1 and fim != 0:
+        texto = texto[inicio:fim]
+    return texto
+
+
+def _chave_rotulo(valor: str) -> str:
+    sem_acentos = unicodedata.normalize('NFKD', valor).encode('ascii', 'ignore').decode('ascii')
+    sem_acentos = re.sub(r'\s*/\s*', '/', sem_acentos.replace('_', ' ').replace('-', ' '))
+    return " ".join(sem_acentos.lower().split())
+
+
+def normalizar_resultado(item):
+    """
+    Ajusta um item da resposta ao formato esperado antes de desistir dele.
+
+    Corrige nomes de campos em inglês e rótulos com outra grafia (acentos,
+    maiúsculas, sinônimos em inglês). Retorna (resultado, reparado), ou
+    (None, False) se o item não tiver conserto.
+    """
+    if not isinstance(item, dict):
+        return None, False
+
+    reparado = False
+    campos = {}
+    for chave, valor in item.items():
+        nome = SINONIMOS_CAMPOS.get(str(chave).lower(), str(chave).lower())
+        reparado = reparado or nome != chave
+        campos.setdefault(nome, valor)
+
+    resultado = {}
+    for campo, validos, sinonimos in (('sentimento', SENTIMENTOS, SINONIMOS_SENTIMENTO),
+                                      ('categoria', CATEGORIAS, SINONIMOS_CATEGORIA)):
+        valor = campos.get(campo)
+        if valor in validos:
+            resultado[campo] = valor
+            continue
+        corrigido = sinonimos.get(_chave_rotulo(valor)) if isinstance(valor, str) else None
+        if corrigido is None:
+            return None, False
+        resultado[campo] = corrigido
+        reparado = True
+
+    resumo = campos.get('resumo_curto')
+    if not isinstance(resumo, str) or not resumo.strip():
+        return None, False
+    resultado['resumo_curto'] = resumo
+    if 'indice' in campos:
+        resultado['indice'] = campos['indice']
+    return resultado, reparado
+
+
+def _carregar_json(texto: str, abre: str, fecha: str):
+    """JSON da resposta; só procura cercas e delimitadores se o texto não for JSON puro."""
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return json.loads(_limpar_resposta(texto, abre, fecha))
+
+
+def _resultado_valido(resultado) -> bool:
+    return (
+        isinstance(resultado, dict)
+        and all(isinstance(resultado.get(key), str) and resultado.get(key) for key in CAMPOS_OBRIGATORIOS)
+    )
+
+
+def _modelo_do_comentario(comentario: str) -> str:
+    return obter_backend(rotear(comentario)["modelo"]).modelo
+
+
+def consultar_cache(comentarios: list) -> list:
+    """Busca resultados já analisados (pelo modelo da faixa de cada um); None nas posições sem cache."""
+    cache = obter_cache()
+    if cache is None:
+        return [None] * len(comentarios)
+
+    por_modelo = {}
+    for i, comentario in enumerate(comentarios):
+        por_modelo.setdefault(_modelo_do_comentario(comentario), []).append(i)
+
+    resultados = [None] * len(comentarios)
+    for modelo, indices in por_modelo.items():
+        encontrados = cache.obter_varios([comentarios[i] for i in indices], modelo, VERSAO_PROMPT)
+        for i, resultado in zip(indices, encontrados):
+            resultados[i] = resultado
+    return resultados
+
+
+def registrar_no_cache(comentarios: list, resultados: list):
+    """Armazena no cache os resultados válidos (erros nunca são armazenados)."""
+    cache = obter_cache()
+    if cache is None:
+        return
+
+    por_modelo = {}
+    for c, r in zip(comentarios, resultados):
+        if _resultado_valido(r) and r['sentimento'] != 'Erro':
+            por_modelo.setdefault(_modelo_do_comentario(c), []).append((c, r))
+    for modelo, pares in por_modelo.items():
+        cache.salvar_varios([c for c, _ in pares], [r for _, r in pares], modelo, VERSAO_PROMPT)
+
+
+def estatisticas_cache():
+    cache = obter_cache()
+    return cache.estatisticas() if cache is not None else None
+
+
+def _montar_prompt_individual(comentario: str) -> str:
+    return f"""
     Analise este comentário de cliente e responda APENAS com JSON válido:
 
     {{
@@ -52,60 +444,357 @@ def analisar_comentario_individual(comentario: str) -> dict:
     Comentário: "{comentario}"
     """
 
+
+def _interpretar_resposta_individual(texto: str) -> dict:
+    try:
+        dados = _carregar_json(texto, '{', '}')
+    except ValueError:
+        _contar_respostas(respostas=1, respostas_invalidas=1)
+        raise
+
+    # Validar campos obrigatórios e rótulos, reparando o que for possível
+    resultado, reparado = normalizar_resultado(dados)
+    _contar_respostas(respostas=1, itens_reparados=int(reparado), itens_rejeitados=int(resultado is None))
+    if resultado is None:
+        raise ValueError("Campos obrigatórios ausentes ou rótulos inválidos")
+    return resultado
+
+
+def _gerar_texto(prompt: str, max_output_tokens=None, esquema=None, modelo=None, ao_responder=None) -> str:
+    """
+    Faz a chamada à API respeitando o limitador global.
+
+    Com `esquema`, pede a resposta como JSON restrito a ele; `modelo`
+    escolhe o backend da faixa e `ao_responder(latencia)` recebe a latência
+    de cada resposta, como em `_gerar_texto_async`.
+
+    Cada tentativa tem o prazo de [PRAZOS] TIMEOUT_REQUISICAO, aplicado pelo
+    próprio backend; sem cancelamento barato de uma chamada bloqueante, aqui
+    não há requisições de reserva (hedging).
+
+    Erros transitórios (cota, 5xx, timeouts) são repetidos com backoff
+    exponencial e jitter enquanto houver orçamento global de retentativas.
+    """
+    limitador = obter_limitador()
+    orcamento = obter_orcamento_retentativas()
+    prazos = obter_controle_prazos()
+    backend = obter_backend(modelo)
+
+    for tentativa in range(MAX_TENTATIVAS_PADRAO):
+        limitador.adquirir()
+        orcamento.registrar_requisicao()
+        try:
+            inicio = time.monotonic()
+            texto = backend.gerar(prompt, max_output_tokens, esquema, timeout=prazos.timeout)
+            if ao_responder:
+                ao_responder(time.monotonic() - inicio)
+            limitador.recompensar()
+            return texto
+        except Exception as e:
+            if isinstance(e, TimeoutError) or type(e).__name__ == 'DeadlineExceeded':
+                prazos.registrar_timeout()
+            if eh_erro_de_cota(e):
+                limitador.penalizar(calcular_backoff(tentativa))
+            if (not eh_erro_transitorio(e) or tentativa == MAX_TENTATIVAS_PADRAO - 1
+                    or not orcamento.consumir()):
+                raise
+            time.sleep(calcular_backoff(tentativa))
+
+
+async def _gerar_texto_async(prompt: str, max_output_tokens=None, controle=None, esquema=None,
+                             modelo=None, ao_responder=None) -> str:
+    """
+    Versão assíncrona de `_gerar_texto`.
+
+    Se `controle` (ControleConcorrenciaAIMD) for informado, cada tentativa
+    ocupa uma vaga dele e alimenta o ajuste de concorrência com a latência
+    observada e os erros.
+
+    Cada tentativa tem o prazo de [PRAZOS] TIMEOUT_REQUISICAO e, se demorar
+    mais que o p95 recente, pode ganhar uma cópia de reserva (ControlePrazos).
+    """
+    limitador = obter_limitador()
+    orcamento = obter_orcamento_retentativas()
+    prazos = obter_controle_prazos()
+    backend = obter_backend(modelo)
+
+    for tentativa in range(MAX_TENTATIVAS_PADRAO):
+        await limitador.adquirir_async()
+        orcamento.registrar_requisicao()
+        try:
+            async with (controle or contextlib.AsyncExitStack()):
+                inicio = time.monotonic()
+                try:
+                    texto = await prazos.executar(
+                        lambda: backend.gerar_async(prompt, max_output_tokens, esquema),
+                        (backend.modelo, max_output_tokens), limitador
+                    )
+                except Exception as e:
+                    if controle is not None:
+                        controle.registrar_falha(cota=eh_erro_de_cota(e))
+                    raise
+                if controle is not None:
+                    controle.registrar_sucesso(time.monotonic() - inicio)
+                if ao_responder:
+                    ao_responder(time.monotonic() - inicio)
+            limitador.recompensar()
+            return texto
+        except Exception as e:
+            if eh_erro_de_cota(e):
+                limitador.penalizar(calcular_backoff(tentativa))
+            if (not eh_erro_transitorio(e) or tentativa == MAX_TENTATIVAS_PADRAO - 1
+                    or not orcamento.consumir()):
+                raise
+            await asyncio.sleep(calcular_backoff(tentativa))
+
+
+def _esquema(esquema):
+    return esquema if usar_saida_estruturada() else None
+
+
+def _analisar_trecho(comentario: str, faixa: dict, segmento: bool = False) -> dict:
+    prompt = _montar_prompt_individual(comentario)
+
+    # Falhas da API já foram repetidas em _gerar_texto; aqui só se repete
+    # quando a resposta veio malformada
     for tentativa in range(3):
         try:
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.1,
-                    max_output_tokens=100
-                )
+            texto = _gerar_texto(
+                prompt, faixa["tokens_saida"], _esquema(ESQUEMA_ANALISE), faixa["modelo"],
+                lambda latencia: _registrar_faixa(faixa, 1, latencia, int(segmento))
             )
-            texto = response.text.strip()
-            
-            # Limpar resposta mais agressivamente
-            if "```" in texto:
-                texto = texto.split("```")[1] if "```json" in texto else texto.split("```")[0]
-            
-            # Remover texto antes e depois do JSON
-            inicio = texto.find('{')
-            fim = texto.rfind('}') + 1
-            if inicio != -1 and fim != 0:
-                texto = texto[inicio:fim]
-            
-            resultado = json.loads(texto)
-            
-            # Validar campos obrigatórios
-            if all(key in resultado for key in ['sentimento', 'categoria', 'resumo_curto']):
-                return resultado
-            else:
-                raise ValueError("Campos obrigatórios ausentes")
-            
+            return _interpretar_resposta_individual(texto)
+
+        except ValueError as e:
+            if tentativa < 2:
+                continue
+            print(f"[ERRO] Falha ao processar: '{comentario[:30]}...' - {e}")
+            return resultado_erro()
         except Exception as e:
+            print(f"[ERRO] Falha ao processar: '{comentario[:30]}...' - {e}")
+            return resultado_erro()
+
+
+async def _analisar_trecho_async(comentario: str, faixa: dict, controle=None, segmento: bool = False) -> dict:
+    prompt = _montar_prompt_individual(comentario)
+
+    for tentativa in range(3):
+        try:
+            texto = await _gerar_texto_async(
+                prompt, faixa["tokens_saida"], controle, _esquema(ESQUEMA_ANALISE), faixa["modelo"],
+                lambda latencia: _registrar_faixa(faixa, 1, latencia, int(segmento))
+            )
+            return _interpretar_resposta_individual(texto)
+
+        except ValueError as e:
             if tentativa < 2:
-                time.sleep(0.5)
                 continue
-            else:
-                print(f"[ERRO] Falha ao processar: '{comentario[:30]}...' - {e}")
-                return {
-                    "sentimento": "Erro",
-                    "categoria": "Erro",
-                    "resumo_curto": "Erro no processamento."
-                }
+            print(f"[ERRO] Falha ao processar: '{comentario[:30]}...' - {e}")
+            return resultado_erro()
+        except Exception as e:
+            print(f"[ERRO] Falha ao processar: '{comentario[:30]}...' - {e}")
+            return resultado_erro()
+
+
+def analisar_comentario_individual(comentario: str, usar_cache: bool = True) -> dict:
+    """
+    Analisa um comentário no modelo da sua faixa de tamanho. Comentários
+    longos demais são divididos em trechos analisados em paralelo.
+    """
+    if usar_cache:
+        em_cache = consultar_cache([comentario])[0]
+        if em_cache is not None:
+            return em_cache
+
+    if precisa_segmentar(comentario):
+        trechos = segmentar_comentario(comentario)
+        with ThreadPoolExecutor(max_workers=min(8, len(trechos))) as executor:
+            resultados = list(executor.map(lambda trecho: _analisar_trecho(trecho, rotear(trecho), True), trechos))
+        resultado = combinar_segmentos(trechos, resultados)
+    else:
+        resultado = _analisar_trecho(comentario, rotear(comentario))
+
+    if usar_cache:
+        registrar_no_cache([comentario], [resultado])
+    return resultado
+
+
+async def analisar_comentario_individual_async(comentario: str, usar_cache: bool = True, controle=None) -> dict:
+    """Versão assíncrona de `analisar_comentario_individual`."""
+    if usar_cache:
+        em_cache = consultar_cache([comentario])[0]
+        if em_cache is not None:
+            return em_cache
+
+    if precisa_segmentar(comentario):
+        trechos = segmentar_comentario(comentario)
+        resultados = await asyncio.gather(
+            *(_analisar_trecho_async(trecho, rotear(trecho), controle, True) for trecho in trechos)
+        )
+        resultado = combinar_segmentos(trechos, resultados)
+    else:
+        resultado = await _analisar_trecho_async(comentario, rotear(comentario), controle)
+
+    if usar_cache:
+        registrar_no_cache([comentario], [resultado])
+    return resultado
 
-def gerar_resumo_executivo(estatisticas: str) -> str:
-    model = genai.GenerativeModel('gemini-1.5-flash')
 
-    prompt = f"""
+def _montar_prompt_lote(comentarios: list) -> str:
+    linhas = "\n    ".join(
+        f"[{i}] {json.dumps(comentario, ensure_ascii=False)}"
+        for i, comentario in enumerate(comentarios)
+    )
+
+    return f"""
+    Analise cada comentário de cliente abaixo e responda APENAS com um array JSON válido,
+    contendo exatamente um objeto por comentário, identificado pelo seu índice:
+
+    [
+      {{
+        "indice": 0,
+        "sentimento": "Positivo" ou "Negativo" ou "Neutro",
+        "categoria": "Bug" ou "Sugestão" ou "UI/UX" ou "Suporte",
+        "resumo_curto": "resumo em uma frase"
+      }}
+    ]
+
+    Comentários:
+    {linhas}
+    """
+
+
+def _interpretar_resposta_lote(texto: str, quantidade: int) -> list:
+    """
+    Converte a resposta do modelo em uma lista alinhada aos comentários do lote.
+
+    Itens ausentes, duplicados ou malformados (e sem reparo) ficam como None.
+    """
+    resultados = [None] * quantidade
+
+    try:
+        dados = _carregar_json(texto, '[', ']')
+    except ValueError:
+        _contar_respostas(respostas=1, respostas_invalidas=1)
+        return resultados
+
+    if isinstance(dados, dict):
+        dados = next((v for v in dados.values() if isinstance(v, list)), [])
+    if not isinstance(dados, list):
+        _contar_respostas(respostas=1, respostas_invalidas=1)
+        return resultados
+
+    reparados = rejeitados = 0
+    for item in dados:
+        resultado, reparado = normalizar_resultado(item)
+        if resultado is None:
+            rejeitados += 1
+            continue
+        try:
+            indice = int(resultado.get('indice'))
+        except (TypeError, ValueError):
+            rejeitados += 1
+            continue
+        if 0 <= indice < quantidade and resultados[indice] is None:
+            resultados[indice] = {key: resultado[key] for key in CAMPOS_OBRIGATORIOS}
+            reparados += int(reparado)
+
+    _contar_respostas(respostas=1, itens_reparados=reparados, itens_rejeitados=rejeitados)
+    return resultados
+
+
+def analisar_lote(comentarios: list, faixa=None) -> list:
+    """
+    Analisa vários comentários em uma única requisição.
+
+    `faixa` (de `rotear`) define o modelo e os tokens de saída por item; sem
+    ela, usa a faixa do maior comentário do lote.
+
+    Retorna uma lista do mesmo tamanho de `comentarios`; posições com None
+    indicam itens ausentes ou inválidos na resposta, que devem ser reenviados.
+    """
+    if not comentarios:
+        return []
+
+    faixa = faixa or rotear(max(comentarios, key=len))
+    try:
+        texto = _gerar_texto(
+            _montar_prompt_lote(comentarios), faixa["tokens_saida"] * len(comentarios) + 50,
+            _esquema(ESQUEMA_LOTE), faixa["modelo"],
+            lambda latencia: _registrar_faixa(faixa, len(comentarios), latencia)
+        )
+        return _interpretar_resposta_lote(texto, len(comentarios))
+    except Exception as e:
+        print(f"[ERRO] Falha ao processar lote de {len(comentarios)} comentários - {e}")
+        return [None] * len(comentarios)
+
+
+async def analisar_lote_async(comentarios: list, controle=None, faixa=None) -> list:
+    """Versão assíncrona de `analisar_lote`."""
+    if not comentarios:
+        return []
+
+    faixa = faixa or rotear(max(comentarios, key=len))
+    try:
+        texto = await _gerar_texto_async(
+            _montar_prompt_lote(comentarios), faixa["tokens_saida"] * len(comentarios) + 50, controle,
+            _esquema(ESQUEMA_LOTE), faixa["modelo"],
+            lambda latencia: _registrar_faixa(faixa, len(comentarios), latencia)
+        )
+        return _interpretar_resposta_lote(texto, len(comentarios))
+    except Exception as e:
+        print(f"[ERRO] Falha ao processar lote de {len(comentarios)} comentários - {e}")
+        return [None] * len(comentarios)
+
+
+def dividir_em_lotes(comentarios: list, tamanho_lote=TAMANHO_LOTE_PADRAO,
+                     max_tokens_lote=MAX_TOKENS_LOTE_PADRAO) -> list:
+    """
+    Agrupa as posições de `comentarios` em lotes de até `tamanho_lote` itens,
+    respeitando o orçamento estimado de tokens de entrada por requisição.
+
+    Um comentário que sozinho excede o orçamento vai em um lote próprio.
+    """
+    tamanho_lote = max(1, tamanho_lote)
+    lotes = []
+    atual = []
+    tokens_atual = TOKENS_PROMPT_LOTE
+
+    for i, comentario in enumerate(comentarios):
+        tokens = estimar_tokens(comentario) + 5  # Índice e aspas
+        if atual and (len(atual) >= tamanho_lote or tokens_atual + tokens > max_tokens_lote):
+            lotes.append(atual)
+            atual = []
+            tokens_atual = TOKENS_PROMPT_LOTE
+        atual.append(i)
+        tokens_atual += tokens
+
+    if atual:
+        lotes.append(atual)
+
+    return lotes
+
+
+def _montar_prompt_resumo(estatisticas: str) -> str:
+    return f"""
     Como Analista de Produto, escreva um resumo executivo de 3-4 frases baseado nas estatísticas:
-    
+
     {estatisticas}
-    
+
     Destaque a tendência principal e problema mais urgente.
     """
 
+
+def gerar_resumo_executivo(estatisticas: str) -> str:
+    try:
+        return _gerar_texto(_montar_prompt_resumo(estatisticas))
+    except Exception as e:
+        return "Erro ao gerar resumo executivo."
+
+
+async def gerar_resumo_executivo_async(estatisticas: str) -> str:
+    """Versão assíncrona de `gerar_resumo_executivo`."""
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return await _gerar_texto_async(_montar_prompt_resumo(estatisticas))
     except Exception as e:
-        return "Erro ao gerar resumo executivo."
\ No newline at end of file
+        return "Erro ao gerar resumo executivo."
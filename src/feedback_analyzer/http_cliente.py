@@ -0,0 +1,212 @@
+"""
+Sessão HTTP compartilhada e cache em disco de páginas com GET condicional.
+
+A extração por requests usa uma única `requests.Session` por processo, com
+keep-alive e um pool de conexões por host. As respostas que trazem ETag ou
+Last-Modified ficam em um cache SQLite junto com os comentários extraídos
+delas; a próxima visita manda If-None-Match/If-Modified-Since e, se o
+servidor responder 304, reaproveita os comentários sem baixar nem processar
+a página de novo.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .capturas import capturar_pagina, obter_pasta_captura, para_reproducao, url_original
+from .config import obter_opcao
+
+
+CAMINHO_CACHE_PADRAO = os.path.join('cache', 'paginas.db')
+MAX_IDADE_DIAS_PADRAO = 30
+CONEXOES_POR_HOST_PADRAO = 10
+TIMEOUT_HTTP_PADRAO = 15
+CABECALHOS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+_sessao = None
+_sessao_lock = threading.Lock()
+_cache_global = None
+_cache_carregado = False
+_cache_lock = threading.Lock()
+
+
+def obter_sessao_http() -> requests.Session:
+    """Sessão compartilhada, com até [EXTRACAO] CONEXOES_POR_HOST conexões mantidas por host."""
+    global _sessao
+
+    with _sessao_lock:
+        if _sessao is None:
+            conexoes = obter_opcao('EXTRACAO', 'CONEXOES_POR_HOST', CONEXOES_POR_HOST_PADRAO, int)
+            _sessao = requests.Session()
+            _sessao.headers.update(CABECALHOS)
+            adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+            _sessao.mount('http://', adaptador)
+            _sessao.mount('https://', adaptador)
+        return _sessao
+
+
+class CachePaginas:
+    """Respostas HTTP com validadores (ETag/Last-Modified) e os comentários extraídos delas."""
+
+    def __init__(self, caminho=CAMINHO_CACHE_PADRAO, max_idade_dias=MAX_IDADE_DIAS_PADRAO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.caminho = caminho
+        self.max_idade_segundos = max_idade_dias * 86400
+        self.nao_modificadas = 0  # Respostas 304
+        self.baixadas = 0
+        self._lock = threading.Lock()
+
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT NOT NULL,
+                extrator TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                comentarios TEXT NOT NULL,
+                verificado_em REAL NOT NULL,
+                PRIMARY KEY (url, extrator)
+            )
+        """)
+        self._conexao.commit()
+
+    def obter(self, url, extrator):
+        """Entrada de `url` para `extrator` como dict (etag, last_modified, comentarios), ou None."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT etag, last_modified, comentarios FROM paginas "
+                "WHERE url = ? AND extrator = ? AND verificado_em >= ?",
+                (url, extrator, time.time() - self.max_idade_segundos)
+            ).fetchone()
+        if linha is None:
+            return None
+        return {'etag': linha[0], 'last_modified': linha[1], 'comentarios': json.loads(linha[2])}
+
+    def salvar(self, url, extrator, etag, last_modified, comentarios):
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO paginas (url, extrator, etag, last_modified, comentarios, verificado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, extrator, etag, last_modified, json.dumps(comentarios, ensure_ascii=False), time.time())
+            )
+            self._conexao.commit()
+
+    def renovar(self, url, extrator):
+        """Marca a entrada como verificada agora (o servidor respondeu 304)."""
+        with self._lock:
+            self.nao_modificadas += 1
+            self._conexao.execute(
+                "UPDATE paginas SET verificado_em = ? WHERE url = ? AND extrator = ?",
+                (time.time(), url, extrator)
+            )
+            self._conexao.commit()
+
+    def registrar_baixada(self):
+        """Conta uma página baixada e extraída por inteiro (sem 304)."""
+        with self._lock:
+            self.baixadas += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {'nao_modificadas': self.nao_modificadas, 'baixadas': self.baixadas}
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+def obter_cache_paginas():
+    """
+    Retorna o cache de páginas configurado em [EXTRACAO] no config.ini.
+
+    Retorna None se estiver desativado ou não puder ser aberto.
+    """
+    global _cache_global, _cache_carregado
+
+    with _cache_lock:
+        if _cache_carregado:
+            return _cache_global
+        _cache_carregado = True
+
+        if not obter_opcao('EXTRACAO', 'CACHE_HTTP', True, bool):
+            return None
+
+        try:
+            _cache_global = CachePaginas(
+                caminho=obter_opcao('EXTRACAO', 'CAMINHO_CACHE_HTTP', CAMINHO_CACHE_PADRAO),
+                max_idade_dias=obter_opcao('EXTRACAO', 'MAX_IDADE_CACHE_HTTP_DIAS', MAX_IDADE_DIAS_PADRAO, float)
+            )
+        except sqlite3.Error as e:
+            print(f"[AVISO] Cache de páginas indisponível: {e}")
+            return None
+
+        return _cache_global
+
+
+def extrair_com_cache(url, extrator, nome_extrator=None, timeout=None):
+    """
+    Baixa `url` pela sessão compartilhada e devolve `extrator(resposta)`.
+
+    Com o cache ativo, manda os validadores da última visita; se o servidor
+    responder 304, devolve o que foi extraído daquela vez sem baixar nem
+    processar a página. O retorno de `extrator` precisa ser serializável em
+    JSON (lista de comentários ou dict); `nome_extrator` separa entradas de
+    extratores diferentes para a mesma URL. Erros HTTP sobem como
+    `requests.exceptions.RequestException`.
+
+    Com a captura ligada, a página é sempre baixada inteira e gravada (ver
+    `capturas`); com a reprodução ligada, vem do servidor de capturas, mas
+    `extrator` recebe a resposta com a URL original.
+    """
+    nome_extrator = nome_extrator or extrator.__name__
+    sessao = obter_sessao_http()
+    cache = obter_cache_paginas()
+    capturando = obter_pasta_captura() is not None
+    anterior = cache.obter(url, nome_extrator) if cache is not None and not capturando else None
+
+    cabecalhos = {}
+    if anterior:
+        if anterior['etag']:
+            cabecalhos['If-None-Match'] = anterior['etag']
+        if anterior['last_modified']:
+            cabecalhos['If-Modified-Since'] = anterior['last_modified']
+
+    resposta = sessao.get(
+        para_reproducao(url, 'http'), headers=cabecalhos,
+        timeout=timeout or obter_opcao('EXTRACAO', 'TIMEOUT_HTTP', TIMEOUT_HTTP_PADRAO, float)
+    )
+    if resposta.status_code == 304 and anterior:
+        cache.renovar(url, nome_extrator)
+        print(f"♻️  Página sem alterações desde a última visita: {url}")
+        return anterior['comentarios']  # Objeto novo a cada leitura (json.loads)
+
+    resposta.raise_for_status()
+    resposta.url = url_original(resposta.url)  # Links relativos resolvidos contra o site, não o servidor de capturas
+    if capturando:
+        capturar_pagina(url, resposta.content, 'http', resposta.headers.get('Content-Type'))
+    comentarios = extrator(resposta)
+    if cache is not None:
+        cache.registrar_baixada()
+        etag = resposta.headers.get('ETag')
+        last_modified = resposta.headers.get('Last-Modified')
+        if etag or last_modified:
+            cache.salvar(url, nome_extrator, etag, last_modified, comentarios)
+    return comentarios
@@ -0,0 +1,164 @@
+"""
+Diário (journal) de execuções de análise, para retomar execuções interrompidas.
+
+Cada execução ganha uma pasta em `execucoes/<id>/` com:
+- entrada.csv: os comentários carregados (data, fonte, comentario);
+- execucao.json: metadados (produto, total, criada_em, concluida);
+- resultados.jsonl: uma linha {"i": linha, "r": resultado} por comentário
+  concluído, gravada e sincronizada com o disco assim que o resultado chega.
+
+Um Ctrl-C, queda ou cota esgotada perde no máximo o lote em andamento; com
+`--resume` só as linhas sem resultado no diário voltam para a API.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from .config import obter_opcao
+
+
+PASTA_PADRAO = 'execucoes'
+
+
+class JournalExecucao:
+    """Diário append-only dos resultados de uma execução."""
+
+    def __init__(self, pasta_execucao):
+        self.pasta = pasta_execucao
+        self.id_execucao = os.path.basename(os.path.normpath(pasta_execucao))
+        self.caminho_resultados = os.path.join(pasta_execucao, 'resultados.jsonl')
+        self.caminho_metadados = os.path.join(pasta_execucao, 'execucao.json')
+        self.caminho_entrada = os.path.join(pasta_execucao, 'entrada.csv')
+        self._lock = threading.Lock()
+        self._arquivo = None
+        self._arquivo_entrada = None
+        self._falhou = False
+
+    @classmethod
+    def criar(cls, df, nome_produto, pasta_base=PASTA_PADRAO):
+        """Cria a pasta da execução e salva a entrada e os metadados."""
+        id_execucao = time.strftime('%Y%m%d-%H%M%S')
+        pasta = os.path.join(pasta_base, id_execucao)
+        sufixo = 1
+        while os.path.exists(pasta):
+            sufixo += 1
+            pasta = os.path.join(pasta_base, f"{id_execucao}-{sufixo}")
+        os.makedirs(pasta)
+
+        journal = cls(pasta)
+        df[['data', 'fonte', 'comentario']].to_csv(journal.caminho_entrada, index=False)
+        journal._salvar_metadados({
+            "produto": nome_produto,
+            "total": len(df),
+            "criada_em": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "concluida": False
+        })
+        return journal
+
+    @classmethod
+    def abrir(cls, id_execucao=None, pasta_base=PASTA_PADRAO):
+        """
+        Abre uma execução existente pelo id; sem id, a mais recente não concluída.
+
+        Levanta ValueError se não houver execução para retomar.
+        """
+        if id_execucao:
+            pasta = os.path.join(pasta_base, id_execucao)
+            if not os.path.exists(os.path.join(pasta, 'execucao.json')):
+                raise ValueError(f"Execução '{id_execucao}' não encontrada em {pasta_base}/")
+            return cls(pasta)
+
+        candidatas = sorted(os.listdir(pasta_base), reverse=True) if os.path.isdir(pasta_base) else []
+        for nome in candidatas:
+            journal = cls(os.path.join(pasta_base, nome))
+            if os.path.exists(journal.caminho_metadados) and not journal.metadados().get('concluida'):
+                return journal
+        raise ValueError(f"Nenhuma execução pendente em {pasta_base}/")
+
+    def metadados(self) -> dict:
+        with open(self.caminho_metadados, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _salvar_metadados(self, metadados):
+        temporario = self.caminho_metadados + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(metadados, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho_metadados)
+
+    def carregar_entrada(self):
+        return pd.read_csv(self.caminho_entrada, dtype=str, keep_default_na=False)
+
+    def adicionar_entrada(self, registros):
+        """Acrescenta comentários à entrada (execuções em fluxo, em que a entrada chega aos poucos)."""
+        with self._lock:
+            if self._arquivo_entrada is None:
+                self._arquivo_entrada = open(self.caminho_entrada, 'a', encoding='utf-8', newline='')
+            escritor = csv.writer(self._arquivo_entrada)
+            for registro in registros:
+                escritor.writerow([registro.get('data', ''), registro.get('fonte', ''), registro['comentario']])
+            self._arquivo_entrada.flush()
+
+    def carregar_resultados(self) -> dict:
+        """Resultados já gravados, por linha. Uma última linha truncada (queda durante a escrita) é ignorada."""
+        resultados = {}
+        if not os.path.exists(self.caminho_resultados):
+            return resultados
+
+        with open(self.caminho_resultados, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                    resultados[int(registro['i'])] = registro['r']
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return resultados
+
+    def registrar(self, linhas, resultados):
+        """Grava os resultados válidos e força a escrita em disco (erros ficam para a retomada)."""
+        registros = [
+            json.dumps({"i": linha, "r": resultado}, ensure_ascii=False)
+            for linha, resultado in zip(linhas, resultados)
+            if resultado is not None and resultado.get('sentimento') != 'Erro'
+        ]
+        if not registros or self._falhou:
+            return
+
+        with self._lock:
+            try:
+                if self._arquivo is None:
+                    self._arquivo = open(self.caminho_resultados, 'a', encoding='utf-8')
+                self._arquivo.write("\n".join(registros) + "\n")
+                self._arquivo.flush()
+                os.fsync(self._arquivo.fileno())
+            except OSError as e:
+                # Sem diário a análise continua; só perde a capacidade de retomar
+                self._falhou = True
+                print(f"[AVISO] Falha ao gravar o diário da execução: {e}")
+
+    def marcar_concluida(self, relatorio=None, total=None):
+        metadados = self.metadados()
+        metadados['concluida'] = True
+        if total is not None:
+            metadados['total'] = total
+        if relatorio:
+            metadados['relatorio'] = relatorio
+        self._salvar_metadados(metadados)
+
+    def fechar(self):
+        with self._lock:
+            for arquivo in (self._arquivo, self._arquivo_entrada):
+                if arquivo is not None:
+                    arquivo.close()
+            self._arquivo = self._arquivo_entrada = None
+
+
+def obter_pasta_execucoes():
+    """Pasta base do diário configurada em [EXECUCAO], ou None se desativado."""
+    if not obter_opcao('EXECUCAO', 'JOURNAL', True, bool):
+        return None
+    return obter_opcao('EXECUCAO', 'PASTA', PASTA_PADRAO)
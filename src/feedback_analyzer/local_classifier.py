@@ -0,0 +1,282 @@
+"""
+Pré-classificador local executado antes do Gemini.
+
+Classifica sentimento e categoria com um modelo linear (regressão logística
+sobre n-gramas de palavras com feature hashing) treinado a partir das análises
+do Gemini guardadas no cache. Sem modelo treinado, usa um léxico em português.
+Só os resultados com confiança acima do limiar são aceitos; o resto segue para
+a API.
+
+Treino:
+    python -m feedback_analyzer.local_classifier
+"""
+
+import os
+import re
+import zlib
+
+import numpy as np
+
+from .cache import obter_cache
+from .config import obter_opcao
+from .dedup import normalizar_comentario
+from .gemini_processor import MODELO_PADRAO, SENTIMENTOS, CATEGORIAS
+
+
+CAMINHO_MODELO_PADRAO = os.path.join('cache', 'classificador_local.npz')
+LIMIAR_CONFIANCA_PADRAO = 0.9
+DIMENSAO_HASH = 2 ** 18
+EPOCAS_PADRAO = 5
+TAXA_APRENDIZADO = 0.5
+REGULARIZACAO = 1e-6
+MIN_EXEMPLOS_TREINO = 200
+
+_classificador_global = None
+
+_POSITIVAS = {
+    'otimo', 'otima', 'excelente', 'perfeito', 'perfeita', 'maravilhoso', 'maravilhosa', 'incrivel',
+    'adorei', 'amei', 'recomendo', 'bom', 'boa', 'top', 'show', 'sensacional', 'satisfeito',
+    'satisfeita', 'gostei', 'excepcional'
+}
+_NEGATIVAS = {
+    'pessimo', 'pessima', 'horrivel', 'ruim', 'terrivel', 'lixo', 'odiei', 'decepcionante',
+    'decepcao', 'golpe', 'fraude', 'porcaria', 'insatisfeito', 'insatisfeita', 'arrependido',
+    'arrependida', 'defeito', 'quebrado', 'quebrou', 'travando', 'atrasou'
+}
+_PALAVRAS_CATEGORIA = {
+    'Bug': {
+        'bug', 'erro', 'trava', 'travando', 'travou', 'crash', 'fecha sozinho', 'nao abre',
+        'nao funciona', 'parou de funcionar', 'defeito', 'falha', 'quebrou', 'quebrado', 'nao liga'
+    },
+    'Suporte': {
+        'atendimento', 'suporte', 'sac', 'atendente', 'reembolso', 'devolucao', 'troca',
+        'ninguem responde', 'nao responde', 'entrega', 'garantia'
+    },
+    'UI/UX': {
+        'interface', 'layout', 'design', 'botao', 'menu', 'navegacao', 'visual', 'usabilidade',
+        'intuitivo', 'intuitiva', 'confuso', 'confusa', 'dificil de usar', 'facil de usar'
+    },
+    'Sugestão': {
+        'poderia', 'deveria', 'sugiro', 'sugestao', 'seria bom', 'seria legal', 'gostaria',
+        'faltou', 'falta', 'adicionar', 'incluir'
+    }
+}
+_NEGADORES = {'nao', 'nunca', 'jamais', 'nem'}
+JANELA_NEGACAO = 3  # Palavras seguintes a um negador que têm a polaridade invertida
+CONFIANCA_INCERTA = 0.7  # Abaixo do limiar padrão: textos longos ou com negação vão para a API
+_FIM_ORACAO = re.compile(r'[.,;:!?()\n]+')
+
+
+def extrair_features(texto: str) -> np.ndarray:
+    """Índices (com repetição) dos unigramas e bigramas de palavras no espaço de hash."""
+    palavras = normalizar_comentario(texto).split()
+    termos = palavras + [f"{a} {b}" for a, b in zip(palavras, palavras[1:])]
+    if not termos:
+        termos = ['<vazio>']
+    return np.fromiter(
+        (zlib.crc32(t.encode('utf-8')) % DIMENSAO_HASH for t in termos), dtype=np.int64, count=len(termos)
+    )
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=0, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=0, keepdims=True)
+
+
+class ModeloLinearHash:
+    """Regressão logística multinomial sobre features esparsas com hashing."""
+
+    def __init__(self, classes, pesos=None, vies=None):
+        self.classes = list(classes)
+        self.pesos = pesos if pesos is not None else np.zeros((len(self.classes), DIMENSAO_HASH), dtype=np.float32)
+        self.vies = vies if vies is not None else np.zeros(len(self.classes), dtype=np.float32)
+
+    def treinar(self, features: list, rotulos: list, epocas=EPOCAS_PADRAO, semente=0):
+        alvos = np.array([self.classes.index(r) for r in rotulos])
+        rng = np.random.default_rng(semente)
+
+        for epoca in range(epocas):
+            taxa = TAXA_APRENDIZADO / (1 + epoca)
+            for i in rng.permutation(len(features)):
+                indices = features[i]
+                escala = 1.0 / np.sqrt(len(indices))
+                scores = self.pesos[:, indices].sum(axis=1) * escala + self.vies
+                gradiente = _softmax(scores[:, None])[:, 0]
+                gradiente[alvos[i]] -= 1.0
+                self.vies -= taxa * gradiente
+                np.add.at(
+                    self.pesos, (slice(None), indices),
+                    -(taxa * escala * gradiente[:, None] + REGULARIZACAO * self.pesos[:, indices])
+                )
+
+    def prever(self, features: list):
+        """Retorna (rótulos, confianças) para uma lista de vetores de features."""
+        if not features:
+            return [], np.array([])
+
+        tamanhos = np.array([len(f) for f in features])
+        inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+        todos = np.concatenate(features)
+
+        # Soma das colunas de cada comentário de uma vez só
+        scores = np.add.reduceat(self.pesos[:, todos], inicios, axis=1) / np.sqrt(tamanhos) + self.vies[:, None]
+        probabilidades = _softmax(scores)
+        melhores = probabilidades.argmax(axis=0)
+        return [self.classes[i] for i in melhores], probabilidades.max(axis=0)
+
+
+def _contem(texto_normalizado: str, termos: set) -> set:
+    palavras = f" {texto_normalizado} "
+    return {t for t in termos if f" {t} " in palavras}
+
+
+def _classificar_por_lexico(texto: str):
+    """Retorna ((sentimento, confiança), (categoria, confiança)) pelas listas de palavras."""
+    normalizado = normalizar_comentario(texto)
+    palavras = normalizado.split()
+
+    # Um negador inverte as próximas JANELA_NEGACAO palavras da mesma oração
+    # ("não é bom, atendimento horrível": só "bom" é invertido)
+    positivos = negativos = 0
+    houve_negacao = False
+    for oracao in _FIM_ORACAO.split(str(texto)):
+        restantes = 0
+        for palavra in normalizar_comentario(oracao).split():
+            if palavra in _NEGADORES:
+                restantes = JANELA_NEGACAO
+                continue
+            negado = restantes > 0
+            restantes = max(0, restantes - 1)
+            if palavra in _POSITIVAS:
+                negativos, positivos = (negativos + 1, positivos) if negado else (negativos, positivos + 1)
+            elif palavra in _NEGATIVAS:
+                positivos, negativos = (positivos + 1, negativos) if negado else (positivos, negativos + 1)
+            else:
+                continue
+            houve_negacao = houve_negacao or negado
+
+    # Comentários curtos e de polaridade única, sem negação, são os casos triviais
+    trivial = len(palavras) <= 12 and not houve_negacao
+    if positivos and not negativos:
+        sentimento = ('Positivo', 0.9 + 0.02 * min(positivos, 3) if trivial else CONFIANCA_INCERTA)
+    elif negativos and not positivos:
+        sentimento = ('Negativo', 0.9 + 0.02 * min(negativos, 3) if trivial else CONFIANCA_INCERTA)
+    else:
+        sentimento = ('Neutro', 0.4)
+
+    encontradas = [c for c, termos in _PALAVRAS_CATEGORIA.items() if _contem(normalizado, termos)]
+    categoria = (encontradas[0], 0.92) if len(encontradas) == 1 else ((encontradas or ['Sugestão'])[0], 0.3)
+
+    return sentimento, categoria
+
+
+def _resumo_local(texto: str) -> str:
+    primeira_frase = re.split(r'(?<=[.!?])\s', str(texto).strip(), maxsplit=1)[0]
+    return primeira_frase if len(primeira_frase) <= 100 else primeira_frase[:97].rstrip() + "..."
+
+
+class ClassificadorLocal:
+    """Primeira camada da cascata: modelos treinados se existirem, senão o léxico."""
+
+    def __init__(self, modelo_sentimento=None, modelo_categoria=None):
+        self.modelo_sentimento = modelo_sentimento
+        self.modelo_categoria = modelo_categoria
+
+    @property
+    def treinado(self) -> bool:
+        return self.modelo_sentimento is not None and self.modelo_categoria is not None
+
+    def classificar(self, comentarios: list, limiar=LIMIAR_CONFIANCA_PADRAO) -> list:
+        """
+        Retorna uma lista alinhada a `comentarios` com o resultado local, ou
+        None quando a confiança de sentimento ou categoria ficar abaixo de `limiar`.
+        """
+        if self.treinado:
+            features = [extrair_features(c) for c in comentarios]
+            sentimentos, conf_sentimentos = self.modelo_sentimento.prever(features)
+            categorias, conf_categorias = self.modelo_categoria.prever(features)
+            previsoes = zip(sentimentos, conf_sentimentos, categorias, conf_categorias)
+        else:
+            previsoes = (
+                (s, cs, c, cc)
+                for (s, cs), (c, cc) in (_classificar_por_lexico(texto) for texto in comentarios)
+            )
+
+        resultados = []
+        for comentario, (sentimento, conf_s, categoria, conf_c) in zip(comentarios, previsoes):
+            if min(conf_s, conf_c) >= limiar:
+                resultados.append({
+                    "sentimento": sentimento,
+                    "categoria": categoria,
+                    "resumo_curto": _resumo_local(comentario)
+                })
+            else:
+                resultados.append(None)
+        return resultados
+
+    def salvar(self, caminho=CAMINHO_MODELO_PADRAO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        np.savez_compressed(
+            caminho,
+            pesos_sentimento=self.modelo_sentimento.pesos, vies_sentimento=self.modelo_sentimento.vies,
+            pesos_categoria=self.modelo_categoria.pesos, vies_categoria=self.modelo_categoria.vies
+        )
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_MODELO_PADRAO):
+        """Carrega os modelos salvos; sem arquivo, retorna um classificador só de léxico."""
+        if not os.path.exists(caminho):
+            return cls()
+        dados = np.load(caminho)
+        return cls(
+            ModeloLinearHash(SENTIMENTOS, dados['pesos_sentimento'], dados['vies_sentimento']),
+            ModeloLinearHash(CATEGORIAS, dados['pesos_categoria'], dados['vies_categoria'])
+        )
+
+
+def treinar_do_cache(caminho=CAMINHO_MODELO_PADRAO, epocas=EPOCAS_PADRAO):
+    """Treina os modelos com as análises do Gemini armazenadas no cache e salva em `caminho`."""
+    cache = obter_cache()
+    if cache is None:
+        print("❌ Cache de análises desativado; não há exemplos para treinar.")
+        return None
+
+    exemplos = [
+        (comentario, resultado) for comentario, resultado in cache.iterar_exemplos(MODELO_PADRAO)
+        if resultado.get('sentimento') in SENTIMENTOS and resultado.get('categoria') in CATEGORIAS
+    ]
+    if len(exemplos) < MIN_EXEMPLOS_TREINO:
+        print(f"❌ Apenas {len(exemplos)} exemplos no cache (mínimo {MIN_EXEMPLOS_TREINO}).")
+        return None
+
+    print(f"🧠 Treinando classificador local com {len(exemplos)} exemplos...")
+    features = [extrair_features(comentario) for comentario, _ in exemplos]
+
+    modelo_sentimento = ModeloLinearHash(SENTIMENTOS)
+    modelo_sentimento.treinar(features, [r['sentimento'] for _, r in exemplos], epocas)
+    modelo_categoria = ModeloLinearHash(CATEGORIAS)
+    modelo_categoria.treinar(features, [r['categoria'] for _, r in exemplos], epocas)
+
+    classificador = ClassificadorLocal(modelo_sentimento, modelo_categoria)
+    classificador.salvar(caminho)
+    print(f"💾 Classificador salvo em: {caminho}")
+    return classificador
+
+
+def obter_classificador_local():
+    """Retorna o classificador configurado em [CLASSIFICADOR_LOCAL], ou None se desativado."""
+    global _classificador_global
+
+    if not obter_opcao('CLASSIFICADOR_LOCAL', 'ATIVO', True, bool):
+        return None
+    if _classificador_global is None:
+        caminho = obter_opcao('CLASSIFICADOR_LOCAL', 'CAMINHO_MODELO', CAMINHO_MODELO_PADRAO)
+        _classificador_global = ClassificadorLocal.carregar(caminho)
+    return _classificador_global
+
+
+if __name__ == "__main__":
+    treinar_do_cache(obter_opcao('CLASSIFICADOR_LOCAL', 'CAMINHO_MODELO', CAMINHO_MODELO_PADRAO))
@@ -0,0 +1,251 @@
+"""
+Pipeline em fluxo: extração -> análise -> relatório.
+
+Os comentários entram por um iterável (ex.: o gerador de extração de uma URL),
+que roda em uma thread própria e alimenta uma fila limitada. A análise consome
+a fila em blocos assim que eles se formam, e os resultados seguem por outra
+fila limitada até quem escreve o relatório. Filas cheias seguram a etapa
+anterior (backpressure), então a memória fica limitada e o tempo total se
+aproxima de max(extração, análise) em vez da soma.
+
+O agrupamento de quase duplicados vale dentro de cada bloco; repetições entre
+blocos diferentes são aproveitadas pelo cache, quando ativo.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from tqdm import tqdm
+
+from .analysis_engine import (
+    processar_comentarios_async, _percentis, MAX_CONCORRENCIA_PADRAO
+)
+from .gemini_processor import resultado_erro, estatisticas_respostas
+from .rate_limiter import (
+    ControleConcorrenciaAIMD, obter_orcamento_retentativas, obter_controle_prazos, CONCORRENCIA_INICIAL_PADRAO
+)
+
+
+TAMANHO_FILA_PADRAO = 1000
+TAMANHO_BLOCO_PADRAO = 200
+ESPERA_BLOCO_PADRAO = 1.0  # Segundos até despachar um bloco incompleto
+MAX_BLOCOS_SIMULTANEOS_PADRAO = 4
+
+_FIM = object()
+
+
+def _como_registro(item) -> dict:
+    if isinstance(item, dict):
+        return dict(item)
+    return {"comentario": str(item)}
+
+
+async def executar_pipeline_async(fonte, ao_resultado, ao_receber=None, ao_concluir=None,
+                                  tamanho_fila=TAMANHO_FILA_PADRAO,
+                                  tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                                  espera_bloco=ESPERA_BLOCO_PADRAO,
+                                  max_blocos_simultaneos=MAX_BLOCOS_SIMULTANEOS_PADRAO,
+                                  max_concorrencia=MAX_CONCORRENCIA_PADRAO,
+                                  prazo_execucao=None,
+                                  **opcoes_analise) -> dict:
+    """
+    Analisa os comentários de `fonte` à medida que chegam e retorna as estatísticas.
+
+    `fonte` gera textos ou dicionários com a chave 'comentario' (demais chaves,
+    como 'data' e 'fonte', são preservadas). Cada registro recebe 'linha', sua
+    posição na ordem de chegada.
+
+    `ao_receber(registro)` é chamado na thread da extração para cada registro
+    que entra; `ao_resultado(registros, resultados)` recebe os resultados bloco
+    a bloco, na ordem em que os comentários chegaram, em uma thread auxiliar
+    para não bloquear a análise. `ao_concluir(registros, resultados)` recebe
+    cada resultado assim que fica pronto, antes de o bloco terminar (ex.: para
+    gravar no diário da execução).
+
+    Com `prazo_execucao` (segundos), a leitura da fonte para quando o prazo
+    acaba e os blocos em análise recebem só o tempo restante; comentários sem
+    resultado a tempo saem como erro (e podem ser retomados pelo diário).
+    As demais opções seguem para `processar_comentarios_async`.
+    """
+    loop = asyncio.get_running_loop()
+    entrada = asyncio.Queue(maxsize=tamanho_fila)
+    saida = asyncio.Queue()  # Limitada pelas vagas de blocos simultâneos
+    vagas = asyncio.Semaphore(max_blocos_simultaneos)
+    parar = threading.Event()
+    erro_fonte = []
+
+    controle = ControleConcorrenciaAIMD(
+        inicial=opcoes_analise.pop('concorrencia_inicial', CONCORRENCIA_INICIAL_PADRAO), maximo=max_concorrencia
+    )
+    orcamento = obter_orcamento_retentativas()
+    retentativas_antes = orcamento.estatisticas()['retentativas']
+    prazos = obter_controle_prazos()
+    prazos_antes = prazos.estatisticas()
+    respostas_antes = estatisticas_respostas()
+    stats = {
+        "comentarios": 0, "unicos": 0, "duplicados_agrupados": 0,
+        "por_camada": {"cache": 0, "local": 0, "gemini": 0}, "requisicoes": 0, "blocos": 0,
+        "sem_analise_no_prazo": 0, "prazo_esgotado": False
+    }
+    latencias = []
+    inicio = time.monotonic()
+    limite = inicio + prazo_execucao if prazo_execucao else None
+    primeira_analise = [None]
+
+    def colocar(item):
+        futuro = asyncio.run_coroutine_threadsafe(entrada.put(item), loop)
+        while True:
+            try:
+                return futuro.result(timeout=0.5)
+            except concurrent.futures.TimeoutError:
+                if parar.is_set():
+                    futuro.cancel()
+                    return None
+
+    def produzir():
+        # Extração síncrona (Selenium, requests) fora do event loop
+        try:
+            for linha, item in enumerate(fonte):
+                if parar.is_set():
+                    break
+                registro = _como_registro(item)
+                registro['linha'] = registro.get('linha', linha)
+                if ao_receber:
+                    ao_receber(registro)
+                colocar((registro, time.monotonic()))
+        except Exception as e:
+            erro_fonte.append(e)
+        finally:
+            colocar(_FIM)
+
+    async def analisar(numero, bloco):
+        if primeira_analise[0] is None:
+            primeira_analise[0] = time.monotonic() - inicio
+        registros = [registro for registro, _ in bloco]
+
+        def concluir_parcial(posicoes, resultados_prontos):
+            ao_concluir([registros[p] for p in posicoes], resultados_prontos)
+
+        parcial = {}  # Contadores deste bloco, sem misturar com os blocos simultâneos
+        try:
+            resultados = await processar_comentarios_async(
+                [registro['comentario'] for registro in registros],
+                controle=controle, silencioso=True,
+                ao_concluir=concluir_parcial if ao_concluir else None,
+                prazo_execucao=max(0.0, limite - time.monotonic()) if limite else None,
+                estatisticas=parcial,
+                **opcoes_analise
+            )
+            for chave in ("comentarios", "unicos", "duplicados_agrupados", "requisicoes", "sem_analise_no_prazo"):
+                stats[chave] += parcial[chave]
+            for camada, quantidade in parcial["por_camada"].items():
+                stats["por_camada"][camada] += quantidade
+        except Exception as e:
+            print(f"[ERRO] Falha ao analisar bloco {numero}: {e}")
+            resultados = [resultado_erro() for _ in bloco]
+        stats["blocos"] += 1
+
+        agora = time.monotonic()
+        latencias.extend(agora - chegada for _, chegada in bloco)
+        await saida.put((numero, registros, resultados))
+
+    async def consumir():
+        tarefas = []
+        bloco = []
+
+        async def despachar(bloco):
+            # Sem vaga, para de ler a fila de entrada e a extração espera
+            await vagas.acquire()
+            tarefas.append(asyncio.create_task(analisar(len(tarefas), bloco)))
+
+        while True:
+            espera = espera_bloco if bloco else None
+            if limite is not None:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    stats["prazo_esgotado"] = True
+                    parar.set()
+                    break
+                espera = restante if espera is None else min(espera, restante)
+
+            try:
+                item = await asyncio.wait_for(entrada.get(), espera)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _FIM:
+                break
+            if item is not None:
+                bloco.append(item)
+            if bloco and (item is None or len(bloco) >= tamanho_bloco):
+                await despachar(bloco)
+                bloco = []
+
+        if bloco:
+            await despachar(bloco)
+        try:
+            await asyncio.gather(*tarefas)
+        finally:
+            await saida.put(_FIM)
+
+    async def escoar(pbar):
+        # Blocos podem terminar fora de ordem; entrega na ordem de despacho e só
+        # então libera a vaga, para que um bloco lento limite os que esperam
+        prontos = {}
+        proximo = 0
+        while True:
+            item = await saida.get()
+            if item is _FIM:
+                break
+            numero, registros, resultados = item
+            prontos[numero] = (registros, resultados)
+            while proximo in prontos:
+                registros, resultados = prontos.pop(proximo)
+                await asyncio.to_thread(ao_resultado, registros, resultados)
+                pbar.update(len(registros))
+                vagas.release()
+                proximo += 1
+
+    produtor = threading.Thread(target=produzir, daemon=True)
+    produtor.start()
+    try:
+        with tqdm(desc="Processando", unit=" comentários") as pbar:
+            await asyncio.gather(consumir(), escoar(pbar))
+    finally:
+        parar.set()
+        await asyncio.to_thread(produtor.join, 5)
+
+    if erro_fonte:
+        print(f"[AVISO] Extração interrompida: {erro_fonte[0]}")
+
+    stats.update(controle.estatisticas())
+    stats.update({chave: valor - prazos_antes[chave] for chave, valor in prazos.estatisticas().items()})
+    stats.update({chave: valor - respostas_antes[chave] for chave, valor in estatisticas_respostas().items()})
+    stats.update({
+        "retentativas": orcamento.estatisticas()['retentativas'] - retentativas_antes,
+        "latencia_comentario": _percentis(latencias),
+        "latencia_requisicao": _percentis(controle.latencias),
+        "inicio_analise": primeira_analise[0],
+        "duracao": time.monotonic() - inicio
+    })
+    print(f"[INFO] {stats['requisicoes']} requisições à API para {stats['comentarios']} comentários "
+          f"em {stats['blocos']} blocos ({stats['retentativas']} retentativas, "
+          f"pico de {stats['pico_concorrencia']} simultâneas)")
+    if stats['hedges'] or stats['timeouts']:
+        print(f"[INFO] {stats['hedges']} requisições de reserva ({stats['hedges_vencedores']} responderam "
+              f"primeiro), {stats['timeouts']} requisições excederam o prazo")
+    if stats['respostas_invalidas'] or stats['itens_reparados'] or stats['itens_rejeitados']:
+        print(f"[INFO] Respostas: {stats['respostas_invalidas']}/{stats['respostas']} com JSON inválido, "
+              f"{stats['itens_rejeitados']} itens rejeitados, "
+              f"{stats['itens_reparados']} reparados localmente (reenvios evitados)")
+    if stats['prazo_esgotado'] or stats['sem_analise_no_prazo']:
+        print(f"[AVISO] Prazo da execução ({prazo_execucao:.0f}s) esgotado; "
+              f"{stats['sem_analise_no_prazo']} comentários ficaram sem análise")
+    return stats
+
+
+def executar_pipeline(fonte, ao_resultado, **kwargs) -> dict:
+    """Executa `executar_pipeline_async` em um event loop próprio (uso síncrono)."""
+    return asyncio.run(executar_pipeline_async(fonte, ao_resultado, **kwargs))
@@ -0,0 +1,444 @@
+"""
+Controle de vazão das chamadas à API: limitador token bucket compartilhado,
+controle de concorrência AIMD, backoff exponencial com jitter, orçamento
+global de retentativas e prazos por requisição com requisições de reserva.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+from .config import obter_opcao
+
+
+REQUISICOES_POR_MINUTO_PADRAO = 1000
+RAJADA_PADRAO = 10
+CONCORRENCIA_INICIAL_PADRAO = 4
+MAX_TENTATIVAS_PADRAO = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAXIMO = 30.0
+PROPORCAO_RETENTATIVAS_PADRAO = 0.2  # Retentativas permitidas por requisição feita
+MINIMO_RETENTATIVAS_PADRAO = 20
+INTERVALO_REDUCAO = 1.0  # Segundos mínimos entre dois cortes multiplicativos
+TIMEOUT_REQUISICAO_PADRAO = 60.0
+PROPORCAO_HEDGE_PADRAO = 0.1  # Requisições de reserva permitidas por requisição feita
+MINIMO_AMOSTRAS_HEDGE = 20  # Latências observadas antes de usar o p95
+JANELA_LATENCIAS_HEDGE = 200
+JANELA_LATENCIAS_CONCORRENCIA = 10000  # Latências recentes guardadas para os percentis das estatísticas
+
+_limitador_global = None
+_orcamento_global = None
+_prazos_global = None
+_lock_global = threading.Lock()
+
+
+def calcular_backoff(tentativa: int, base=BACKOFF_BASE, maximo=BACKOFF_MAXIMO) -> float:
+    """Backoff exponencial com "full jitter": espera aleatória em [0, base * 2^tentativa]."""
+    return random.uniform(0, min(maximo, base * (2 ** tentativa)))
+
+
+def _codigo_erro(erro):
+    codigo = getattr(erro, 'code', None)
+    if callable(codigo):  # Exceções gRPC expõem code() como método
+        try:
+            codigo = codigo()
+        except Exception:
+            codigo = None
+    codigo = getattr(codigo, 'value', codigo)
+    if isinstance(codigo, tuple):
+        codigo = codigo[0]
+    return codigo if isinstance(codigo, int) else None
+
+
+def eh_erro_de_cota(erro) -> bool:
+    """Indica se a exceção é um 429 / cota esgotada."""
+    nome = type(erro).__name__
+    mensagem = str(erro).lower()
+    return (
+        _codigo_erro(erro) == 429
+        or nome in ('ResourceExhausted', 'TooManyRequests')
+        or '429' in mensagem
+        or 'quota' in mensagem
+        or 'rate limit' in mensagem
+    )
+
+
+def eh_erro_transitorio(erro) -> bool:
+    """Indica se vale a pena repetir a requisição que gerou a exceção."""
+    if eh_erro_de_cota(erro):
+        return True
+    if isinstance(erro, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    nome = type(erro).__name__
+    return (
+        _codigo_erro(erro) in (500, 502, 503, 504)
+        or nome in ('ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded', 'GatewayTimeout')
+    )
+
+
+class LimitadorTokenBucket:
+    """
+    Token bucket seguro entre threads e event loops.
+
+    A taxa cai pela metade em erros de cota (no máximo um corte por
+    `INTERVALO_REDUCAO`, respeitando `taxa_minima`) e volta a subir aos
+    poucos, até `taxa_maxima`, enquanto as chamadas têm sucesso.
+    """
+
+    def __init__(self, requisicoes_por_minuto=REQUISICOES_POR_MINUTO_PADRAO, rajada=RAJADA_PADRAO):
+        self.taxa_maxima = requisicoes_por_minuto / 60.0
+        self.taxa_minima = max(self.taxa_maxima / 64, 1 / 60.0)
+        self.taxa = self.taxa_maxima
+        self.capacidade = max(1, rajada)
+        self._tokens = float(self.capacidade)
+        self._ultimo = time.monotonic()
+        self._pausado_ate = 0.0
+        self._ultima_reducao = 0.0
+        self._lock = threading.Lock()
+
+    def _tentar_consumir(self) -> float:
+        """
+        Consome um token se houver; senão retorna quantos segundos esperar
+        antes de tentar de novo. A espera é recalculada a cada tentativa para
+        que cortes de taxa valham imediatamente para quem já está aguardando.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            if self._pausado_ate > agora:
+                return self._pausado_ate - agora
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.taxa
+
+    def adquirir(self):
+        while True:
+            espera = self._tentar_consumir()
+            if espera <= 0:
+                return
+            time.sleep(espera)
+
+    async def adquirir_async(self):
+        while True:
+            espera = self._tentar_consumir()
+            if espera <= 0:
+                return
+            await asyncio.sleep(espera)
+
+    def tentar_adquirir(self) -> bool:
+        """Consome um token só se houver um disponível agora, sem esperar."""
+        return self._tentar_consumir() <= 0
+
+    def penalizar(self, pausa: float = 1.0):
+        """Reduz a taxa pela metade e pausa novas requisições por `pausa` segundos."""
+        with self._lock:
+            agora = time.monotonic()
+            # Vários 429 em sequência contam como um único corte de taxa
+            if agora - self._ultima_reducao >= INTERVALO_REDUCAO:
+                self.taxa = max(self.taxa_minima, self.taxa / 2)
+                self._tokens = min(self._tokens, 0.0)
+                self._ultima_reducao = agora
+            self._pausado_ate = max(self._pausado_ate, agora + pausa)
+
+    def recompensar(self):
+        with self._lock:
+            self.taxa = min(self.taxa_maxima, self.taxa + self.taxa_maxima * 0.01)
+
+
+class OrcamentoRetentativas:
+    """Limita o total de retentativas a uma fração das requisições feitas."""
+
+    def __init__(self, proporcao=PROPORCAO_RETENTATIVAS_PADRAO, minimo=MINIMO_RETENTATIVAS_PADRAO):
+        self.proporcao = proporcao
+        self.minimo = minimo
+        self.requisicoes = 0
+        self.retentativas = 0
+        self.negadas = 0
+        self._lock = threading.Lock()
+
+    def registrar_requisicao(self):
+        with self._lock:
+            self.requisicoes += 1
+
+    def consumir(self) -> bool:
+        """Retorna True se ainda há orçamento para mais uma retentativa."""
+        with self._lock:
+            if self.retentativas < self.minimo + self.proporcao * self.requisicoes:
+                self.retentativas += 1
+                return True
+            self.negadas += 1
+            return False
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "requisicoes": self.requisicoes,
+                "retentativas": self.retentativas,
+                "retentativas_negadas": self.negadas
+            }
+
+
+class ControleConcorrenciaAIMD:
+    """
+    Limite de requisições simultâneas ajustado por AIMD.
+
+    O limite cresce aditivamente (cerca de +1 a cada janela completa de
+    requisições) enquanto a latência fica próxima da melhor observada e a taxa
+    de erros é baixa, e cai multiplicativamente em erros de cota, erros
+    frequentes ou latência degradada. Só as últimas `janela_latencias`
+    latências ficam guardadas para os percentis. Deve ser criado dentro do
+    event loop que o utiliza.
+    """
+
+    def __init__(self, inicial=CONCORRENCIA_INICIAL_PADRAO, minimo=1, maximo=64, fator_reducao=0.5,
+                 limite_latencia=2.0, limite_erros=0.1, intervalo_reducao=INTERVALO_REDUCAO,
+                 janela_latencias=JANELA_LATENCIAS_CONCORRENCIA):
+        self.minimo = max(1, minimo)
+        self.maximo = max(self.minimo, maximo)
+        self.limite = float(min(self.maximo, max(self.minimo, inicial)))
+        self.fator_reducao = fator_reducao
+        self.limite_latencia = limite_latencia
+        self.limite_erros = limite_erros
+        self.intervalo_reducao = intervalo_reducao
+        self.em_voo = 0
+        self.pico = 0
+        self.reducoes = 0
+        self._latencia_media = None
+        self._latencia_base = None
+        # Janela limitada: em execuções longas a lista cresceria sem fim
+        self.latencias = deque(maxlen=janela_latencias)
+        self._taxa_erros = 0.0
+        self._ultima_reducao = 0.0
+        self._condicao = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condicao:
+            await self._condicao.wait_for(lambda: self.em_voo < int(self.limite))
+            self.em_voo += 1
+            self.pico = max(self.pico, self.em_voo)
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condicao:
+            self.em_voo -= 1
+            self._condicao.notify_all()
+
+    def registrar_sucesso(self, latencia: float):
+        self.latencias.append(latencia)
+        self._taxa_erros *= 0.95
+        if self._latencia_media is None:
+            self._latencia_media = latencia
+        else:
+            self._latencia_media = 0.8 * self._latencia_media + 0.2 * latencia
+        if self._latencia_base is None or self._latencia_media < self._latencia_base:
+            self._latencia_base = self._latencia_media
+        else:
+            # Deixa a referência acompanhar mudanças lentas do serviço
+            self._latencia_base += (self._latencia_media - self._latencia_base) * 0.01
+
+        if self._latencia_media > self._latencia_base * self.limite_latencia * 1.5:
+            self._reduzir()
+        elif self._latencia_media <= self._latencia_base * self.limite_latencia and self._taxa_erros < self.limite_erros:
+            self.limite = min(self.maximo, self.limite + 1 / self.limite)
+
+    def registrar_falha(self, cota: bool = False):
+        self._taxa_erros = 0.95 * self._taxa_erros + 0.05
+        if cota or self._taxa_erros > self.limite_erros:
+            self._reduzir()
+
+    def _reduzir(self):
+        agora = time.monotonic()
+        # Uma rajada de erros simultâneos conta como um único evento de congestionamento
+        if agora - self._ultima_reducao >= self.intervalo_reducao:
+            self.limite = max(self.minimo, self.limite * self.fator_reducao)
+            self._ultima_reducao = agora
+            self.reducoes += 1
+
+    def estatisticas(self) -> dict:
+        return {
+            "limite_concorrencia": int(self.limite),
+            "pico_concorrencia": self.pico,
+            "reducoes": self.reducoes,
+            "latencia_media": self._latencia_media
+        }
+
+
+class ControlePrazos:
+    """
+    Prazo por requisição e requisições de reserva (hedging) contra a cauda de latência.
+
+    Uma chamada que passa de `timeout` segundos é cancelada e levanta
+    TimeoutError, que entra nas retentativas como erro transitório. Com
+    `hedge`, quando a chamada passa do p95 das latências recentes de chamadas
+    do mesmo tipo, uma cópia é disparada e vale a primeira resposta; a outra é
+    cancelada. As cópias ficam limitadas a `proporcao_hedge` das chamadas e só
+    saem se o limitador tiver um token livre naquele momento.
+    """
+
+    def __init__(self, timeout=TIMEOUT_REQUISICAO_PADRAO, hedge=True, proporcao_hedge=PROPORCAO_HEDGE_PADRAO,
+                 minimo_amostras=MINIMO_AMOSTRAS_HEDGE):
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.hedge = hedge
+        self.proporcao_hedge = proporcao_hedge
+        self.minimo_amostras = max(1, minimo_amostras)
+        self.chamadas = 0
+        self.hedges = 0
+        self.hedges_vencedores = 0
+        self.timeouts = 0
+        self._latencias = {}
+        self._lock = threading.Lock()
+
+    def limiar_hedge(self, tipo=None):
+        """p95 das latências recentes do tipo de chamada, ou None com poucas amostras."""
+        with self._lock:
+            janela = self._latencias.get(tipo)
+            if janela is None or len(janela) < self.minimo_amostras:
+                return None
+            ordenados = sorted(janela)
+        return ordenados[int(round(0.95 * (len(ordenados) - 1)))]
+
+    def _registrar_latencia(self, tipo, latencia):
+        with self._lock:
+            if tipo not in self._latencias:
+                self._latencias[tipo] = deque(maxlen=JANELA_LATENCIAS_HEDGE)
+            self._latencias[tipo].append(latencia)
+
+    def _liberar_hedge(self, limitador) -> bool:
+        with self._lock:
+            if self.hedges >= self.proporcao_hedge * self.chamadas:
+                return False
+        if limitador is not None and not limitador.tentar_adquirir():
+            return False
+        with self._lock:
+            self.hedges += 1
+        return True
+
+    async def executar(self, fabrica, tipo=None, limitador=None):
+        """
+        Aguarda `fabrica()` (que cria a corrotina da chamada) dentro do prazo.
+
+        `tipo` separa as latências de chamadas de tamanhos diferentes (ex.: o
+        limite de tokens de saída). Levanta TimeoutError se nenhuma cópia
+        responder a tempo, ou o erro da última cópia que falhar.
+        """
+        with self._lock:
+            self.chamadas += 1
+        inicio = time.monotonic()
+        limite = inicio + self.timeout if self.timeout else None
+        limiar = self.limiar_hedge(tipo) if self.hedge else None
+        original = asyncio.ensure_future(fabrica())
+        tarefas = [original]
+        erro = None
+
+        try:
+            while tarefas:
+                agora = time.monotonic()
+                esperas = []
+                if limite is not None:
+                    if agora >= limite:
+                        break
+                    esperas.append(limite - agora)
+                if limiar is not None:
+                    esperas.append(max(0.0, inicio + limiar - agora))
+
+                prontas, _ = await asyncio.wait(
+                    tarefas, timeout=min(esperas) if esperas else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for tarefa in prontas:
+                    tarefas.remove(tarefa)
+                    if tarefa.exception() is None:
+                        self._registrar_latencia(tipo, time.monotonic() - inicio)
+                        if tarefa is not original:
+                            with self._lock:
+                                self.hedges_vencedores += 1
+                        return tarefa.result()
+                    erro = tarefa.exception()
+
+                if limiar is not None and tarefas and time.monotonic() >= inicio + limiar:
+                    limiar = None  # No máximo uma cópia por chamada
+                    if self._liberar_hedge(limitador):
+                        tarefas.append(asyncio.ensure_future(fabrica()))
+
+            if erro is not None and not tarefas:
+                raise erro
+            self.registrar_timeout()
+            raise TimeoutError(f"Requisição excedeu o prazo de {self.timeout:.0f}s")
+        finally:
+            for tarefa in tarefas:
+                if tarefa.done():
+                    if not tarefa.cancelled():
+                        tarefa.exception()  # Evita o aviso de exceção não recuperada
+                else:
+                    tarefa.cancel()
+
+    def registrar_timeout(self):
+        """Conta uma chamada que estourou o prazo fora de `executar` (ex.: chamadas síncronas)."""
+        with self._lock:
+            self.timeouts += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "hedges": self.hedges,
+                "hedges_vencedores": self.hedges_vencedores,
+                "timeouts": self.timeouts
+            }
+
+
+def definir_limitador(limitador):
+    """Substitui o limitador global (ex.: benchmarks contra o backend simulado)."""
+    global _limitador_global
+    with _lock_global:
+        _limitador_global = limitador
+
+
+def obter_limitador():
+    """Retorna o token bucket global configurado em [LIMITES] no config.ini."""
+    global _limitador_global
+
+    with _lock_global:
+        if _limitador_global is None:
+            _limitador_global = LimitadorTokenBucket(
+                requisicoes_por_minuto=obter_opcao('LIMITES', 'REQUISICOES_POR_MINUTO',
+                                                   REQUISICOES_POR_MINUTO_PADRAO, float),
+                rajada=obter_opcao('LIMITES', 'RAJADA', RAJADA_PADRAO, int)
+            )
+        return _limitador_global
+
+
+def obter_orcamento_retentativas():
+    """Retorna o orçamento global de retentativas configurado em [LIMITES]."""
+    global _orcamento_global
+
+    with _lock_global:
+        if _orcamento_global is None:
+            _orcamento_global = OrcamentoRetentativas(
+                proporcao=obter_opcao('LIMITES', 'PROPORCAO_RETENTATIVAS', PROPORCAO_RETENTATIVAS_PADRAO, float),
+                minimo=obter_opcao('LIMITES', 'MINIMO_RETENTATIVAS', MINIMO_RETENTATIVAS_PADRAO, int)
+            )
+        return _orcamento_global
+
+
+def definir_controle_prazos(controle):
+    """Substitui o controle de prazos global (ex.: benchmarks com outro timeout)."""
+    global _prazos_global
+    with _lock_global:
+        _prazos_global = controle
+
+
+def obter_controle_prazos():
+    """Retorna o controle global de prazos e hedging configurado em [PRAZOS]."""
+    global _prazos_global
+
+    with _lock_global:
+        if _prazos_global is None:
+            _prazos_global = ControlePrazos(
+                timeout=obter_opcao('PRAZOS', 'TIMEOUT_REQUISICAO', TIMEOUT_REQUISICAO_PADRAO, float),
+                hedge=obter_opcao('PRAZOS', 'HEDGE', True, bool),
+                proporcao_hedge=obter_opcao('PRAZOS', 'PROPORCAO_HEDGE', PROPORCAO_HEDGE_PADRAO, float)
+            )
+        return _prazos_global
@@ -0,0 +1,425 @@
+"""
+Escrita do relatório à medida que os resultados chegam, em vários formatos.
+
+Os comentários analisados vão para arquivos parciais assim que cada bloco
+fica pronto, renderizados de uma vez por bloco (uma escrita por bloco, não
+por comentário); o cabeçalho (estatísticas e resumo executivo), que só é
+conhecido no fim, é escrito em `finalizar`, seguido do conteúdo parcial.
+
+Formatos ([RELATORIO] FORMATOS):
+- md: o relatório Markdown; a seção por comentário pode ser truncada
+  (MAX_COMENTARIOS) ou dividida em páginas em arquivos à parte
+  (COMENTARIOS_POR_PAGINA), para continuar leve com 100k comentários;
+- csv: uma linha por comentário, com os resultados;
+- parquet: o mesmo em Parquet, com colunas categóricas (requer pyarrow);
+- html: relatório autocontido (CSS embutido, sem scripts nem arquivos
+  externos), com gráficos de barras das contagens e a tabela de comentários.
+"""
+
+import csv
+import html
+import os
+import re
+import shutil
+from collections import Counter
+
+from .config import obter_opcao
+
+
+FORMATOS_RELATORIO = ('md', 'csv', 'parquet', 'html')
+COLUNAS_CSV = ['linha', 'data', 'fonte', 'comentario', 'sentimento', 'categoria', 'resumo_curto']
+
+
+class EscritorRelatorioMarkdown:
+    """
+    Relatório Markdown escrito em fluxo.
+
+    Com `max_comentarios`, só os primeiros comentários entram na seção por
+    comentário; com `comentarios_por_pagina`, a seção vai para arquivos
+    `<relatório>_comentarios_001.md`, ..., ligados a partir do relatório.
+    """
+
+    def __init__(self, caminho, max_comentarios=0, comentarios_por_pagina=0):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.caminho = caminho
+        self.max_comentarios = max_comentarios
+        self.comentarios_por_pagina = comentarios_por_pagina
+        self._caminho_parcial = caminho + '.parcial'
+        self._paginas = []
+        self._na_pagina = 0
+        self._corpo = None
+        if not comentarios_por_pagina:
+            self._corpo = open(self._caminho_parcial, 'w', encoding='utf-8')
+        self.renderizados = 0
+        self.omitidos = 0
+
+    def _nova_pagina(self):
+        if self._corpo is not None:
+            self._corpo.close()
+        base, extensao = os.path.splitext(self.caminho)
+        caminho = f"{base}_comentarios_{len(self._paginas) + 1:03d}{extensao}"
+        self._paginas.append((caminho, self.renderizados + 1))
+        self._corpo = open(caminho, 'w', encoding='utf-8')
+        self._corpo.write(f"# 💬 Comentários Analisados (a partir do {self.renderizados + 1}º)\n\n")
+        self._na_pagina = 0
+
+    def escrever(self, registros, resultados):
+        """Acrescenta os comentários analisados (registros com linha, data, fonte e comentario)."""
+        pares = list(zip(registros, resultados))
+        if self.max_comentarios:
+            restantes = max(0, self.max_comentarios - self.renderizados)
+            self.omitidos += max(0, len(pares) - restantes)
+            pares = pares[:restantes]
+
+        inicio = 0
+        while inicio < len(pares):
+            fim = len(pares)
+            if self.comentarios_por_pagina:
+                if self._corpo is None or self._na_pagina >= self.comentarios_por_pagina:
+                    self._nova_pagina()
+                fim = min(fim, inicio + self.comentarios_por_pagina - self._na_pagina)
+            self._corpo.write(_markdown_comentarios(pares[inicio:fim]))
+            self._corpo.flush()
+            self._na_pagina += fim - inicio
+            self.renderizados += fim - inicio
+            inicio = fim
+
+    def finalizar(self, cabecalho: str, outros_formatos=()):
+        """Grava o relatório final: `cabecalho` seguido dos comentários já escritos (ou dos links das páginas)."""
+        if self._corpo is not None:
+            self._corpo.close()
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            f.write(cabecalho)
+            f.write("## 💬 Comentários Analisados\n\n")
+            if self.comentarios_por_pagina:
+                for numero, (caminho, primeiro) in enumerate(self._paginas, start=1):
+                    ultimo = self._paginas[numero][1] - 1 if numero < len(self._paginas) else self.renderizados
+                    f.write(f"- [Página {numero}: comentários {primeiro} a {ultimo}]({os.path.basename(caminho)})\n")
+                f.write("\n")
+            else:
+                with open(self._caminho_parcial, 'r', encoding='utf-8') as parcial:
+                    shutil.copyfileobj(parcial, f)
+                os.remove(self._caminho_parcial)
+            if self.omitidos:
+                completos = ", ".join(os.path.basename(caminho) for caminho in outros_formatos)
+                f.write(f"_… mais {self.omitidos} comentários omitidos deste relatório"
+                        f"{f' (lista completa em: {completos})' if completos else ''}._\n")
+
+    def descartar(self):
+        if self._corpo is not None:
+            self._corpo.close()
+        for caminho in [self._caminho_parcial] + [caminho for caminho, _ in self._paginas]:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+def _markdown_comentarios(pares):
+    return "".join(
+        f"### {'❌' if resultado['sentimento'] == 'Erro' else '✅'} Comentário {registro['linha'] + 1}\n"
+        f"**Data:** {registro.get('data', '')}\n"
+        f"**Fonte:** {registro.get('fonte', '')}\n"
+        f"**Texto:** _{registro['comentario']}_\n"
+        f"**Sentimento:** {resultado['sentimento']}\n"
+        f"**Categoria:** {resultado['categoria']}\n"
+        f"**Resumo:** {resultado['resumo_curto']}\n\n"
+        for registro, resultado in pares
+    )
+
+
+class EscritorRelatorioCsv:
+    """Uma linha por comentário analisado, com os resultados."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._caminho_parcial = caminho + '.parcial'
+        self._arquivo = open(self._caminho_parcial, 'w', encoding='utf-8', newline='')
+        self._csv = csv.writer(self._arquivo)
+        self._csv.writerow(COLUNAS_CSV)
+
+    def escrever(self, registros, resultados):
+        self._csv.writerows(
+            (registro['linha'] + 1, registro.get('data', ''), registro.get('fonte', ''), registro['comentario'],
+             resultado['sentimento'], resultado['categoria'], resultado['resumo_curto'])
+            for registro, resultado in zip(registros, resultados)
+        )
+        self._arquivo.flush()
+
+    def finalizar(self, cabecalho: str, outros_formatos=()):
+        self._arquivo.close()
+        os.replace(self._caminho_parcial, self.caminho)
+
+    def descartar(self):
+        self._arquivo.close()
+        if os.path.exists(self._caminho_parcial):
+            os.remove(self._caminho_parcial)
+
+
+class EscritorRelatorioParquet:
+    """Os comentários analisados em Parquet, no mesmo esquema do histórico (`armazem_resultados`)."""
+
+    def __init__(self, caminho, produto, id_execucao=None):
+        from .armazem_resultados import ArmazemResultados
+
+        self.caminho = caminho
+        id_execucao = id_execucao or os.path.splitext(os.path.basename(caminho))[0]
+        self._armazem = ArmazemResultados(os.path.dirname(caminho) or '.', id_execucao, produto, caminho=caminho)
+
+    def escrever(self, registros, resultados):
+        self._armazem.escrever(registros, resultados)
+
+    def finalizar(self, cabecalho: str, outros_formatos=()):
+        self._armazem.finalizar()
+
+    def descartar(self):
+        self._armazem.descartar()
+
+
+ESTILO_HTML = """
+body{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;max-width:1100px;margin:2em auto;
+padding:0 1em;color:#222;line-height:1.5}
+h1,h2,h3{line-height:1.2}
+table{border-collapse:collapse;width:100%;font-size:.9em;margin:1em 0}
+th,td{border:1px solid #ddd;padding:.35em .5em;text-align:left;vertical-align:top}
+th{background:#f4f4f4;position:sticky;top:0}
+tr.erro td{background:#fff3f3}
+.barras{display:grid;grid-template-columns:max-content 1fr max-content;gap:.3em .6em;align-items:center}
+.barra{background:#4a7bd0;height:1em;border-radius:2px}
+.nota{color:#666;font-style:italic}
+"""
+
+
+class EscritorRelatorioHtml:
+    """Relatório HTML autocontido: cabeçalho, gráficos das contagens e a tabela de comentários."""
+
+    def __init__(self, caminho, max_comentarios=0):
+        self.caminho = caminho
+        self.max_comentarios = max_comentarios
+        self._caminho_parcial = caminho + '.parcial'
+        self._corpo = open(self._caminho_parcial, 'w', encoding='utf-8')
+        self.contagem_sentimentos = Counter()
+        self.contagem_categorias = Counter()
+        self.renderizados = 0
+        self.omitidos = 0
+
+    def escrever(self, registros, resultados):
+        pares = list(zip(registros, resultados))
+        for _, resultado in pares:
+            if resultado['sentimento'] != 'Erro':
+                self.contagem_sentimentos[resultado['sentimento']] += 1
+                self.contagem_categorias[resultado['categoria']] += 1
+        if self.max_comentarios:
+            restantes = max(0, self.max_comentarios - self.renderizados)
+            self.omitidos += max(0, len(pares) - restantes)
+            pares = pares[:restantes]
+        if not pares:
+            return
+
+        escapar = html.escape
+        self._corpo.write("".join(
+            ('<tr class="erro">' if resultado['sentimento'] == 'Erro' else "<tr>") +
+            f"<td>{registro['linha'] + 1}</td><td>{escapar(str(registro.get('data', '')))}</td>"
+            f"<td>{escapar(str(registro.get('fonte', '')))}</td><td>{escapar(str(registro['comentario']))}</td>"
+            f"<td>{escapar(str(resultado['sentimento']))}</td><td>{escapar(str(resultado['categoria']))}</td>"
+            f"<td>{escapar(str(resultado['resumo_curto']))}</td></tr>\n"
+            for registro, resultado in pares
+        ))
+        self._corpo.flush()
+        self.renderizados += len(pares)
+
+    def finalizar(self, cabecalho: str, outros_formatos=()):
+        self._corpo.close()
+        titulo = next((linha.lstrip('# ').strip() for linha in cabecalho.splitlines() if linha.startswith('# ')),
+                      'Análise de Feedback')
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            f.write(f"<!DOCTYPE html>\n<html lang=\"pt-BR\"><head><meta charset=\"utf-8\">"
+                    f"<title>{html.escape(titulo)}</title><style>{ESTILO_HTML}</style></head><body>\n")
+            f.write(markdown_para_html(cabecalho))
+            f.write(_barras_html("Sentimentos", self.contagem_sentimentos))
+            f.write(_barras_html("Categorias", self.contagem_categorias))
+            f.write("<h2>💬 Comentários Analisados</h2>\n<table><thead><tr><th>#</th><th>Data</th><th>Fonte</th>"
+                    "<th>Comentário</th><th>Sentimento</th><th>Categoria</th><th>Resumo</th></tr></thead><tbody>\n")
+            with open(self._caminho_parcial, 'r', encoding='utf-8') as parcial:
+                shutil.copyfileobj(parcial, f)
+            f.write("</tbody></table>\n")
+            if self.omitidos:
+                completos = ", ".join(os.path.basename(caminho) for caminho in outros_formatos)
+                f.write(f"<p class=\"nota\">… mais {self.omitidos} comentários omitidos"
+                        f"{f' (lista completa em: {html.escape(completos)})' if completos else ''}.</p>\n")
+            f.write("</body></html>\n")
+        os.remove(self._caminho_parcial)
+
+    def descartar(self):
+        self._corpo.close()
+        if os.path.exists(self._caminho_parcial):
+            os.remove(self._caminho_parcial)
+
+
+def _barras_html(titulo, contagem):
+    if not contagem:
+        return ""
+    maior = max(contagem.values())
+    linhas = "".join(
+        f"<span>{html.escape(str(nome))}</span>"
+        f"<div class=\"barra\" style=\"width:{100 * quantidade / maior:.1f}%\"></div><span>{quantidade}</span>"
+        for nome, quantidade in contagem.most_common()
+    )
+    return f"<h3>{html.escape(titulo)}</h3>\n<div class=\"barras\">{linhas}</div>\n"
+
+
+def _html_em_linha(texto):
+    texto = html.escape(texto, quote=False)
+    texto = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', texto)
+    texto = re.sub(r'`([^`]+)`', r'<code>\1</code>', texto)
+    return texto
+
+
+def markdown_para_html(texto: str) -> str:
+    """
+    Converte o Markdown do cabeçalho do relatório para HTML.
+
+    Cobre o que o cabeçalho e o resumo executivo usam: títulos, negrito,
+    código, listas, tabelas, linhas horizontais e parágrafos.
+    """
+    saida = []
+    paragrafo, lista, tabela = [], [], []
+
+    def fechar_blocos():
+        if paragrafo:
+            saida.append("<p>" + "<br>\n".join(paragrafo) + "</p>")
+            paragrafo.clear()
+        if lista:
+            saida.append("<ul>" + "".join(f"<li>{item}</li>" for item in lista) + "</ul>")
+            lista.clear()
+        if tabela:
+            cabecalho, *linhas = tabela
+            saida.append("<table><thead><tr>" + "".join(f"<th>{c}</th>" for c in cabecalho) + "</tr></thead><tbody>"
+                         + "".join("<tr>" + "".join(f"<td>{c}</td>" for c in linha) + "</tr>" for linha in linhas)
+                         + "</tbody></table>")
+            tabela.clear()
+
+    for linha in texto.splitlines():
+        limpa = linha.strip()
+        titulo = re.match(r'(#{1,6})\s+(.*)', limpa)
+        item = re.match(r'(?:[-*•+]|\d+[.)])\s+(.*)', limpa)
+        if limpa.startswith('|'):
+            if not tabela:
+                fechar_blocos()
+            if not re.fullmatch(r'\|[\s:|-]+\|?', limpa):  # Linha separadora |---|---|
+                tabela.append([_html_em_linha(celula.strip()) for celula in limpa.strip('|').split('|')])
+            continue
+        if tabela:
+            fechar_blocos()
+        if not limpa:
+            fechar_blocos()
+        elif titulo:
+            fechar_blocos()
+            nivel = len(titulo.group(1))
+            saida.append(f"<h{nivel}>{_html_em_linha(titulo.group(2))}</h{nivel}>")
+        elif re.fullmatch(r'-{3,}|\*{3,}|_{3,}', limpa):
+            fechar_blocos()
+            saida.append("<hr>")
+        elif item:
+            if paragrafo:
+                fechar_blocos()
+            lista.append(_html_em_linha(item.group(1)))
+        else:
+            if lista:
+                fechar_blocos()
+            paragrafo.append(_html_em_linha(limpa))
+    fechar_blocos()
+    return "\n".join(saida) + "\n"
+
+
+class EscritorRelatorios:
+    """
+    Relatório em todos os formatos pedidos, com as contagens acumuladas.
+
+    Repassa cada bloco de resultados a cada formato; `caminhos` lista os
+    arquivos gerados, o Markdown (se pedido) primeiro.
+    """
+
+    def __init__(self, escritores):
+        self.escritores = escritores
+        self.contagem_sentimentos = Counter()
+        self.contagem_categorias = Counter()
+        self.total = 0
+        self.validos = 0
+
+    @property
+    def caminhos(self):
+        return [escritor.caminho for escritor in self.escritores]
+
+    def escrever(self, registros, resultados):
+        """Acrescenta os comentários analisados (registros com linha, data, fonte e comentario)."""
+        for resultado in resultados:
+            self.total += 1
+            if resultado['sentimento'] != 'Erro':
+                self.validos += 1
+                self.contagem_sentimentos[resultado['sentimento']] += 1
+                self.contagem_categorias[resultado['categoria']] += 1
+        for escritor in self.escritores:
+            escritor.escrever(registros, resultados)
+
+    def finalizar(self, cabecalho: str):
+        """Grava os arquivos finais; Markdown e HTML recebem `cabecalho` antes dos comentários."""
+        # Se o Markdown/HTML omitir comentários, apontam para os formatos com a lista completa
+        completos = [escritor.caminho for escritor in self.escritores
+                     if isinstance(escritor, (EscritorRelatorioCsv, EscritorRelatorioParquet))]
+        for escritor in self.escritores:
+            escritor.finalizar(cabecalho, completos)
+
+    def descartar(self):
+        for escritor in self.escritores:
+            escritor.descartar()
+
+
+def obter_formatos_relatorio():
+    """Formatos de [RELATORIO] FORMATOS válidos e disponíveis (parquet só com pyarrow)."""
+    pedidos = [formato.strip().lower() for formato in
+               obter_opcao('RELATORIO', 'FORMATOS', ",".join(FORMATOS_RELATORIO)).split(',') if formato.strip()]
+    formatos = []
+    for formato in pedidos:
+        if formato not in FORMATOS_RELATORIO:
+            print(f"[AVISO] Formato de relatório desconhecido: '{formato}' (use {', '.join(FORMATOS_RELATORIO)})")
+        elif formato == 'parquet' and not _pyarrow_disponivel():
+            print("[AVISO] pyarrow não instalado; relatório sem a saída Parquet (pip install pyarrow).")
+        elif formato not in formatos:
+            formatos.append(formato)
+    return formatos or ['md']
+
+
+def _pyarrow_disponivel():
+    from .armazem_resultados import pa
+    return pa is not None
+
+
+def criar_escritor_relatorio(caminho_base, produto, formatos=None, id_execucao=None) -> EscritorRelatorios:
+    """
+    Escritores de `caminho_base` + extensão para cada formato (por padrão [RELATORIO] FORMATOS).
+
+    A seção por comentário do Markdown e do HTML segue [RELATORIO]
+    MAX_COMENTARIOS (0 = todos) e, no Markdown, COMENTARIOS_POR_PAGINA
+    (0 = tudo no relatório).
+    """
+    pasta = os.path.dirname(caminho_base)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    formatos = formatos or obter_formatos_relatorio()
+    max_comentarios = obter_opcao('RELATORIO', 'MAX_COMENTARIOS', 0, int)
+    comentarios_por_pagina = obter_opcao('RELATORIO', 'COMENTARIOS_POR_PAGINA', 0, int)
+
+    escritores = []
+    for formato in sorted(formatos, key=FORMATOS_RELATORIO.index):
+        caminho = f"{caminho_base}.{formato}"
+        if formato == 'md':
+            escritores.append(EscritorRelatorioMarkdown(caminho, max_comentarios, comentarios_por_pagina))
+        elif formato == 'csv':
+            escritores.append(EscritorRelatorioCsv(caminho))
+        elif formato == 'parquet':
+            escritores.append(EscritorRelatorioParquet(caminho, produto, id_execucao))
+        else:
+            escritores.append(EscritorRelatorioHtml(caminho, max_comentarios))
+    return EscritorRelatorios(escritores)
@@ -0,0 +1,150 @@
+"""
+Resumo executivo em duas etapas (map-reduce) sobre o conteúdo dos comentários.
+
+1. Mapa: para cada grupo (categoria, sentimento), uma amostra dos
+   `resumo_curto` é resumida pelo modelo; os grupos rodam em paralelo.
+2. Redução: os resumos parciais, com as contagens, viram o resumo executivo.
+
+A amostra de cada grupo é estável: ficam os resumos com os menores hashes
+(bottom-k), então novos comentários só mudam a amostra quando entram nela. O
+resumo parcial é guardado no cache pela amostra, e uma nova execução só gera
+de novo os grupos cuja amostra mudou.
+"""
+
+import asyncio
+import hashlib
+import heapq
+
+from .cache import obter_cache, normalizar_texto
+from .gemini_processor import _gerar_texto_async, obter_backend, gerar_resumo_executivo_async
+
+
+AMOSTRA_POR_GRUPO_PADRAO = 40
+VERSAO_PROMPT_RESUMO = 1  # Incrementar ao mudar os prompts abaixo (invalida os resumos em cache)
+TOKENS_RESUMO_PARCIAL = 200
+TOKENS_RESUMO_EXECUTIVO = 400
+
+
+def _hash_estavel(texto: str) -> int:
+    return int.from_bytes(hashlib.sha1(texto.encode('utf-8')).digest()[:8], 'big')
+
+
+class AmostraPorGrupo:
+    """Contagens e amostra estável dos resumos curtos por (categoria, sentimento)."""
+
+    def __init__(self, tamanho_amostra=AMOSTRA_POR_GRUPO_PADRAO):
+        self.tamanho_amostra = tamanho_amostra
+        self.contagens = {}
+        self._amostras = {}  # grupo -> heap de (-hash, texto) com os menores hashes
+
+    def adicionar(self, resultados):
+        for resultado in resultados:
+            if not resultado or resultado.get('sentimento') == 'Erro':
+                continue
+            grupo = (resultado['categoria'], resultado['sentimento'])
+            self.contagens[grupo] = self.contagens.get(grupo, 0) + 1
+
+            texto = " ".join(str(resultado.get('resumo_curto', '')).split())
+            if not texto:
+                continue
+            heap = self._amostras.setdefault(grupo, [])
+            item = (-_hash_estavel(normalizar_texto(texto)), texto)
+            if item in heap:
+                continue
+            if len(heap) < self.tamanho_amostra:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def grupos(self) -> list:
+        """Lista de (categoria, sentimento, contagem, amostra), dos maiores grupos para os menores."""
+        return [
+            (categoria, sentimento, contagem, sorted(texto for _, texto in self._amostras.get((categoria, sentimento), [])))
+            for (categoria, sentimento), contagem in sorted(self.contagens.items(), key=lambda item: -item[1])
+        ]
+
+
+def _montar_prompt_grupo(categoria, sentimento, amostra) -> str:
+    resumos = "\n".join(f"- {texto}" for texto in amostra)
+    return f"""
+    Como Analista de Produto, leia os resumos de comentários de clientes com
+    sentimento "{sentimento}" sobre "{categoria}":
+
+    {resumos}
+
+    Em 2-3 frases, descreva os temas recorrentes e os problemas ou elogios
+    mais concretos. Use apenas o que está nos resumos.
+    """
+
+
+def _montar_prompt_reducao(estatisticas, parciais) -> str:
+    grupos = "\n".join(
+        f"- {sentimento} / {categoria} ({contagem} comentários): {texto}"
+        for categoria, sentimento, contagem, texto in parciais
+    )
+    return f"""
+    Como Analista de Produto, escreva um resumo executivo de 3-4 frases baseado nas estatísticas:
+
+    {estatisticas}
+
+    E nos resumos do conteúdo de cada grupo de comentários:
+
+    {grupos}
+
+    Destaque a tendência principal e problema mais urgente, citando o que os clientes relatam.
+    """
+
+
+def _chave_grupo(categoria, sentimento, amostra) -> str:
+    conteudo = "\x1f".join([obter_backend().modelo, str(VERSAO_PROMPT_RESUMO), categoria, sentimento, *amostra])
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+async def _resumir_grupos_async(grupos) -> list:
+    cache = obter_cache()
+    reaproveitados = 0
+
+    async def resumir(categoria, sentimento, contagem, amostra):
+        nonlocal reaproveitados
+        chave = _chave_grupo(categoria, sentimento, amostra)
+        if cache is not None:
+            em_cache = cache.obter_resumo(chave)
+            if em_cache is not None:
+                reaproveitados += 1
+                return categoria, sentimento, contagem, em_cache
+
+        try:
+            texto = " ".join((await _gerar_texto_async(
+                _montar_prompt_grupo(categoria, sentimento, amostra), TOKENS_RESUMO_PARCIAL
+            )).split())
+        except Exception as e:
+            print(f"[AVISO] Falha ao resumir o grupo {sentimento}/{categoria}: {e}")
+            return None
+
+        if cache is not None and texto:
+            cache.salvar_resumo(chave, texto)
+        return categoria, sentimento, contagem, texto
+
+    parciais = await asyncio.gather(*(resumir(*grupo) for grupo in grupos if grupo[3]))
+    print(f"[INFO] Resumos por grupo: {reaproveitados} do cache, {len(parciais) - reaproveitados} gerados")
+    return [p for p in parciais if p and p[3]]
+
+
+def gerar_resumo_executivo_mapreduce(estatisticas: str, amostras: AmostraPorGrupo) -> str:
+    """
+    Resumo executivo a partir das estatísticas e do conteúdo amostrado de cada grupo.
+
+    Se nenhum resumo parcial puder ser gerado, cai no resumo só de estatísticas.
+    """
+    return asyncio.run(_resumo_mapreduce_async(estatisticas, amostras.grupos()))
+
+
+async def _resumo_mapreduce_async(estatisticas, grupos) -> str:
+    parciais = await _resumir_grupos_async(grupos)
+    if not parciais:
+        return await gerar_resumo_executivo_async(estatisticas)
+
+    try:
+        return await _gerar_texto_async(_montar_prompt_reducao(estatisticas, parciais), TOKENS_RESUMO_EXECUTIVO)
+    except Exception:
+        return "Erro ao gerar resumo executivo."
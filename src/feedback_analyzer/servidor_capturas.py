@@ -0,0 +1,113 @@
+"""
+Servidor HTTP local que reproduz as páginas gravadas por `capturas`.
+
+Serve cada captura no caminho espelhado da URL original (ver
+`capturas.para_reproducao`), com ETag e Last-Modified, e responde 304 a
+GETs condicionais como um site real. Se a página não tiver o tipo pedido
+('http' ou 'dom'), serve o outro. A latência por requisição é configurável.
+
+Uso:
+    python -m feedback_analyzer.servidor_capturas --pasta capturas/ --porta 8766
+
+E no config.ini:
+    [EXTRACAO]
+    SERVIDOR_REPRODUCAO = http://127.0.0.1:8766
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .capturas import TIPOS_CAPTURA, ler_indice, url_do_caminho
+
+
+def _carregar_capturas(pasta):
+    # url -> tipo -> (conteúdo, tipo de conteúdo, etag, last-modified)
+    capturas = {}
+    for url, por_tipo in ler_indice(pasta)['paginas'].items():
+        for tipo, dados in por_tipo.items():
+            caminho = os.path.join(pasta, dados['arquivo'])
+            with open(caminho, 'rb') as f:
+                conteudo = f.read()
+            capturas.setdefault(url, {})[tipo] = (
+                conteudo,
+                dados.get('tipo_conteudo') or 'text/html; charset=utf-8',
+                '"' + hashlib.sha1(conteudo).hexdigest()[:16] + '"',
+                formatdate(os.path.getmtime(caminho), usegmt=True)
+            )
+    return capturas
+
+
+def _criar_handler(capturas, latencia):
+
+    class HandlerCapturas(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _responder(self, status, corpo=b'', cabecalhos=()):
+            self.send_response(status)
+            for nome, valor in cabecalhos:
+                self.send_header(nome, valor)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            if latencia:
+                time.sleep(latencia)
+
+            tipo, url = url_do_caminho(self.path)
+            por_tipo = capturas.get(url) if url else None
+            if not por_tipo:
+                self._responder(404, b'Pagina nao capturada', [("Content-Type", "text/plain")])
+                return
+
+            outro = next(t for t in TIPOS_CAPTURA if t != tipo)
+            conteudo, tipo_conteudo, etag, modificado = por_tipo.get(tipo) or por_tipo[outro]
+            cabecalhos = [("ETag", etag), ("Last-Modified", modificado)]
+            if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == modificado:
+                self._responder(304, cabecalhos=cabecalhos)
+                return
+            self._responder(200, conteudo, [("Content-Type", tipo_conteudo), *cabecalhos])
+
+        def log_message(self, formato, *args):
+            pass  # Sem log por requisição durante benchmarks
+
+    return HandlerCapturas
+
+
+def iniciar_servidor_capturas(pasta, host='127.0.0.1', porta=0, latencia=0.0):
+    """
+    Sobe o servidor em uma thread de fundo.
+
+    Com `porta=0` uma porta livre é escolhida. Retorna (servidor, url);
+    encerre com `servidor.shutdown()`.
+    """
+    servidor = ThreadingHTTPServer((host, porta), _criar_handler(_carregar_capturas(pasta), latencia))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que reproduz páginas capturadas na extração")
+    parser.add_argument("--pasta", required=True, help="Pasta das capturas ([EXTRACAO] PASTA_CAPTURA)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8766)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos de espera por requisição")
+    args = parser.parse_args()
+
+    capturas = _carregar_capturas(args.pasta)
+    servidor = ThreadingHTTPServer((args.host, args.porta), _criar_handler(capturas, args.latencia))
+    print(f"🧪 Reproduzindo {len(capturas)} páginas capturadas em http://{args.host}:{args.porta}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
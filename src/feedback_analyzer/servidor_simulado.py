@@ -0,0 +1,121 @@
+"""
+Servidor HTTP local que imita o endpoint generateContent do Gemini.
+
+Permite testes de carga do pipeline completo (rede incluída) sem gastar cota.
+A latência e as taxas de erro, 429 e JSON malformado são configuráveis.
+
+Uso:
+    python -m feedback_analyzer.servidor_simulado --porta 8765 --taxa-429 0.05
+
+E no config.ini:
+    [BACKEND]
+    TIPO = http
+    URL = http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends import SimuladorGemini, ErroBackend
+
+
+def _criar_handler(simulador):
+
+    class HandlerGeminiSimulado(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _responder(self, status, dados):
+            corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_POST(self):
+            if not self.path.endswith(":generateContent"):
+                self._responder(404, {"error": {"code": 404, "message": "Not found"}})
+                return
+
+            tamanho = int(self.headers.get("Content-Length", 0))
+            try:
+                pedido = json.loads(self.rfile.read(tamanho))
+                prompt = "".join(p.get("text", "") for p in pedido["contents"][0]["parts"])
+                estruturada = "responseSchema" in pedido.get("generationConfig", {})
+            except (ValueError, KeyError, IndexError):
+                self._responder(400, {"error": {"code": 400, "message": "Invalid request"}})
+                return
+
+            time.sleep(simulador.latencia(prompt))
+            try:
+                simulador.verificar_falha()
+            except ErroBackend as e:
+                self._responder(e.code, {"error": {"code": e.code, "message": str(e)}})
+                return
+
+            self._responder(200, {
+                "candidates": [{
+                    "content": {"role": "model", "parts": [{"text": simulador.responder(prompt, estruturada)}]},
+                    "finishReason": "STOP"
+                }]
+            })
+
+        def log_message(self, formato, *args):
+            pass  # Sem log por requisição durante testes de carga
+
+    return HandlerGeminiSimulado
+
+
+def iniciar_servidor_simulado(host='127.0.0.1', porta=0, **parametros_simulacao):
+    """
+    Sobe o servidor em uma thread de fundo.
+
+    Com `porta=0` uma porta livre é escolhida. Retorna (servidor, url);
+    encerre com `servidor.shutdown()`.
+    """
+    simulador = SimuladorGemini(**parametros_simulacao)
+    servidor = ThreadingHTTPServer((host, porta), _criar_handler(simulador))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do Gemini")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia-mediana", type=float, default=0.5)
+    parser.add_argument("--dispersao-latencia", type=float, default=0.4)
+    parser.add_argument("--segundos-por-item", type=float, default=0.02)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--taxa-429", type=float, default=0.0)
+    parser.add_argument("--taxa-json-malformado", type=float, default=0.0)
+    parser.add_argument("--taxa-item-ausente", type=float, default=0.0)
+    parser.add_argument("--taxa-travamento", type=float, default=0.0)
+    parser.add_argument("--taxa-rotulo-variante", type=float, default=0.0)
+    args = parser.parse_args()
+
+    simulador = SimuladorGemini(
+        latencia_mediana=args.latencia_mediana,
+        dispersao_latencia=args.dispersao_latencia,
+        segundos_por_item=args.segundos_por_item,
+        taxa_erro=args.taxa_erro,
+        taxa_429=args.taxa_429,
+        taxa_json_malformado=args.taxa_json_malformado,
+        taxa_item_ausente=args.taxa_item_ausente,
+        taxa_travamento=args.taxa_travamento,
+        taxa_rotulo_variante=args.taxa_rotulo_variante
+    )
+    servidor = ThreadingHTTPServer((args.host, args.porta), _criar_handler(simulador))
+    print(f"🧪 Servidor Gemini simulado em http://{args.host}:{args.porta}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,214 +4,473 @@ Suporta Amazon, MercadoLivre, Google Play, App Store e sites genéricos.
 """
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
-from selenium import webdriver
+import itertools
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import json
-from urllib.parse import urlparse
+import queue
+import threading
+from collections import Counter, deque
+from urllib.parse import urljoin, urlparse
+
+from .config import obter_opcao
+from .driver_pool import criar_driver, obter_pool_drivers, registrar_pagina
+from .http_cliente import extrair_com_cache
+from .analisador_html import analisar_html
+from .capturas import capturar_pagina, obter_pasta_captura, para_reproducao, registrar_listagem, url_original
+from .estado_coleta import Coleta, obter_estado_coletas
+
+
+TIMEOUT_ESPERA_PADRAO = 10  # Segundos esperando o conteúdo de uma página aparecer
+TIMEOUT_ROLAGEM_PADRAO = 2  # Segundos esperando novos itens depois de rolar a página
+TAMANHO_MINIMO_TEXTO = 11  # Textos mais curtos não são comentários
+MAX_EXTRACOES_SIMULTANEAS_PADRAO = 4
+MAX_POR_DOMINIO_PADRAO = 2
+TAMANHO_FILA_EXTRACAO = 1000
+MAX_COMENTARIOS_POR_PAGINA = 100  # A quantidade total depende das páginas lidas ([EXTRACAO] MAX_PAGINAS)
+MAX_PAGINAS_FEED_APP_STORE = 10  # O feed de reviews do App Store não passa da página 10
+# Link para a próxima página de reviews, em ordem de preferência (genérico, Amazon, MercadoLivre)
+SELETORES_PROXIMA_PAGINA = [
+    'link[rel~="next"]',
+    'a[rel~="next"]',
+    'li.a-last a',
+    '.andes-pagination__button--next a',
+    'a[aria-label*="Próxima"]',
+    'a[aria-label*="Siguiente"]',
+    'a[aria-label*="Next"]'
+]
+# Seletores da extração por HTTP, em ordem de preferência (MercadoLivre, Amazon, genéricos)
+SELETORES_HTML = [
+    # MercadoLivre
+    '.ui-review-view__comment',
+    '.ui-review-capability-comments__comment__text',
+    '[class*="review"] [class*="comment"]',
+    '[class*="opinion"]',
+    
+    # Amazon
+    '[data-hook="review-body"] span',
+    '.review-text',
+    '.cr-original-review-text',
+    
+    # Genéricos
+    '[class*="comment"]',
+    '[class*="review"]',
+    '[class*="feedback"]',
+    '.comment-text',
+    '.review-content',
+    '.user-review',
+    '.customer-review'
+]
+SELETOR_APP_STORE = 'p[class*="review"], p[class*="comment"], div[class*="review"], div[class*="comment"]'
+# Busca por texto quando nenhum seletor acha comentários: padrões comuns de
+# reviews, compilados uma vez. Cada padrão percorre o texto inteiro por conta
+# própria (um trecho pode casar em mais de um), como nas buscas separadas.
+PADROES_PALAVRAS_CHAVE = tuple(re.compile(padrao, re.IGNORECASE) for padrao in (
+    r'(?:excelente|ótimo|bom|ruim|péssimo|recomendo|não recomendo).{10,200}',
+    r'(?:produto|app|aplicativo|serviço).{10,200}',
+    r'(?:comprei|usei|testei|instalei).{10,200}',
+))
+# Métodos tentados por plataforma, em ordem, até algum trazer comentários;
+# configurável em [EXTRACAO] ORDEM_<PLATAFORMA> (ex.: ORDEM_AMAZON = http, selenium)
+METODOS_EXTRACAO = ('http', 'selenium')
+ORDEM_EXTRACAO_PADRAO = {
+    'amazon': ('selenium', 'http'),
+    'mercadolivre': ('selenium', 'http'),
+    'google_play': ('selenium', 'http'),
+    'app_store': ('http',),
+    'generico': ('http', 'selenium'),
+}
 
 
 def configurar_driver():
-    """Configura o driver do Chrome com opções otimizadas."""
+    """
+    Abre um driver do Chrome avulso com opções otimizadas.
+
+    A extração usa o pool de `driver_pool`, que reaproveita os navegadores;
+    esta função fica para quem precisa de um driver próprio.
+    """
     try:
-        options = Options()
-        options.add_argument('--headless')  # Executa em modo headless
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
+        return criar_driver()
     except Exception as e:
         print(f"⚠️ Selenium não disponível: {e}")
         print("📝 Tentando extração alternativa com requests...")
         return None
 
 
-def extrair_amazon(driver, url):
-    """Extrai comentários da Amazon."""
-    comentarios = []
-    
+def obter_timeout_espera():
+    return obter_opcao('NAVEGADOR', 'TIMEOUT_ESPERA', TIMEOUT_ESPERA_PADRAO, float)
+
+
+# Coleta, em uma única chamada ao navegador, os textos do primeiro seletor que
+# tiver algum texto válido: já filtrados pelo tamanho mínimo e sem repetições
+SCRIPT_COLHER_TEXTOS = """
+const [seletores, limite, minimo] = arguments;
+for (const seletor of seletores) {
+    let elementos;
+    try {
+        elementos = document.querySelectorAll(seletor);
+    } catch (e) {
+        continue;
+    }
+    const vistos = new Set();
+    const textos = [];
+    for (const elemento of elementos) {
+        const texto = (elemento.innerText || '').trim();
+        if (texto.length >= minimo && !vistos.has(texto)) {
+            vistos.add(texto);
+            textos.push(texto);
+            if (textos.length >= limite) break;
+        }
+    }
+    if (textos.length) return {seletor: seletor, textos: textos, total: elementos.length};
+}
+return {seletor: null, textos: [], total: 0};
+"""
+
+# href, como está no HTML, do primeiro link de próxima página que existir
+SCRIPT_PROXIMA_PAGINA = """
+for (const seletor of arguments[0]) {
+    const elemento = document.querySelector(seletor);
+    const href = elemento && elemento.getAttribute('href');
+    if (href) return href;
+}
+return null;
+"""
+
+
+def colher_textos(driver, seletores, limite=50, minimo=TAMANHO_MINIMO_TEXTO):
+    """
+    Textos do primeiro seletor CSS (na ordem dada) com algum texto válido.
+
+    Roda um único `execute_script` por chamada, em vez de uma ida ao
+    chromedriver por elemento; devolve {'seletor', 'textos', 'total'}, com até
+    `limite` textos únicos de pelo menos `minimo` caracteres e o total de
+    elementos do seletor.
+    """
+    return driver.execute_script(SCRIPT_COLHER_TEXTOS, list(seletores), limite, minimo)
+
+
+def esperar_textos(driver, seletores, limite=50, timeout=None):
+    """
+    Espera até algum dos seletores ter textos válidos e devolve a coleta (ver `colher_textos`).
+
+    Se nada aparecer em `timeout` segundos (por padrão [NAVEGADOR]
+    TIMEOUT_ESPERA), devolve a coleta vazia.
+    """
+    def coletados(driver):
+        coleta = colher_textos(driver, seletores, limite)
+        return coleta if coleta['textos'] else False
+
     try:
-        driver.get(url)
-        time.sleep(3)
-        
-        # Tentar encontrar o link de reviews
+        return WebDriverWait(driver, obter_timeout_espera() if timeout is None else timeout,
+                             poll_frequency=0.2).until(coletados)
+    except TimeoutException:
+        return {'seletor': None, 'textos': [], 'total': 0}
+
+
+def rolar_e_colher(driver, seletor, limite=50, rolagens=3, timeout=None):
+    """
+    Gera os textos de `seletor` enquanto rola a página, até `limite` textos.
+
+    Depois de cada rolagem, espera o número de elementos crescer por até
+    `timeout` segundos (por padrão [NAVEGADOR] TIMEOUT_ROLAGEM) e gera só os
+    textos novos; para quando uma rolagem não trouxer nada.
+    """
+    if timeout is None:
+        timeout = obter_opcao('NAVEGADOR', 'TIMEOUT_ROLAGEM', TIMEOUT_ROLAGEM_PADRAO, float)
+
+    vistos = set()
+    coleta = esperar_textos(driver, [seletor], limite)
+    for rodada in range(rolagens + 1):
+        for texto in coleta['textos']:
+            if texto not in vistos:
+                vistos.add(texto)
+                yield texto
+                if len(vistos) >= limite:
+                    return
+        if rodada == rolagens or not coleta['total']:
+            return
+
+        antes = coleta['total']
+
+        def cresceu(driver):
+            nova = colher_textos(driver, [seletor], limite)
+            return nova if nova['total'] > antes else False
+
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         try:
-            reviews_link = driver.find_element(By.PARTIAL_LINK_TEXT, "customer reviews")
-            reviews_link.click()
-            time.sleep(3)
-        except:
-            # Se não encontrar, tentar buscar reviews na página atual
-            pass
-        
-        # Extrair comentários
-        review_elements = driver.find_elements(By.CSS_SELECTOR, "[data-hook='review-body'] span")
-        
-        for review in review_elements[:50]:  # Limitar a 50 comentários
-            texto = review.text.strip()
-            if texto and len(texto) > 10:
-                comentarios.append(texto)
+            coleta = WebDriverWait(driver, timeout, poll_frequency=0.2).until(cresceu)
+        except TimeoutException:
+            return
+
+
+def abrir_pagina(driver, pagina):
+    """Abre `pagina` no navegador (no servidor de capturas, se a reprodução estiver ligada)."""
+    driver.get(para_reproducao(pagina, 'dom'))
+    registrar_pagina(driver)  # Conta para a reciclagem do driver no pool
+
+
+def capturar_dom(driver, pagina):
+    """Grava o DOM atual como a captura de `pagina`, se a captura estiver ligada."""
+    if obter_pasta_captura() is not None:
+        capturar_pagina(pagina, driver.page_source, 'dom')
+
+
+def proxima_pagina_selenium(driver):
+    """
+    Endereço da próxima página de reviews na página aberta, ou None.
+
+    O href é resolvido contra a URL original da página, mesmo na reprodução.
+    """
+    try:
+        href = driver.execute_script(SCRIPT_PROXIMA_PAGINA, SELETORES_PROXIMA_PAGINA)
+        return urljoin(url_original(driver.current_url), href.strip()) if href else None
+    except WebDriverException:
+        return None
+
+
+def url_reviews_amazon(url):
+    """
+    Primeira página de reviews do produto, dos mais recentes para os mais antigos.
+
+    Monta a URL de /product-reviews/ a partir do ASIN; se não houver ASIN na
+    URL, devolve a própria URL.
+    """
+    encontrado = re.search(r'/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})', url)
+    if not encontrado:
+        return url
+    return f"https://{urlparse(url).netloc}/product-reviews/{encontrado.group(1)}/?sortBy=recent&pageNumber=1"
+
+
+def extrair_amazon(driver, url, coleta=None):
+    """Extrai comentários da Amazon página a página, gerando cada um assim que é encontrado."""
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    
+    def ler_pagina(pagina):
+        abrir_pagina(driver, pagina)
+        
+        if pagina == url:
+            # Sem ASIN: tentar encontrar o link de reviews na página do produto
+            try:
+                reviews_link = driver.find_element(By.PARTIAL_LINK_TEXT, "customer reviews")
+                reviews_link.click()
+            except:
+                # Se não encontrar, tentar buscar reviews na página atual
+                pass
+        
+        # Extrair comentários assim que aparecerem
+        textos = esperar_textos(driver, ["[data-hook='review-body'] span"], limite=MAX_COMENTARIOS_POR_PAGINA)['textos']
+        capturar_dom(driver, pagina)
+        return textos, proxima_pagina_selenium(driver)
+    
+    try:
+        for texto in coleta.percorrer(url_reviews_amazon(url), ler_pagina):
+            encontrados += 1
+            yield texto
         
-        print(f"✅ Amazon: {len(comentarios)} comentários extraídos")
+        print(f"✅ Amazon: {encontrados} comentários extraídos ({coleta.paginas_lidas} páginas)")
         
     except Exception as e:
         print(f"❌ Erro ao extrair da Amazon: {e}")
-    
-    return comentarios
 
 
-def extrair_mercadolivre(driver, url):
-    """Extrai comentários do MercadoLivre."""
-    comentarios = []
+def extrair_mercadolivre(driver, url, coleta=None):
+    """Extrai comentários do MercadoLivre página a página, gerando cada um assim que é encontrado."""
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    
+    # Seletores de comentários; vale o primeiro que tiver textos
+    selectors = [
+        ".ui-review-view__comment",
+        ".ui-review-capability-comments__comment__text",
+        "[class*='review'] [class*='comment']",
+        ".review-text",
+        ".opinion-text"
+    ]
+    
+    def ler_pagina(pagina):
+        abrir_pagina(driver, pagina)
+        
+        if pagina == url:
+            # Tentar clicar na aba de opiniões
+            try:
+                opinions_tab = WebDriverWait(driver, obter_timeout_espera()).until(
+                    EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Opiniões') or contains(text(), 'Opiniones')]"))
+                )
+                opinions_tab.click()
+            except:
+                print("⚠️ Não foi possível encontrar a aba de opiniões")
+        
+        textos = esperar_textos(driver, selectors, limite=MAX_COMENTARIOS_POR_PAGINA)['textos']
+        capturar_dom(driver, pagina)
+        return textos, proxima_pagina_selenium(driver)
     
     try:
-        driver.get(url)
-        time.sleep(3)
-        
-        # Tentar clicar na aba de opiniões
-        try:
-            opinions_tab = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Opiniões') or contains(text(), 'Opiniones')]"))
-            )
-            opinions_tab.click()
-            time.sleep(3)
-        except:
-            print("⚠️ Não foi possível encontrar a aba de opiniões")
+        for texto in coleta.percorrer(url, ler_pagina):
+            encontrados += 1
+            yield texto
         
-        # Extrair comentários com diferentes seletores
-        selectors = [
-            ".ui-review-view__comment",
-            ".ui-review-capability-comments__comment__text",
-            "[class*='review'] [class*='comment']",
-            ".review-text",
-            ".opinion-text"
-        ]
-        
-        for selector in selectors:
-            review_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if review_elements:
-                break
-        
-        for review in review_elements[:50]:  # Limitar a 50 comentários
-            texto = review.text.strip()
-            if texto and len(texto) > 10:
-                comentarios.append(texto)
-        
-        print(f"✅ MercadoLivre: {len(comentarios)} comentários extraídos")
+        print(f"✅ MercadoLivre: {encontrados} comentários extraídos ({coleta.paginas_lidas} páginas)")
         
     except Exception as e:
         print(f"❌ Erro ao extrair do MercadoLivre: {e}")
-    
-    return comentarios
 
 
-def extrair_google_play(driver, url):
-    """Extrai reviews do Google Play."""
-    comentarios = []
+def extrair_google_play(driver, url, coleta=None):
+    """
+    Extrai reviews do Google Play, gerando cada um assim que é encontrado.
+
+    A lista carrega mais reviews ao rolar: cada rolagem conta como uma página
+    e a rolagem para no primeiro review de uma coleta anterior.
+    """
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    
+    def ler_pagina(pagina):
+        abrir_pagina(driver, pagina)
+        
+        # Scroll para carregar mais reviews, colhendo os novos a cada rolagem
+        textos = []
+        for texto in rolar_e_colher(driver, "[jsname='bN97Pc']",
+                                    limite=coleta.max_paginas * MAX_COMENTARIOS_POR_PAGINA,
+                                    rolagens=coleta.max_paginas - 1):
+            textos.append(texto)
+            if coleta.conhecido(texto):
+                break
+        capturar_dom(driver, pagina)
+        return textos, None
     
     try:
-        driver.get(url)
-        time.sleep(3)
-        
-        # Scroll para carregar mais reviews
-        for _ in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+        for texto in coleta.percorrer(url, ler_pagina):
+            encontrados += 1
+            yield texto
         
-        # Extrair reviews
-        review_elements = driver.find_elements(By.CSS_SELECTOR, "[jsname='bN97Pc']")
-        
-        for review in review_elements[:50]:
-            texto = review.text.strip()
-            if texto and len(texto) > 10:
-                comentarios.append(texto)
-        
-        print(f"✅ Google Play: {len(comentarios)} reviews extraídos")
+        print(f"✅ Google Play: {encontrados} reviews extraídos")
         
     except Exception as e:
         print(f"❌ Erro ao extrair do Google Play: {e}")
+
+
+def comentarios_app_store(conteudo, analisador=None):
+    """Reviews de uma página do App Store já baixada."""
+    documento = analisar_html(conteudo, analisador)
     
+    # Tentar encontrar reviews (o App Store é mais complexo)
+    review_elements = documento.selecionar_varios([SELETOR_APP_STORE])[SELETOR_APP_STORE]
+    
+    comentarios = []
+    for review in review_elements[:MAX_COMENTARIOS_POR_PAGINA]:
+        texto = documento.texto(review).strip()
+        if texto and len(texto) > 10:
+            comentarios.append(texto)
     return comentarios
 
 
-def extrair_app_store(url):
-    """Extrai reviews do App Store usando requests (sem Selenium)."""
+def url_feed_app_store(url, pagina=1):
+    """
+    Página do feed público de reviews do app (JSON, mais recentes primeiro), ou None.
+
+    O feed vem de itunes.apple.com/<país>/rss/customerreviews; o país sai do
+    início do caminho da URL (ex.: apps.apple.com/br/app/...), senão 'us'.
+    """
+    encontrado = re.search(r'/id(\d+)', url)
+    if not encontrado:
+        return None
+    pais = urlparse(url).path.strip('/').split('/')[0]
+    pais = pais if len(pais) == 2 else 'us'
+    return f"https://itunes.apple.com/{pais}/rss/customerreviews/page={pagina}/id={encontrado.group(1)}/sortby=mostrecent/json"
+
+
+def comentarios_feed_app_store(conteudo):
+    """Reviews de uma página do feed JSON do App Store já baixada."""
+    entradas = json.loads(conteudo).get('feed', {}).get('entry', [])
+    if isinstance(entradas, dict):  # Página com uma entrada só
+        entradas = [entradas]
+    
     comentarios = []
+    for entrada in entradas:
+        texto = entrada.get('content', {}).get('label', '').strip()
+        if len(texto) > 10:
+            comentarios.append(texto)
+    return comentarios
+
+
+def extrair_app_store(url, coleta=None):
+    """
+    Extrai reviews do App Store usando requests (sem Selenium), gerando cada um assim que é encontrado.
+
+    Lê o feed JSON de reviews, página a página; sem o id do app na URL, só a
+    página do app.
+    """
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    feed = url_feed_app_store(url)
     
-    try:
+    def ler_pagina_feed(pagina):
+        comentarios = extrair_com_cache(pagina, lambda resposta: comentarios_feed_app_store(resposta.content),
+                                        'app_store_feed')
+        numero = int(re.search(r'/page=(\d+)/', pagina).group(1))
+        if not comentarios or numero >= MAX_PAGINAS_FEED_APP_STORE:
+            return comentarios, None
+        return comentarios, url_feed_app_store(url, numero + 1)
+    
+    def ler_pagina_app(pagina):
         # O App Store tem uma API diferente, vamos tentar uma abordagem básica
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Tentar encontrar reviews (o App Store é mais complexo)
-        review_elements = soup.find_all(['p', 'div'], class_=re.compile('review|comment'))
-        
-        for review in review_elements[:20]:
-            texto = review.get_text().strip()
-            if texto and len(texto) > 10:
-                comentarios.append(texto)
+        return extrair_com_cache(pagina, lambda resposta: comentarios_app_store(resposta.content), 'app_store'), None
+    
+    try:
+        if feed:
+            paginas = coleta.percorrer(feed, ler_pagina_feed)
+        else:
+            paginas = coleta.percorrer(url, ler_pagina_app)
+        for texto in paginas:
+            encontrados += 1
+            yield texto
         
-        print(f"✅ App Store: {len(comentarios)} reviews extraídos")
+        print(f"✅ App Store: {encontrados} reviews extraídos ({coleta.paginas_lidas} páginas)")
         
     except Exception as e:
         print(f"❌ Erro ao extrair do App Store: {e}")
-    
-    return comentarios
 
 
-def extrair_generico(driver, url):
-    """Extrai comentários de sites genéricos."""
-    comentarios = []
+def extrair_generico(driver, url, coleta=None):
+    """Extrai comentários de sites genéricos página a página, gerando cada um assim que é encontrado."""
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    
+    # Seletores genéricos para comentários; vale o primeiro que tiver textos
+    selectors = [
+        "[class*='comment']",
+        "[class*='review']",
+        "[class*='feedback']",
+        "[class*='opinion']",
+        ".comment-text",
+        ".review-text",
+        ".user-comment",
+        ".customer-review"
+    ]
+    
+    def ler_pagina(pagina):
+        abrir_pagina(driver, pagina)
+        textos = esperar_textos(driver, selectors, limite=MAX_COMENTARIOS_POR_PAGINA)['textos']
+        capturar_dom(driver, pagina)
+        return textos, proxima_pagina_selenium(driver)
     
     try:
-        driver.get(url)
-        time.sleep(3)
-        
-        # Seletores genéricos para comentários
-        selectors = [
-            "[class*='comment']",
-            "[class*='review']",
-            "[class*='feedback']",
-            "[class*='opinion']",
-            ".comment-text",
-            ".review-text",
-            ".user-comment",
-            ".customer-review"
-        ]
-        
-        for selector in selectors:
-            review_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if review_elements:
-                for review in review_elements[:30]:
-                    texto = review.text.strip()
-                    if texto and len(texto) > 10:
-                        comentarios.append(texto)
-                if comentarios:
-                    break
+        for texto in coleta.percorrer(url, ler_pagina):
+            encontrados += 1
+            yield texto
         
-        print(f"✅ Site genérico: {len(comentarios)} comentários extraídos")
+        print(f"✅ Site genérico: {encontrados} comentários extraídos ({coleta.paginas_lidas} páginas)")
         
     except Exception as e:
         print(f"❌ Erro ao extrair do site genérico: {e}")
-    
-    return comentarios
 
 
 def identificar_plataforma(url):
@@ -231,69 +490,230 @@ def identificar_plataforma(url):
         return 'generico'
 
 
-def extrair_comentarios_de_url(url):
+def obter_ordem_extracao(plataforma):
+    """Métodos de extração ('http', 'selenium') a tentar para a plataforma, em ordem."""
+    padrao = ORDEM_EXTRACAO_PADRAO.get(plataforma, ORDEM_EXTRACAO_PADRAO['generico'])
+    texto = obter_opcao('EXTRACAO', f'ORDEM_{plataforma.upper()}', '')
+    ordem = [metodo.strip().lower() for metodo in texto.split(',') if metodo.strip()]
+    invalidos = [metodo for metodo in ordem if metodo not in METODOS_EXTRACAO]
+    if invalidos:
+        print(f"[AVISO] Métodos de extração desconhecidos em ORDEM_{plataforma.upper()}: {', '.join(invalidos)}")
+        ordem = [metodo for metodo in ordem if metodo in METODOS_EXTRACAO]
+    return tuple(dict.fromkeys(ordem)) or padrao
+
+
+def iterar_comentarios_de_url(url, incremental=True):
     """
-    Função principal para extrair comentários de uma URL.
-    
-    Args:
-        url (str): URL do produto/aplicativo
-    
-    Returns:
-        pandas.DataFrame: DataFrame com os comentários extraídos
+    Gera os comentários de uma URL à medida que são extraídos.
+
+    Aplica a mesma limpeza de `extrair_comentarios_de_url` (espaços, mínimo de
+    11 caracteres, sem repetições), mas sem esperar a extração terminar; é a
+    fonte usada pelo pipeline em fluxo.
+
+    Lê até [EXTRACAO] MAX_PAGINAS páginas de reviews. Com a coleta
+    incremental ativa e `incremental`, gera só os reviews que não saíram em
+    coletas anteriores da mesma URL e para nas páginas já vistas (ver
+    `estado_coleta`); com `incremental=False`, lê tudo de novo, mas ainda
+    atualiza o estado.
     """
     print(f"🌐 Extraindo comentários de: {url}")
     
     plataforma = identificar_plataforma(url)
     print(f"📱 Plataforma detectada: {plataforma.title()}")
+    registrar_listagem(url, plataforma)
     
-    comentarios = []
+    coleta = Coleta(url, obter_estado_coletas(), incremental=incremental)
+    if coleta.incremental:
+        print("🔁 Coleta incremental: só reviews novos desde a última coleta")
     
-    # Tentar primeiro com Selenium (mais eficiente)
-    driver = configurar_driver()
+    vistos = set()
+
+    def novos(textos):
+        for texto in textos:
+            texto = texto.strip()
+            if len(texto) > 10 and texto not in vistos:
+                vistos.add(texto)
+                yield texto
     
-    if driver:
-        print("🤖 Usando Selenium para extração...")
-        try:
-            if plataforma == 'amazon':
-                comentarios = extrair_amazon(driver, url)
-            elif plataforma == 'mercadolivre':
-                comentarios = extrair_mercadolivre(driver, url)
-            elif plataforma == 'google_play':
-                comentarios = extrair_google_play(driver, url)
-            elif plataforma == 'app_store':
-                comentarios = extrair_app_store(url)
+    for metodo in obter_ordem_extracao(plataforma):
+        if vistos or coleta.lidos:  # Reviews lidos, mesmo que já conhecidos, encerram as tentativas
+            break
+        if metodo == 'http':
+            if plataforma == 'app_store':
+                yield from novos(extrair_app_store(url, coleta))
             else:
-                comentarios = extrair_generico(driver, url)
-        
-        finally:
-            driver.quit()
+                yield from novos(extrair_com_requests(url, coleta))
+        else:
+            # Selenium com um navegador do pool
+            with obter_pool_drivers().emprestar() as driver:
+                if driver:
+                    print("🤖 Usando Selenium para extração...")
+                    if plataforma == 'amazon':
+                        yield from novos(extrair_amazon(driver, url, coleta))
+                    elif plataforma == 'mercadolivre':
+                        yield from novos(extrair_mercadolivre(driver, url, coleta))
+                    elif plataforma == 'google_play':
+                        yield from novos(extrair_google_play(driver, url, coleta))
+                    else:
+                        yield from novos(extrair_generico(driver, url, coleta))
     
-    # Se Selenium falhou ou não está disponível, usar requests
-    if not comentarios:
-        print("🌐 Tentando extração alternativa com requests...")
-        comentarios = extrair_com_requests(url)
+    # Só chega aqui se todos os comentários foram consumidos
+    coleta.concluir()
+    if coleta.cursor:
+        print(f"⏸️  Limite de {coleta.max_paginas} páginas atingido; a próxima coleta continua de: {coleta.cursor}")
     
-    if not comentarios:
+    if not vistos and coleta.lidos:
+        print("✅ Nenhum review novo desde a última coleta")
+    elif not vistos:
         print("⚠️ Nenhum comentário foi extraído. Possíveis causas:")
         print("  • O site pode ter proteção anti-bot")
         print("  • A estrutura da página pode ter mudado")
         print("  • O produto pode não ter comentários")
         print("  • Sua conexão pode estar instável")
         print("  • Chrome não está instalado (para Selenium)")
-        return pd.DataFrame()
+    else:
+        print(f"✅ Total de comentários únicos extraídos: {len(vistos)}")
+
+
+def extrair_comentarios_de_url(url, incremental=True):
+    """
+    Função principal para extrair comentários de uma URL.
     
-    # Criar DataFrame
-    df = pd.DataFrame({'comentario': comentarios})
+    Args:
+        url (str): URL do produto/aplicativo
+        incremental (bool): só reviews novos desde a última coleta (ver `iterar_comentarios_de_url`)
     
-    # Limpar e filtrar comentários
-    df['comentario'] = df['comentario'].str.strip()
-    df = df[df['comentario'].str.len() > 10]  # Remover comentários muito curtos
-    df = df.drop_duplicates('comentario')  # Remover duplicatas
-    df = df.reset_index(drop=True)
+    Returns:
+        pandas.DataFrame: DataFrame com os comentários extraídos
+    """
+    comentarios = list(iterar_comentarios_de_url(url, incremental))
     
-    print(f"✅ Total de comentários únicos extraídos: {len(df)}")
+    if not comentarios:
+        return pd.DataFrame()
     
-    return df
+    return pd.DataFrame({'comentario': comentarios})
+
+
+def chave_dominio(url):
+    """
+    Chave usada para limitar extrações simultâneas no mesmo site.
+
+    Plataformas conhecidas compartilham a chave entre seus domínios (ex.:
+    amazon.com e amazon.com.br); sites genéricos usam o próprio domínio.
+    """
+    plataforma = identificar_plataforma(url)
+    if plataforma == 'generico':
+        return urlparse(url).netloc.lower()
+    return plataforma
+
+
+def iterar_comentarios_de_urls(urls, max_simultaneas=None, max_por_dominio=None, incremental=True):
+    """
+    Gera (url, comentario) extraindo várias URLs ao mesmo tempo.
+
+    Até `max_simultaneas` URLs são extraídas em paralelo, com no máximo
+    `max_por_dominio` por site (ver `chave_dominio`); os navegadores vêm do
+    pool de `driver_pool`. Os comentários saem na ordem em que são
+    encontrados, intercalando as URLs. Sem limites explícitos, usa
+    [EXTRACAO] MAX_SIMULTANEAS e MAX_POR_DOMINIO do config.ini.
+    `incremental` vale para cada URL (ver `iterar_comentarios_de_url`).
+    """
+    urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+    if max_simultaneas is None:
+        max_simultaneas = obter_opcao('EXTRACAO', 'MAX_SIMULTANEAS', MAX_EXTRACOES_SIMULTANEAS_PADRAO, int)
+    if max_por_dominio is None:
+        max_por_dominio = obter_opcao('EXTRACAO', 'MAX_POR_DOMINIO', MAX_POR_DOMINIO_PADRAO, int)
+    if not urls:
+        return
+
+    pendentes = {}  # chave do domínio -> URLs ainda não iniciadas
+    for url in urls:
+        pendentes.setdefault(chave_dominio(url), deque()).append(url)
+    ativos = Counter()
+    condicao = threading.Condition()
+    saida = queue.Queue(maxsize=TAMANHO_FILA_EXTRACAO)
+    parar = threading.Event()
+    fim = object()
+
+    def proxima():
+        # Próxima URL de um domínio com vaga livre; espera se todos estiverem no limite
+        with condicao:
+            while not parar.is_set():
+                livres = [chave for chave, fila in pendentes.items() if fila and ativos[chave] < max_por_dominio]
+                if livres:
+                    chave = min(livres, key=lambda c: ativos[c])
+                    ativos[chave] += 1
+                    return chave, pendentes[chave].popleft()
+                if not any(pendentes.values()):
+                    return None
+                condicao.wait()
+            return None
+
+    def colocar(item):
+        while not parar.is_set():
+            try:
+                saida.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def trabalhar():
+        try:
+            while (proximo := proxima()) is not None:
+                chave, url = proximo
+                try:
+                    for comentario in iterar_comentarios_de_url(url, incremental):
+                        if not colocar((url, comentario)):
+                            return
+                except Exception as e:
+                    print(f"❌ Erro ao extrair de {url}: {e}")
+                finally:
+                    with condicao:
+                        ativos[chave] -= 1
+                        condicao.notify_all()
+        finally:
+            colocar(fim)
+
+    max_por_dominio = max(1, max_por_dominio)
+    trabalhadores = [
+        threading.Thread(target=trabalhar, daemon=True)
+        for _ in range(max(1, min(max_simultaneas, len(urls))))
+    ]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+
+    try:
+        restantes = len(trabalhadores)
+        while restantes:
+            item = saida.get()
+            if item is fim:
+                restantes -= 1
+            else:
+                yield item
+    finally:
+        parar.set()
+        with condicao:
+            condicao.notify_all()
+
+
+def extrair_comentarios_de_urls(urls, max_simultaneas=None, max_por_dominio=None, incremental=True):
+    """
+    Extrai comentários de várias URLs em paralelo.
+
+    Returns:
+        pandas.DataFrame: colunas `comentario`, `fonte` (a URL de origem) e
+        `plataforma`, com os comentários de todas as URLs
+    """
+    linhas = list(iterar_comentarios_de_urls(urls, max_simultaneas, max_por_dominio, incremental))
+    if not linhas:
+        return pd.DataFrame(columns=['comentario', 'fonte', 'plataforma'])
+
+    df = pd.DataFrame(linhas, columns=['fonte', 'comentario'])
+    df['plataforma'] = df['fonte'].map(identificar_plataforma)
+    por_url = Counter(df['fonte'])
+    print(f"✅ {len(df)} comentários de {len(por_url)}/{len(set(urls))} URLs")
+    return df[['comentario', 'fonte', 'plataforma']]
 
 
 def salvar_comentarios(df, arquivo='comentarios_extraidos.csv'):
@@ -305,90 +725,100 @@ def salvar_comentarios(df, arquivo='comentarios_extraidos.csv'):
         print(f"❌ Erro ao salvar: {e}")
 
 
-def extrair_com_requests(url):
-    """Extração alternativa usando apenas requests e BeautifulSoup."""
+def _comentarios_por_seletores(documento):
+    """Textos do primeiro seletor de `SELETORES_HTML` que trouxer comentários."""
     comentarios = []
+    encontrados = documento.selecionar_varios(SELETORES_HTML)
+    
+    for selector in SELETORES_HTML:
+        elements = encontrados[selector]
+        if elements:
+            print(f"✅ Encontrados elementos com seletor: {selector}")
+            for element in elements[:MAX_COMENTARIOS_POR_PAGINA]:
+                text = documento.texto(element).strip()
+                if text and len(text) > 15 and len(text) < 1000:  # Filtrar textos muito curtos ou longos
+                    comentarios.append(text)
+            
+            if comentarios:
+                break
+    
+    return comentarios
+
+
+def _comentarios_por_palavras_chave(documento):
+    """Trechos do texto da página que parecem reviews (até 10 por padrão)."""
+    print("🔍 Tentando busca por texto...")
+    texto = documento.texto()
+    comentarios = []
+    for padrao in PADROES_PALAVRAS_CHAVE:
+        # finditer para nos 10 primeiros, sem listar todos os trechos da página
+        for match in itertools.islice(padrao.finditer(texto), 10):
+            if len(match.group().strip()) > 15:
+                comentarios.append(match.group().strip())
+    return comentarios
+
+
+def comentarios_do_html(conteudo, analisador=None):
+    """
+    Comentários de uma página já baixada, pelos seletores conhecidos ou por palavras-chave.
+
+    Todos os seletores são avaliados em uma única passada pela página; vale
+    o primeiro, na ordem de `SELETORES_HTML`, que trouxer comentários.
+    """
+    documento = analisar_html(conteudo, analisador)
+    # Se não encontrou com seletores específicos, tentar busca por texto
+    return _comentarios_por_seletores(documento) or _comentarios_por_palavras_chave(documento)
+
+
+def pagina_html(conteudo, url, analisador=None):
+    """
+    Comentários de uma página de reviews já baixada e o endereço da próxima página.
+
+    Devolve {'comentarios', 'proxima'}. A próxima página (link rel=next ou os
+    botões de paginação conhecidos) só é seguida quando os seletores acharam
+    reviews; a busca por palavras-chave vale apenas para a primeira página.
+    """
+    documento = analisar_html(conteudo, analisador)
+    comentarios = _comentarios_por_seletores(documento)
+    if not comentarios:
+        return {'comentarios': _comentarios_por_palavras_chave(documento), 'proxima': None}
+    
+    proxima = None
+    encontrados = documento.selecionar_varios(SELETORES_PROXIMA_PAGINA)
+    for seletor in SELETORES_PROXIMA_PAGINA:
+        href = next((documento.atributo(e, 'href') for e in encontrados[seletor] if documento.atributo(e, 'href')), None)
+        if href:
+            proxima = urljoin(url, href.strip())
+            break
+    return {'comentarios': comentarios, 'proxima': proxima if proxima != url else None}
+
+
+def extrair_com_requests(url, coleta=None):
+    """
+    Extração usando apenas requests e o analisador HTML (ver `analisador_html`), página a página.
+
+    Usa a sessão HTTP compartilhada e o cache de páginas: se uma página não
+    mudou desde a última visita (304), os comentários e o link da próxima vêm
+    do cache. Gera cada comentário assim que a página dele é lida.
+    """
+    encontrados = 0
+    coleta = coleta or Coleta(url)
+    
+    def ler_pagina(pagina):
+        dados = extrair_com_cache(pagina, lambda resposta: pagina_html(resposta.content, resposta.url), 'pagina_html')
+        return dados['comentarios'], dados['proxima']
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        session = requests.Session()
-        session.headers.update(headers)
-        
         print("🌐 Fazendo requisição HTTP...")
-        response = session.get(url, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Tentar diferentes seletores para encontrar comentários/reviews
-        selectors = [
-            # MercadoLivre
-            '.ui-review-view__comment',
-            '.ui-review-capability-comments__comment__text',
-            '[class*="review"] [class*="comment"]',
-            '[class*="opinion"]',
-            
-            # Amazon
-            '[data-hook="review-body"] span',
-            '.review-text',
-            '.cr-original-review-text',
-            
-            # Genéricos
-            '[class*="comment"]',
-            '[class*="review"]',
-            '[class*="feedback"]',
-            '.comment-text',
-            '.review-content',
-            '.user-review',
-            '.customer-review'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"✅ Encontrados elementos com seletor: {selector}")
-                for element in elements[:30]:  # Limitar a 30
-                    text = element.get_text().strip()
-                    if text and len(text) > 15 and len(text) < 1000:  # Filtrar textos muito curtos ou longos
-                        comentarios.append(text)
-                
-                if comentarios:
-                    break
-        
-        # Se não encontrou com seletores específicos, tentar busca por texto
-        if not comentarios:
-            print("🔍 Tentando busca por texto...")
-            all_text = soup.get_text()
-            # Procurar por padrões comuns de reviews
-            patterns = [
-                r'(?i)(?:excelente|ótimo|bom|ruim|péssimo|recomendo|não recomendo).{10,200}',
-                r'(?i)(?:produto|app|aplicativo|serviço).{10,200}',
-                r'(?i)(?:comprei|usei|testei|instalei).{10,200}'
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, all_text)
-                for match in matches[:10]:  # Limitar a 10 por padrão
-                    if len(match.strip()) > 15:
-                        comentarios.append(match.strip())
-        
-        print(f"📝 Extração com requests: {len(comentarios)} comentários encontrados")
+        for texto in coleta.percorrer(url, ler_pagina):
+            encontrados += 1
+            yield texto
+        print(f"📝 Extração com requests: {encontrados} comentários encontrados ({coleta.paginas_lidas} páginas)")
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Erro na requisição HTTP: {e}")
     except Exception as e:
         print(f"❌ Erro na extração com requests: {e}")
-    
-    return comentarios
 
 
 if __name__ == "__main__":
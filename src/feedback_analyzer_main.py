@@ -1,17 +1,43 @@
 import pandas as pd
-from tqdm import tqdm
+import argparse
 import sys
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
-import json
 import re
 
-from feedback_analyzer.gemini_processor import analisar_comentario_individual, gerar_resumo_executivo, configurar_ia
-from feedback_analyzer.web_extractor import extrair_comentarios_de_url
+from feedback_analyzer.gemini_processor import (
+    gerar_resumo_executivo, configurar_ia, estatisticas_cache, estatisticas_faixas,
+    TAMANHO_LOTE_PADRAO, MAX_TOKENS_LOTE_PADRAO
+)
+from feedback_analyzer.analysis_engine import MAX_CONCORRENCIA_PADRAO
+from feedback_analyzer.dedup import LIMIAR_SIMILARIDADE_PADRAO
+from feedback_analyzer.local_classifier import LIMIAR_CONFIANCA_PADRAO
+from feedback_analyzer.config import obter_opcao
+from feedback_analyzer.journal import JournalExecucao, obter_pasta_execucoes
+from feedback_analyzer.web_extractor import iterar_comentarios_de_urls
+from feedback_analyzer.pipeline import executar_pipeline, TAMANHO_BLOCO_PADRAO, TAMANHO_FILA_PADRAO
+from feedback_analyzer.carregador_arquivos import iterar_blocos_arquivo, TAMANHO_BLOCO_LEITURA_PADRAO
+from feedback_analyzer.relatorio import criar_escritor_relatorio
+from feedback_analyzer.armazem_resultados import ArmazemResultados, obter_pasta_historico
+from feedback_analyzer.resumo_executivo import (
+    AmostraPorGrupo, gerar_resumo_executivo_mapreduce, AMOSTRA_POR_GRUPO_PADRAO
+)
 
-def carregar_comentarios():
-    """Carrega comentários de diferentes fontes disponíveis."""
+PADRAO_URL = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+def selecionar_fonte():
+    """
+    Mostra o menu de fontes e retorna (df, url, arquivo).
+
+    Para URLs e arquivos só o endereço é lido (df é None): a extração ou a
+    leitura do arquivo, em blocos, roda em fluxo junto com a análise.
+    """
     print("📁 Escolha a fonte dos comentários:")
     print("1. 🌐 Extrair de URL (Amazon, MercadoLivre, Google Play, etc.)")
     print("2. 📄 Carregar de arquivo (CSV, TXT, JSON)")
@@ -20,17 +46,17 @@ def carregar_comentarios():
     opcao = input("\nEscolha uma opção (1/2/3): ").strip()
     
     if opcao == "1":
-        return extrair_de_url()
+        return None, ler_url(), None
     elif opcao == "2":
-        return carregar_de_arquivo()
+        return None, None, localizar_arquivo()
     elif opcao == "3":
-        return entrada_manual()
+        return entrada_manual(), None, None
     else:
         print("❌ Opção inválida.")
         sys.exit(1)
 
-def extrair_de_url():
-    """Extrai comentários de uma URL de produto."""
+def ler_url():
+    """Pede e valida a URL de um produto."""
     print("\n🌐 EXTRAÇÃO DE COMENTÁRIOS POR URL")
     print("=" * 40)
     print("Plataformas suportadas:")
@@ -48,44 +74,42 @@ def extrair_de_url():
         sys.exit(1)
     
     # Validar se é uma URL válida
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    if not url_pattern.match(url):
+    if not PADRAO_URL.match(url):
         print("❌ URL inválida. Deve começar com http:// ou https://")
         sys.exit(1)
-    
-    print(f"\n🚀 Extraindo comentários de: {url}")
-    print("⏳ Isso pode levar alguns minutos...")
-    
-    try:
-        df = extrair_comentarios_de_url(url)
-        
-        if df.empty:
-            print("\n❌ Nenhum comentário foi encontrado nesta URL.")
-            print("💡 Dicas:")
-            print("   • Verifique se a URL está correta")
-            print("   • Alguns sites podem bloquear extração automática")
-            print("   • Tente uma URL direta para a página de reviews/comentários")
-            sys.exit(1)
-        
-        return df
-        
-    except Exception as e:
-        print(f"\n❌ Erro ao extrair comentários: {e}")
-        print("💡 Tente:")
-        print("   • Verificar sua conexão com a internet")
-        print("   • Usar uma URL diferente")
-        print("   • Carregar comentários de arquivo")
+
+    return url
+
+def ler_lista_urls(valores):
+    """
+    Monta a lista de URLs do modo em lote (--urls).
+
+    Cada valor é uma URL ou um arquivo com uma URL por linha (linhas vazias
+    e iniciadas por # são ignoradas). URLs inválidas são avisadas e puladas.
+    """
+    urls = []
+    for valor in valores:
+        if os.path.isfile(valor):
+            with open(valor, 'r', encoding='utf-8') as f:
+                linhas = [linha.strip() for linha in f]
+            urls.extend(linha for linha in linhas if linha and not linha.startswith('#'))
+        else:
+            urls.append(valor.strip())
+
+    validas = []
+    for url in dict.fromkeys(urls):
+        if PADRAO_URL.match(url):
+            validas.append(url)
+        else:
+            print(f"[AVISO] URL inválida ignorada: {url}")
+
+    if not validas:
+        print("❌ Nenhuma URL válida informada.")
         sys.exit(1)
+    return validas
 
-def carregar_de_arquivo():
-    """Carrega comentários de arquivos locais."""
+def localizar_arquivo():
+    """Procura um arquivo de comentários conhecido (ou pede o caminho) e retorna o caminho."""
     print("\n📄 CARREGAMENTO DE ARQUIVO")
     print("=" * 30)
     
@@ -109,7 +133,7 @@ def carregar_de_arquivo():
     for arquivo in arquivos_possiveis:
         if os.path.exists(arquivo):
             print(f"✅ Arquivo encontrado: {arquivo}")
-            return carregar_arquivo(arquivo)
+            return arquivo
     
     print("❌ Nenhum arquivo encontrado.")
     print("📝 Arquivos suportados:")
@@ -120,73 +144,11 @@ def carregar_de_arquivo():
     arquivo_manual = input("\n📂 Digite o caminho do arquivo (ou Enter para sair): ").strip()
     
     if arquivo_manual and os.path.exists(arquivo_manual):
-        return carregar_arquivo(arquivo_manual)
+        return arquivo_manual
     else:
         print("❌ Arquivo não encontrado.")
         sys.exit(1)
 
-def carregar_arquivo(nome_arquivo):
-    """Carrega comentários de diferentes tipos de arquivo."""
-    try:
-        extensao = nome_arquivo.split('.')[-1].lower()
-        
-        if extensao == 'csv':
-            df = pd.read_csv(nome_arquivo)
-            # Verificar se tem as colunas necessárias
-            if 'comentario' not in df.columns:
-                # Tentar encontrar coluna de comentários com nomes alternativos
-                colunas_comentario = ['review', 'text', 'feedback', 'comment', 'mensaje', 'texto']
-                for col in colunas_comentario:
-                    if col in df.columns:
-                        df['comentario'] = df[col]
-                        break
-                else:
-                    print("❌ Arquivo CSV deve ter uma coluna 'comentario' ou similar.")
-                    sys.exit(1)
-            
-            # Adicionar colunas padrão se não existirem
-            if 'data' not in df.columns:
-                df['data'] = pd.Timestamp.now().strftime('%Y-%m-%d')
-            if 'fonte' not in df.columns:
-                df['fonte'] = 'Produto Web'
-                
-        elif extensao == 'txt':
-            with open(nome_arquivo, 'r', encoding='utf-8') as f:
-                linhas = f.readlines()
-            
-            comentarios = [linha.strip() for linha in linhas if linha.strip()]
-            df = pd.DataFrame({
-                'data': [pd.Timestamp.now().strftime('%Y-%m-%d')] * len(comentarios),
-                'fonte': ['Produto Web'] * len(comentarios),
-                'comentario': comentarios
-            })
-            
-        elif extensao == 'json':
-            with open(nome_arquivo, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
-            if isinstance(dados, list):
-                # Lista de comentários
-                if isinstance(dados[0], str):
-                    comentarios = dados
-                else:
-                    comentarios = [item.get('comentario', item.get('text', str(item))) for item in dados]
-            else:
-                comentarios = [str(dados)]
-                
-            df = pd.DataFrame({
-                'data': [pd.Timestamp.now().strftime('%Y-%m-%d')] * len(comentarios),
-                'fonte': ['Produto Web'] * len(comentarios),
-                'comentario': comentarios
-            })
-        
-        print(f"✅ Carregados {len(df)} comentários de {nome_arquivo}")
-        return df
-        
-    except Exception as e:
-        print(f"❌ Erro ao carregar arquivo {nome_arquivo}: {e}")
-        sys.exit(1)
-
 def entrada_manual():
     """Permite entrada manual de comentários."""
     print("\n📝 Inserção manual de comentários")
@@ -212,34 +174,44 @@ def entrada_manual():
     
     return df
 
-def processar_comentarios_otimizado(comentarios, max_workers=8):
-    print(f"[INFO] Processando {len(comentarios)} comentários com {max_workers} workers...")
-    
-    resultados = [None] * len(comentarios)
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_index = {
-            executor.submit(analisar_comentario_individual, comentario): i 
-            for i, comentario in enumerate(comentarios)
-        }
-        
-        with tqdm(total=len(comentarios), desc="Processando") as pbar:
-            for future in as_completed(future_to_index):
-                index = future_to_index[future]
-                try:
-                    resultado = future.result(timeout=15)
-                    resultados[index] = resultado
-                except Exception as e:
-                    resultados[index] = {
-                        "sentimento": "Erro",
-                        "categoria": "Erro", 
-                        "resumo_curto": "Erro de processamento."
-                    }
-                pbar.update(1)
-    
-    return resultados
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Analisador de Feedback para Produtos Web")
+    parser.add_argument(
+        "--resume", nargs="?", const="", default=None, metavar="ID_EXECUCAO",
+        help="Retoma uma execução interrompida (sem ID, a mais recente não concluída)"
+    )
+    parser.add_argument(
+        "--urls", nargs="+", metavar="URL_OU_ARQUIVO",
+        help="Extrai e analisa várias URLs em paralelo (URLs ou arquivos com uma URL por linha)"
+    )
+    parser.add_argument(
+        "--coleta-completa", action="store_true",
+        help="Lê de novo todas as páginas de reviews, inclusive as de coletas anteriores"
+    )
+    return parser.parse_args()
+
+def retomar_execucao(id_execucao):
+    """Abre o diário de uma execução anterior e devolve (journal, df, nome_produto, concluidos)."""
+    pasta = obter_pasta_execucoes()
+    if pasta is None:
+        print("❌ O diário de execuções está desativado em [EXECUCAO] no config.ini.")
+        sys.exit(1)
+
+    try:
+        journal = JournalExecucao.abrir(id_execucao or None, pasta)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    df = journal.carregar_entrada()
+    concluidos = journal.carregar_resultados()
+    print(f"♻️  Retomando execução {journal.id_execucao}: "
+          f"{len(concluidos)}/{len(df)} comentários já analisados")
+    return journal, df, journal.metadados().get('produto', 'Produto Analisado'), concluidos
 
 def main():
+    args = ler_argumentos()
+
     print("🚀 Analisador de Feedback para Produtos Web")
     print("=" * 50)
     print("📊 Analise comentários de qualquer produto da web!")
@@ -249,48 +221,226 @@ def main():
         print("❌ Erro ao configurar a IA.")
         sys.exit(1)
 
-    # Carregar comentários de forma flexível
-    df = carregar_comentarios()
-    
-    if df.empty:
-        print("❌ Nenhum comentário para processar.")
-        sys.exit(1)
-    
-    # Mostrar informações sobre os dados carregados
-    print(f"\n📊 Resumo dos dados:")
-    print(f"   • Total de comentários: {len(df)}")
-    print(f"   • Fontes: {', '.join(df['fonte'].unique())}")
-    if 'data' in df.columns:
-        print(f"   • Período: {df['data'].min()} a {df['data'].max()}")
-    
-    # Permitir ao usuário configurar o produto
-    nome_produto = input("\n🏷️  Nome do produto/serviço: ").strip()
-    if not nome_produto:
-        nome_produto = "Produto Analisado"
+    urls = None
+    blocos = None
+    if args.resume is not None:
+        journal, df, nome_produto, concluidos = retomar_execucao(args.resume)
+    else:
+        if args.urls:
+            df, urls = None, ler_lista_urls(args.urls)
+            print(f"🌐 {len(urls)} URLs para extrair")
+        else:
+            # Carregar comentários de forma flexível
+            df, url, arquivo = selecionar_fonte()
+            urls = [url] if url else None
+            if arquivo:
+                # Arquivo lido em blocos junto com a análise, sem carregá-lo inteiro
+                try:
+                    blocos = iterar_blocos_arquivo(arquivo, obter_opcao(
+                        'PROCESSAMENTO', 'TAMANHO_BLOCO_LEITURA', TAMANHO_BLOCO_LEITURA_PADRAO, int))
+                except (OSError, ValueError) as e:
+                    print(f"❌ Erro ao carregar arquivo {arquivo}: {e}")
+                    sys.exit(1)
+                print(f"📄 Lendo {arquivo} em blocos durante a análise")
+
+        if df is not None:
+            if df.empty:
+                print("❌ Nenhum comentário para processar.")
+                sys.exit(1)
+
+            # Mostrar informações sobre os dados carregados
+            print(f"\n📊 Resumo dos dados:")
+            print(f"   • Total de comentários: {len(df)}")
+            print(f"   • Fontes: {', '.join(df['fonte'].unique())}")
+            if 'data' in df.columns:
+                print(f"   • Período: {df['data'].min()} a {df['data'].max()}")
+
+        # Permitir ao usuário configurar o produto
+        nome_produto = input("\n🏷️  Nome do produto/serviço: ").strip()
+        if not nome_produto:
+            nome_produto = "Produto Analisado"
+
+        journal = None
+        concluidos = {}
+        pasta_execucoes = obter_pasta_execucoes()
+        if pasta_execucoes is not None:
+            try:
+                entrada = df if df is not None else pd.DataFrame(columns=['data', 'fonte', 'comentario'])
+                journal = JournalExecucao.criar(entrada, nome_produto, pasta_execucoes)
+                print(f"[INFO] Execução {journal.id_execucao} registrada em {journal.pasta} "
+                      f"(retome com: python main.py --resume {journal.id_execucao})")
+            except OSError as e:
+                print(f"[AVISO] Não foi possível criar o diário da execução: {e}")
+
+    # Criar pasta de relatórios se não existir
+    pasta_relatorios = 'relatorios'
+    os.makedirs(pasta_relatorios, exist_ok=True)
+    caminho_base = os.path.join(pasta_relatorios, f"relatorio_{nome_produto.replace(' ', '_').lower()}_{int(time.time())}")
+    id_execucao = journal.id_execucao if journal else time.strftime('%Y%m%d-%H%M%S')
+    escritor = criar_escritor_relatorio(caminho_base, nome_produto, id_execucao=id_execucao)
+    nome_arquivo = escritor.caminhos[0]
+    resumo_mapreduce = obter_opcao('RESUMO', 'MAPA_REDUCE', True, bool)
+    amostras = AmostraPorGrupo(obter_opcao('RESUMO', 'AMOSTRA_POR_GRUPO', AMOSTRA_POR_GRUPO_PADRAO, int))
+
+    # Entrada e resultados também vão para o histórico em Parquet, consultável entre execuções
+    armazem = None
+    pasta_historico = obter_pasta_historico()
+    if pasta_historico is not None:
+        try:
+            armazem = ArmazemResultados(pasta_historico, id_execucao, nome_produto)
+        except OSError as e:
+            print(f"[AVISO] Não foi possível abrir o histórico em {pasta_historico}: {e}")
+
+    def escrever(registros, resultados):
+        escritor.escrever(registros, resultados)
+        amostras.adicionar(resultados)
+        if armazem:
+            armazem.escrever(registros, resultados)
+
+    if df is not None:
+        df = df.reset_index(drop=True)
+        registros_df = df[['data', 'fonte', 'comentario']].to_dict('records')
+        for linha, registro in enumerate(registros_df):
+            registro['linha'] = linha
+        fonte = (registros_df[i] for i in range(len(df)) if i not in concluidos)
+        pendentes = len(df) - len(concluidos)
+    elif blocos is not None:
+        def registros_do_arquivo():
+            for bloco in blocos:
+                registros = bloco.to_dict('records')
+                if journal:
+                    journal.adicionar_entrada(registros)
+                yield from registros
+
+        fonte = registros_do_arquivo()
+        registros_df = []
+        pendentes = None
+    else:
+        # Extração e análise em paralelo: comentários vão para a análise assim que
+        # encontrados, marcados com a URL de origem
+        print(f"\n🚀 Extraindo comentários de: {', '.join(urls) if len(urls) <= 3 else f'{len(urls)} URLs'}")
+        hoje = pd.Timestamp.now().strftime('%Y-%m-%d')
+        fonte = (
+            {'data': hoje, 'fonte': url, 'comentario': comentario}
+            for url, comentario in iterar_comentarios_de_urls(urls, incremental=not args.coleta_completa)
+        )
+        registros_df = []
+        pendentes = None
+
+    # Resultados de uma execução anterior entram no relatório na ordem das linhas
+    anteriores = sorted(concluidos)
+    proximo_anterior = [0]
+
+    def escrever_anteriores(ate_linha):
+        inicio_faixa = proximo_anterior[0]
+        while proximo_anterior[0] < len(anteriores) and anteriores[proximo_anterior[0]] < ate_linha:
+            proximo_anterior[0] += 1
+        faixa = anteriores[inicio_faixa:proximo_anterior[0]]
+        if faixa:
+            escrever([registros_df[i] for i in faixa], [concluidos[i] for i in faixa])
+
+    def ao_receber(registro):
+        if journal and urls:
+            journal.adicionar_entrada([registro])
+
+    def gravar_no_journal(registros, resultados):
+        journal.registrar([r['linha'] for r in registros], resultados)
+
+    def ao_resultado(registros, resultados):
+        inicio_trecho = 0
+        for k, registro in enumerate(registros):
+            if proximo_anterior[0] < len(anteriores) and anteriores[proximo_anterior[0]] < registro['linha']:
+                escrever(registros[inicio_trecho:k], resultados[inicio_trecho:k])
+                escrever_anteriores(registro['linha'])
+                inicio_trecho = k
+        escrever(registros[inicio_trecho:], resultados[inicio_trecho:])
 
     print(f"\n🔄 Analisando feedback de '{nome_produto}'...")
-    print("⚡ Usando processamento paralelo otimizado...")
+    print("⚡ Usando processamento assíncrono otimizado...")
     inicio = time.time()
     
-    # Otimizado: mais workers e timeout menor
-    resultados = processar_comentarios_otimizado(df['comentario'].tolist(), max_workers=10)
-    
+    # Otimizado: mais workers e vários comentários por requisição
+    tamanho_lote = obter_opcao('PROCESSAMENTO', 'TAMANHO_LOTE', TAMANHO_LOTE_PADRAO, int)
+    max_tokens_lote = obter_opcao('PROCESSAMENTO', 'MAX_TOKENS_LOTE', MAX_TOKENS_LOTE_PADRAO, int)
+    max_concorrencia = obter_opcao('PROCESSAMENTO', 'MAX_CONCORRENCIA', MAX_CONCORRENCIA_PADRAO, int)
+    agrupar_duplicados = obter_opcao('PROCESSAMENTO', 'AGRUPAR_DUPLICADOS', True, bool)
+    limiar_similaridade = obter_opcao('PROCESSAMENTO', 'LIMIAR_SIMILARIDADE', LIMIAR_SIMILARIDADE_PADRAO, float)
+    tamanho_bloco = obter_opcao('PROCESSAMENTO', 'TAMANHO_BLOCO', TAMANHO_BLOCO_PADRAO, int)
+    if pendentes:
+        # Entrada já toda em memória: um bloco só, para o agrupamento de
+        # duplicados enxergar todos os comentários
+        tamanho_bloco = pendentes
+    tamanho_fila = obter_opcao('PROCESSAMENTO', 'TAMANHO_FILA', TAMANHO_FILA_PADRAO, int)
+    usar_classificador_local = obter_opcao('CLASSIFICADOR_LOCAL', 'ATIVO', True, bool)
+    limiar_confianca = obter_opcao('CLASSIFICADOR_LOCAL', 'LIMIAR_CONFIANCA', LIMIAR_CONFIANCA_PADRAO, float)
+    prazo_execucao = obter_opcao('PRAZOS', 'PRAZO_EXECUCAO', 0, float) or None
+
+    stats_execucao = {}
+    if pendentes != 0:
+        print(f"[INFO] Analisando em blocos de até {tamanho_bloco} comentários, com até {max_concorrencia} "
+              f"requisições simultâneas (lotes de até {tamanho_lote})...")
+        try:
+            stats_execucao = executar_pipeline(
+                fonte, ao_resultado,
+                ao_receber=ao_receber,
+                ao_concluir=gravar_no_journal if journal else None,
+                tamanho_fila=tamanho_fila,
+                tamanho_bloco=tamanho_bloco,
+                max_concorrencia=max_concorrencia,
+                prazo_execucao=prazo_execucao,
+                tamanho_lote=tamanho_lote,
+                max_tokens_lote=max_tokens_lote,
+                agrupar_duplicados=agrupar_duplicados,
+                limiar_similaridade=limiar_similaridade,
+                usar_classificador_local=usar_classificador_local,
+                limiar_confianca=limiar_confianca
+            )
+        except KeyboardInterrupt:
+            print("\n⏸️  Análise interrompida.")
+            escritor.descartar()
+            if armazem:
+                armazem.descartar()
+            if journal:
+                journal.fechar()
+                print(f"💾 Progresso salvo. Retome com: python main.py --resume {journal.id_execucao}")
+            sys.exit(130)
+    else:
+        print("✅ Todos os comentários já foram analisados; indo direto para o relatório.")
+    escrever_anteriores(float('inf'))
+
     fim = time.time()
     tempo_total = fim - inicio
-    velocidade = len(df) / tempo_total if tempo_total > 0 else 0
+    analisados = stats_execucao.get('comentarios', 0)
+    velocidade = analisados / tempo_total if tempo_total > 0 else 0
     print(f"⚡ Análise concluída em {tempo_total:.1f}s ({velocidade:.1f} comentários/seg)")
+    stats_cache = estatisticas_cache()
+    stats_faixas = {nome: dados for nome, dados in estatisticas_faixas().items() if dados['requisicoes']}
+    total_comentarios = escritor.total
 
-    # Filtrar erros para estatísticas mais precisas
-    resultados_validos = [r for r in resultados if r['sentimento'] != 'Erro']
-    print(f"📊 {len(resultados_validos)}/{len(resultados)} comentários processados com sucesso")
+    # Erros ficam de fora das estatísticas
+    print(f"📊 {escritor.validos}/{total_comentarios} comentários processados com sucesso")
+    if journal and (escritor.validos < total_comentarios or stats_execucao.get('prazo_esgotado')):
+        print(f"💡 Os comentários com erro ou não analisados no prazo podem ser reanalisados com: "
+              f"python main.py --resume {journal.id_execucao}")
     
-    if not resultados_validos:
-        print("❌ Nenhum comentário foi processado com sucesso.")
-        print("💡 Tente novamente ou verifique sua conexão com a API Gemini.")
+    if not escritor.validos:
+        escritor.descartar()
+        if armazem:
+            armazem.descartar()
+        if total_comentarios == 0:
+            print("❌ Nenhum comentário foi encontrado.")
+            if urls:
+                print("💡 Dicas:")
+                print("   • Verifique se a URL está correta")
+                print("   • Alguns sites podem bloquear extração automática")
+                print("   • Tente uma URL direta para a página de reviews/comentários")
+        else:
+            print("❌ Nenhum comentário foi processado com sucesso.")
+            print("💡 Tente novamente ou verifique sua conexão com a API Gemini.")
         sys.exit(1)
 
-    contagem_sentimentos = pd.Series([r['sentimento'] for r in resultados_validos]).value_counts()    
-    contagem_categorias = pd.Series([r['categoria'] for r in resultados_validos]).value_counts()
+    contagem_sentimentos = pd.Series(dict(escritor.contagem_sentimentos.most_common()))
+    contagem_categorias = pd.Series(dict(escritor.contagem_categorias.most_common()))
 
     texto_estatisticas = "## 📊 Análise Quantitativa\n\n"
     texto_estatisticas += "### Distribuição de Sentimento:\n"
@@ -299,52 +449,81 @@ def main():
     texto_estatisticas += contagem_categorias.to_string()
 
     print("🤖 Gerando resumo executivo...")
-    resumo_executivo = gerar_resumo_executivo(texto_estatisticas)
+    if resumo_mapreduce:
+        # Resume o conteúdo de cada grupo (categoria/sentimento) e depois junta
+        resumo_executivo = gerar_resumo_executivo_mapreduce(texto_estatisticas, amostras)
+    else:
+        resumo_executivo = gerar_resumo_executivo(texto_estatisticas)
 
     print("💾 Criando relatório...")
     
-    # Criar pasta de relatórios se não existir
-    pasta_relatorios = 'relatorios'
-    os.makedirs(pasta_relatorios, exist_ok=True)
-    
-    nome_arquivo = os.path.join(pasta_relatorios, f"relatorio_{nome_produto.replace(' ', '_').lower()}_{int(time.time())}.md")
-    
     try:
-        with open(nome_arquivo, "w", encoding="utf-8") as f:
-            f.write(f"# 📋 Análise de Feedback - {nome_produto}\n\n")
-            f.write(f"**Produto/Serviço:** {nome_produto}\n")
-            f.write(f"**Processado em:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Total de comentários:** {len(df)}\n")
-            f.write(f"**Comentários válidos:** {len(resultados_validos)}\n")
-            f.write(f"**Tempo de processamento:** {tempo_total:.1f} segundos\n")
-            f.write(f"**Velocidade:** {velocidade:.1f} comentários/seg\n\n")
-            f.write("## 🚀 Resumo Executivo\n")
-            f.write(resumo_executivo)
-            f.write("\n\n---\n\n")
-            f.write(texto_estatisticas)
-            f.write("\n\n---\n\n")
-            f.write("## 💬 Comentários Analisados\n\n")
-            
-            for i, (idx, row) in enumerate(df.iterrows()):
-                if i < len(resultados):
-                    resultado = resultados[i]
-                    status = "✅" if resultado['sentimento'] != 'Erro' else "❌"
-                    f.write(f"### {status} Comentário {i+1}\n")
-                    f.write(f"**Data:** {row['data']}\n")
-                    f.write(f"**Fonte:** {row['fonte']}\n")
-                    f.write(f"**Texto:** _{row['comentario']}_\n")
-                    f.write(f"**Sentimento:** {resultado['sentimento']}\n")
-                    f.write(f"**Categoria:** {resultado['categoria']}\n")
-                    f.write(f"**Resumo:** {resultado['resumo_curto']}\n\n")
+        cabecalho = f"# 📋 Análise de Feedback - {nome_produto}\n\n"
+        cabecalho += f"**Produto/Serviço:** {nome_produto}\n"
+        cabecalho += f"**Processado em:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        cabecalho += f"**Total de comentários:** {total_comentarios}\n"
+        cabecalho += f"**Comentários válidos:** {escritor.validos}\n"
+        cabecalho += f"**Tempo de processamento:** {tempo_total:.1f} segundos\n"
+        cabecalho += f"**Velocidade:** {velocidade:.1f} comentários/seg\n"
+        if stats_cache:
+            cabecalho += f"**Cache:** {stats_cache['acertos']} acertos, {stats_cache['falhas']} falhas\n"
+        if stats_execucao.get('duplicados_agrupados'):
+            cabecalho += (f"**Quase duplicados:** {stats_execucao['duplicados_agrupados']} comentários "
+                          f"reaproveitaram a análise de outro\n")
+        if stats_execucao.get('unicos'):
+            camadas = stats_execucao['por_camada']
+            cabecalho += "**Camadas de análise:** " + ", ".join(
+                f"{nome} {qtd / stats_execucao['unicos']:.0%}" for nome, qtd in camadas.items()
+            ) + "\n"
+        if stats_faixas:
+            cabecalho += "\n### ⚙️ Modelos por faixa de tamanho\n"
+            cabecalho += "| Faixa | Modelo | Textos | Requisições | p50 | p95 | Textos/s |\n"
+            cabecalho += "|---|---|---|---|---|---|---|\n"
+            for nome, dados in stats_faixas.items():
+                cabecalho += (f"| {nome} | {dados['modelo']} | {dados['comentarios']} | {dados['requisicoes']} | "
+                              f"{dados['latencia_p50']:.2f}s | {dados['latencia_p95']:.2f}s | "
+                              f"{dados['comentarios_por_segundo']:.1f} |\n")
+        cabecalho += "\n"
+        cabecalho += "## 🚀 Resumo Executivo\n"
+        cabecalho += resumo_executivo
+        cabecalho += "\n\n---\n\n"
+        cabecalho += texto_estatisticas
+        cabecalho += "\n\n---\n\n"
+        escritor.finalizar(cabecalho)
 
         print(f"✅ Relatório salvo: {nome_arquivo}")
+        if len(escritor.caminhos) > 1:
+            print(f"📎 Também em: {', '.join(escritor.caminhos[1:])}")
+        if armazem:
+            armazem.finalizar()
+            print(f"🗃️  Histórico atualizado: {armazem.caminho} "
+                  f"(consulte com: python -m feedback_analyzer.armazem_resultados --pasta {pasta_historico})")
+        if journal:
+            journal.fechar()
+            journal.marcar_concluida(nome_arquivo, total_comentarios)
         
         # Mostrar resumo no terminal
         print("\n" + "="*50)
         print("📊 RESUMO RÁPIDO")
         print("="*50)
         print(f"Produto: {nome_produto}")
-        print(f"Total processado: {len(resultados_validos)}/{len(df)} comentários")
+        print(f"Total processado: {escritor.validos}/{total_comentarios} comentários")
+        if stats_cache:
+            print(f"Cache: {stats_cache['acertos']} acertos, {stats_cache['falhas']} falhas "
+                  f"({stats_cache['taxa_acerto']:.0%} de acerto, {stats_cache['entradas']} entradas)")
+        if stats_execucao:
+            print(f"Quase duplicados: {stats_execucao['duplicados_agrupados']} agrupados "
+                  f"({stats_execucao['duplicados_agrupados']} análises a menos na API, "
+                  f"{stats_execucao['requisicoes']} requisições feitas)")
+            if stats_execucao['unicos']:
+                print("Camadas de análise:")
+                for nome, qtd in stats_execucao['por_camada'].items():
+                    print(f"  • {nome}: {qtd} ({qtd / stats_execucao['unicos']:.0%})")
+        if stats_faixas:
+            print("Modelos por faixa:")
+            for nome, dados in stats_faixas.items():
+                print(f"  • {nome} ({dados['modelo']}): {dados['comentarios']} textos em "
+                      f"{dados['requisicoes']} requisições, p95 {dados['latencia_p95']:.2f}s")
         print("\nSentimentos:")
         for sentimento, count in contagem_sentimentos.items():
             print(f"  • {sentimento}: {count}")
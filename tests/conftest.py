@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture(autouse=True)
+def pasta_isolada(tmp_path, monkeypatch):
+    """Cada teste roda em uma pasta vazia, sem enxergar o config.ini nem o cache do projeto."""
+    from feedback_analyzer import cache, config
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, 'CAMINHOS_CONFIG', [str(tmp_path / 'config.ini')])
+    monkeypatch.setattr(cache, '_cache_global', None)  # Cache de análises aberto na pasta do teste
+    return tmp_path
+
+
+@pytest.fixture
+def escrever_config(pasta_isolada):
+    """Grava o config.ini do teste: escrever_config("[SECAO]\\nCHAVE = valor")."""
+    def escrever(conteudo):
+        (pasta_isolada / 'config.ini').write_text(conteudo, encoding='utf-8')
+    return escrever
+
+
+@pytest.fixture
+def backend_simulado():
+    """BackendSimulado instantâneo e sem falhas, com limitador sem espera; restaura os globais no fim."""
+    from feedback_analyzer import gemini_processor
+    from feedback_analyzer.backends import BackendSimulado
+    from feedback_analyzer.rate_limiter import LimitadorTokenBucket, definir_limitador
+
+    backend = BackendSimulado(latencia_mediana=0.0, segundos_por_item=0.0, semente=1)
+    gemini_processor.definir_backend(backend)
+    definir_limitador(LimitadorTokenBucket(requisicoes_por_minuto=1e9, rajada=10**6))
+    yield backend
+    gemini_processor.definir_backend(None)
+    definir_limitador(None)
@@ -0,0 +1,31 @@
+from feedback_analyzer import gemini_processor
+from feedback_analyzer.analysis_engine import executar_analise
+
+
+def _analisar(comentarios, **kwargs):
+    return executar_analise(comentarios, usar_cache=False, usar_classificador_local=False,
+                            agrupar_duplicados=False, silencioso=True, **kwargs)
+
+
+def test_resultados_na_ordem_da_entrada(backend_simulado):
+    comentarios = [f"Comentário número {i} sobre a entrega do pedido." for i in range(12)]
+    stats = {}
+    resultados = _analisar(comentarios, tamanho_lote=5, estatisticas=stats)
+
+    assert len(resultados) == 12
+    assert all(r['sentimento'] in gemini_processor.SENTIMENTOS for r in resultados)
+    assert stats['requisicoes'] == 3
+
+
+def test_comentario_segmentado_conta_uma_requisicao_por_trecho(backend_simulado, escrever_config, monkeypatch):
+    escrever_config("[MODELOS]\nTOKENS_SEGMENTO = 20\n")
+    monkeypatch.setattr(gemini_processor, '_tokens_segmento', None)
+    longo = " ".join(f"A frase número {i} fala do aplicativo." for i in range(20))
+    trechos = gemini_processor.segmentar_comentario(longo)
+    assert len(trechos) > 1
+
+    stats = {}
+    resultados = _analisar([longo, "Curto e bom."], tamanho_lote=5, estatisticas=stats)
+
+    assert len(resultados) == 2
+    assert stats['requisicoes'] == 1 + len(trechos)
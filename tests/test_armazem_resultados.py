@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from feedback_analyzer.armazem_resultados import ArmazemResultados, agregar_historico, ler_historico
+
+pytest.importorskip('pyarrow')  # Dependência opcional do histórico
+
+
+def _registros(inicio, quantidade):
+    return [
+        {'linha': i, 'data': '2024-03-0%d' % (1 + i % 3), 'fonte': 'Loja', 'comentario': f"Comentário {i}"}
+        for i in range(inicio, inicio + quantidade)
+    ]
+
+
+def _resultados(sentimentos):
+    return [{'sentimento': s, 'categoria': 'Suporte', 'resumo_curto': f"Resumo {s}"} for s in sentimentos]
+
+
+def test_execucoes_gravadas_voltam_no_historico(tmp_path):
+    pasta = str(tmp_path / 'historico')
+    primeira = ArmazemResultados(pasta, 'exec-1', 'App X', linhas_por_grupo=2)
+    primeira.escrever(_registros(0, 3), _resultados(['Positivo', 'Negativo', 'Positivo']))
+    primeira.escrever(_registros(3, 1), _resultados(['Erro']))
+    primeira.finalizar()
+    segunda = ArmazemResultados(pasta, 'exec-2', 'App Y')
+    segunda.escrever(_registros(0, 2), _resultados(['Neutro', 'Positivo']))
+    segunda.finalizar()
+
+    df = ler_historico(pasta=pasta).sort_values(['execucao', 'linha']).reset_index(drop=True)
+
+    assert primeira.total == 4 and segunda.total == 2
+    assert list(df['execucao']) == ['exec-1'] * 4 + ['exec-2'] * 2
+    assert list(df['produto'].unique()) == ['App X', 'App Y']
+    assert list(df['comentario'][:4]) == [f"Comentário {i}" for i in range(4)]
+    assert list(df['sentimento']) == ['Positivo', 'Negativo', 'Positivo', 'Erro', 'Neutro', 'Positivo']
+    assert str(df['sentimento'].dtype) == 'category'
+    assert df['data'][0].strftime('%Y-%m-%d') == '2024-03-01'
+
+    contagem = agregar_historico(por=['sentimento'], pasta=pasta)
+    assert dict(zip(contagem['sentimento'], contagem['comentarios'])) == {'Positivo': 3, 'Negativo': 1, 'Neutro': 1}
+
+
+def test_execucao_descartada_nao_entra_no_historico(tmp_path):
+    pasta = str(tmp_path / 'historico')
+    armazem = ArmazemResultados(pasta, 'exec-1', 'App X')
+    armazem.escrever(_registros(0, 2), _resultados(['Positivo', 'Negativo']))
+    armazem.descartar()
+
+    assert os.listdir(pasta) == []
+    assert ler_historico(pasta=pasta).empty
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feedback_analyzer.backends import BackendHTTP, BackendSimulado, criar_backend
+from feedback_analyzer.servidor_simulado import iniciar_servidor_simulado
+
+
+def test_http_usa_o_modelo_na_url():
+    caminhos = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            caminhos.append(self.path)
+            self.rfile.read(int(self.headers['Content-Length']))
+            corpo = b'{"candidates": [{"content": {"parts": [{"text": "ok"}]}}]}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        backend = criar_backend('http', 'gemini-1.5-pro', url=f"http://127.0.0.1:{servidor.server_address[1]}")
+        assert isinstance(backend, BackendHTTP)
+        assert backend.modelo == 'gemini-1.5-pro'
+        assert backend.gerar("oi") == "ok"
+    finally:
+        servidor.shutdown()
+    assert caminhos == ['/v1beta/models/gemini-1.5-pro:generateContent']
+
+
+def test_simulado_informa_o_modelo_da_faixa():
+    backend = criar_backend('simulado', 'gemini-1.5-flash', latencia_mediana=0.0)
+    assert isinstance(backend, BackendSimulado)
+    assert backend.modelo == 'simulado:gemini-1.5-flash'
+
+
+def test_http_contra_o_servidor_simulado():
+    servidor, url = iniciar_servidor_simulado(latencia_mediana=0.0, segundos_por_item=0.0)
+    try:
+        backend = criar_backend('http', 'gemini-1.5-flash', url=url)
+        assert 'sentimento' in backend.gerar('Analise.\n\n    Comentário: "Adorei"\n    ')
+    finally:
+        servidor.shutdown()
+
+
+def test_http_async_contra_o_servidor_simulado():
+    servidor, url = iniciar_servidor_simulado(latencia_mediana=0.0, segundos_por_item=0.0)
+    try:
+        backend = criar_backend('http', 'gemini-1.5-flash', url=url)
+        assert 'sentimento' in asyncio.run(backend.gerar_async('Analise.\n\n    Comentário: "Adorei"\n    '))
+    finally:
+        servidor.shutdown()
+
+
+def test_http_async_recusa_resposta_chunked():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            corpo = b'{"candidates": [{"content": {"parts": [{"text": "ok"}]}}]}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(corpo), corpo))
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        backend = criar_backend('http', 'simulado', url=f"http://127.0.0.1:{servidor.server_address[1]}")
+        with pytest.raises(ValueError, match="chunked"):
+            asyncio.run(backend.gerar_async("oi"))
+    finally:
+        servidor.shutdown()
+
+
+def test_http_recusa_esquema_desconhecido():
+    with pytest.raises(ValueError, match="http"):
+        criar_backend('http', 'simulado', url="ftp://127.0.0.1:8080")
+
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        criar_backend('outro', 'x')
@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+PASTA_BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from corpus_sintetico import gerar_corpus  # noqa: E402
+
+
+def test_corpus_sintetico_e_deterministico():
+    corpus = gerar_corpus(200, semente=7, proporcao_repetidos=0.3)
+
+    assert corpus == gerar_corpus(200, semente=7, proporcao_repetidos=0.3)
+    assert corpus != gerar_corpus(200, semente=8, proporcao_repetidos=0.3)
+    assert len(corpus) == 200 and all(isinstance(c, str) and c for c in corpus)
+
+
+def test_benchmark_grava_as_medicoes_em_json(pasta_isolada):
+    saida = pasta_isolada / 'resultado.json'
+    subprocess.run(
+        [sys.executable, os.path.join(PASTA_BENCHMARKS, 'benchmark_analise.py'),
+         '--tamanhos', '30', '--workers', '2,4', '--lotes', '10', '--sem-carregadores',
+         '--latencia-mediana', '0', '--segundos-por-item', '0', '--saida', str(saida)],
+        check=True, capture_output=True, timeout=120
+    )
+
+    relatorio = json.loads(saida.read_text(encoding='utf-8'))
+    assert [(m['max_workers'], m['tamanho_lote']) for m in relatorio['analise']] == [(2, 10), (4, 10)]
+    for medicao in relatorio['analise']:
+        assert medicao['comentarios'] == 30 and medicao['erros'] == 0
+        assert medicao['latencia_p50'] <= medicao['latencia_p95'] <= medicao['latencia_p99']
+        assert medicao['requisicoes'] >= 1
@@ -0,0 +1,97 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+import requests
+
+from feedback_analyzer import http_cliente
+from feedback_analyzer.capturas import (
+    capturar_pagina, ler_indice, normalizar_url, para_reproducao, registrar_listagem, url_original
+)
+from feedback_analyzer.http_cliente import extrair_com_cache
+from feedback_analyzer.servidor_capturas import iniciar_servidor_capturas
+
+PAGINA = ('<html><body><p class="review">Entrega rápida</p>'
+          '<a class="next" href="/reviews?p=2">Próxima</a></body></html>')
+
+
+class SiteOriginal(BaseHTTPRequestHandler):
+    def do_GET(self):
+        corpo = PAGINA.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _extrair(resposta):
+    """Texto do review e o link da próxima página resolvido contra a URL da resposta."""
+    return [resposta.text.split('"review">')[1].split('<')[0], urljoin(resposta.url, '/reviews?p=2')]
+
+
+def test_mapeamento_de_urls(escrever_config):
+    url = "https://loja.com/produto?id=1#reviews"
+    assert normalizar_url(url) == "https://loja.com/produto?id=1"
+    assert normalizar_url("https://loja.com") == "https://loja.com/"
+    assert para_reproducao(url) == url  # Reprodução desligada
+
+    escrever_config("[EXTRACAO]\nSERVIDOR_REPRODUCAO = http://127.0.0.1:8766/\n")
+    espelhada = para_reproducao(url, 'dom')
+    assert espelhada == "http://127.0.0.1:8766/dom/https/loja.com/produto?id=1"
+    assert para_reproducao(espelhada) == espelhada
+    assert url_original(espelhada) == "https://loja.com/produto?id=1"
+    assert url_original("https://outro.com/x") == "https://outro.com/x"
+
+
+def test_captura_e_reproducao_offline(escrever_config, pasta_isolada, monkeypatch):
+    monkeypatch.setattr(http_cliente, '_cache_global', None)
+    monkeypatch.setattr(http_cliente, '_cache_carregado', False)
+    site = ThreadingHTTPServer(('127.0.0.1', 0), SiteOriginal)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{site.server_port}/reviews?p=1"
+
+    escrever_config("[EXTRACAO]\nCACHE_HTTP = false\nPASTA_CAPTURA = capturas\n")
+    registrar_listagem(url, 'generico')
+    capturado = extrair_com_cache(url, _extrair)
+    capturar_pagina(url, PAGINA.replace('</body>', '<script>alert(1)</script></body>'), 'dom')
+    site.shutdown()
+    site.server_close()  # Daqui em diante, o site original não existe mais
+
+    indice = ler_indice(str(pasta_isolada / 'capturas'))
+    assert indice['listagens'] == {url: 'generico'}
+    assert set(indice['paginas'][url]) == {'http', 'dom'}
+
+    servidor, endereco = iniciar_servidor_capturas(str(pasta_isolada / 'capturas'))
+    try:
+        escrever_config(f"[EXTRACAO]\nCACHE_HTTP = false\nSERVIDOR_REPRODUCAO = {endereco}\n")
+        reproduzido = extrair_com_cache(url, _extrair)
+        assert reproduzido == capturado == ["Entrega rápida", f"http://127.0.0.1:{site.server_port}/reviews?p=2"]
+
+        dom = requests.get(para_reproducao(url, 'dom'), timeout=5)
+        assert 'Entrega rápida' in dom.text and '<script' not in dom.text
+
+        etag = dom.headers['ETag']
+        assert requests.get(para_reproducao(url, 'dom'), headers={'If-None-Match': etag}, timeout=5).status_code == 304
+        assert requests.get(para_reproducao(url + '&x=1'), timeout=5).status_code == 404
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_pagina_sem_o_tipo_pedido_serve_o_outro(escrever_config, pasta_isolada):
+    escrever_config("[EXTRACAO]\nPASTA_CAPTURA = capturas\n")
+    capturar_pagina("https://loja.com/api/reviews", json.dumps({"reviews": ["Ok"]}), 'http', 'application/json')
+
+    servidor, endereco = iniciar_servidor_capturas(str(pasta_isolada / 'capturas'))
+    try:
+        resposta = requests.get(f"{endereco}/dom/https/loja.com/api/reviews", timeout=5)
+        assert resposta.json() == {"reviews": ["Ok"]}
+        assert resposta.headers['Content-Type'] == 'application/json'
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+from feedback_analyzer.carregador_arquivos import iterar_blocos_arquivo, iterar_valores_json, juntar_blocos
+
+
+def _comentarios(caminho, tamanho_bloco=10000):
+    return list(juntar_blocos(iterar_blocos_arquivo(str(caminho), tamanho_bloco))['comentario'])
+
+
+@pytest.mark.parametrize('tamanho_leitura', [1, 3, 7, 1 << 20])
+def test_valores_de_um_array_lidos_aos_poucos(tamanho_leitura):
+    valores = [{"comentario": "Bom, mas [caro]"}, "texto com \"aspas\" e ]", 12345, -0.5, None, [1, 2], True]
+    texto = ' [\n' + ',\n  '.join(json.dumps(valor, ensure_ascii=False) for valor in valores) + '\n] '
+    assert list(iterar_valores_json(io.StringIO(texto), tamanho_leitura)) == valores
+
+
+@pytest.mark.parametrize('tamanho_leitura', [1, 5, 1 << 20])
+def test_valores_de_json_lines(tamanho_leitura):
+    valores = [{"text": "Ótimo"}, {"comentario": "Ruim"}, 42, "solto"]
+    texto = '\n'.join(json.dumps(valor, ensure_ascii=False) for valor in valores) + '\n'
+    assert list(iterar_valores_json(io.StringIO(texto), tamanho_leitura)) == valores
+
+
+def test_arquivo_vazio_e_array_vazio():
+    assert list(iterar_valores_json(io.StringIO(''))) == []
+    assert list(iterar_valores_json(io.StringIO('  [ ]  '))) == []
+
+
+def test_json_invalido_falha():
+    with pytest.raises(json.JSONDecodeError):
+        list(iterar_valores_json(io.StringIO('[{"comentario": "sem fim"')))
+
+
+def test_array_json_em_blocos(pasta_isolada):
+    caminho = pasta_isolada / 'comentarios.json'
+    caminho.write_text(json.dumps(["Primeiro", {"comentario": "Segundo"}, {"text": "Terceiro"}]), encoding='utf-8')
+
+    blocos = list(iterar_blocos_arquivo(str(caminho), tamanho_bloco=2))
+    assert [len(bloco) for bloco in blocos] == [2, 1]
+    assert list(juntar_blocos(blocos)['comentario']) == ["Primeiro", "Segundo", "Terceiro"]
+
+
+def test_objeto_unico_no_topo_vira_um_comentario(pasta_isolada):
+    dados = {"produto": "App", "nota": 2}
+    caminho = pasta_isolada / 'objeto.json'
+    caminho.write_text(json.dumps(dados), encoding='utf-8')
+    assert _comentarios(caminho) == [str(dados)]
+
+
+def test_json_lines_avisa_objetos_sem_comentario(pasta_isolada, capsys):
+    caminho = pasta_isolada / 'comentarios.jsonl'
+    caminho.write_text('{"comentario": "Bom"}\n{"nota": 5}\n', encoding='utf-8')
+
+    assert _comentarios(caminho) == ["Bom", "{'nota': 5}"]
+    assert "[AVISO] 1 objetos sem a chave 'comentario' ou 'text'" in capsys.readouterr().out
+
+
+def test_csv_em_blocos_com_coluna_alternativa(pasta_isolada):
+    caminho = pasta_isolada / 'comentarios.csv'
+    caminho.write_text("id,review,fonte\n1,Muito bom,Amazon\n2,,Amazon\n3,Travou,Google Play\n", encoding='utf-8')
+
+    df = juntar_blocos(iterar_blocos_arquivo(str(caminho), tamanho_bloco=1))
+    assert list(df.columns) == ['data', 'fonte', 'comentario']
+    assert list(df['comentario']) == ["Muito bom", "Travou"]
+    assert list(df['fonte']) == ["Amazon", "Google Play"]
+
+
+def test_txt_ignora_linhas_vazias(pasta_isolada):
+    caminho = pasta_isolada / 'comentarios.txt'
+    caminho.write_text("Primeiro\n\n  Segundo  \n", encoding='utf-8')
+    assert _comentarios(caminho) == ["Primeiro", "Segundo"]
+
+
+def test_erros_saem_na_chamada(pasta_isolada):
+    with pytest.raises(FileNotFoundError):
+        iterar_blocos_arquivo(str(pasta_isolada / 'nao_existe.csv'))
+    (pasta_isolada / 'dados.xml').write_text('<a/>', encoding='utf-8')
+    with pytest.raises(ValueError):
+        iterar_blocos_arquivo(str(pasta_isolada / 'dados.xml'))
+    (pasta_isolada / 'sem_coluna.csv').write_text('id,nota\n1,5\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        iterar_blocos_arquivo(str(pasta_isolada / 'sem_coluna.csv'))
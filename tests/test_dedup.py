@@ -0,0 +1,57 @@
+from feedback_analyzer.dedup import agrupar_quase_duplicados, expandir_resultados, normalizar_comentario
+
+
+def test_normalizacao():
+    assert normalizar_comentario("Ótimo produto!!") == "otimo produto"
+    assert normalizar_comentario("  otimo   PRODUTOOO ") == "otimo produto"
+    assert normalizar_comentario("Bateria de 5000mAh por 1000 reais") == "bateria de 5000mah por 1000 reais"
+
+
+def test_iguais_apos_normalizar_ficam_no_mesmo_grupo():
+    grupos = agrupar_quase_duplicados(["Ótimo produto!", "otimo produtooo", "Entrega atrasou", "ÓTIMO PRODUTO"])
+    assert grupos == [0, 0, 2, 0]
+
+
+def test_quase_duplicados_agrupados_pelo_lsh():
+    base = "O aplicativo fecha sozinho toda vez que tento finalizar a compra pelo celular"
+    comentarios = [
+        "Adorei a entrega rápida",
+        base,
+        base + " hoje",
+        "A interface nova ficou confusa e difícil de usar",
+        base.replace("celular", "celulr"),
+    ]
+    assert agrupar_quase_duplicados(comentarios) == [0, 1, 1, 3, 1]
+
+
+def test_numeros_diferentes_nao_sao_agrupados():
+    assert agrupar_quase_duplicados(["custa 1000 reais", "custa 10 reais"]) == [0, 1]
+    assert agrupar_quase_duplicados(["Bateria de 5000mAh dura o dia todo",
+                                     "Bateria de 50mAh dura o dia todo"], limiar=1.0) == [0, 1]
+
+
+def test_negacao_separa_grupos():
+    comentarios = ["O atendimento foi muito bom e resolveu tudo rapidamente",
+                   "O atendimento não foi muito bom e resolveu tudo rapidamente"]
+    assert agrupar_quase_duplicados(comentarios, limiar=0.5) == [0, 1]
+
+
+def test_limiar_um_so_agrupa_iguais():
+    comentarios = ["A tela trava ao abrir o carrinho de compras", "A tela trava ao abrir o carrinho de compra"]
+    assert agrupar_quase_duplicados(comentarios, limiar=1.0) == [0, 1]
+    assert agrupar_quase_duplicados(comentarios) == [0, 0]
+
+
+def test_representante_e_o_menor_indice_em_muitos_repetidos():
+    comentarios = [f"Comentário diferente número {i} sobre assuntos variados" if i % 3 else "Muito bom"
+                   for i in range(300)]
+    grupos = agrupar_quase_duplicados(comentarios)
+    assert all(grupos[i] == 0 for i in range(0, 300, 3))
+    assert all(grupos[i] <= i for i in range(300))
+
+
+def test_expandir_copia_o_resultado_para_cada_membro():
+    resultados = expandir_resultados({0: {"sentimento": "Positivo"}, 2: {"sentimento": "Negativo"}}, [0, 0, 2])
+    assert resultados == [{"sentimento": "Positivo"}, {"sentimento": "Positivo"}, {"sentimento": "Negativo"}]
+    resultados[0]["sentimento"] = "Neutro"
+    assert resultados[1]["sentimento"] == "Positivo"  # Cópias independentes
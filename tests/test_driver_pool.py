@@ -0,0 +1,106 @@
+from feedback_analyzer import driver_pool
+from feedback_analyzer.driver_pool import PoolDrivers
+
+
+class DriverFalso:
+    def __init__(self):
+        self.fechado = False
+
+    def execute_script(self, script):
+        if self.fechado:
+            raise RuntimeError("sessão encerrada")
+        return 1
+
+    def quit(self):
+        self.fechado = True
+
+
+def test_reaproveita_o_driver_entre_emprestimos():
+    pool = PoolDrivers(tamanho=1, fabrica=DriverFalso)
+    with pool.emprestar() as primeiro:
+        pass
+    with pool.emprestar() as segundo:
+        pass
+    assert primeiro is segundo
+    assert pool.estatisticas()['criados'] == 1
+
+
+def test_recicla_pelas_paginas_abertas_e_nao_pelos_emprestimos():
+    pool = PoolDrivers(tamanho=1, paginas_por_driver=5, fabrica=DriverFalso)
+
+    with pool.emprestar() as driver:
+        for _ in range(5):  # Uma URL com várias páginas de reviews
+            pool.registrar_pagina(driver)
+    assert driver.fechado
+
+    with pool.emprestar() as novo:
+        pool.registrar_pagina(novo)
+    for _ in range(3):
+        with pool.emprestar() as mesmo:
+            pool.registrar_pagina(mesmo)
+    assert mesmo is novo and not novo.fechado
+
+    estatisticas = pool.estatisticas()
+    assert estatisticas['criados'] == 2
+    assert estatisticas['reciclados'] == 1
+    assert estatisticas['paginas'] == 9
+
+
+def test_registrar_pagina_global_ignora_drivers_fora_do_pool(monkeypatch):
+    pool = PoolDrivers(tamanho=1, fabrica=DriverFalso)
+    monkeypatch.setattr(driver_pool, '_pool_global', pool)
+    driver_pool.registrar_pagina(DriverFalso())
+    with pool.emprestar() as driver:
+        driver_pool.registrar_pagina(driver)
+    assert pool.estatisticas()['paginas'] == 1
+
+
+def test_substitui_driver_que_nao_responde():
+    pool = PoolDrivers(tamanho=1, fabrica=DriverFalso)
+    with pool.emprestar() as driver:
+        pass
+    driver.fechado = True  # O Chrome caiu enquanto estava ocioso
+    with pool.emprestar() as novo:
+        pass
+    assert novo is not driver
+    assert pool.estatisticas()['reciclados'] == 1
+
+
+def test_tenta_criar_de_novo_depois_da_espera(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(driver_pool.time, 'monotonic', lambda: agora[0])
+    tentativas = []
+
+    def fabrica():
+        tentativas.append(1)
+        if len(tentativas) == 1:
+            raise RuntimeError("chromedriver ausente")
+        return DriverFalso()
+
+    pool = PoolDrivers(tamanho=1, fabrica=fabrica, espera_apos_erro=30)
+    with pool.emprestar() as driver:
+        assert driver is None
+    with pool.emprestar() as driver:
+        assert driver is None  # Ainda dentro da espera: nem tenta
+    assert len(tentativas) == 1
+
+    agora[0] += 30
+    with pool.emprestar() as driver:
+        assert isinstance(driver, DriverFalso)
+    assert pool.erro is None
+    assert pool.estatisticas()['abertos'] == 1
+
+
+def test_bloqueia_recursos_pesados_pelo_devtools():
+    comandos = []
+
+    class DriverComDevtools(DriverFalso):
+        def execute_cdp_cmd(self, comando, parametros):
+            comandos.append((comando, parametros))
+
+    driver_pool.bloquear_recursos(DriverComDevtools())
+
+    assert [comando for comando, _ in comandos] == ['Network.enable', 'Network.setBlockedURLs']
+    bloqueados = comandos[1][1]['urls']
+    assert '*.woff2' in bloqueados and '*.png' in bloqueados
+    assert not any(padrao.endswith('.css') for padrao in bloqueados)  # O texto visível depende do CSS
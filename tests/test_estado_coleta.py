@@ -0,0 +1,101 @@
+import pytest
+
+from feedback_analyzer.estado_coleta import Coleta, EstadoColetas
+
+URL = "https://loja.com/produto/reviews"
+
+
+class Listagem:
+    """Listagem paginada falsa: páginas p1..pN, cada uma com seus reviews, do mais novo ao mais antigo."""
+
+    def __init__(self, paginas):
+        self.paginas = paginas
+        self.lidas = []
+
+    def ler_pagina(self, pagina):
+        self.lidas.append(pagina)
+        numero = int(pagina.rsplit('p', 1)[1])
+        proxima = f"{URL}?p{numero + 1}" if numero < len(self.paginas) else None
+        return list(self.paginas[numero - 1]), proxima
+
+
+def _coletar(estado, listagem, max_paginas, incremental=True):
+    coleta = Coleta(URL, estado, max_paginas=max_paginas, incremental=incremental)
+    textos = list(coleta.percorrer(f"{URL}?p1", listagem.ler_pagina))
+    coleta.concluir()
+    return coleta, textos
+
+
+@pytest.fixture
+def estado(pasta_isolada):
+    estado = EstadoColetas(str(pasta_isolada / 'coletas.db'))
+    yield estado
+    estado.fechar()
+
+
+def test_primeira_coleta_para_no_limite_e_guarda_o_cursor(estado):
+    listagem = Listagem([["r1", "r2"], ["r3", "r4"], ["r5"], ["r6"]])
+    coleta, textos = _coletar(estado, listagem, max_paginas=2)
+
+    assert not coleta.incremental
+    assert textos == ["r1", "r2", "r3", "r4"]
+    assert coleta.cursor == f"{URL}?p3"
+    assert estado.obter(URL)['cursor'] == f"{URL}?p3"
+
+
+def test_coleta_seguinte_traz_so_os_novos_e_retoma_do_cursor(estado):
+    listagem = Listagem([["r1", "r2"], ["r3", "r4"], ["r5"], ["r6"]])
+    _coletar(estado, listagem, max_paginas=2)
+
+    listagem.paginas[0] = ["novo", "r1", "r2"]  # Um review novo no topo
+    listagem.lidas = []
+    coleta, textos = _coletar(estado, listagem, max_paginas=2)
+    assert coleta.incremental and coleta.parou_em_conhecidos
+    assert textos == ["novo", "r5"]
+    assert listagem.lidas == [f"{URL}?p1", f"{URL}?p3"]  # Pula a página já vista
+    assert coleta.cursor == f"{URL}?p4"
+
+    listagem.lidas = []
+    coleta, textos = _coletar(estado, listagem, max_paginas=2)
+    assert textos == ["r6"]
+    assert coleta.cursor is None  # Listagem toda coletada
+    assert estado.obter(URL)['cursor'] is None
+
+    listagem.lidas = []
+    coleta, textos = _coletar(estado, listagem, max_paginas=2)
+    assert textos == []
+    assert listagem.lidas == [f"{URL}?p1"]  # Sem cursor: para na primeira página conhecida
+    assert coleta.lidos == 3
+
+
+def test_coleta_completa_le_tudo_mas_grava_o_estado(estado):
+    listagem = Listagem([["r1"], ["r2"], ["r2", "r3"]])
+    _coletar(estado, listagem, max_paginas=10)
+
+    coleta, textos = _coletar(estado, listagem, max_paginas=10, incremental=False)
+    assert textos == ["r1", "r2", "r3"]  # Repetidos dentro da mesma coleta saem uma vez só
+    assert estado.obter(URL)['coletas'] == 2
+
+
+def test_erro_na_pagina_vira_o_cursor(estado):
+    def ler_pagina(pagina):
+        if pagina.endswith('p2'):
+            raise ConnectionError("queda")
+        return ["r1"], f"{URL}?p2"
+
+    coleta = Coleta(URL, estado, max_paginas=5)
+    textos = []
+    with pytest.raises(ConnectionError):
+        for texto in coleta.percorrer(f"{URL}?p1", ler_pagina):
+            textos.append(texto)
+    coleta.concluir()
+
+    assert textos == ["r1"]
+    assert estado.obter(URL)['cursor'] == f"{URL}?p2"
+
+
+def test_sem_estado_nao_e_incremental():
+    coleta = Coleta(URL, None, max_paginas=1)
+    assert not coleta.incremental
+    assert list(coleta.percorrer(f"{URL}?p1", lambda pagina: (["r1", "r1"], None))) == ["r1"]
+    coleta.concluir()  # Sem onde gravar: não faz nada
@@ -0,0 +1,147 @@
+import time
+
+from feedback_analyzer import gemini_processor
+from feedback_analyzer.gemini_processor import (
+    analisar_comentario_individual, analisar_lote, gerar_resumo_executivo, dividir_em_lotes,
+    normalizar_resultado, _interpretar_resposta_lote, TOKENS_PROMPT_LOTE
+)
+
+
+def test_analise_individual_sincrona(backend_simulado):
+    resultado = analisar_comentario_individual("O aplicativo trava toda vez que abro.")
+    assert resultado['sentimento'] in gemini_processor.SENTIMENTOS
+    assert resultado['categoria'] in gemini_processor.CATEGORIAS
+
+
+def test_analise_em_lote_sincrona(backend_simulado):
+    resultados = analisar_lote(["Adorei o produto.", "Entrega atrasou.", "Tela travando."])
+    assert len(resultados) == 3
+    assert all(r is not None and r['sentimento'] in gemini_processor.SENTIMENTOS for r in resultados)
+
+
+def test_resumo_executivo_sincrono(backend_simulado):
+    resumo = gerar_resumo_executivo("Positivo 10\nNegativo 3")
+    assert resumo.startswith("Resumo simulado")
+
+
+def test_tokens_segmento_le_o_config_uma_vez(escrever_config, monkeypatch):
+    escrever_config("[MODELOS]\nTOKENS_SEGMENTO = 50\n")
+    monkeypatch.setattr(gemini_processor, '_tokens_segmento', None)
+    leituras = []
+    obter_opcao = gemini_processor.obter_opcao
+    monkeypatch.setattr(gemini_processor, 'obter_opcao', lambda *a, **k: leituras.append(a) or obter_opcao(*a, **k))
+
+    assert gemini_processor.precisa_segmentar("palavra " * 100)
+    assert not gemini_processor.precisa_segmentar("curto")
+    assert gemini_processor.tokens_segmento() == 50
+    assert len(leituras) == 1
+
+
+def test_estatisticas_mostram_o_modelo_do_backend(backend_simulado, monkeypatch):
+    monkeypatch.setattr(gemini_processor, '_metricas_faixas', {})
+    analisar_lote(["Adorei o produto."])
+    assert {dados['modelo'] for dados in gemini_processor.estatisticas_faixas().values()} == {'simulado'}
+
+
+def test_lotes_respeitam_o_tamanho_maximo():
+    lotes = dividir_em_lotes(["curto"] * 45, tamanho_lote=20)
+    assert [len(lote) for lote in lotes] == [20, 20, 5]
+    assert [i for lote in lotes for i in lote] == list(range(45))
+
+
+def test_lotes_respeitam_o_orcamento_de_tokens():
+    comentario = "x" * 400  # 100 tokens estimados, mais 5 do índice
+    lotes = dividir_em_lotes([comentario] * 10, tamanho_lote=20, max_tokens_lote=TOKENS_PROMPT_LOTE + 3 * 105)
+    assert [len(lote) for lote in lotes] == [3, 3, 3, 1]
+
+
+def test_comentario_maior_que_o_orcamento_vai_sozinho():
+    lotes = dividir_em_lotes(["a", "x" * 40000, "b"], tamanho_lote=20, max_tokens_lote=1000)
+    assert lotes == [[0], [1], [2]]
+
+
+def test_resposta_em_lote_alinhada_pelos_indices():
+    texto = """```json
+    [
+      {"indice": 2, "sentimento": "Negativo", "categoria": "Bug", "resumo_curto": "Trava"},
+      {"indice": 0, "sentimento": "Positivo", "categoria": "UI/UX", "resumo_curto": "Bonito"},
+      {"indice": 0, "sentimento": "Neutro", "categoria": "Suporte", "resumo_curto": "Duplicado"},
+      {"indice": 7, "sentimento": "Neutro", "categoria": "Suporte", "resumo_curto": "Fora do lote"},
+      {"sentimento": "Neutro", "categoria": "Suporte", "resumo_curto": "Sem índice"}
+    ]
+    ```"""
+    resultados = _interpretar_resposta_lote(texto, 4)
+
+    assert resultados[0] == {"sentimento": "Positivo", "categoria": "UI/UX", "resumo_curto": "Bonito"}
+    assert resultados[1] is None and resultados[3] is None
+    assert resultados[2]["resumo_curto"] == "Trava"
+
+
+def test_resposta_em_lote_invalida_deixa_tudo_para_reenvio():
+    assert _interpretar_resposta_lote("não é JSON", 3) == [None, None, None]
+    assert _interpretar_resposta_lote('{"erro": "sem lista"}', 2) == [None, None]
+
+
+def test_resultado_valido_passa_sem_reparo():
+    item = {"sentimento": "Negativo", "categoria": "Bug", "resumo_curto": "Trava ao abrir", "indice": 3}
+    assert normalizar_resultado(item) == (item, False)
+
+
+def test_repara_campos_em_ingles_e_rotulos_com_outra_grafia():
+    resultado, reparado = normalizar_resultado(
+        {"Sentiment": "NEGATIVE", "category": "ui / ux", "summary": "Botão escondido", "index": "1"}
+    )
+    assert reparado
+    assert resultado == {"sentimento": "Negativo", "categoria": "UI/UX", "resumo_curto": "Botão escondido",
+                         "indice": "1"}
+    assert normalizar_resultado({"sentimento": "positivo", "categoria": "sugestao", "resumo_curto": "Ok"}) == (
+        {"sentimento": "Positivo", "categoria": "Sugestão", "resumo_curto": "Ok"}, True
+    )
+
+
+def test_rejeita_o_que_nao_tem_conserto():
+    assert normalizar_resultado("Positivo") == (None, False)
+    assert normalizar_resultado({"sentimento": "Furioso", "categoria": "Bug", "resumo_curto": "x"}) == (None, False)
+    assert normalizar_resultado({"sentimento": "Positivo", "categoria": "Bug", "resumo_curto": "  "}) == (None, False)
+    assert normalizar_resultado({"sentimento": "Positivo", "resumo_curto": "Sem categoria"}) == (None, False)
+
+
+def test_resposta_em_lote_conta_itens_reparados_e_rejeitados(monkeypatch):
+    monkeypatch.setattr(gemini_processor, '_metricas_respostas', dict.fromkeys(
+        ("respostas", "respostas_invalidas", "itens_reparados", "itens_rejeitados"), 0))
+    texto = """[
+      {"index": 0, "sentiment": "positive", "category": "support", "summary": "Atendeu rápido"},
+      {"indice": 1, "sentimento": "Furioso", "categoria": "Bug", "resumo_curto": "x"}
+    ]"""
+    resultados = _interpretar_resposta_lote(texto, 2)
+
+    assert resultados == [{"sentimento": "Positivo", "categoria": "Suporte", "resumo_curto": "Atendeu rápido"}, None]
+    assert gemini_processor.estatisticas_respostas() == {
+        "respostas": 1, "respostas_invalidas": 0, "itens_reparados": 1, "itens_rejeitados": 1
+    }
+
+
+def test_chamada_sincrona_respeita_o_prazo_e_repete(backend_simulado, monkeypatch):
+    from feedback_analyzer import rate_limiter
+
+    prazos = rate_limiter.ControlePrazos(timeout=0.05, hedge=False)
+    monkeypatch.setattr(rate_limiter, '_prazos_global', prazos)
+    monkeypatch.setattr(gemini_processor, 'calcular_backoff', lambda tentativa: 0.0)
+    latencias = iter([5.0, 0.0])
+    monkeypatch.setattr(backend_simulado.simulador, 'latencia', lambda prompt: next(latencias))
+
+    inicio = time.monotonic()
+    resumo = gemini_processor._gerar_texto("Resumo executivo dos comentários")
+
+    assert time.monotonic() - inicio < 1.0  # A primeira tentativa parou no prazo, sem esperar os 5s
+    assert resumo
+    assert prazos.estatisticas()['timeouts'] == 1
+
+
+def test_saida_estruturada_desligada_sem_config(escrever_config, monkeypatch):
+    monkeypatch.setattr(gemini_processor, '_saida_estruturada', None)
+    assert not gemini_processor.usar_saida_estruturada()
+
+    escrever_config("[PROCESSAMENTO]\nSAIDA_ESTRUTURADA = true\n")
+    monkeypatch.setattr(gemini_processor, '_saida_estruturada', None)
+    assert gemini_processor.usar_saida_estruturada()
@@ -0,0 +1,71 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feedback_analyzer import http_cliente
+from feedback_analyzer.http_cliente import CachePaginas, extrair_com_cache
+
+
+class ServidorComEtag(BaseHTTPRequestHandler):
+    """Responde sempre a mesma página, com ETag; 304 quando o cliente já a tem."""
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        corpo = '<p class="review">Ótimo produto</p>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url_servidor(monkeypatch):
+    monkeypatch.setattr(http_cliente, '_cache_global', None)
+    monkeypatch.setattr(http_cliente, '_cache_carregado', False)
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorComEtag)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_port}/produto"
+    servidor.shutdown()
+    servidor.server_close()
+    if http_cliente._cache_global is not None:
+        http_cliente._cache_global.fechar()
+
+
+def _extrair_texto(resposta):
+    return [resposta.text]
+
+
+def test_segunda_visita_usa_o_get_condicional(url_servidor):
+    primeira = extrair_com_cache(url_servidor, _extrair_texto)
+    segunda = extrair_com_cache(url_servidor, _extrair_texto)
+
+    assert primeira == segunda == ['<p class="review">Ótimo produto</p>']
+    assert http_cliente.obter_cache_paginas().estatisticas() == {'nao_modificadas': 1, 'baixadas': 1}
+
+
+def test_contadores_do_cache_sao_seguros_entre_threads(tmp_path):
+    cache = CachePaginas(caminho=str(tmp_path / 'paginas.db'))
+    cache.salvar('https://site.com/p', 'extrator', '"v1"', None, ['comentário'])
+
+    def visitar():
+        for _ in range(200):
+            cache.registrar_baixada()
+            cache.renovar('https://site.com/p', 'extrator')
+
+    threads = [threading.Thread(target=visitar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.fechar()
+
+    assert cache.estatisticas() == {'nao_modificadas': 1600, 'baixadas': 1600}
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from feedback_analyzer.journal import JournalExecucao, obter_pasta_execucoes
+
+
+def _entrada(comentarios):
+    return pd.DataFrame({'data': ['2024-01-15'] * len(comentarios), 'fonte': ['Produto Web'] * len(comentarios),
+                         'comentario': comentarios})
+
+
+def _resultado(sentimento='Positivo'):
+    return {"sentimento": sentimento, "categoria": "Bug", "resumo_curto": "Resumo"}
+
+
+def test_retomada_traz_so_os_resultados_gravados(pasta_isolada):
+    journal = JournalExecucao.criar(_entrada(["a", "b", "c", "d"]), "App X")
+    journal.registrar([0, 2], [_resultado(), _resultado('Negativo')])
+    journal.registrar([1, 3], [_resultado('Erro'), None])  # Erros ficam para a retomada
+    journal.fechar()
+
+    retomada = JournalExecucao.abrir()
+    assert retomada.id_execucao == journal.id_execucao
+    assert retomada.metadados()['produto'] == "App X"
+    assert retomada.metadados()['total'] == 4
+    assert list(retomada.carregar_entrada()['comentario']) == ["a", "b", "c", "d"]
+    assert retomada.carregar_resultados() == {0: _resultado(), 2: _resultado('Negativo')}
+
+
+def test_ultima_linha_truncada_e_ignorada(pasta_isolada):
+    journal = JournalExecucao.criar(_entrada(["a", "b"]), "App X")
+    journal.registrar([0], [_resultado()])
+    journal.fechar()
+    with open(journal.caminho_resultados, 'a', encoding='utf-8') as f:
+        f.write('{"i": 1, "r": {"sentimento": "Pos')  # Queda durante a escrita
+
+    assert JournalExecucao.abrir(journal.id_execucao).carregar_resultados() == {0: _resultado()}
+
+
+def test_abrir_escolhe_a_mais_recente_pendente(pasta_isolada):
+    primeira = JournalExecucao.criar(_entrada(["a"]), "Primeira")
+    segunda = JournalExecucao.criar(_entrada(["b"]), "Segunda")
+    assert primeira.id_execucao != segunda.id_execucao  # Mesmo segundo: sufixo na pasta
+
+    assert JournalExecucao.abrir().id_execucao == segunda.id_execucao
+    segunda.marcar_concluida(relatorio="relatorio.md", total=1)
+    assert JournalExecucao.abrir().id_execucao == primeira.id_execucao
+    assert segunda.metadados()['relatorio'] == "relatorio.md"
+
+    primeira.marcar_concluida()
+    with pytest.raises(ValueError):
+        JournalExecucao.abrir()
+    with pytest.raises(ValueError):
+        JournalExecucao.abrir('nao-existe')
+
+
+def test_entrada_em_fluxo(pasta_isolada):
+    journal = JournalExecucao.criar(_entrada([]), "App X")
+    journal.adicionar_entrada([{'data': '2024-01-15', 'fonte': 'Amazon', 'comentario': 'Chegou, "ótimo"'}])
+    journal.adicionar_entrada([{'comentario': 'Sem data\nem duas linhas'}])
+    journal.marcar_concluida(total=2)
+    journal.fechar()
+
+    entrada = JournalExecucao.abrir(journal.id_execucao).carregar_entrada()
+    assert list(entrada['comentario']) == ['Chegou, "ótimo"', 'Sem data\nem duas linhas']
+    assert list(entrada['fonte']) == ['Amazon', '']
+    assert journal.metadados()['total'] == 2
+
+
+def test_pasta_do_diario_no_config(escrever_config):
+    assert obter_pasta_execucoes() == 'execucoes'
+    escrever_config("[EXECUCAO]\nPASTA = outras\n")
+    assert obter_pasta_execucoes() == 'outras'
+    escrever_config("[EXECUCAO]\nJOURNAL = false\n")
+    assert obter_pasta_execucoes() is None
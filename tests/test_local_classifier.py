@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from feedback_analyzer.local_classifier import (
+    ClassificadorLocal, ModeloLinearHash, _classificar_por_lexico, extrair_features, LIMIAR_CONFIANCA_PADRAO
+)
+
+
+def test_comentario_curto_de_polaridade_unica_e_aceito():
+    (sentimento, confianca), (categoria, _) = _classificar_por_lexico("Adorei, excelente!")
+    assert sentimento == 'Positivo' and confianca >= LIMIAR_CONFIANCA_PADRAO
+
+    resultado = ClassificadorLocal().classificar(["App trava, péssimo."])[0]
+    assert resultado == {"sentimento": "Negativo", "categoria": "Bug", "resumo_curto": "App trava, péssimo."}
+
+
+@pytest.mark.parametrize('texto', [
+    "não é bom o atendimento",
+    "não é bom, atendimento horrível",
+    "O atendimento nunca foi muito bom",
+])
+def test_negacao_nao_vira_positivo_nem_e_aceita(texto):
+    (sentimento, confianca), _ = _classificar_por_lexico(texto)
+    assert sentimento != 'Positivo'
+    assert confianca < LIMIAR_CONFIANCA_PADRAO
+    assert ClassificadorLocal().classificar([texto]) == [None]
+
+
+def test_janela_de_negacao_termina_na_pontuacao():
+    (sentimento, _), _ = _classificar_por_lexico("não, gostei muito")
+    assert sentimento == 'Positivo'
+    (sentimento, _), _ = _classificar_por_lexico("não sei se eu realmente gostei")
+    assert sentimento == 'Positivo'  # Fora da janela de 3 palavras
+
+
+def test_limiar_decide_o_que_fica_local():
+    comentarios = ["Adorei a interface!", "Chegou ontem e estou testando."]
+    assert ClassificadorLocal().classificar(comentarios, limiar=0.9) == [
+        {"sentimento": "Positivo", "categoria": "UI/UX", "resumo_curto": "Adorei a interface!"}, None
+    ]
+    assert ClassificadorLocal().classificar(comentarios, limiar=0.95) == [None, None]
+
+
+def test_modelo_treinado_aprende_e_respeita_o_limiar():
+    exemplos = [("app trava sempre", 'Negativo'), ("adorei o app", 'Positivo')] * 50
+    modelo = ModeloLinearHash(['Positivo', 'Negativo', 'Neutro'])
+    modelo.treinar([extrair_features(t) for t, _ in exemplos], [r for _, r in exemplos], epocas=3)
+
+    rotulos, confiancas = modelo.prever([extrair_features("app trava sempre"), extrair_features("adorei o app")])
+    assert rotulos == ['Negativo', 'Positivo']
+    assert np.all(confiancas > 0.5)
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from feedback_analyzer.pipeline import executar_pipeline
+
+OPCOES = dict(usar_cache=False, usar_classificador_local=False, agrupar_duplicados=False, espera_bloco=0.05)
+
+
+def test_blocos_entregues_na_ordem_mesmo_terminando_fora_dela(backend_simulado, monkeypatch):
+    original = backend_simulado.gerar_async
+    terminados = []
+
+    async def gerar_async(prompt, *args, **kwargs):
+        if "lento" in prompt:
+            await asyncio.sleep(0.2)
+        resposta = await original(prompt, *args, **kwargs)
+        terminados.append("lento" in prompt)
+        return resposta
+
+    monkeypatch.setattr(backend_simulado, 'gerar_async', gerar_async)
+    comentarios = ["Pedido lento demais."] + [f"Comentário {i} sobre a entrega." for i in range(1, 6)]
+    entregues = []
+
+    stats = executar_pipeline(
+        comentarios, lambda registros, resultados: entregues.append(([r['linha'] for r in registros], resultados)),
+        tamanho_bloco=2, max_blocos_simultaneos=3, tamanho_lote=2, **OPCOES
+    )
+
+    assert terminados[-1]  # O primeiro bloco foi o último a terminar...
+    assert [linhas for linhas, _ in entregues] == [[0, 1], [2, 3], [4, 5]]  # ...e ainda saiu primeiro
+    assert all(len(resultados) == 2 for _, resultados in entregues)
+    assert stats['comentarios'] == 6 and stats['blocos'] == 3
+
+
+def test_relatorio_lento_segura_a_leitura_da_fonte(backend_simulado):
+    lidos = [0]
+    adiantamento = []
+
+    def fonte():
+        for i in range(40):
+            lidos[0] += 1
+            yield f"Comentário {i} sobre o produto."
+
+    entregues = [0]
+
+    def ao_resultado(registros, resultados):
+        entregues[0] += len(registros)
+        adiantamento.append(lidos[0] - entregues[0])
+        time.sleep(0.05)
+
+    executar_pipeline(
+        fonte(), ao_resultado, tamanho_fila=2, tamanho_bloco=2, max_blocos_simultaneos=1, tamanho_lote=2, **OPCOES
+    )
+
+    assert entregues[0] == 40
+    # Fila de entrada + bloco em formação + bloco à espera de vaga + item do produtor
+    assert max(adiantamento) <= 2 + 2 * 2 + 1
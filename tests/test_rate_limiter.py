@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+from feedback_analyzer import rate_limiter
+from feedback_analyzer.rate_limiter import (
+    ControleConcorrenciaAIMD, ControlePrazos, LimitadorTokenBucket, OrcamentoRetentativas,
+    eh_erro_de_cota, eh_erro_transitorio
+)
+
+
+class RelogioFalso:
+    """Substitui time.monotonic do módulo por um relógio avançado à mão."""
+
+    def __init__(self, monkeypatch):
+        self.agora = 1000.0
+        monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: self.agora)
+
+
+def test_token_bucket_libera_a_rajada_e_depois_a_taxa(monkeypatch):
+    relogio = RelogioFalso(monkeypatch)
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=60, rajada=3)
+
+    assert [limitador.tentar_adquirir() for _ in range(4)] == [True, True, True, False]
+    assert limitador._tentar_consumir() == 1.0  # Um token por segundo
+
+    relogio.agora += 1.0
+    assert limitador.tentar_adquirir()
+    assert not limitador.tentar_adquirir()
+
+
+def test_token_bucket_penaliza_uma_vez_por_intervalo_e_recupera(monkeypatch):
+    relogio = RelogioFalso(monkeypatch)
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=60, rajada=5)
+
+    limitador.penalizar(pausa=2.0)
+    limitador.penalizar(pausa=2.0)  # Mesmo evento de congestionamento
+    assert limitador.taxa == 0.5
+    assert limitador._tentar_consumir() == 2.0  # Pausado, mesmo com a taxa cortada
+
+    relogio.agora += 5.0
+    assert limitador.tentar_adquirir()
+
+    for _ in range(100):
+        limitador.recompensar()
+    assert limitador.taxa == limitador.taxa_maxima
+
+
+def test_token_bucket_respeita_a_taxa_minima(monkeypatch):
+    relogio = RelogioFalso(monkeypatch)
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=60, rajada=1)
+    for _ in range(20):
+        relogio.agora += rate_limiter.INTERVALO_REDUCAO
+        limitador.penalizar(pausa=0.0)
+    assert limitador.taxa == limitador.taxa_minima
+
+
+def test_aimd_cresce_com_sucessos_e_corta_em_erro_de_cota(monkeypatch):
+    relogio = RelogioFalso(monkeypatch)
+    controle = ControleConcorrenciaAIMD(inicial=4, maximo=8)
+
+    for _ in range(40):
+        controle.registrar_sucesso(0.1)
+    assert 6 <= controle.limite <= 8
+
+    limite = controle.limite
+    controle.registrar_falha(cota=True)
+    controle.registrar_falha(cota=True)  # Dentro do intervalo: não corta de novo
+    assert controle.limite == limite / 2
+    assert controle.reducoes == 1
+
+    relogio.agora += rate_limiter.INTERVALO_REDUCAO
+    controle.registrar_falha(cota=True)
+    assert controle.limite == max(1, limite / 4)
+    assert controle.reducoes == 2
+
+
+def test_aimd_corta_quando_a_latencia_degrada(monkeypatch):
+    RelogioFalso(monkeypatch)
+    controle = ControleConcorrenciaAIMD(inicial=8, maximo=8)
+    for _ in range(10):
+        controle.registrar_sucesso(0.1)
+    for _ in range(10):
+        controle.registrar_sucesso(2.0)
+    assert controle.limite < 8
+    assert controle.reducoes >= 1
+
+
+def test_aimd_guarda_so_a_janela_de_latencias(monkeypatch):
+    RelogioFalso(monkeypatch)
+    controle = ControleConcorrenciaAIMD(janela_latencias=5)
+    for latencia in range(20):
+        controle.registrar_sucesso(float(latencia))
+    assert list(controle.latencias) == [15.0, 16.0, 17.0, 18.0, 19.0]
+
+
+def test_aimd_limita_as_requisicoes_simultaneas():
+    async def executar():
+        controle = ControleConcorrenciaAIMD(inicial=2, maximo=2)
+
+        async def tarefa():
+            async with controle:
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(tarefa() for _ in range(6)))
+        return controle
+
+    controle = asyncio.run(executar())
+    assert controle.pico == 2
+    assert controle.em_voo == 0
+
+
+def test_orcamento_de_retentativas():
+    orcamento = OrcamentoRetentativas(proporcao=0.5, minimo=1)
+    for _ in range(4):
+        orcamento.registrar_requisicao()
+    assert [orcamento.consumir() for _ in range(4)] == [True, True, True, False]
+    assert orcamento.estatisticas() == {"requisicoes": 4, "retentativas": 3, "retentativas_negadas": 1}
+
+
+def test_classificacao_de_erros():
+    class ResourceExhausted(Exception):
+        pass
+
+    assert eh_erro_de_cota(ResourceExhausted("sem cota"))
+    assert eh_erro_de_cota(Exception("HTTP 429 Too Many Requests"))
+    assert eh_erro_transitorio(TimeoutError())
+    assert not eh_erro_transitorio(ValueError("JSON inválido"))
+
+
+def test_prazo_cancela_a_chamada_lenta():
+    prazos = ControlePrazos(timeout=0.05, hedge=False)
+    canceladas = []
+
+    async def lenta():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            canceladas.append(True)
+            raise
+
+    async def executar():
+        inicio = asyncio.get_running_loop().time()
+        with pytest.raises(TimeoutError):
+            await prazos.executar(lenta)
+        return asyncio.get_running_loop().time() - inicio
+
+    assert asyncio.run(executar()) < 1.0
+    assert canceladas == [True]
+    assert prazos.estatisticas()['timeouts'] == 1
+
+
+def test_hedge_dispara_copia_acima_do_p95_e_vale_a_primeira_resposta():
+    prazos = ControlePrazos(timeout=5, hedge=True, proporcao_hedge=1.0, minimo_amostras=1)
+    chamadas = []
+
+    async def chamada():
+        chamadas.append(len(chamadas))
+        await asyncio.sleep(2.0 if len(chamadas) == 2 else 0.01)  # Só a segunda (a original) trava
+        return f"resposta {len(chamadas)}"
+
+    async def executar():
+        await prazos.executar(chamada, 'lote')  # Amostra de latência para o p95
+        inicio = asyncio.get_running_loop().time()
+        resposta = await prazos.executar(chamada, 'lote')
+        return resposta, asyncio.get_running_loop().time() - inicio
+
+    resposta, duracao = asyncio.run(executar())
+    assert resposta == "resposta 3"
+    assert duracao < 1.0
+    assert prazos.estatisticas() == {"hedges": 1, "hedges_vencedores": 1, "timeouts": 0}
+
+
+def test_hedge_respeita_a_proporcao_de_copias():
+    prazos = ControlePrazos(timeout=5, hedge=True, proporcao_hedge=0.0, minimo_amostras=1)
+
+    async def executar():
+        async def rapida():
+            await asyncio.sleep(0.01)
+
+        async def lenta():
+            await asyncio.sleep(0.1)
+
+        await prazos.executar(rapida)
+        await prazos.executar(lenta)
+
+    asyncio.run(executar())
+    assert prazos.estatisticas()['hedges'] == 0
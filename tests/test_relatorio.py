@@ -0,0 +1,56 @@
+from feedback_analyzer.relatorio import EscritorRelatorioHtml, EscritorRelatorioMarkdown, markdown_para_html
+
+
+def _bloco(inicio, quantidade, comentario="Gostei do app"):
+    registros = [{'linha': i, 'data': '2024-03-01', 'fonte': 'Loja', 'comentario': comentario}
+                 for i in range(inicio, inicio + quantidade)]
+    resultados = [{'sentimento': 'Positivo', 'categoria': 'UI/UX', 'resumo_curto': 'Elogio'}] * quantidade
+    return registros, resultados
+
+
+def test_markdown_dividido_em_paginas(tmp_path):
+    caminho = tmp_path / 'relatorio.md'
+    escritor = EscritorRelatorioMarkdown(str(caminho), comentarios_por_pagina=2)
+    escritor.escrever(*_bloco(0, 3))  # Um bloco atravessa a divisa entre páginas
+    escritor.escrever(*_bloco(3, 2))
+    escritor.finalizar("# Relatório\n\n")
+
+    relatorio = caminho.read_text(encoding='utf-8')
+    assert "- [Página 1: comentários 1 a 2](relatorio_comentarios_001.md)" in relatorio
+    assert "- [Página 2: comentários 3 a 4](relatorio_comentarios_002.md)" in relatorio
+    assert "- [Página 3: comentários 5 a 5](relatorio_comentarios_003.md)" in relatorio
+    paginas = [(tmp_path / f'relatorio_comentarios_00{n}.md').read_text(encoding='utf-8') for n in (1, 2, 3)]
+    assert [pagina.count("### ✅ Comentário") for pagina in paginas] == [2, 2, 1]
+    assert "Comentário 3\n" in paginas[1] and "Comentário 5\n" in paginas[2]
+    assert not (tmp_path / 'relatorio.md.parcial').exists()
+
+
+def test_markdown_truncado_aponta_os_outros_formatos(tmp_path):
+    caminho = tmp_path / 'relatorio.md'
+    escritor = EscritorRelatorioMarkdown(str(caminho), max_comentarios=3)
+    escritor.escrever(*_bloco(0, 5))
+    escritor.finalizar("# Relatório\n\n", outros_formatos=[str(tmp_path / 'relatorio.csv')])
+
+    relatorio = caminho.read_text(encoding='utf-8')
+    assert relatorio.count("### ✅ Comentário") == 3
+    assert "_… mais 2 comentários omitidos deste relatório (lista completa em: relatorio.csv)._" in relatorio
+
+
+def test_html_escapa_o_texto_dos_comentarios_e_do_cabecalho(tmp_path):
+    caminho = tmp_path / 'relatorio.html'
+    escritor = EscritorRelatorioHtml(str(caminho))
+    escritor.escrever(*_bloco(0, 1, comentario='<script>alert("x")</script> & "aspas"'))
+    escritor.finalizar("# Produto <b>X</b>\n\n- **Total:** 1\n")
+
+    pagina = caminho.read_text(encoding='utf-8')
+    assert "<script>" not in pagina
+    assert "<td>&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; &quot;aspas&quot;</td>" in pagina
+    assert "<title>Produto &lt;b&gt;X&lt;/b&gt;</title>" in pagina
+    assert "<h1>Produto &lt;b&gt;X&lt;/b&gt;</h1>" in pagina
+
+
+def test_markdown_para_html_converte_tabela_e_lista():
+    convertido = markdown_para_html("| Sentimento | Total |\n|---|---|\n| Positivo | 3 |\n\n- **um** item\n")
+    assert ("<table><thead><tr><th>Sentimento</th><th>Total</th></tr></thead>"
+            "<tbody><tr><td>Positivo</td><td>3</td></tr></tbody></table>") in convertido
+    assert "<ul><li><strong>um</strong> item</li></ul>" in convertido
@@ -0,0 +1,48 @@
+from feedback_analyzer import gemini_processor
+from feedback_analyzer.resumo_executivo import AmostraPorGrupo, gerar_resumo_executivo_mapreduce
+
+
+class BackendSemMapa:
+    """Falha nos resumos por grupo (etapa de mapa) e responde aos demais prompts."""
+
+    modelo = 'teste'
+
+    def __init__(self):
+        self.prompts = []
+
+    async def gerar_async(self, prompt, max_output_tokens=None, esquema=None):
+        self.prompts.append(prompt)
+        if 'leia os resumos' in prompt:
+            raise ValueError("falha simulada")
+        return "Resumo das estatísticas."
+
+
+def _amostras():
+    amostras = AmostraPorGrupo(tamanho_amostra=5)
+    amostras.adicionar([
+        {"sentimento": "Negativo", "categoria": "Bug", "resumo_curto": "App trava ao abrir"},
+        {"sentimento": "Positivo", "categoria": "UI/UX", "resumo_curto": "Interface bonita"},
+        {"sentimento": "Erro", "categoria": "Erro", "resumo_curto": "Erro no processamento."},
+    ])
+    return amostras
+
+
+def test_amostra_ignora_erros_e_conta_grupos():
+    amostras = _amostras()
+    assert amostras.contagens == {("Bug", "Negativo"): 1, ("UI/UX", "Positivo"): 1}
+
+
+def test_mapreduce_cai_no_resumo_de_estatisticas(backend_simulado, escrever_config):
+    escrever_config("[CACHE]\nATIVO = false\n")
+    backend = BackendSemMapa()
+    gemini_processor.definir_backend(backend)
+
+    resumo = gerar_resumo_executivo_mapreduce("Negativo 1\nPositivo 1", _amostras())
+
+    assert resumo == "Resumo das estatísticas."
+    assert any('estatísticas' in prompt and 'leia os resumos' not in prompt for prompt in backend.prompts)
+
+
+def test_mapreduce_com_backend_simulado(backend_simulado, escrever_config):
+    escrever_config("[CACHE]\nATIVO = false\n")
+    assert gerar_resumo_executivo_mapreduce("Negativo 1\nPositivo 1", _amostras()).startswith("Resumo simulado")
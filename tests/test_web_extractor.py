@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import Counter
+
+from feedback_analyzer import web_extractor
+from feedback_analyzer.web_extractor import comentarios_do_html
+
+
+def test_busca_por_texto_aplica_cada_padrao_no_texto_inteiro():
+    html = "<html><body><div>Comprei este produto e achei excelente, chegou antes do prazo.</div></body></html>"
+
+    # Um mesmo trecho casa nos três padrões; cada um traz o seu, na ordem dos padrões
+    assert comentarios_do_html(html) == [
+        'excelente, chegou antes do prazo.',
+        'produto e achei excelente, chegou antes do prazo.',
+        'Comprei este produto e achei excelente, chegou antes do prazo.',
+    ]
+
+
+def test_busca_por_texto_limita_dez_trechos_por_padrao():
+    linhas = "".join(f"<p>Ruim, travou na tela {i} de novo.</p>\n" for i in range(15))
+    comentarios = comentarios_do_html(f"<html><body>{linhas}</body></html>")
+
+    assert comentarios == [f"Ruim, travou na tela {i} de novo." for i in range(10)]
+
+
+def test_extracao_em_lote_respeita_o_limite_por_dominio(monkeypatch):
+    trava = threading.Lock()
+    ativos, picos = Counter(), Counter()
+
+    def extrair_falso(url, incremental=True):
+        chave = web_extractor.chave_dominio(url)
+        with trava:
+            ativos[chave] += 1
+            picos[chave] = max(picos[chave], ativos[chave])
+        try:
+            time.sleep(0.05)
+            yield f"Comentário longo vindo de {url}"
+        finally:
+            with trava:
+                ativos[chave] -= 1
+
+    monkeypatch.setattr(web_extractor, 'iterar_comentarios_de_url', extrair_falso)
+    urls = [f"https://loja-a.com/produto/{i}" for i in range(4)] + [
+        "https://www.amazon.com/dp/1", "https://www.amazon.com.br/dp/2", "https://www.amazon.com/dp/3",
+        "https://loja-b.com/produto/1",
+    ]
+
+    df = web_extractor.extrair_comentarios_de_urls(urls, max_simultaneas=8, max_por_dominio=2)
+
+    assert sorted(df['fonte']) == sorted(urls)
+    # amazon.com e amazon.com.br dividem o mesmo limite
+    assert picos == {'loja-a.com': 2, 'amazon': 2, 'loja-b.com': 1}
+
+
+class DriverColheita:
+    """Simula a página: `etapas` são as coletas devolvidas a cada execução do script de colheita."""
+
+    def __init__(self, etapas):
+        self.etapas = list(etapas)
+        self.scripts = []
+
+    def execute_script(self, script, *argumentos):
+        self.scripts.append(script)
+        if script != web_extractor.SCRIPT_COLHER_TEXTOS:
+            return None  # Rolagem
+        return self.etapas.pop(0) if len(self.etapas) > 1 else self.etapas[0]
+
+
+def _coleta(textos, total=None):
+    return {'seletor': '.review', 'textos': textos, 'total': len(textos) if total is None else total}
+
+
+def test_espera_pelos_textos_em_vez_de_um_tempo_fixo():
+    driver = DriverColheita([_coleta([]), _coleta([]), _coleta(["Chegou rápido e bem embalado."])])
+
+    inicio = time.monotonic()
+    coleta = web_extractor.esperar_textos(driver, ['.review'], timeout=5)
+
+    assert coleta['textos'] == ["Chegou rápido e bem embalado."]
+    assert time.monotonic() - inicio < 2  # Sai assim que o seletor tem texto
+    assert web_extractor.esperar_textos(DriverColheita([_coleta([])]), ['.review'], timeout=0.3)['textos'] == []
+
+
+def test_colhe_todos_os_seletores_em_uma_chamada():
+    chamadas = []
+
+    class Driver:
+        def execute_script(self, script, *argumentos):
+            chamadas.append(argumentos)
+            return _coleta(["Texto da review."])
+
+    coleta = web_extractor.colher_textos(Driver(), ('.a', '.b', '.c'), limite=20)
+
+    assert coleta['textos'] == ["Texto da review."]
+    assert chamadas == [(['.a', '.b', '.c'], 20, web_extractor.TAMANHO_MINIMO_TEXTO)]
+
+
+def test_rolagem_gera_so_os_textos_novos_e_para_quando_nao_cresce():
+    primeiros = ["Review número 1 do app.", "Review número 2 do app."]
+    depois = primeiros + ["Review número 3 do app.", "Review número 4 do app."]
+    driver = DriverColheita([_coleta(primeiros), _coleta(depois), _coleta(depois)])
+
+    textos = list(web_extractor.rolar_e_colher(driver, '.review', limite=50, rolagens=5, timeout=0.3))
+
+    assert textos == depois
+    assert driver.scripts.count(web_extractor.SCRIPT_COLHER_TEXTOS) >= 3
+    assert len(driver.scripts) - driver.scripts.count(web_extractor.SCRIPT_COLHER_TEXTOS) == 2  # Duas rolagens
+
+
+def test_rolagem_para_no_limite():
+    driver = DriverColheita([_coleta([f"Review número {i} do app." for i in range(10)])])
+    assert len(list(web_extractor.rolar_e_colher(driver, '.review', limite=3, timeout=0.3))) == 3